@@ -1,15 +1,39 @@
 """
 Memory Attachment Store - Simple in-memory storage for ChatKit attachments.
 
-Stores attachment content in memory during the request lifecycle.
+Stores attachment metadata in memory during the request lifecycle.
 Based on old-directory implementation with ChatKit AttachmentStore interface.
+
+Content is spooled to disk, not kept on the heap: uploads are streamed in
+chunks into a temp file (AttachmentWriter), hashed with SHA-256 and stored
+once per content hash, so re-uploading the same image shares one file. The
+process only keeps metadata and file references, in bounded caches (total
+bytes + TTL); evicted content files are deleted.
+
+The data URL (images) or OpenAI file id (documents) of a content hash is
+produced lazily on first use and cached, so each upload is encoded once.
+
+Limits:
+    ATTACHMENT_MAX_UPLOAD_BYTES: max size of one upload (default 20MB)
+    ATTACHMENT_CACHE_MAX_BYTES: total spooled content (default 256MB)
+    ATTACHMENT_CACHE_TTL_SECONDS: content/metadata lifetime (default 1 hour)
+    ATTACHMENT_DATA_URL_CACHE_BYTES: cached data URLs (default 64MB)
+    ATTACHMENT_SPOOL_DIR: spool directory (default: system temp dir); each
+        process writes to a <pid> subdirectory, stale ones are removed at startup
 """
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
 import logging
 import os
+import shutil
+import tempfile
+import threading
+import time
 import uuid
+from dataclasses import dataclass
 from typing import Any, Dict
 
 from chatkit.server import AttachmentStore
@@ -20,6 +44,8 @@ from chatkit.types import (
     ImageAttachment,
 )
 
+from app.utils.cache import BoundedCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,9 +55,189 @@ def generate_attachment_id(prefix: str = "attachment") -> str:
     return f"{prefix}_{unique_id}"
 
 
-# Global in-memory storage for attachments (persists between requests)
-_attachment_storage: Dict[str, bytes] = {}
-_global_attachments_content: Dict[str, str] = {}  # Base64 content storage
+ATTACHMENT_MAX_UPLOAD_BYTES = int(os.getenv("ATTACHMENT_MAX_UPLOAD_BYTES", 20 * 1024 * 1024))
+ATTACHMENT_CACHE_MAX_BYTES = int(os.getenv("ATTACHMENT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+ATTACHMENT_CACHE_TTL_SECONDS = float(os.getenv("ATTACHMENT_CACHE_TTL_SECONDS", 3600))
+ATTACHMENT_DATA_URL_CACHE_BYTES = int(
+    os.getenv("ATTACHMENT_DATA_URL_CACHE_BYTES", 64 * 1024 * 1024)
+)
+
+# Per-process directory: content indexes are process-local, so another
+# worker must never delete (evict) files this one references
+ATTACHMENT_SPOOL_ROOT = (
+    os.getenv("ATTACHMENT_SPOOL_DIR") or os.path.join(tempfile.gettempdir(), "fizko-attachments")
+)
+ATTACHMENT_SPOOL_DIR = os.path.join(ATTACHMENT_SPOOL_ROOT, str(os.getpid()))
+
+
+class AttachmentTooLargeError(ValueError):
+    """Upload exceeds ATTACHMENT_MAX_UPLOAD_BYTES."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"Attachment exceeds the maximum size of {max_bytes} bytes")
+
+
+@dataclass(frozen=True)
+class StoredContent:
+    """Spooled attachment content (one file per content hash)."""
+
+    sha256: str
+    path: str
+    size: int
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"⚠️ Could not delete attachment file {path}: {e}")
+
+
+def _clean_spool() -> None:
+    """
+    Remove spool directories left by previous processes.
+
+    Runs once per process at import. This process's own directory can only
+    hold leftovers of a dead process that had the same PID. Other
+    directories are removed once untouched for longer than the cache TTL:
+    every upload or eviction touches the directory, so older content has
+    expired for its process too (dead or alive).
+    """
+    if not os.path.isdir(ATTACHMENT_SPOOL_ROOT):
+        return
+
+    cutoff = time.time() - ATTACHMENT_CACHE_TTL_SECONDS
+    removed = 0
+    for name in os.listdir(ATTACHMENT_SPOOL_ROOT):
+        path = os.path.join(ATTACHMENT_SPOOL_ROOT, name)
+        try:
+            if not name.isdigit() or not os.path.isdir(path):
+                continue
+            if path != ATTACHMENT_SPOOL_DIR and os.path.getmtime(path) >= cutoff:
+                continue
+            shutil.rmtree(path)
+            removed += 1
+        except FileNotFoundError:
+            pass  # Cleaned up by another process starting at the same time
+        except OSError as e:
+            logger.warning(f"⚠️ Could not remove attachment spool {path}: {e}")
+
+    if removed:
+        logger.info(f"🧹 Removed {removed} stale attachment spool directories")
+
+
+_clean_spool()
+
+# Global content storage (persists between requests, NOT server restarts)
+# sha256 -> spooled file; evicted files are deleted from disk
+_content_storage: BoundedCache[str, StoredContent] = BoundedCache(
+    "attachments.content",
+    max_bytes=ATTACHMENT_CACHE_MAX_BYTES,
+    ttl_seconds=ATTACHMENT_CACHE_TTL_SECONDS,
+    sizeof=lambda content: content.size,
+    on_evict=lambda sha256, content, reason: _remove_file(content.path),
+)
+
+# attachment_id -> sha256 (several attachments may share one content)
+_attachment_content: BoundedCache[str, str] = BoundedCache(
+    "attachments.index",
+    max_items=10_000,
+    ttl_seconds=ATTACHMENT_CACHE_TTL_SECONDS,
+)
+
+# (sha256, mime_type) -> data URL, built on first use
+_data_urls: BoundedCache[tuple[str, str], str] = BoundedCache(
+    "attachments.data_urls",
+    max_bytes=ATTACHMENT_DATA_URL_CACHE_BYTES,
+    ttl_seconds=ATTACHMENT_CACHE_TTL_SECONDS,
+    sizeof=len,
+)
+_data_url_lock = threading.Lock()
+
+# sha256 -> OpenAI file id, uploaded on first use
+_openai_files: BoundedCache[str, str] = BoundedCache(
+    "attachments.openai_files",
+    max_items=10_000,
+    ttl_seconds=ATTACHMENT_CACHE_TTL_SECONDS,
+)
+_openai_uploads: Dict[str, asyncio.Task] = {}
+
+
+class AttachmentWriter:
+    """
+    Spools an upload to disk chunk by chunk.
+
+    Hashes while writing and aborts as soon as the size cap is exceeded, so
+    an oversized upload never lands in memory or on disk in full. Blocking
+    file I/O: call from a thread when used by async code.
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        self.max_bytes = ATTACHMENT_MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        os.makedirs(ATTACHMENT_SPOOL_DIR, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=ATTACHMENT_SPOOL_DIR, suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.abort()
+            raise AttachmentTooLargeError(self.max_bytes)
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self, attachment_id: str) -> StoredContent:
+        """Finish the upload and register it for attachment_id."""
+        self._file.close()
+        sha256 = self._hash.hexdigest()
+
+        existing = _content_storage.get(sha256)
+        if existing is not None and os.path.exists(existing.path):
+            # Same content already stored: keep one copy
+            _remove_file(self._tmp_path)
+            content = existing
+        else:
+            path = os.path.join(ATTACHMENT_SPOOL_DIR, sha256)
+            os.replace(self._tmp_path, path)
+            content = StoredContent(sha256=sha256, path=path, size=self.size)
+
+        _content_storage[sha256] = content  # (re)write refreshes the TTL
+        _attachment_content[attachment_id] = sha256
+        return content
+
+    def abort(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        _remove_file(self._tmp_path)
+
+
+def get_stored_content(attachment_id: str) -> StoredContent | None:
+    """Spooled content of an attachment (None if missing or evicted)."""
+    sha256 = _attachment_content.get(attachment_id)
+    if sha256 is None:
+        return None
+    return _content_storage.get(sha256)
+
+
+def _release_content(attachment_id: str) -> bool:
+    """Unlink an attachment from its content; delete the file if unshared."""
+    sha256 = _attachment_content.pop(attachment_id)
+    if sha256 is None:
+        return False
+    if sha256 not in _attachment_content.values():
+        content = _content_storage.pop(sha256)
+        if content is not None:
+            _remove_file(content.path)
+    return True
 
 
 class MemoryAttachmentStore(AttachmentStore):
@@ -46,7 +252,11 @@ class MemoryAttachmentStore(AttachmentStore):
 
     def __init__(self):
         """Initialize memory attachment store."""
-        self._attachments: Dict[str, Attachment] = {}
+        self._attachments: BoundedCache[str, Attachment] = BoundedCache(
+            "attachments.metadata",
+            max_items=10_000,
+            ttl_seconds=ATTACHMENT_CACHE_TTL_SECONDS,
+        )
         self.backend_url = os.getenv("BACKEND_URL", "http://localhost:8000")
         logger.info("📎 MemoryAttachmentStore initialized")
 
@@ -120,64 +330,57 @@ class MemoryAttachmentStore(AttachmentStore):
 
     async def delete_attachment(self, attachment_id: str) -> None:
         """Delete attachment from memory."""
-        if attachment_id in self._attachments:
-            del self._attachments[attachment_id]
+        if self._attachments.pop(attachment_id) is not None:
             logger.info(f"🗑️  Deleted attachment metadata: {attachment_id}")
 
-        if attachment_id in _global_attachments_content:
-            del _global_attachments_content[attachment_id]
+        if _release_content(attachment_id):
             logger.info(f"🗑️  Deleted attachment content: {attachment_id}")
 
+    async def get_openai_metadata(self, attachment_id: str) -> Dict[str, Any] | None:
+        """OpenAI file reference of an attachment, if it was already uploaded."""
+        content = get_stored_content(attachment_id)
+        file_id = _openai_files.get(content.sha256) if content is not None else None
+        return {"file_id": file_id} if file_id else None
+
     def store(self, attachment_id: str, content: bytes) -> None:
         """Store attachment content (Phase 2 upload, backwards compat)."""
-        global _attachment_storage
-        _attachment_storage[attachment_id] = content
-        logger.info(f"📎 Stored attachment {attachment_id} ({len(content)} bytes)")
+        store_attachment_content(attachment_id, content)
 
     def get(self, attachment_id: str) -> bytes | None:
         """Get attachment content (backwards compat)."""
-        global _attachment_storage
-        return _attachment_storage.get(attachment_id)
+        content = get_stored_content(attachment_id)
+        return content.read() if content is not None else None
 
     def delete(self, attachment_id: str) -> None:
         """Delete attachment content (backwards compat, non-async)."""
-        global _attachment_storage
-        if attachment_id in _attachment_storage:
-            del _attachment_storage[attachment_id]
+        if _release_content(attachment_id):
             logger.info(f"📎 Deleted attachment {attachment_id}")
 
 
 # Global helper functions for compatibility
 def store_attachment_content(attachment_id: str, content: bytes) -> None:
     """
-    Store attachment content in memory (Phase 2 of upload).
+    Store attachment content (already in memory) to the spool.
 
-    This is called by the /chatkit/upload/{attachment_id} endpoint.
+    The upload endpoint streams into an AttachmentWriter instead.
 
     Args:
         attachment_id: The attachment identifier
         content: Raw file bytes
-    """
-    # Convert to base64 for storage
-    base64_content = base64.b64encode(content).decode('utf-8')
 
-    # Store in global dict (persists between requests but NOT server restarts)
-    global _global_attachments_content
-    _global_attachments_content[attachment_id] = base64_content
-
-    # Also store raw bytes for backwards compatibility
-    global _attachment_storage
-    _attachment_storage[attachment_id] = content
+    Raises:
+        AttachmentTooLargeError: If content exceeds ATTACHMENT_MAX_UPLOAD_BYTES
+    """
+    writer = AttachmentWriter()
+    writer.write(content)
+    stored = writer.commit(attachment_id)
 
-    logger.info(
-        f"💾 Stored attachment {attachment_id}: "
-        f"{len(base64_content)} chars (base64), {len(content)} bytes"
-    )
+    logger.info(f"💾 Stored attachment {attachment_id}: {stored.size} bytes")
 
 
 def get_attachment_content(attachment_id: str) -> str | None:
     """
-    Retrieve attachment content from memory.
+    Retrieve attachment content.
 
     Args:
         attachment_id: The attachment identifier
@@ -185,5 +388,86 @@ def get_attachment_content(attachment_id: str) -> str | None:
     Returns:
         Base64-encoded content or None if not found
     """
-    global _global_attachments_content
-    return _global_attachments_content.get(attachment_id)
+    content = get_stored_content(attachment_id)
+    if content is None:
+        return None
+    return base64.b64encode(content.read()).decode('utf-8')
+
+
+def get_attachment_data_url(attachment_id: str, mime_type: str) -> str | None:
+    """
+    Data URL of an attachment, encoded once per content and cached.
+
+    Blocking file read on the first call: use asyncio.to_thread() from
+    async code.
+
+    Returns:
+        "data:<mime_type>;base64,..." or None if the content is gone
+    """
+    content = get_stored_content(attachment_id)
+    if content is None:
+        return None
+
+    key = (content.sha256, mime_type)
+    data_url = _data_urls.get(key)
+    if data_url is None:
+        with _data_url_lock:
+            data_url = _data_urls.get(key)
+            if data_url is None:
+                try:
+                    raw = content.read()
+                except FileNotFoundError:
+                    return None
+                encoded = base64.b64encode(raw).decode("ascii")
+                data_url = f"data:{mime_type};base64,{encoded}"
+                _data_urls[key] = data_url
+    return data_url
+
+
+async def get_openai_file_id(
+    attachment_id: str,
+    openai_client: Any,
+    filename: str | None = None,
+    purpose: str = "user_data",
+) -> str | None:
+    """
+    OpenAI file id of an attachment, uploading its content once.
+
+    Concurrent calls for the same content share one upload.
+
+    Args:
+        attachment_id: The attachment identifier
+        openai_client: AsyncOpenAI client
+        filename: Name sent to OpenAI (defaults to the attachment id)
+        purpose: OpenAI file purpose
+
+    Returns:
+        File id, or None if the content is gone
+    """
+    content = get_stored_content(attachment_id)
+    if content is None:
+        return None
+
+    file_id = _openai_files.get(content.sha256)
+    if file_id is not None:
+        return file_id
+
+    task = _openai_uploads.get(content.sha256)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        async def upload() -> str:
+            with open(content.path, "rb") as f:
+                result = await openai_client.files.create(
+                    file=(filename or attachment_id, f),
+                    purpose=purpose,
+                )
+            _openai_files[content.sha256] = result.id
+            logger.info(f"📤 Uploaded attachment {attachment_id} to OpenAI: {result.id}")
+            return result.id
+
+        task = asyncio.ensure_future(upload())
+        _openai_uploads[content.sha256] = task
+        task.add_done_callback(
+            lambda t, sha256=content.sha256: _openai_uploads.pop(sha256, None)
+        )
+
+    return await asyncio.shield(task)
@@ -0,0 +1,344 @@
+"""
+Conversation session store for agent runs.
+
+Agent history used to live in a local SQLite file (AdvancedSQLiteSession),
+which pins a thread to one host and serializes writers. The store is now
+pluggable and shared across processes:
+
+- redis: SDK RedisSession over a pooled redis.asyncio client
+  (AGENT_SESSION_REDIS_URL, falls back to REDIS_URL)
+- postgres: SDK SQLAlchemySession over a pooled async engine
+  (AGENT_SESSION_DATABASE_URL, e.g. postgresql+asyncpg://...;
+  requires sqlalchemy[asyncio] and asyncpg)
+- sqlite: AdvancedSQLiteSession in a local file (single host, dev only)
+
+AGENT_SESSION_BACKEND selects one (default: sqlite). Clients/engines are
+created once per event loop and shared by every session. Redis sessions
+expire after AGENT_SESSION_TTL_SECONDS of inactivity (default 30 days, 0
+keeps them forever).
+
+Switching backends does not migrate history: threads started on the SQLite
+file continue with an empty history on redis/postgres. Switch during a
+quiet window, or keep sqlite until the old threads no longer matter.
+
+Each message gets a ConversationSession wrapper that:
+- loads the history once (classifier and specialist share it)
+- only loads the most recent window (AGENT_HISTORY_MAX_ITEMS) and trims it
+  to a token budget (AGENT_HISTORY_MAX_TOKENS), starting at a user message
+  so tool calls are never split from their outputs
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import weakref
+from typing import Any, List, Optional
+
+from agents.memory.session import SessionABC
+
+logger = logging.getLogger(__name__)
+
+BACKEND_REDIS = "redis"
+BACKEND_POSTGRES = "postgres"
+BACKEND_SQLITE = "sqlite"
+
+DEFAULT_HISTORY_MAX_ITEMS = 60
+DEFAULT_HISTORY_MAX_TOKENS = 12000
+DEFAULT_POOL_SIZE = 20
+DEFAULT_SESSION_TTL_SECONDS = 30 * 24 * 3600
+CHARS_PER_TOKEN = 4  # rough estimate, good enough for budgeting
+
+REDIS_KEY_PREFIX = "agents:session"
+
+# Shared clients, one per event loop (async connections are loop-bound)
+_redis_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+_pg_engines: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+_pg_tables_ready: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_warned_fallback = False
+
+
+# ==========================================
+# CONFIG
+# ==========================================
+
+def _get_redis_url() -> Optional[str]:
+    return os.getenv("AGENT_SESSION_REDIS_URL") or os.getenv("REDIS_URL")
+
+
+def get_session_backend() -> str:
+    """
+    Configured session backend (AGENT_SESSION_BACKEND, default: sqlite).
+
+    Never switched implicitly (e.g. because REDIS_URL is set): existing
+    SQLite histories are not carried over to the other backends.
+    """
+    return os.getenv("AGENT_SESSION_BACKEND", BACKEND_SQLITE).strip().lower() or BACKEND_SQLITE
+
+
+def _get_int_env(name: str, default: int) -> Optional[int]:
+    """Read an int env var; 0 or negative disables the limit (None)."""
+    value = int(os.getenv(name, default))
+    return value if value > 0 else None
+
+
+# ==========================================
+# BACKENDS
+# ==========================================
+
+def _get_redis_client() -> Any:
+    """Shared, pooled redis.asyncio client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _redis_clients.get(loop)
+    if client is None:
+        import redis.asyncio as redis
+
+        pool = redis.BlockingConnectionPool.from_url(
+            _get_redis_url(),
+            max_connections=int(os.getenv("AGENT_SESSION_POOL_SIZE", DEFAULT_POOL_SIZE)),
+            timeout=5,
+            health_check_interval=30,
+        )
+        client = redis.Redis(connection_pool=pool)
+        _redis_clients[loop] = client
+        logger.info("💾 Agent sessions using Redis (pooled)")
+    return client
+
+
+def _get_pg_engine() -> Any:
+    """Shared, pooled SQLAlchemy async engine for the running event loop."""
+    loop = asyncio.get_running_loop()
+    engine = _pg_engines.get(loop)
+    if engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = os.getenv("AGENT_SESSION_DATABASE_URL")
+        if not url:
+            raise ValueError("AGENT_SESSION_DATABASE_URL environment variable not set")
+
+        engine = create_async_engine(
+            url,
+            pool_size=int(os.getenv("AGENT_SESSION_POOL_SIZE", DEFAULT_POOL_SIZE)),
+            max_overflow=10,
+            pool_pre_ping=True,
+        )
+        _pg_engines[loop] = engine
+        logger.info("💾 Agent sessions using Postgres (pooled)")
+    return engine
+
+
+def _create_backend_session(thread_id: str, sqlite_path: str) -> SessionABC:
+    """Create the SDK session for the configured backend."""
+    global _warned_fallback
+    backend = get_session_backend()
+
+    try:
+        if backend == BACKEND_REDIS:
+            from agents.extensions.memory import RedisSession
+
+            ttl = _get_int_env("AGENT_SESSION_TTL_SECONDS", DEFAULT_SESSION_TTL_SECONDS)
+            return RedisSession(
+                thread_id,
+                redis_client=_get_redis_client(),
+                key_prefix=REDIS_KEY_PREFIX,
+                ttl=ttl,
+            )
+
+        if backend == BACKEND_POSTGRES:
+            from agents.extensions.memory import SQLAlchemySession
+
+            engine = _get_pg_engine()
+            # Create tables once per engine, not on every session
+            create_tables = engine not in _pg_tables_ready
+            _pg_tables_ready.add(engine)
+            return SQLAlchemySession(thread_id, engine=engine, create_tables=create_tables)
+
+        if backend != BACKEND_SQLITE:
+            raise ValueError(f"Unknown AGENT_SESSION_BACKEND: {backend}")
+
+    except Exception as e:
+        if not _warned_fallback:
+            logger.warning(f"⚠️ Agent session backend '{backend}' unavailable ({e}), using SQLite")
+            _warned_fallback = True
+
+    from agents.extensions.memory import AdvancedSQLiteSession
+
+    return AdvancedSQLiteSession(
+        session_id=thread_id,
+        db_path=sqlite_path,
+        create_tables=True,
+    )
+
+
+# ==========================================
+# HISTORY WINDOW
+# ==========================================
+
+def estimate_tokens(item: Any) -> int:
+    """Approximate token count of a history item."""
+    try:
+        size = len(json.dumps(item, ensure_ascii=False, default=str))
+    except Exception:
+        size = len(str(item))
+    return size // CHARS_PER_TOKEN + 1
+
+
+def _is_user_message(item: Any) -> bool:
+    return isinstance(item, dict) and item.get("role") == "user"
+
+
+def window_history(
+    items: List[Any],
+    max_items: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+) -> List[Any]:
+    """
+    Keep the most recent items that fit the item/token limits.
+
+    The window always starts at a user message, so it never begins with a
+    tool output or assistant reply whose turn was cut off.
+
+    Args:
+        items: History in chronological order
+        max_items: Max items to keep (None = unlimited)
+        max_tokens: Approximate token budget (None = unlimited)
+
+    Returns:
+        Trimmed history (chronological order)
+    """
+    start = len(items)
+    used = 0
+    while start > 0:
+        if max_items is not None and len(items) - start >= max_items:
+            break
+        cost = estimate_tokens(items[start - 1]) if max_tokens is not None else 0
+        if max_tokens is not None and used + cost > max_tokens:
+            break
+        used += cost
+        start -= 1
+
+    while start < len(items) and not _is_user_message(items[start]):
+        start += 1
+
+    return items[start:]
+
+
+class ConversationSession(SessionABC):
+    """
+    Per-message view over a thread's stored history.
+
+    Loads the (windowed) history once and serves it to every run of the
+    message; items added during the message are appended to both the store
+    and the cached copy.
+    """
+
+    def __init__(
+        self,
+        backend: SessionABC,
+        max_items: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ):
+        self.session_id = backend.session_id
+        self._backend = backend
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self._history: Optional[List[Any]] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def backend(self) -> SessionABC:
+        """Underlying SDK session."""
+        return self._backend
+
+    async def _load(self) -> List[Any]:
+        if self._history is None:
+            async with self._lock:
+                if self._history is None:
+                    items = await self._backend.get_items(limit=self.max_items)
+                    self._history = window_history(items, self.max_items, self.max_tokens)
+                    logger.debug(
+                        f"💾 Loaded history {self.session_id[:12]}...: "
+                        f"{len(self._history)}/{len(items)} items"
+                    )
+        return self._history
+
+    async def get_items(self, limit: int | None = None) -> List[Any]:
+        history = await self._load()
+        if limit is not None:
+            return list(history[-limit:]) if limit > 0 else []
+        return list(history)
+
+    async def add_items(self, items: List[Any]) -> None:
+        if not items:
+            return
+        await self._backend.add_items(items)
+        if self._history is not None:
+            self._history.extend(items)
+
+    async def pop_item(self) -> Any:
+        item = await self._backend.pop_item()
+        self._history = None  # Reload on next read
+        return item
+
+    async def clear_session(self) -> None:
+        await self._backend.clear_session()
+        self._history = []
+
+    async def store_run_usage(self, result: Any) -> None:
+        """Store usage data if the backend tracks it (AdvancedSQLiteSession)."""
+        store_run_usage = getattr(self._backend, "store_run_usage", None)
+        if store_run_usage is not None:
+            await store_run_usage(result)
+
+    def read_only(self) -> "ReadOnlySessionView":
+        """View sharing this history that does not persist new items."""
+        return ReadOnlySessionView(self)
+
+
+class ReadOnlySessionView(SessionABC):
+    """
+    History-only view of a ConversationSession.
+
+    Used for auxiliary runs (e.g. the classifier) that need the conversation
+    context but must not write their turn into the thread history.
+    """
+
+    def __init__(self, session: ConversationSession):
+        self.session_id = session.session_id
+        self._session = session
+
+    async def get_items(self, limit: int | None = None) -> List[Any]:
+        return await self._session.get_items(limit)
+
+    async def add_items(self, items: List[Any]) -> None:
+        return None
+
+    async def pop_item(self) -> Any:
+        return None
+
+    async def clear_session(self) -> None:
+        return None
+
+
+def create_conversation_session(thread_id: str, sqlite_path: str) -> ConversationSession:
+    """
+    Create the session for one message of a thread.
+
+    Args:
+        thread_id: Conversation/thread ID (session key)
+        sqlite_path: SQLite file used by the sqlite backend (and as fallback)
+
+    Returns:
+        ConversationSession over the configured backend
+    """
+    return ConversationSession(
+        _create_backend_session(thread_id, sqlite_path),
+        max_items=_get_int_env("AGENT_HISTORY_MAX_ITEMS", DEFAULT_HISTORY_MAX_ITEMS),
+        max_tokens=_get_int_env("AGENT_HISTORY_MAX_TOKENS", DEFAULT_HISTORY_MAX_TOKENS),
+    )
+
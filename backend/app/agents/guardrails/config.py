@@ -1,13 +1,23 @@
 """
 Centralized guardrail configuration for all agents.
 
-This file defines which guardrails are applied to each agent type.
+This file defines which guardrails are applied to each agent type, and the
+input guardrails AgentRunnerV2 runs per execution mode (AGENT_GUARDRAILS_MODE):
+
+- off (default): no input guardrails
+- heuristics: precompiled keyword checks only, before the agent starts
+- parallel: keyword checks before the agent starts, plus the AI abuse check
+  running concurrently with the agent (a tripwire cancels the stream)
 """
 
-from typing import Callable
+import dataclasses
+import os
+from typing import Any, Callable
 
 from app.agents.guardrails.implementations import (
+    abuse_ai_guardrail,
     abuse_detection_guardrail,
+    abuse_heuristics_guardrail,
     pii_output_guardrail,
     subscription_limit_guardrail,
 )
@@ -98,3 +108,46 @@ def apply_guardrails_to_agent(agent, agent_name: str):
         agent.output_guardrails = guardrails["output"]
 
     return agent
+
+
+GUARDRAILS_MODE_OFF = "off"
+GUARDRAILS_MODE_HEURISTICS = "heuristics"
+GUARDRAILS_MODE_PARALLEL = "parallel"
+
+# Input guardrails per execution mode
+GUARDRAIL_MODES: dict[str, list[Any]] = {
+    GUARDRAILS_MODE_OFF: [],
+    GUARDRAILS_MODE_HEURISTICS: [abuse_heuristics_guardrail],
+    GUARDRAILS_MODE_PARALLEL: [abuse_heuristics_guardrail, abuse_ai_guardrail],
+}
+
+
+def get_guardrails_mode() -> str:
+    """Configured guardrail execution mode (AGENT_GUARDRAILS_MODE, default: off)."""
+    mode = os.getenv("AGENT_GUARDRAILS_MODE", GUARDRAILS_MODE_OFF).strip().lower()
+    return mode if mode in GUARDRAIL_MODES else GUARDRAILS_MODE_OFF
+
+
+def apply_guardrails_to_run_config(run_config: Any = None, mode: str | None = None) -> Any:
+    """
+    Add the mode's input guardrails to a RunConfig.
+
+    Args:
+        run_config: Existing RunConfig (or None)
+        mode: Execution mode (default: get_guardrails_mode())
+
+    Returns:
+        RunConfig with the guardrails appended (unchanged if the mode has none)
+    """
+    guardrails = GUARDRAIL_MODES.get(mode or get_guardrails_mode(), [])
+    if not guardrails:
+        return run_config
+
+    from agents import RunConfig
+
+    if run_config is None:
+        return RunConfig(input_guardrails=list(guardrails))
+    return dataclasses.replace(
+        run_config,
+        input_guardrails=list(run_config.input_guardrails or []) + guardrails,
+    )
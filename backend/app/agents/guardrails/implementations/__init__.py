@@ -1,7 +1,9 @@
 """Concrete guardrail implementations for Fizko platform."""
 
 from app.agents.guardrails.implementations.abuse_detection import (
+    abuse_ai_guardrail,
     abuse_detection_guardrail,
+    abuse_heuristics_guardrail,
 )
 from app.agents.guardrails.implementations.pii_detection import (
     pii_output_guardrail,
@@ -12,6 +14,8 @@ from app.agents.guardrails.implementations.subscription_check import (
 
 __all__ = [
     "abuse_detection_guardrail",
+    "abuse_heuristics_guardrail",
+    "abuse_ai_guardrail",
     "pii_output_guardrail",
     "subscription_limit_guardrail",
 ]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import re
 from typing import Any
 
 from agents import Agent, RunContextWrapper, Runner, input_guardrail
@@ -22,6 +23,168 @@ class AbuseCheckOutput(BaseModel):
     confidence: float  # 0.0 to 1.0
 
 
+# Heuristic patterns, compiled once into a single regex each (one scan per input)
+PROMPT_INJECTION_PATTERNS = (
+    "ignore previous instructions",
+    "disregard your instructions",
+    "act as if you are",
+    "pretend to be",
+    "you are now",
+    "new instructions:",
+)
+
+# Keywords that indicate the request is NOT about taxes/accounting/Chile
+OFF_TOPIC_KEYWORDS = {
+    # Homework/Academic
+    "homework": ("homework", "exam", "examen", "exámenes"),
+    # Math/Science (unless tax-related)
+    "math": ("ecuación", "ecuaciones", "equation", "equations", "álgebra", "algebra", "matemática", "matemáticas", "mathematics"),
+    # Entertainment
+    "entertainment": ("película", "películas", "movie", "movies", "serie", "series", "juego", "juegos", "game", "games", "videojuego", "videojuegos"),
+    # Creative writing
+    "creative_writing": ("poema", "poemas", "poem", "poems", "cuento", "cuentos", "story", "stories", "novela", "novelas", "novel", "novels"),
+    # Programming (unless about Fizko integration)
+    "programming": ("código python", "codigo python", "código java", "codigo java", "python code", "java code", "javascript", "programar", "programación", "programacion", "programming"),
+    # General knowledge unrelated to business
+    "trivia": ("quién fue", "quien fue", "who was", "quiénes fueron", "who were"),
+    # Recipes/Cooking
+    "cooking": ("receta", "recetas", "recipe", "recipes", "cocinar", "cocina", "cooking", "cook", "preparar comida", "ingredientes", "ingredients"),
+}
+
+
+def _alternation(keywords: tuple[str, ...] | list[str]) -> str:
+    # Longest first so the reported keyword is the most specific one
+    return "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+
+
+_PROMPT_INJECTION_RE = re.compile(_alternation(PROMPT_INJECTION_PATTERNS), re.IGNORECASE)
+_OFF_TOPIC_RE = re.compile(
+    "|".join(f"(?P<{group}>{_alternation(words)})" for group, words in OFF_TOPIC_KEYWORDS.items()),
+    re.IGNORECASE,
+)
+
+ABUSE_CHECK_INSTRUCTIONS_FILE = "guardrails/ABUSE_DETECTION_AI_CHECK.md"
+
+_abuse_check_agent: Agent | None = None
+
+
+def _extract_input_text(input_data: str | list[dict[str, Any]]) -> str:
+    """Extract text from a string or message-format input."""
+    if isinstance(input_data, str):
+        return input_data
+
+    text_parts = []
+    for item in input_data:
+        if isinstance(item, dict) and "content" in item:
+            content = item["content"]
+            if isinstance(content, str):
+                text_parts.append(content)
+                continue
+            for part in content:
+                if isinstance(part, dict) and part.get("type") == "input_text":
+                    text_parts.append(part.get("text", ""))
+    return " ".join(text_parts)
+
+
+def check_abuse_heuristics(input_text: str) -> GuardrailFunctionOutput | None:
+    """
+    Fast path: prompt injection patterns and off-topic keywords.
+
+    Returns:
+        Tripwire output if a pattern matched, None otherwise
+    """
+    # 1. Prompt injection patterns
+    match = _PROMPT_INJECTION_RE.search(input_text)
+    if match:
+        pattern = match.group(0).lower()
+        logger.warning(f"🚨 Abuse detection: Prompt injection pattern detected: '{pattern}'")
+        return GuardrailFunctionOutput(
+            output_info={
+                "reason": f"Prompt injection attempt detected (pattern: {pattern})",
+                "confidence": 0.9,
+            },
+            tripwire_triggered=True,
+        )
+
+    # 2. Off-topic / Out-of-scope keywords (one match per group is enough)
+    off_topic_matches: dict[str, str] = {}
+    for match in _OFF_TOPIC_RE.finditer(input_text):
+        off_topic_matches.setdefault(match.lastgroup, match.group(0).lower())
+
+    # If keywords detected, block immediately (no need to call AI)
+    if off_topic_matches:
+        keywords = list(off_topic_matches.values())
+        logger.warning(f"🚨 Abuse detection: Off-topic request detected: {keywords}")
+        return GuardrailFunctionOutput(
+            output_info={
+                "reason": f"Off-topic request (keywords: {keywords})",
+                "confidence": 0.9,  # High confidence when keywords match
+            },
+            tripwire_triggered=True,
+        )
+
+    return None
+
+
+def _get_abuse_check_agent() -> Agent:
+    """Abuse check agent (built once per process)."""
+    global _abuse_check_agent
+    if _abuse_check_agent is None:
+        from app.agents.instructions import get_instruction_file
+
+        _abuse_check_agent = Agent(
+            name="Abuse Detection",
+            instructions=get_instruction_file(ABUSE_CHECK_INSTRUCTIONS_FILE),
+            model="gpt-5-nano",
+            model_settings=ModelSettings(reasoning=Reasoning(effort="low")),
+            output_type=AbuseCheckOutput,
+        )
+    return _abuse_check_agent
+
+
+async def check_abuse_with_ai(ctx: RunContextWrapper, input_text: str) -> GuardrailFunctionOutput | None:
+    """
+    AI check - catches edge cases the keywords miss (~200ms model call).
+
+    Returns:
+        Tripwire output if the model flags the input, None otherwise
+        (also None if the check fails: never block on guardrail errors)
+    """
+    try:
+        result = await Runner.run(
+            _get_abuse_check_agent(),
+            input_text,
+            context=ctx.context,
+        )
+
+        abuse_check: AbuseCheckOutput = result.final_output
+
+        if abuse_check.is_abusive:
+            logger.warning(
+                f"🚨 Abuse detection (AI): {abuse_check.reason} | "
+                f"Confidence: {abuse_check.confidence:.2f}"
+            )
+            return GuardrailFunctionOutput(
+                output_info={
+                    "reason": abuse_check.reason,
+                    "confidence": abuse_check.confidence,
+                },
+                tripwire_triggered=True,
+            )
+
+    except Exception as e:
+        logger.error(f"❌ Abuse detection AI check failed: {e}")
+        # Don't block on guardrail failure - allow request through
+
+    return None
+
+
+_OK = GuardrailFunctionOutput(
+    output_info={"status": "ok"},
+    tripwire_triggered=False,
+)
+
+
 @input_guardrail
 async def abuse_detection_guardrail(
     ctx: RunContextWrapper,
@@ -35,139 +198,42 @@ async def abuse_detection_guardrail(
     - Prompt injection attempts
     - Off-topic requests (e.g., creative writing, coding help)
 
-    This uses a fast model (gpt-4o-mini) to quickly classify the request.
+    Runs the keyword heuristics first and the AI check only if none matched
+    (serial). For concurrent execution use abuse_heuristics_guardrail +
+    abuse_ai_guardrail instead.
     """
-    # Extract text from input
-    if isinstance(input_data, str):
-        input_text = input_data
-    else:
-        # Extract text from message format
-        text_parts = []
-        for item in input_data:
-            if isinstance(item, dict) and "content" in item:
-                for part in item["content"]:
-                    if isinstance(part, dict) and part.get("type") == "input_text":
-                        text_parts.append(part.get("text", ""))
-        input_text = " ".join(text_parts)
-
-    # Quick heuristic checks (fast path)
-    # 1. Prompt injection patterns
-    prompt_injection_patterns = [
-        "ignore previous instructions",
-        "disregard your instructions",
-        "act as if you are",
-        "pretend to be",
-        "you are now",
-        "new instructions:",
-    ]
-
-    for pattern in prompt_injection_patterns:
-        if pattern in input_text.lower():
-            logger.warning(f"🚨 Abuse detection: Prompt injection pattern detected: '{pattern}'")
-            return GuardrailFunctionOutput(
-                output_info={
-                    "reason": f"Prompt injection attempt detected (pattern: {pattern})",
-                    "confidence": 0.9,
-                },
-                tripwire_triggered=True,
-            )
+    input_text = _extract_input_text(input_data)
+    return (
+        check_abuse_heuristics(input_text)
+        or await check_abuse_with_ai(ctx, input_text)
+        or _OK
+    )
 
-    # 2. Off-topic / Out-of-scope patterns
-    # Keywords that indicate the request is NOT about taxes/accounting/Chile
-    off_topic_keywords = [
-        # Homework/Academic
-        ("homework", "exam", "examen", "exámenes"),
-        # Math/Science (unless tax-related)
-        ("ecuación", "ecuaciones", "equation", "equations", "álgebra", "algebra", "matemática", "matemáticas", "mathematics"),
-        # Entertainment
-        ("película", "películas", "movie", "movies", "serie", "series", "juego", "juegos", "game", "games", "videojuego", "videojuegos"),
-        # Creative writing
-        ("poema", "poemas", "poem", "poems", "cuento", "cuentos", "story", "stories", "novela", "novelas", "novel", "novels"),
-        # Programming (unless about Fizko integration)
-        ("código python", "codigo python", "código java", "codigo java", "python code", "java code", "javascript", "programar", "programación", "programacion", "programming"),
-        # General knowledge unrelated to business
-        ("quién fue", "quien fue", "who was", "quiénes fueron", "who were"),
-        # Recipes/Cooking
-        ("receta", "recetas", "recipe", "recipes", "cocinar", "cocina", "cooking", "cook", "preparar comida", "ingredientes", "ingredients"),
-    ]
-
-    input_lower = input_text.lower()
-
-    # Check for off-topic keywords
-    off_topic_matches = []
-    for keyword_group in off_topic_keywords:
-        for keyword in keyword_group:
-            if keyword in input_lower:
-                off_topic_matches.append(keyword)
-                break  # One match per group is enough
 
-    # If keywords detected, block immediately (no need to call AI)
-    if len(off_topic_matches) >= 1:
-        logger.warning(f"🚨 Abuse detection: Off-topic request detected: {off_topic_matches}")
-        return GuardrailFunctionOutput(
-            output_info={
-                "reason": f"Off-topic request (keywords: {off_topic_matches})",
-                "confidence": 0.9,  # High confidence when keywords match
-            },
-            tripwire_triggered=True,
-        )
+@input_guardrail(name="abuse_heuristics", run_in_parallel=False)
+async def abuse_heuristics_guardrail(
+    ctx: RunContextWrapper,
+    agent: Agent,
+    input_data: str | list[dict[str, Any]],
+) -> GuardrailFunctionOutput:
+    """
+    Keyword heuristics only (blocking, runs before the agent starts).
 
-    # AI check - FALLBACK layer for cases without obvious keywords
-    # Only runs if NO keywords were detected
-    USE_AI_CHECK = True  # ⚠️ Adds ~200ms latency but catches edge cases keywords miss
-
-    if USE_AI_CHECK:
-        try:
-            # Create a simple agent to classify the request
-            from openai import AsyncOpenAI
-            import os
-            from pathlib import Path
-
-            client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-            # Load instructions from file
-            # __file__ is in: app/agents/guardrails/implementations/abuse_detection.py
-            # Need to go up to: app/agents/instructions/guardrails/ABUSE_DETECTION_AI_CHECK.md
-            instructions_path = Path(__file__).parent.parent.parent / "instructions" / "guardrails" / "ABUSE_DETECTION_AI_CHECK.md"
-            with open(instructions_path, "r", encoding="utf-8") as f:
-                instructions = f.read()
-
-            abuse_check_agent = Agent(
-                name="Abuse Detection",
-                instructions=instructions,
-                model="gpt-5-nano",
-                model_settings=ModelSettings(reasoning=Reasoning(effort="low")),
-                output_type=AbuseCheckOutput,
-            )
+    A single precompiled regex scan, so it adds no noticeable latency.
+    """
+    return check_abuse_heuristics(_extract_input_text(input_data)) or _OK
 
-            result = await Runner.run(
-                abuse_check_agent,
-                input_text,
-                context=ctx.context,
-            )
 
-            abuse_check: AbuseCheckOutput = result.final_output
-
-            if abuse_check.is_abusive:
-                logger.warning(
-                    f"🚨 Abuse detection (AI): {abuse_check.reason} | "
-                    f"Confidence: {abuse_check.confidence:.2f}"
-                )
-                return GuardrailFunctionOutput(
-                    output_info={
-                        "reason": abuse_check.reason,
-                        "confidence": abuse_check.confidence,
-                    },
-                    tripwire_triggered=True,
-                )
-
-        except Exception as e:
-            logger.error(f"❌ Abuse detection AI check failed: {e}")
-            # Don't block on guardrail failure - allow request through
-            pass
-
-    # All checks passed
-    return GuardrailFunctionOutput(
-        output_info={"status": "ok"},
-        tripwire_triggered=False,
-    )
+@input_guardrail(name="abuse_ai_check", run_in_parallel=True)
+async def abuse_ai_guardrail(
+    ctx: RunContextWrapper,
+    agent: Agent,
+    input_data: str | list[dict[str, Any]],
+) -> GuardrailFunctionOutput:
+    """
+    AI abuse check, run concurrently with the agent.
+
+    The agent starts streaming right away; if this check trips, the SDK
+    cancels the run and the stream raises InputGuardrailTripwireTriggered.
+    """
+    return await check_abuse_with_ai(ctx, _extract_input_text(input_data)) or _OK
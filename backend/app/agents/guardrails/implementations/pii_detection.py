@@ -12,6 +12,17 @@ from app.agents.guardrails.core import GuardrailFunctionOutput
 
 logger = logging.getLogger(__name__)
 
+PII_PATTERNS = {
+    "rut": r"\d{1,2}\.\d{3}\.\d{3}[-\.][\dkK]",  # Chilean RUT format
+    "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+    "phone": r"\+?56\s?9\s?\d{4}\s?\d{4}",  # Chilean phone format
+    "credit_card": r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b",
+    "api_key": r"sk-[a-zA-Z0-9]{32,}",  # OpenAI API key pattern
+}
+
+# Compiled once: one named group per PII type, scanned in a single pass
+_PII_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in PII_PATTERNS.items()))
+
 
 @output_guardrail
 async def pii_output_guardrail(
@@ -40,23 +51,19 @@ async def pii_output_guardrail(
     else:
         output_text = str(output_data)
 
-    pii_patterns = {
-        "rut": r"\d{1,2}\.\d{3}\.\d{3}[-\.][\dkK]",  # Chilean RUT format
-        "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
-        "phone": r"\+?56\s?9\s?\d{4}\s?\d{4}",  # Chilean phone format
-        "credit_card": r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b",
-        "api_key": r"sk-[a-zA-Z0-9]{32,}",  # OpenAI API key pattern
-    }
-
-    detected_pii = []
-    for pii_type, pattern in pii_patterns.items():
-        matches = re.findall(pattern, output_text)
-        if matches:
-            detected_pii.append({
-                "type": pii_type,
-                "count": len(matches),
-                "samples": matches[:2],  # First 2 examples
-            })
+    # Single pass over the output with the combined pattern
+    matches_by_type: dict[str, list[str]] = {}
+    for match in _PII_RE.finditer(output_text):
+        matches_by_type.setdefault(match.lastgroup, []).append(match.group(0))
+
+    detected_pii = [
+        {
+            "type": pii_type,
+            "count": len(matches),
+            "samples": matches[:2],  # First 2 examples
+        }
+        for pii_type, matches in matches_by_type.items()
+    ]
 
     if detected_pii:
         logger.warning(
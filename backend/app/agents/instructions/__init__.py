@@ -2,10 +2,40 @@
 
 This module loads agent instructions from markdown files for better organization
 and maintainability. Each agent has its own instruction directory with modular sections.
+
+Instructions are loaded lazily on first access and cached for the life of the
+process. If AGENT_INSTRUCTIONS_SNAPSHOT points to a JSON snapshot (see
+build_snapshot), all instructions are read from that single file instead of
+the markdown tree.
 """
 
+import json
+import logging
+import os
+import threading
+from functools import lru_cache
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+INSTRUCTIONS_DIR = Path(__file__).parent
+
+# Public constant name -> agent instruction directory
+_INSTRUCTION_DIRS = {
+    "CLASSIFIER_INSTRUCTIONS": "classifier",  # NEW: Simplified classifier
+    "SUPERVISOR_INSTRUCTIONS": "supervisor",  # DEPRECATED: Old handoff-based supervisor
+    "GENERAL_KNOWLEDGE_INSTRUCTIONS": "general_knowledge",
+    "TAX_DOCUMENTS_INSTRUCTIONS": "tax_documents",
+    "MONTHLY_TAXES_INSTRUCTIONS": "monthly_taxes",
+    "PAYROLL_INSTRUCTIONS": "payroll",
+    "EXPENSE_INSTRUCTIONS": "expense",
+    "FEEDBACK_INSTRUCTIONS": "feedback",
+    "SETTINGS_INSTRUCTIONS": "settings",
+}
+
+_snapshot: dict[str, str] | None = None
+_snapshot_lock = threading.Lock()
+
 
 def _load_modular_instruction(agent_name: str) -> str:
     """Load modular instruction from agent directory.
@@ -19,7 +49,7 @@ def _load_modular_instruction(agent_name: str) -> str:
     Returns:
         Combined instruction text content
     """
-    agent_dir = Path(__file__).parent / agent_name
+    agent_dir = INSTRUCTIONS_DIR / agent_name
     if not agent_dir.exists():
         raise FileNotFoundError(f"Agent directory not found: {agent_dir}")
 
@@ -39,16 +69,88 @@ def _load_modular_instruction(agent_name: str) -> str:
     return "\n\n".join(sections)
 
 
-# Load all agent instructions using modular structure
-CLASSIFIER_INSTRUCTIONS = _load_modular_instruction("classifier")  # NEW: Simplified classifier
-SUPERVISOR_INSTRUCTIONS = _load_modular_instruction("supervisor")  # DEPRECATED: Old handoff-based supervisor
-GENERAL_KNOWLEDGE_INSTRUCTIONS = _load_modular_instruction("general_knowledge")
-TAX_DOCUMENTS_INSTRUCTIONS = _load_modular_instruction("tax_documents")
-MONTHLY_TAXES_INSTRUCTIONS = _load_modular_instruction("monthly_taxes")
-PAYROLL_INSTRUCTIONS = _load_modular_instruction("payroll")
-EXPENSE_INSTRUCTIONS = _load_modular_instruction("expense")
-FEEDBACK_INSTRUCTIONS = _load_modular_instruction("feedback")
-SETTINGS_INSTRUCTIONS = _load_modular_instruction("settings")
+def _get_snapshot() -> dict[str, str]:
+    """Load the instructions snapshot once (empty if not configured)."""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                path = os.getenv("AGENT_INSTRUCTIONS_SNAPSHOT")
+                snapshot: dict[str, str] = {}
+                if path:
+                    try:
+                        snapshot = json.loads(Path(path).read_text(encoding="utf-8"))
+                        logger.info(f"📚 Loaded {len(snapshot)} agent instructions from snapshot")
+                    except Exception as e:
+                        logger.warning(f"⚠️ Could not load instructions snapshot {path}: {e}")
+                _snapshot = snapshot
+    return _snapshot
+
+
+@lru_cache(maxsize=None)
+def get_instructions(agent_name: str) -> str:
+    """Get the combined instructions for an agent (cached per process).
+
+    Args:
+        agent_name: Name of the agent directory (e.g., "supervisor")
+
+    Returns:
+        Combined instruction text content
+    """
+    snapshot = _get_snapshot()
+    if agent_name in snapshot:
+        return snapshot[agent_name]
+    return _load_modular_instruction(agent_name)
+
+
+@lru_cache(maxsize=None)
+def get_instruction_file(relative_path: str) -> str:
+    """Get a single instruction file (cached per process).
+
+    Args:
+        relative_path: Path relative to the instructions directory
+            (e.g., "guardrails/ABUSE_DETECTION_AI_CHECK.md")
+
+    Returns:
+        File content
+    """
+    snapshot = _get_snapshot()
+    if relative_path in snapshot:
+        return snapshot[relative_path]
+    return (INSTRUCTIONS_DIR / relative_path).read_text(encoding="utf-8")
+
+
+def build_snapshot(path: str | Path) -> int:
+    """Write every agent's combined instructions to a JSON snapshot.
+
+    Meant for build/deploy time; point AGENT_INSTRUCTIONS_SNAPSHOT at the
+    output to skip reading the markdown tree at runtime.
+
+    Args:
+        path: Output file path
+
+    Returns:
+        Number of instructions written
+    """
+    snapshot = {
+        agent_name: _load_modular_instruction(agent_name)
+        for agent_name in _INSTRUCTION_DIRS.values()
+    }
+    for md_file in sorted((INSTRUCTIONS_DIR / "guardrails").glob("*.md")):
+        if md_file.name != "README.md":
+            snapshot[f"guardrails/{md_file.name}"] = md_file.read_text(encoding="utf-8")
+
+    Path(path).write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
+    return len(snapshot)
+
+
+def __getattr__(name: str) -> str:
+    """Resolve the *_INSTRUCTIONS constants lazily (PEP 562)."""
+    agent_name = _INSTRUCTION_DIRS.get(name)
+    if agent_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return get_instructions(agent_name)
+
 
 __all__ = [
     "CLASSIFIER_INSTRUCTIONS",
@@ -60,4 +162,7 @@ __all__ = [
     "EXPENSE_INSTRUCTIONS",
     "FEEDBACK_INSTRUCTIONS",
     "SETTINGS_INSTRUCTIONS",
+    "get_instructions",
+    "get_instruction_file",
+    "build_snapshot",
 ]
@@ -3,12 +3,20 @@
 from .handoffs_manager import handoffs_manager, HandoffsManager
 from .multi_agent_orchestrator import (
     MultiAgentOrchestrator,
+    clear_agent_set_cache,
     create_multi_agent_orchestrator,
+    get_openai_client,
 )
+from .query_router import QueryRouter, RoutingDecision, query_router
 
 __all__ = [
     "handoffs_manager",
     "HandoffsManager",
     "MultiAgentOrchestrator",
     "create_multi_agent_orchestrator",
+    "clear_agent_set_cache",
+    "get_openai_client",
+    "QueryRouter",
+    "RoutingDecision",
+    "query_router",
 ]
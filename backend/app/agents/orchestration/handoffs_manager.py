@@ -11,11 +11,18 @@ from agents import Agent
 from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .multi_agent_orchestrator import create_multi_agent_orchestrator
+from app.utils.cache import BoundedCache
+
+from .multi_agent_orchestrator import create_multi_agent_orchestrator, get_openai_client
 
 logger = logging.getLogger(__name__)
 
 
+def _forget_evicted_thread(thread_id: str, orchestrator: Any, reason: str) -> None:
+    """Drop sticky-agent state of an evicted orchestrator."""
+    orchestrator.session_manager.forget_thread(thread_id)
+
+
 class HandoffsManager:
     """
     Manager for lazy-initialized multi-agent orchestrators.
@@ -24,8 +31,9 @@ class HandoffsManager:
     which is only available per-request, not at server initialization.
 
     Key features:
-    - Creates orchestrators on-demand per thread
-    - Caches orchestrators to maintain agent state across requests
+    - Creates orchestrators on-demand per thread (cheap: agents are compiled
+      once per process and shared, see multi_agent_orchestrator)
+    - Caches orchestrators to keep the subscription check per thread
     - Handles handoffs between specialized agents
 
     Design:
@@ -35,17 +43,18 @@ class HandoffsManager:
     """
 
     def __init__(self):
-        self._orchestrator_cache: dict[str, Any] = {}
-        self._openai_client: AsyncOpenAI | None = None
+        # Bounded: idle threads are evicted (their sticky state with them)
+        self._orchestrator_cache: BoundedCache[str, Any] = BoundedCache(
+            "handoffs_manager.orchestrators",
+            max_items=int(os.getenv("ORCHESTRATOR_CACHE_MAX_ITEMS", 1000)),
+            ttl_seconds=float(os.getenv("ORCHESTRATOR_CACHE_TTL_SECONDS", 6 * 3600)),
+            sliding_ttl=True,
+            on_evict=_forget_evicted_thread,
+        )
 
     def _get_openai_client(self) -> AsyncOpenAI:
-        """Get or create OpenAI client (singleton)."""
-        if self._openai_client is None:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise ValueError("OPENAI_API_KEY environment variable not set")
-            self._openai_client = AsyncOpenAI(api_key=api_key)
-        return self._openai_client
+        """Get the process-wide OpenAI client (shared with the compiled agents)."""
+        return get_openai_client()
 
     async def get_orchestrator(
         self,
@@ -74,8 +83,9 @@ class HandoffsManager:
             MultiAgentOrchestrator instance
         """
         # Check cache first
-        if thread_id in self._orchestrator_cache:
-            return self._orchestrator_cache[thread_id]
+        cached = self._orchestrator_cache.get(thread_id)
+        if cached is not None:
+            return cached
 
         # Create new orchestrator
         import time
@@ -188,9 +198,12 @@ class HandoffsManager:
         """
         if thread_id:
             if thread_id in self._orchestrator_cache:
-                del self._orchestrator_cache[thread_id]
+                orchestrator = self._orchestrator_cache.pop(thread_id)
+                orchestrator.session_manager.forget_thread(thread_id)
                 logger.info(f"🗑️  [HandoffsManager] Cleared cache for thread: {thread_id}")
         else:
+            for cached_thread_id, orchestrator in self._orchestrator_cache.items():
+                orchestrator.session_manager.forget_thread(cached_thread_id)
             self._orchestrator_cache.clear()
             logger.info("🗑️  [HandoffsManager] Cleared entire orchestrator cache")
 
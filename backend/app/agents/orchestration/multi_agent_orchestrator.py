@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import logging
+import os
 from uuid import UUID
 
 from agents import Agent
 from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.utils.cache import BoundedCache
+
 from .subscription_validator import SubscriptionValidator
 from .agent_factory import AgentFactory
 from .handoff_factory import HandoffFactory
@@ -16,6 +19,47 @@ from .session_manager import SessionManager
 
 logger = logging.getLogger(__name__)
 
+# Compiled agent sets shared by every orchestrator in the process, keyed by
+# (available agents, channel, vector stores). Agents hold no per-thread state:
+# thread/user/company live in FizkoContext, and the sticky agent per thread
+# lives in the shared SessionManager below. The compiled agents keep the
+# OpenAI client they were built with, so callers share get_openai_client().
+_agent_set_cache: BoundedCache[tuple, dict[str, Agent]] = BoundedCache(
+    "orchestration.agent_sets",
+    max_items=int(os.getenv("AGENT_SET_CACHE_MAX_ITEMS", 64)),
+)
+_shared_session_manager = SessionManager()
+_openai_client: AsyncOpenAI | None = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get or create the process-wide OpenAI client used by the agents."""
+    global _openai_client
+    if _openai_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable not set")
+        _openai_client = AsyncOpenAI(api_key=api_key)
+    return _openai_client
+
+
+def _agent_set_key(
+    available_agents: list[str],
+    channel: str,
+    vector_store_ids: list[str] | None,
+) -> tuple:
+    return (
+        frozenset(available_agents),
+        channel,
+        tuple(sorted(vector_store_ids or ())),
+    )
+
+
+def clear_agent_set_cache() -> None:
+    """Drop all compiled agent sets (e.g. after reloading instructions)."""
+    _agent_set_cache.clear()
+    logger.info("🗑️  Cleared compiled agent sets")
+
 
 class MultiAgentOrchestrator:
     """
@@ -41,6 +85,10 @@ class MultiAgentOrchestrator:
 
     The Classifier is NOT conversational - it only routes queries to specialists.
 
+    Agents and handoffs are compiled once per process for each
+    (available_agents, channel, vector stores) combination and shared across
+    threads, so creating an orchestrator for a new conversation is cheap.
+
     Sticky vs Non-Sticky:
     - STICKY: Persists across messages (expense, feedback, payroll, settings)
     - NON-STICKY: Always returns to classifier (general_knowledge, tax_documents, monthly_taxes)
@@ -66,15 +114,27 @@ class MultiAgentOrchestrator:
         self.channel = channel
         self._available_agents = available_agents
 
-        # Initialize managers
-        self.session_manager = SessionManager()
+        # Sticky-agent state is keyed by thread_id, shared with the handoff callbacks
+        self.session_manager = _shared_session_manager
 
         # Initialize agents
         self.agents: dict[str, Agent] = {}
         self._initialize_agents()
 
     def _initialize_agents(self):
-        """Initialize all agents and configure handoffs."""
+        """Get the compiled agent set for this configuration (build on first use)."""
+        key = _agent_set_key(self._available_agents, self.channel, self.vector_store_ids)
+        agents = _agent_set_cache.get(key)
+        if agents is None:
+            agents = self._build_agents()
+            _agent_set_cache[key] = agents
+        else:
+            logger.debug(f"♻️  Reusing compiled agent set ({len(agents)} agents)")
+
+        self.agents = agents
+
+    def _build_agents(self) -> dict[str, Agent]:
+        """Create all agents and configure handoffs."""
         import time
         init_start = time.time()
 
@@ -84,30 +144,32 @@ class MultiAgentOrchestrator:
         )
 
         # Create agents using factory
+        # No request-scoped db session: the compiled agents outlive this request
         agent_factory = AgentFactory(
-            db=self.db,
+            db=None,
             openai_client=self.openai_client,
             vector_store_ids=self.vector_store_ids,
             channel=self.channel
         )
-        self.agents = agent_factory.create_available_agents(self._available_agents)
+        agents = agent_factory.create_available_agents(self._available_agents)
 
         # Configure handoffs
-        self._configure_supervisor_handoffs()
+        self._configure_supervisor_handoffs(agents)
 
         total_init_time = time.time() - init_start
-        agent_count = len(self.agents)
+        agent_count = len(agents)
         logger.info(
             f"🏗️  Orchestrator init: {total_init_time:.3f}s "
             f"({agent_count} agents + handoffs) | Available: {', '.join(self._available_agents)}"
         )
+        return agents
 
-    def _configure_supervisor_handoffs(self):
+    def _configure_supervisor_handoffs(self, agents: dict[str, Agent]):
         """Configure handoffs for the Classifier Agent with subscription validation."""
-        classifier = self.agents["supervisor_agent"]  # Keep key name for compatibility
+        classifier = agents["supervisor_agent"]  # Keep key name for compatibility
 
         # Create handoff factory with session manager for persistence
-        handoff_factory = HandoffFactory(self.agents, self.session_manager)
+        handoff_factory = HandoffFactory(agents, self.session_manager)
 
         # Get standard handoff configurations
         configs = handoff_factory.get_standard_configs()
@@ -0,0 +1,324 @@
+"""
+Tiered query router for AgentRunnerV2.
+
+Running the LLM classifier on every message adds a full model round trip
+before the specialist starts. Routing is tried in tiers, cheapest first:
+
+1. local: greetings and conceptual questions ("¿qué es el IVA?") go to
+   general_knowledge; otherwise a TF-IDF nearest-centroid model over
+   labelled examples answers when the top agent clearly beats the runner-up
+2. cache: short follow-ups with no domain signal ("¿y el de octubre?",
+   "dale") reuse the thread's last routing decision
+3. llm: the classifier agent, only for ambiguous messages
+
+Every decision is counted per tier (see get_stats / GET /health/router).
+
+Config (env):
+- AGENT_LOCAL_ROUTER_ENABLED: "false" sends everything to the LLM
+- AGENT_ROUTER_MIN_SCORE / AGENT_ROUTER_MIN_MARGIN: local confidence thresholds
+- AGENT_ROUTER_CACHE_TTL_SECONDS: how long a thread's decision is reused
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.cache import BoundedCache
+
+logger = logging.getLogger(__name__)
+
+TIER_LOCAL = "local"
+TIER_CACHE = "cache"
+TIER_LLM = "llm"
+TIERS = (TIER_LOCAL, TIER_CACHE, TIER_LLM)
+
+DEFAULT_MIN_SCORE = 0.2
+DEFAULT_MIN_MARGIN = 0.12
+DEFAULT_CACHE_TTL_SECONDS = 30 * 60
+FOLLOW_UP_MAX_TERMS = 4
+
+QUESTION_MARKER = "Pregunta del usuario:"
+
+# Labelled examples per agent (Spanish first, our users are in Chile)
+ROUTING_EXAMPLES: Dict[str, List[str]] = {
+    "general_knowledge": [
+        "hola", "buenos días", "buenas tardes", "buenas noches", "gracias",
+        "qué es el IVA", "cómo funciona el IVA", "qué es el PPM",
+        "explícame qué es el crédito fiscal", "qué significa débito fiscal",
+        "cómo funciona el formulario 29 en general", "qué es el SII",
+        "qué es el régimen pro pyme", "qué es la renta presunta",
+        "cuál es la diferencia entre factura y boleta",
+        "qué puedes hacer", "quién eres", "ayuda",
+        "hello", "what is IVA", "how does the tax system work", "explain",
+    ],
+    "tax_documents": [
+        "muéstrame mis facturas", "lista mis facturas de venta",
+        "facturas de compra", "mis boletas emitidas", "documentos tributarios",
+        "detalle de la factura", "notas de crédito", "notas de débito",
+        "cuánto vendí", "cuánto compré", "mis ventas", "mis compras",
+        "dte recibidos", "documentos emitidos", "folio de la factura",
+        "quiénes son mis principales clientes", "mis proveedores",
+        "registro de compras y ventas", "RCV", "guías de despacho",
+        "show invoices", "list documents", "invoice details", "receipts",
+    ],
+    "monthly_taxes": [
+        "calcula mi F29", "formulario 29", "cuánto debo pagar de IVA",
+        "cuánto tengo que pagar este mes", "declaración mensual",
+        "impuesto mensual", "propuesta de F29", "borrador del F29",
+        "IVA a pagar", "remanente de crédito fiscal", "pago del F29",
+        "vencimiento del F29", "declarar el IVA", "PPM a pagar",
+        "por qué debo tanto", "cuánto debo", "impuestos del mes",
+        "calculate F29", "how much do I owe", "monthly tax declaration",
+    ],
+    "payroll": [
+        "lista mis empleados", "mis trabajadores", "liquidación de sueldo",
+        "remuneraciones del mes", "sueldo de un trabajador", "contrato de trabajo",
+        "agregar un empleado", "nómina", "cotizaciones previsionales",
+        "AFP", "Isapre", "Fonasa", "finiquito", "vacaciones del trabajador",
+        "libro de remuneraciones", "previred",
+        "list employees", "payroll", "employee salary", "staff",
+    ],
+    "settings": [
+        "cambiar mi correo", "configuración de notificaciones",
+        "actualizar mi perfil", "desactivar notificaciones",
+        "cambiar mi contraseña", "preferencias de la cuenta",
+        "configurar recordatorios", "cambiar mi número de teléfono",
+        "actualizar credenciales del SII", "cambiar la clave del SII",
+        "change email", "notification settings", "update profile", "preferences",
+    ],
+    "expense": [
+        "registrar un gasto", "agregar un gasto", "mis gastos",
+        "resumen de gastos", "subir una boleta de gasto", "gastos del mes",
+        "cuánto gasté", "gasto en combustible", "reembolso de gastos",
+        "rendición de gastos", "foto de la boleta de compra",
+        "track expenses", "add expense", "expense summary", "spending",
+    ],
+    "feedback": [
+        "encontré un error", "esto no funciona", "reportar un problema",
+        "tengo una sugerencia", "la app está fallando", "hay un bug",
+        "quiero dejar un comentario", "se cayó la aplicación",
+        "no carga la página", "me gustaría que agregaran",
+        "report bug", "feature request", "this is broken", "feedback",
+    ],
+}
+
+_STOPWORDS = {
+    "a", "al", "algo", "con", "como", "cual", "cuales", "de", "del", "el", "en",
+    "es", "esta", "este", "esto", "la", "las", "le", "lo", "los", "me", "mi",
+    "mis", "muy", "no", "o", "para", "pero", "por", "que", "se", "si", "sin",
+    "su", "sus", "te", "tu", "un", "una", "uno", "y", "ya", "yo", "hay",
+    "the", "an", "of", "to", "my", "is", "i", "do", "and", "for",
+    # Periods are shared by every data agent
+    "enero", "febrer", "marzo", "abril", "mayo", "junio", "julio", "agosto",
+    "septie", "octubr", "noviem", "diciem", "mes", "ano", "anos",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+STEM_LENGTH = 6  # crude prefix stemming: facturas/factura -> factur
+
+# Patterns run on normalized text (lowercase, no accents)
+_SMALL_TALK_RE = re.compile(
+    r"^\W*(hola|holi|buen[oa]s( dias| tardes| noches)?|gracias|muchas gracias|"
+    r"hello|hi|hey|thanks|thank you)\W*$"
+)
+_CONCEPTUAL_RE = re.compile(
+    r"^\W*(que es|que son|que significa|como funciona|explica|explicame|"
+    r"cual es la diferencia|what is|what are|how does|explain)\b"
+)
+# First-person / specific data: "¿qué es esta factura de mi empresa?" is not theory
+_PERSONAL_RE = re.compile(r"\b(mi|mis|mio|mia|me|tengo|debo|esta|este|my|i)\b|\d")
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, strip accents and stopwords, prefix-stem."""
+    terms = []
+    for token in _TOKEN_RE.findall(_normalize(text)):
+        stem = token[:STEM_LENGTH]
+        if token in _STOPWORDS or stem in _STOPWORDS:
+            continue
+        terms.append(stem)
+    return terms
+
+
+def extract_question(text: str, ui_context: Optional[str] = None) -> str:
+    """Strip the UI context block and keep the user's question."""
+    if QUESTION_MARKER in text:
+        return text.rsplit(QUESTION_MARKER, 1)[1].strip()
+    if ui_context and ui_context in text:
+        return text.replace(ui_context, "").strip()
+    return text
+
+
+@dataclass
+class RoutingDecision:
+    """Routing result of one tier."""
+    agent_name: str
+    tier: str
+    score: float = 0.0
+
+
+class LocalRoutingModel:
+    """TF-IDF nearest-centroid classifier over ROUTING_EXAMPLES."""
+
+    def __init__(self, examples: Dict[str, List[str]]):
+        docs = {
+            label: Counter(term for text in texts for term in tokenize(text))
+            for label, texts in examples.items()
+        }
+        n_docs = len(docs)
+        df = Counter(term for counts in docs.values() for term in counts)
+        self.idf = {term: math.log((1 + n_docs) / (1 + freq)) + 1 for term, freq in df.items()}
+
+        self.centroids: Dict[str, Dict[str, float]] = {}
+        for label, counts in docs.items():
+            vector = {term: (1 + math.log(tf)) * self.idf[term] for term, tf in counts.items()}
+            norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+            self.centroids[label] = {term: v / norm for term, v in vector.items()}
+
+    def known_terms(self, terms: List[str]) -> List[str]:
+        """Terms that carry domain signal."""
+        return [t for t in terms if t in self.idf]
+
+    def score(self, terms: List[str]) -> List[Tuple[str, float]]:
+        """Cosine similarity of the query against each agent (best first)."""
+        counts = Counter(t for t in terms if t in self.idf)
+        if not counts:
+            return []
+        query = {term: (1 + math.log(tf)) * self.idf[term] for term, tf in counts.items()}
+        norm = math.sqrt(sum(v * v for v in query.values())) or 1.0
+
+        scores = [
+            (label, sum(weight * centroid.get(term, 0.0) for term, weight in query.items()) / norm)
+            for label, centroid in self.centroids.items()
+        ]
+        return sorted(scores, key=lambda s: s[1], reverse=True)
+
+
+class QueryRouter:
+    """
+    Local + cached routing in front of the LLM classifier.
+
+    Thread-safe; one instance per process (query_router).
+    """
+
+    def __init__(self, examples: Optional[Dict[str, List[str]]] = None):
+        self.enabled = os.getenv("AGENT_LOCAL_ROUTER_ENABLED", "true").lower() != "false"
+        self.min_score = float(os.getenv("AGENT_ROUTER_MIN_SCORE", DEFAULT_MIN_SCORE))
+        self.min_margin = float(os.getenv("AGENT_ROUTER_MIN_MARGIN", DEFAULT_MIN_MARGIN))
+
+        self.model = LocalRoutingModel(examples or ROUTING_EXAMPLES)
+        self._decisions: BoundedCache[str, str] = BoundedCache(
+            "agent_routing_decisions",
+            max_items=10000,
+            ttl_seconds=int(os.getenv("AGENT_ROUTER_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)),
+        )
+
+        self._lock = threading.Lock()
+        self._tier_counts: Counter = Counter()
+        self._agent_counts: Counter = Counter()
+
+    def route(
+        self,
+        thread_id: str,
+        message: str,
+        ui_context: Optional[str] = None,
+    ) -> Optional[RoutingDecision]:
+        """
+        Try to route without the LLM.
+
+        Args:
+            thread_id: Thread ID (for follow-up reuse)
+            message: Message sent to the agent (may include UI context)
+            ui_context: UI context text prepended to the message, if any
+
+        Returns:
+            RoutingDecision, or None if the LLM classifier must decide
+        """
+        if not self.enabled:
+            return None
+
+        question = extract_question(message, ui_context)
+        normalized = _normalize(question)
+
+        # Small talk and theory questions are counted but not remembered, so a
+        # "gracias" between two data questions keeps the thread's domain agent
+        if _SMALL_TALK_RE.match(normalized):
+            return self.record(
+                thread_id, RoutingDecision("general_knowledge", TIER_LOCAL, 1.0), remember=False
+            )
+
+        if _CONCEPTUAL_RE.match(normalized):
+            if _PERSONAL_RE.search(normalized):
+                return None  # Theory about the user's own data: let the LLM decide
+            return self.record(
+                thread_id, RoutingDecision("general_knowledge", TIER_LOCAL, 1.0), remember=False
+            )
+
+        terms = tokenize(question)
+        scores = self.model.score(terms)
+
+        if scores:
+            best_label, best = scores[0]
+            runner_up = scores[1][1] if len(scores) > 1 else 0.0
+            if best >= self.min_score and best - runner_up >= self.min_margin:
+                return self.record(thread_id, RoutingDecision(best_label, TIER_LOCAL, round(best, 3)))
+
+        # Short follow-up with no domain signal: stay with the thread's agent
+        # (unless the UI context may point somewhere else)
+        has_ui_context = question != message
+        if (
+            not has_ui_context
+            and not self.model.known_terms(terms)
+            and len(terms) <= FOLLOW_UP_MAX_TERMS
+        ):
+            previous = self._decisions.get(thread_id)
+            if previous:
+                return self.record(thread_id, RoutingDecision(previous, TIER_CACHE))
+
+        return None
+
+    def record(
+        self, thread_id: str, decision: RoutingDecision, remember: bool = True
+    ) -> RoutingDecision:
+        """Count a decision and, unless remember=False, keep it for follow-ups."""
+        if remember:
+            self._decisions[thread_id] = decision.agent_name
+        with self._lock:
+            self._tier_counts[decision.tier] += 1
+            self._agent_counts[decision.agent_name] += 1
+        return decision
+
+    def forget_thread(self, thread_id: str) -> None:
+        """Drop the cached decision of a thread."""
+        self._decisions.pop(thread_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """How often each tier decided, and per-agent totals."""
+        with self._lock:
+            tiers = {tier: self._tier_counts.get(tier, 0) for tier in TIERS}
+            agents = dict(self._agent_counts)
+        total = sum(tiers.values())
+        return {
+            "enabled": self.enabled,
+            "total": total,
+            "tiers": tiers,
+            "tier_share": {
+                tier: round(count / total, 3) if total else None for tier, count in tiers.items()
+            },
+            "agents": agents,
+        }
+
+
+query_router = QueryRouter()
@@ -22,8 +22,8 @@ class SessionManager:
 
     Implementation:
     - Uses in-memory dictionary for simplicity and speed
-    - Thread-safe within same orchestrator instance (cached per thread_id)
-    - Cleared when orchestrator cache is cleared
+    - One instance per process, shared by all orchestrators (keyed by thread_id)
+    - A thread's entry is dropped when its orchestrator cache entry is cleared
     """
 
     def __init__(self):
@@ -113,6 +113,10 @@ class SessionManager:
         """
         return self._active_agents.copy()
 
+    def forget_thread(self, thread_id: str) -> None:
+        """Drop a thread's state without logging (cache eviction)."""
+        self._active_agents.pop(thread_id, None)
+
     def clear_all(self):
         """Clear all active agent state."""
         self._active_agents.clear()
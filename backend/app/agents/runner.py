@@ -82,7 +82,7 @@ class AgentRunner:
         Initialize agent runner.
 
         Args:
-            sessions_dir: Directory for SQLite session storage
+            sessions_dir: Directory for SQLite session storage (sqlite backend)
         """
         # Setup sessions directory
         if sessions_dir is None:
@@ -151,7 +151,7 @@ class AgentRunner:
                 run_config=run_config,
             )
 
-            # Store usage data for AdvancedSQLiteSession tracking
+            # Store usage data (only tracked by the SQLite backend)
             if session:
                 try:
                     await session.store_run_usage(result)
@@ -298,21 +298,15 @@ class AgentRunner:
 
     def _create_session(self, thread_id: str):
         """
-        Create Advanced SQLite session for conversation history.
+        Create the conversation session for one message of a thread.
 
-        Uses AdvancedSQLiteSession for better conversation management:
-        - Natural message-by-message presentation
-        - Branch support (if needed later)
-        - Better usage tracking
+        The backend (Redis/Postgres/SQLite) is configured with
+        AGENT_SESSION_BACKEND; history is loaded once per message and
+        windowed to the configured item/token budget (see session_store).
         """
-        from agents.extensions.memory import AdvancedSQLiteSession
+        from .core.session_store import create_conversation_session
 
-        session = AdvancedSQLiteSession(
-            session_id=thread_id,
-            db_path=self.session_file,
-            create_tables=True
-        )
-        return session
+        return create_conversation_session(thread_id, self.session_file)
 
     def _parse_result(
         self,
@@ -4,7 +4,8 @@ Agent Runner V2 - Simplified Classification-Based Routing.
 This is a NEW implementation that eliminates handoffs and sticky agents.
 Instead, it uses a simple two-step process:
 
-1. Classifier Agent → Returns {"agent_name": "..."}
+1. Router → {"agent_name": "..."} (local model or thread cache; the
+   Classifier Agent only for ambiguous messages)
 2. Specialized Agent → Processes with full thread history
 
 NO handoffs, NO "For context..." messages, NO sticky/non-sticky complexity.
@@ -23,6 +24,8 @@ from openai import AsyncOpenAI
 
 from .core import FizkoContext
 from .classifier_agent import create_classifier_agent
+from .guardrails.config import apply_guardrails_to_run_config
+from .orchestration.query_router import TIER_LLM, RoutingDecision, query_router
 
 logger = logging.getLogger(__name__)
 
@@ -79,7 +82,7 @@ class AgentRunnerV2:
     Simplified agent runner using classification-based routing.
 
     This runner implements a two-step process:
-    1. Classifier Agent analyzes the query and returns agent_name
+    1. Router picks the agent_name (Classifier Agent only when ambiguous)
     2. Specialized Agent processes the query with full thread history
 
     Benefits:
@@ -98,7 +101,7 @@ class AgentRunnerV2:
         Initialize agent runner v2.
 
         Args:
-            sessions_dir: Directory for SQLite session storage
+            sessions_dir: Directory for SQLite session storage (sqlite backend)
             openai_client: OpenAI client (optional)
         """
         # Setup sessions directory
@@ -137,7 +140,8 @@ class AgentRunnerV2:
 
         Flow:
         1. Create session
-        2. Run classifier agent → get agent_name
+        2. Route the query → get agent_name (local router, thread cache,
+           or the classifier agent for ambiguous messages)
         3. Map agent_name to specialized agent
         4. Run specialized agent with full history
 
@@ -164,15 +168,26 @@ class AgentRunnerV2:
             # Convert content_parts to simple text for session memory
             agent_input = self._extract_text_from_content(request.message)
 
-        # 4. STEP 1: Run classifier to get agent_name
-        agent_name = await self._classify_query(
-            agent_input=agent_input,
-            context=context,
-            session=session,
+        # 4. STEP 1: Route (local model / thread cache first, LLM classifier if ambiguous)
+        decision = query_router.route(
+            request.thread_id,
+            agent_input,
+            ui_context=request.ui_context,
         )
+        if decision is None:
+            agent_name = await self._classify_query(
+                agent_input=agent_input,
+                context=context,
+                session=session,
+            )
+            decision = query_router.record(
+                request.thread_id, RoutingDecision(agent_name, TIER_LLM)
+            )
+        agent_name = decision.agent_name
 
         logger.info(
-            f"🎯 [CLASSIFICATION] thread={request.thread_id[:12]}... → {agent_name}"
+            f"🎯 [CLASSIFICATION] thread={request.thread_id[:12]}... → {agent_name} "
+            f"(tier={decision.tier})"
         )
 
         # 5. STEP 2: Map agent_name to specialized agent
@@ -191,6 +206,10 @@ class AgentRunnerV2:
             f"thread={request.thread_id[:12]}... | tools={len(specialized_agent.tools)}"
         )
 
+        # Input guardrails (AGENT_GUARDRAILS_MODE): keyword checks block before
+        # the agent starts; the AI check runs alongside it and cancels on trip
+        run_config = apply_guardrails_to_run_config(run_config)
+
         # 6. STEP 3: Execute specialized agent with full history
         if stream:
             result = Runner.run_streamed(
@@ -212,7 +231,7 @@ class AgentRunnerV2:
                 run_config=run_config,
             )
 
-            # Store usage data for AdvancedSQLiteSession tracking
+            # Store usage data (only tracked by the SQLite backend)
             if session:
                 try:
                     await session.store_run_usage(result)
@@ -233,7 +252,7 @@ class AgentRunnerV2:
         Args:
             agent_input: User message
             context: Fizko context
-            session: SQLite session (contains full history)
+            session: Conversation session (contains thread history)
 
         Returns:
             agent_name (e.g., "tax_documents", "general_knowledge")
@@ -241,12 +260,16 @@ class AgentRunnerV2:
         # Create classifier agent
         classifier = create_classifier_agent()
 
+        # Classifier reads the (already loaded) history but must not write
+        # its turn into the thread: the specialist run stores the message
+        history_session = session.read_only() if hasattr(session, "read_only") else session
+
         # Run classifier (max_turns=1, only one classification)
         result = await Runner.run(
             classifier,
             agent_input,
             context=context,
-            session=session,  # Classifier sees full history
+            session=history_session,  # Classifier sees thread history
             max_turns=1,  # Only one turn for classification
         )
 
@@ -366,18 +389,15 @@ class AgentRunnerV2:
 
     def _create_session(self, thread_id: str):
         """
-        Create Advanced SQLite session for conversation history.
+        Create the conversation session for one message of a thread.
 
-        Uses AdvancedSQLiteSession for better conversation management.
+        The backend (Redis/Postgres/SQLite) is configured with
+        AGENT_SESSION_BACKEND; history is loaded once per message and
+        windowed to the configured item/token budget (see session_store).
         """
-        from agents.extensions.memory import AdvancedSQLiteSession
+        from .core.session_store import create_conversation_session
 
-        session = AdvancedSQLiteSession(
-            session_id=thread_id,
-            db_path=self.session_file,
-            create_tables=True
-        )
-        return session
+        return create_conversation_session(thread_id, self.session_file)
 
     def _parse_result(
         self,
@@ -32,8 +32,10 @@ def get_mem0_client() -> AsyncMemoryClient:
     """
     Get or create async Mem0 client.
 
-    Detects if event loop has changed (e.g., in Celery tasks) and recreates
-    the client if needed to avoid "Event loop is closed" errors.
+    Detects if event loop has changed and recreates the client if needed to
+    avoid "Event loop is closed" errors. Celery workers run tasks on one
+    long-lived loop (infrastructure/celery/runtime.py), so the client is
+    reused across tasks there.
     """
     global _mem0_client, _mem0_client_loop
 
@@ -73,6 +73,9 @@ class BaseUITool(ABC):
     3. Returns structured information
     """
 
+    cacheable: bool = False
+    """Whether process() results may be cached (see cache_key)"""
+
     def __init__(self):
         """Initialize the UI tool."""
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
@@ -151,6 +154,24 @@ class BaseUITool(ABC):
         """
         pass
 
+    def cache_key(self, context: UIToolContext) -> tuple | None:
+        """
+        Key for caching process() results, or None to skip the cache.
+
+        The dispatcher adds the company's data version, which only document
+        and F29 upserts bump. Caching is opt-in: set cacheable = True only on
+        tools that read nothing else (calendar events, expenses, contacts...
+        would go stale after an edit). The key covers the company and
+        additional_data (entity_id, entity_type, ...); override and return
+        None when the output also depends on the user message.
+        """
+        if not self.cacheable or not context.company_id:
+            return None
+        extra = tuple(sorted(
+            (str(k), str(v)) for k, v in (context.additional_data or {}).items()
+        ))
+        return (self.component_name, context.company_id, extra)
+
     def _format_context_section(self, title: str, content: str) -> str:
         """Helper to format a context section consistently."""
         return f"\n## {title}\n{content}\n"
@@ -0,0 +1,76 @@
+"""Result cache for UI tools.
+
+Tool results are cached by BaseUITool.cache_key plus the company's data
+version (app/utils/data_version.py), so clicking the same card again skips
+the Supabase queries, and document / F29 upserts invalidate every entry of
+the company. Concurrent requests for the same key share one computation
+(a prefetch and the real message do not both hit the database).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.utils.cache import BoundedCache
+
+from .base import UIToolResult
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ITEMS = 2000
+
+
+class UIToolResultCache:
+    """Process-local cache of successful UI tool results."""
+
+    def __init__(self):
+        self.enabled = os.getenv("UI_TOOL_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self._results: BoundedCache[Hashable, UIToolResult] = BoundedCache(
+            "ui_tool_results",
+            max_items=int(os.getenv("UI_TOOL_CACHE_MAX_ITEMS", DEFAULT_MAX_ITEMS)),
+            ttl_seconds=int(os.getenv("UI_TOOL_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        )
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[UIToolResult]],
+    ) -> tuple[UIToolResult, bool]:
+        """
+        Get a cached result or compute it (once for concurrent callers).
+
+        Returns:
+            (result, cache_hit). The result is a copy: callers may modify it.
+        """
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached.model_copy(), True
+
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+
+        result = await asyncio.shield(task)
+        return result.model_copy(), False
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result.success:
+            self._results[key] = result
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return self._results.stats()
+
+
+ui_tool_result_cache = UIToolResultCache()
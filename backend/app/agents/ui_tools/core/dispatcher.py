@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
-from .base import UIToolContext, UIToolResult
+from app.utils.data_version import get_company_data_version
+
+from .base import BaseUITool, UIToolContext, UIToolResult
+from .cache import ui_tool_result_cache
 from .registry import ui_tool_registry
 
 logger = logging.getLogger(__name__)
@@ -82,12 +86,15 @@ class UIToolDispatcher:
         )
         logger.debug(f"  📦 Context creation: {(time.time() - context_create_start):.3f}s")
 
-        # Execute the tool
+        # Execute the tool (or reuse a cached / in-flight result)
         try:
             tool_exec_start = time.time()
-            result = await tool.process(context)
+            result, cache_hit = await UIToolDispatcher._process(tool, context)
             tool_exec_time = time.time() - tool_exec_start
-            logger.debug(f"  🔧 Tool execution ({tool.__class__.__name__}): {tool_exec_time:.3f}s")
+            logger.debug(
+                f"  🔧 Tool execution ({tool.__class__.__name__}): {tool_exec_time:.3f}s"
+                f"{' (cached)' if cache_hit else ''}"
+            )
 
             if not result.success:
                 logger.warning(
@@ -128,6 +135,81 @@ class UIToolDispatcher:
                 },
             )
 
+    @staticmethod
+    async def _process(tool: BaseUITool, context: UIToolContext) -> tuple[UIToolResult, bool]:
+        """
+        Run tool.process through the result cache.
+
+        Returns:
+            (result, cache_hit); results are copies, safe to modify
+        """
+        key = tool.cache_key(context) if ui_tool_result_cache.enabled else None
+        if key is None:
+            return await tool.process(context), False
+
+        version = await get_company_data_version(context.company_id)
+        return await ui_tool_result_cache.get_or_compute(
+            (*key, version),
+            lambda: tool.process(context),
+        )
+
+    @staticmethod
+    async def prefetch(
+        components: list[dict[str, Any]],
+        company_id: str,
+        user_id: str | None = None,
+        supabase: Any = None,
+        max_concurrency: int = 4,
+    ) -> int:
+        """
+        Warm the result cache for UI components currently visible.
+
+        Lets the frontend preload the cards on screen, so a later message
+        with one of them as ui_component skips the pre-agent queries.
+        Components whose tools are not cacheable are skipped.
+
+        Args:
+            components: Dicts with ui_component and optional entity_id / entity_type
+            company_id: Company ID
+            user_id: User ID
+            supabase: Supabase client for data fetching
+            max_concurrency: Max tools running at once
+
+        Returns:
+            Number of components warmed successfully
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _warm(component: dict[str, Any]) -> bool:
+            tool = ui_tool_registry.get_tool(component.get("ui_component") or "")
+            if not tool:
+                return False
+
+            additional_data = {
+                k: component[k] for k in ("entity_id", "entity_type") if component.get(k)
+            }
+            context = UIToolContext(
+                ui_component=component["ui_component"],
+                user_message="",
+                company_id=company_id,
+                user_id=user_id,
+                supabase=supabase,
+                additional_data=additional_data,
+            )
+            if tool.cache_key(context) is None:
+                return False
+
+            async with semaphore:
+                try:
+                    result, _ = await UIToolDispatcher._process(tool, context)
+                    return result.success
+                except Exception as e:
+                    logger.warning(f"⚠️ UI tool prefetch failed for '{component.get('ui_component')}': {e}")
+                    return False
+
+        warmed = await asyncio.gather(*(_warm(c) for c in components))
+        return sum(1 for ok in warmed if ok)
+
     @staticmethod
     def list_registered_tools() -> list[tuple[str, str, str]]:
         """
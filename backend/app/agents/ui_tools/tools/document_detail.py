@@ -32,6 +32,9 @@ class DocumentDetailTool(BaseUITool):
     without needing to query the database.
     """
 
+    # Reads only documents, which bump the company data version
+    cacheable = True
+
     @property
     def component_name(self) -> str:
         return "document_detail"
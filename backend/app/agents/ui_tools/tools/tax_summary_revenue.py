@@ -21,6 +21,9 @@ class TaxSummaryRevenueTool(BaseUITool):
     this tool provides context about revenue for the period.
     """
 
+    # Reads only documents, which bump the company data version
+    cacheable = True
+
     @property
     def component_name(self) -> str:
         return "tax_summary_revenue"
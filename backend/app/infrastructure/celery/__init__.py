@@ -9,8 +9,10 @@ Key differences from original backend:
 - Uses Supabase client instead of SQLAlchemy
 - All database operations go through repositories
 - No direct SQL queries in task code
+- Async services run on one long-lived event loop per worker (runtime.py)
 """
 from celery import Celery
+
 from . import config
 
 # Create Celery app
@@ -19,6 +21,10 @@ celery_app = Celery("fizko-v2")
 # Load configuration from config module
 celery_app.config_from_object(config)
 
+# Register signal handlers: the per-worker event loop lifecycle
+# (runtime, worker_process_*) and the telemetry collector (telemetry, beat_init)
+from . import runtime, telemetry  # noqa: E402,F401
+
 # Auto-discover tasks from tasks/ directory
 # This will import all task modules and register their @celery_app.task decorators
 celery_app.autodiscover_tasks(
@@ -35,6 +35,9 @@ task_soft_time_limit = 25 * 60  # Soft time limit: 25 minutes
 worker_prefetch_multiplier = 4  # Fetch up to 4 tasks at a time (allows parallel processing)
 worker_max_tasks_per_child = 50  # Restart worker after 50 tasks (prevent memory leaks)
 
+# Task events feed the telemetry collector (telemetry.py) behind /api/celery/stats
+worker_send_task_events = True
+
 # Retry settings
 task_acks_late = True  # Only acknowledge task after completion (safer)
 task_reject_on_worker_lost = True  # Re-queue if worker dies
@@ -56,11 +59,20 @@ task_routes = {
     "sii.sync_documents_all_companies": {"queue": "low"},
     "sii.sync_f29": {"queue": "low"},
     "sii.sync_f29_all_companies": {"queue": "low"},
+
+    # ========== DEFAULT PRIORITY ==========
+    # Chord callback for the *_all_companies fan-out (cheap aggregation)
+    "sii.aggregate_company_results": {"queue": "default"},
+
+    # ========== WHATSAPP ==========
+    # Inbound message processing (user-facing latency, kept off the SII queues)
+    "whatsapp.*": {"queue": "whatsapp"},
 }
 
 # Define queues with priorities
 # Backend V2 uses only 'low' and 'default' queues for SII tasks
 task_queues = (
+    Queue("whatsapp", routing_key="whatsapp"),
     Queue("default", routing_key="default"),
     Queue("low", routing_key="low"),
 )
@@ -92,6 +104,15 @@ if DATABASE_URL:
 else:
     beat_dburi = None
 
+# Static entries, merged into the database schedule on Beat startup
+beat_schedule = {
+    # Reschedule WhatsApp conversations whose drainer died (claim expired)
+    "whatsapp-sweep-inbound-queue": {
+        "task": "whatsapp.sweep_inbound_queue",
+        "schedule": 60.0,
+    },
+}
+
 # Beat settings
 beat_max_loop_interval = 5  # Check database every 5 seconds for changes
 beat_sync_every = 0  # Number of tasks beat executes before syncing (0 = always sync)
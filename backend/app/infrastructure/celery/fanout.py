@@ -0,0 +1,128 @@
+"""
+Fan-out helpers for fleet-wide Celery tasks.
+
+Batch tasks (all companies) dispatch one subtask per company inside a
+chord, so the work spreads across every worker consuming the queue and a
+callback aggregates the results.
+
+A configurable cap bounds how many per-company subtasks of the same group
+run at once across the whole fleet (protects SII and Supabase from a
+thundering herd when many workers are online). Slots live in a Redis
+sorted set keyed by group; each member is a task id with an expiry, so a
+worker that dies mid-task cannot leak its slot.
+
+Waiting for a slot is bounded (CELERY_FANOUT_MAX_WAIT_SECONDS): a subtask
+that never gets one gives up with a failed result, so the chord callback
+still runs.
+"""
+import logging
+import math
+import os
+import time
+from typing import Optional
+
+from app.utils.redis_client import LazyRedis
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 8
+DEFAULT_MAX_WAIT_SECONDS = 3 * 3600
+SLOT_WAIT_SECONDS = 30  # countdown before re-checking for a free slot
+SLOT_KEY_PREFIX = "celery:slots:"
+
+# Atomic acquire: drop expired members, keep an existing slot (retries of
+# the same task), otherwise take a slot only if the group is under its cap.
+_ACQUIRE_SCRIPT = """
+local key = KEYS[1]
+local member = ARGV[1]
+local now = tonumber(ARGV[2])
+local expires_at = tonumber(ARGV[3])
+local limit = tonumber(ARGV[4])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now)
+if redis.call('ZSCORE', key, member) then
+  redis.call('ZADD', key, expires_at, member)
+  return 1
+end
+if redis.call('ZCARD', key) < limit then
+  redis.call('ZADD', key, expires_at, member)
+  redis.call('EXPIRE', key, math.ceil(expires_at - now))
+  return 1
+end
+return 0
+"""
+
+_redis = LazyRedis(config.REDIS_URL, "Fan-out slots", "concurrency cap disabled")
+
+
+def get_max_concurrent() -> int:
+    """
+    Max per-company subtasks of one group running at once across workers.
+
+    Configurable with CELERY_FANOUT_MAX_CONCURRENT (default: 8).
+    """
+    return max(1, int(os.getenv("CELERY_FANOUT_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT)))
+
+
+def get_max_slot_waits() -> int:
+    """
+    Max slot re-checks before a subtask gives up.
+
+    Derived from CELERY_FANOUT_MAX_WAIT_SECONDS (default: 3 hours).
+    """
+    max_wait = int(os.getenv("CELERY_FANOUT_MAX_WAIT_SECONDS", DEFAULT_MAX_WAIT_SECONDS))
+    return max(1, math.ceil(max_wait / SLOT_WAIT_SECONDS))
+
+
+def acquire_slot(group: str, task_id: str, limit: Optional[int] = None) -> bool:
+    """
+    Try to take a concurrency slot for a task.
+
+    Args:
+        group: Slot group (e.g. the batch task name)
+        task_id: Celery task id (stable across retries)
+        limit: Max concurrent tasks in the group (default: get_max_concurrent())
+
+    Returns:
+        True if the task may run now (also when Redis is unavailable)
+    """
+    client = _redis.get()
+    if client is None:
+        return True
+
+    now = time.time()
+    expires_at = now + config.task_time_limit
+    try:
+        acquired = client.eval(
+            _ACQUIRE_SCRIPT,
+            1,
+            SLOT_KEY_PREFIX + group,
+            task_id,
+            now,
+            expires_at,
+            limit or get_max_concurrent(),
+        )
+        return bool(acquired)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not acquire slot for {group}: {e}")
+        return True
+
+
+def release_slot(group: str, task_id: str) -> None:
+    """
+    Release a task's concurrency slot.
+
+    Args:
+        group: Slot group
+        task_id: Celery task id
+    """
+    client = _redis.get()
+    if client is None:
+        return
+
+    try:
+        client.zrem(SLOT_KEY_PREFIX + group, task_id)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not release slot for {group}: {e}")
@@ -0,0 +1,174 @@
+"""
+Long-lived asyncio runtime for Celery worker processes.
+
+Celery tasks are synchronous, and our services are async. Instead of
+asyncio.run() per call (new event loop every time, which throws away
+HTTP/Mem0/Supabase clients bound to the previous loop), each worker
+process owns ONE event loop running in a background thread. Tasks submit
+coroutines to it with run_async(), or are declared as `async def` with
+the @async_task decorator.
+
+The loop is created lazily in the child process (never inherited across
+fork) and stopped on worker process shutdown.
+
+Celery keeps the task request (retries, delivery info, called_directly) in
+a thread-local stack, which is empty on the loop thread. @async_task passes
+the worker's request into the coroutine through a context variable, so
+`self.request` and `self.retry()` behave as in a synchronous task.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from celery import Task
+from celery.signals import worker_process_init, worker_process_shutdown
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+_current_request: contextvars.ContextVar = contextvars.ContextVar(
+    "celery_async_task_request", default=None
+)
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get (or start) the event loop of this worker process.
+
+    Returns:
+        Running event loop owned by a daemon thread
+    """
+    global _loop, _loop_thread
+    if _loop is None or _loop.is_closed():
+        with _loop_lock:
+            if _loop is None or _loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="celery-asyncio-loop",
+                    daemon=True,
+                )
+                thread.start()
+                _loop, _loop_thread = loop, thread
+                logger.info(f"🔁 Worker event loop started ({id(loop)})")
+    return _loop
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine on the worker's event loop and wait for its result.
+
+    Drop-in replacement for asyncio.run() inside Celery tasks.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Coroutine result (exceptions propagate)
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_worker_loop())
+    try:
+        return future.result()
+    except BaseException:
+        # Time limits / interrupts: don't leave the coroutine running
+        future.cancel()
+        raise
+
+
+class AsyncTask(Task):
+    """Task base whose request is visible from the worker's event loop."""
+
+    def _get_request(self):
+        request = _current_request.get()
+        if request is not None:
+            return request
+        return super()._get_request()
+
+    request = property(_get_request)
+
+
+async def _with_request(coro: Awaitable[T], request: Any) -> T:
+    token = _current_request.set(request)
+    try:
+        return await coro
+    finally:
+        _current_request.reset(token)
+
+
+def async_task(*task_args: Any, **task_kwargs: Any) -> Callable:
+    """
+    Register an `async def` function as a Celery task.
+
+    Takes the same arguments as celery_app.task. The coroutine runs on the
+    worker's long-lived event loop, with the worker's request attached, so
+    bound tasks can use self.request and raise self.retry() as usual.
+
+    Example:
+        @async_task(bind=True, name="form29.generate_draft_for_company")
+        async def generate_f29_draft_for_company(self, company_id: str): ...
+    """
+    from app.infrastructure.celery import celery_app
+
+    task_kwargs.setdefault("base", AsyncTask)
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Any:
+        task = None
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            # Read on the worker thread, where Celery pushed the request
+            return run_async(_with_request(func(*args, **kwargs), task.request))
+
+        task = celery_app.task(*task_args, **task_kwargs)(wrapper)
+        return task
+
+    return decorator
+
+
+def shutdown_worker_loop(timeout: float = 5.0) -> None:
+    """Stop the worker's event loop (pending tasks are cancelled)."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        loop, thread = _loop, _loop_thread
+        _loop, _loop_thread = None, None
+
+    if loop is None or loop.is_closed():
+        return
+
+    async def _cancel_pending() -> None:
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout)
+    except Exception as e:
+        logger.warning(f"⚠️ Error cancelling pending tasks on worker loop: {e}")
+
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout)
+    if not loop.is_running():
+        loop.close()
+    logger.info("🔁 Worker event loop stopped")
+
+
+@worker_process_init.connect
+def _reset_loop_after_fork(**kwargs: Any) -> None:
+    """Forked children must not reuse the parent's loop/thread state."""
+    global _loop, _loop_thread
+    _loop, _loop_thread = None, None
+
+
+@worker_process_shutdown.connect
+def _stop_loop_on_shutdown(**kwargs: Any) -> None:
+    shutdown_worker_loop()
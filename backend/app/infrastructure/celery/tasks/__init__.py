@@ -17,9 +17,12 @@ Structure:
     ├── calendar/            # Calendar-related tasks
     │   ├── __init__.py
     │   └── events.py        # Calendar event generation
-    └── memory/              # Memory-related tasks
+    ├── memory/              # Memory-related tasks
+    │   ├── __init__.py
+    │   └── load.py          # Memory loading from existing data
+    └── whatsapp/            # WhatsApp inbound queue workers
         ├── __init__.py
-        └── load.py          # Memory loading from existing data
+        └── inbound.py       # Per-conversation message processing
 
 Import your task modules here to ensure they're discovered by Celery.
 """
@@ -29,10 +32,12 @@ from . import sii
 from . import form29
 from . import calendar
 from . import memory
+from . import whatsapp
 
 __all__ = [
     "sii",
     "form29",
     "calendar",
     "memory",
+    "whatsapp",
 ]
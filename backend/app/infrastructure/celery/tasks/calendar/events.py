@@ -57,7 +57,7 @@ def sync_company_calendar(
         >>> sync_company_calendar.delay("123e4567-e89b-12d3-a456-426614174000")
     """
     try:
-        import asyncio
+        from app.infrastructure.celery.runtime import run_async
         from app.config.supabase import get_supabase_client
         from app.services.calendar_sync_service import CalendarSyncService
 
@@ -70,7 +70,7 @@ def sync_company_calendar(
         service = CalendarSyncService(supabase)
 
         # Run async service method synchronously
-        result = asyncio.run(
+        result = run_async(
             service.sync_company_calendar(company_id=company_id)
         )
 
@@ -156,7 +156,7 @@ def sync_all_calendars(self) -> Dict[str, Any]:
         >>> sync_all_calendars.delay()
     """
     try:
-        import asyncio
+        from app.infrastructure.celery.runtime import run_async
         from app.config.supabase import get_supabase_client
         from app.services.calendar_sync_service import CalendarSyncService
 
@@ -167,7 +167,7 @@ def sync_all_calendars(self) -> Dict[str, Any]:
         service = CalendarSyncService(supabase)
 
         # Run async service method synchronously
-        result = asyncio.run(service.sync_all_companies())
+        result = run_async(service.sync_all_companies())
 
         logger.info(
             f"✅ [CELERY TASK] Batch calendar sync completed: "
@@ -11,6 +11,7 @@ from typing import Dict, Any
 from datetime import datetime
 
 from app.infrastructure.celery import celery_app
+from app.infrastructure.celery.runtime import async_task, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,6 @@ def generate_f29_drafts_all_companies(
         # Generate drafts for previous month (auto-detect)
         generate_f29_drafts_all_companies.delay()
     """
-    import asyncio
     from app.config.supabase import get_supabase_client
     from app.services.form29_draft_service import Form29DraftService
 
@@ -88,7 +88,7 @@ def generate_f29_drafts_all_companies(
         service = Form29DraftService(supabase)
 
         # Run async service method synchronously
-        summary = asyncio.run(
+        summary = run_async(
             service.create_drafts_for_all_companies(
                 period_year=period_year,
                 period_month=period_month,
@@ -136,13 +136,13 @@ def generate_f29_drafts_all_companies(
         }
 
 
-@celery_app.task(
+@async_task(
     bind=True,
     name="form29.generate_draft_for_company",
     max_retries=2,
     default_retry_delay=60,
 )
-def generate_f29_draft_for_company(
+async def generate_f29_draft_for_company(
     self,
     company_id: str,
     period_year: int,
@@ -184,7 +184,6 @@ def generate_f29_draft_for_company(
             period_month=10
         )
     """
-    import asyncio
     from app.config.supabase import get_supabase_client
     from app.services.form29_draft_service import Form29DraftService
 
@@ -201,19 +200,14 @@ def generate_f29_draft_for_company(
         supabase = get_supabase_client()
         service = Form29DraftService(supabase)
 
-        # Run async service method synchronously
-        async def _generate():
-            form29, is_new = await service.create_draft_for_period(
-                company_id=company_id,
-                period_year=period_year,
-                period_month=period_month,
-                created_by_user_id=None,  # System-generated
-                auto_calculate=auto_calculate,
-                fetch_sii_proposal=fetch_sii_proposal
-            )
-            return form29, is_new
-
-        form29, is_new = asyncio.run(_generate())
+        form29, is_new = await service.create_draft_for_period(
+            company_id=company_id,
+            period_year=period_year,
+            period_month=period_month,
+            created_by_user_id=None,  # System-generated
+            auto_calculate=auto_calculate,
+            fetch_sii_proposal=fetch_sii_proposal
+        )
 
         execution_time = (datetime.utcnow() - start_time).total_seconds()
 
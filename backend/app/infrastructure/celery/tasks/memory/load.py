@@ -56,7 +56,7 @@ def load_company_memories(
         >>> load_company_memories.delay("123e4567-e89b-12d3-a456-426614174000", user_id="456e789...")
     """
     try:
-        import asyncio
+        from app.infrastructure.celery.runtime import run_async
         from app.services import (
             build_company_memories_from_data,
             save_company_memories,
@@ -164,7 +164,7 @@ def load_company_memories(
             return result
 
         # Run async function
-        result = asyncio.run(_load())
+        result = run_async(_load())
 
         # Log result
         if result.get("success"):
@@ -245,7 +245,7 @@ def load_user_memories(
         >>> load_user_memories.delay("123e4567-e89b-12d3-a456-426614174000")
     """
     try:
-        import asyncio
+        from app.infrastructure.celery.runtime import run_async
         from app.services import build_user_memories_from_data, save_user_memories
 
         logger.info(
@@ -298,7 +298,7 @@ def load_user_memories(
             }
 
         # Run async function
-        result = asyncio.run(_load())
+        result = run_async(_load())
 
         # Log result
         if result.get("success"):
@@ -370,7 +370,7 @@ def load_all_companies_memories(self) -> Dict[str, Any]:
         >>> load_all_companies_memories.delay()
     """
     try:
-        import asyncio
+        from app.infrastructure.celery.runtime import run_async
         from app.config.supabase import get_supabase_client
         from app.repositories import CompaniesRepository
 
@@ -439,7 +439,7 @@ def load_all_companies_memories(self) -> Dict[str, Any]:
             }
 
         # Run async function
-        result = asyncio.run(_load_all())
+        result = run_async(_load_all())
 
         logger.info(
             f"✅ [CELERY TASK] Batch company memory load completed: "
@@ -500,7 +500,7 @@ def load_all_users_memories(self) -> Dict[str, Any]:
         >>> load_all_users_memories.delay()
     """
     try:
-        import asyncio
+        from app.infrastructure.celery.runtime import run_async
         from app.config.supabase import get_supabase_client
 
         logger.info("🚀 [CELERY TASK] Batch user memory load started for ALL users")
@@ -574,7 +574,7 @@ def load_all_users_memories(self) -> Dict[str, Any]:
             }
 
         # Run async function
-        result = asyncio.run(_load_all())
+        result = run_async(_load_all())
 
         logger.info(
             f"✅ [CELERY TASK] Batch user memory load completed: "
@@ -0,0 +1,63 @@
+"""
+Fan-out support for SII batch tasks (all companies).
+
+sync_documents_all_companies and sync_f29_all_companies dispatch one
+per-company subtask each inside a chord; aggregate_company_results is the
+chord callback that builds the batch summary.
+"""
+import logging
+from typing import Any, Dict, List
+
+from app.infrastructure.celery import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+def list_batch_companies() -> List[Dict[str, Any]]:
+    """
+    Get all companies to include in a batch sync.
+
+    Returns:
+        List of company dicts (id, business_name, ...)
+    """
+    from app.config.supabase import get_supabase_client
+    from app.infrastructure.celery.runtime import run_async
+
+    # TODO: Filter by active subscriptions when subscription system is implemented
+    supabase = get_supabase_client()
+    return run_async(supabase.companies.list_all()) or []
+
+
+@celery_app.task(
+    name="sii.aggregate_company_results",
+)
+def aggregate_company_results(
+    results: List[Dict[str, Any]],
+    operation: str,
+) -> Dict[str, Any]:
+    """
+    Chord callback: summarize per-company subtask results.
+
+    Args:
+        results: Results of the per-company subtasks (chord header)
+        operation: Batch name for logging (documents, f29)
+
+    Returns:
+        Dict with batch summary (same shape as the sequential batch sync)
+    """
+    results = [r for r in results if isinstance(r, dict)]
+    synced = sum(1 for r in results if r.get("success"))
+    failed = len(results) - synced
+
+    logger.info(
+        f"✅ [CELERY TASK] Batch {operation} sync completed: "
+        f"total={len(results)}, synced={synced}, failed={failed}"
+    )
+
+    return {
+        "success": True,
+        "total_companies": len(results),
+        "synced": synced,
+        "failed": failed,
+        "results": results
+    }
@@ -10,6 +10,12 @@ import logging
 from typing import Dict, Any
 
 from app.infrastructure.celery import celery_app
+from app.infrastructure.celery.fanout import (
+    SLOT_WAIT_SECONDS,
+    acquire_slot,
+    get_max_slot_waits,
+    release_slot,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +31,8 @@ def sync_documents(
     company_id: str,
     months: int = 1,
     month_offset: int = 0,
+    concurrency_group: str = None,
+    slot_waits: int = 0,
 ) -> Dict[str, Any]:
     """
     Celery task wrapper for tax documents sync (purchases and sales).
@@ -36,12 +44,36 @@ def sync_documents(
         months: Number of months to sync (1-12)
         month_offset: Number of months to skip from current month
                      (0=current month, 1=last month, etc.)
+        concurrency_group: Fan-out slot group (set by batch tasks to cap
+                     how many companies sync at once across workers)
+        slot_waits: Internal - retries spent waiting for a slot
 
     Returns:
         Dict with sync results from service layer
     """
+    if concurrency_group and not acquire_slot(concurrency_group, self.request.id):
+        max_slot_waits = get_max_slot_waits()
+        if slot_waits >= max_slot_waits:
+            # Fail this company only, so the chord callback still runs
+            logger.error(
+                f"❌ [CELERY TASK] No fan-out slot for company {company_id} "
+                f"after {slot_waits} waits, giving up"
+            )
+            return {
+                "success": False,
+                "error": "Timed out waiting for a concurrency slot",
+                "company_id": company_id,
+            }
+
+        # Wait for a free slot without consuming error retries
+        raise self.retry(
+            countdown=SLOT_WAIT_SECONDS,
+            max_retries=self.max_retries + max_slot_waits,
+            kwargs={**self.request.kwargs, "slot_waits": slot_waits + 1},
+        )
+
     try:
-        import asyncio
+        from app.infrastructure.celery.runtime import run_async
         from app.config.supabase import get_supabase_client
         from app.services.sii_service import SIIService
 
@@ -56,7 +88,7 @@ def sync_documents(
 
         # Run async service method synchronously
         # Celery tasks are synchronous, so we need to wrap async calls
-        result = asyncio.run(
+        result = run_async(
             service.sync_documents(
                 company_id=company_id,
                 months=months,
@@ -88,10 +120,11 @@ def sync_documents(
             exc_info=True
         )
 
-        # Retry on unexpected errors
-        if self.request.retries < self.max_retries:
-            logger.info(f"🔄 Retrying... (attempt {self.request.retries + 1}/{self.max_retries})")
-            raise self.retry(exc=e)
+        # Retry on unexpected errors (slot waits don't count as attempts)
+        error_retries = self.request.retries - slot_waits
+        if error_retries < self.max_retries:
+            logger.info(f"🔄 Retrying... (attempt {error_retries + 1}/{self.max_retries})")
+            raise self.retry(exc=e, max_retries=self.max_retries + slot_waits)
 
         return {
             "success": False,
@@ -99,6 +132,10 @@ def sync_documents(
             "company_id": company_id,
         }
 
+    finally:
+        if concurrency_group:
+            release_slot(concurrency_group, self.request.id)
+
 
 @celery_app.task(
     bind=True,
@@ -113,41 +150,58 @@ def sync_documents_all_companies(
     """
     Sync documents for ALL companies with active subscriptions.
 
-    Delegates to SIIService for business logic.
+    Fans out one sii.sync_documents subtask per company (chord), so the
+    batch scales with the number of workers and each company keeps its own
+    retries and time limit. sii.aggregate_company_results collects the
+    summary once every company finished.
+
+    Concurrency across workers is capped by CELERY_FANOUT_MAX_CONCURRENT.
 
     Args:
         months: Number of months to sync per company
         month_offset: Month offset from current date
 
     Returns:
-        Dict with batch sync summary from service layer
+        Dict with dispatch info (total_companies, aggregate_task_id)
     """
     logger.info("🚀 [CELERY TASK] Batch document sync started for all companies")
 
     try:
-        import asyncio
-        from app.config.supabase import get_supabase_client
-        from app.services.sii_service import SIIService
-
-        # Get Supabase client and service
-        supabase = get_supabase_client()
-        service = SIIService(supabase)
-
-        # Run async service method synchronously
-        result = asyncio.run(
-            service.sync_documents_all_companies(
+        from celery import chord
+        from .batch import aggregate_company_results, list_batch_companies
+
+        companies = list_batch_companies()
+        if not companies:
+            logger.info("⏭️  No companies found")
+            return {
+                "success": True,
+                "total_companies": 0,
+                "synced": 0,
+                "failed": 0,
+                "results": []
+            }
+
+        header = [
+            sync_documents.s(
+                company_id=company["id"],
                 months=months,
-                month_offset=month_offset
+                month_offset=month_offset,
+                concurrency_group="sii.sync_documents_all_companies",
             )
-        )
+            for company in companies
+        ]
+        aggregate = chord(header)(aggregate_company_results.s(operation="documents"))
 
         logger.info(
-            f"✅ [CELERY TASK] Batch document sync completed: "
-            f"total={result['total_companies']}, synced={result['synced']}, "
-            f"failed={result['failed']}"
+            f"✅ [CELERY TASK] Batch document sync dispatched: "
+            f"{len(companies)} companies, aggregate_task_id={aggregate.id}"
         )
 
-        return result
+        return {
+            "success": True,
+            "total_companies": len(companies),
+            "aggregate_task_id": aggregate.id
+        }
 
     except Exception as e:
         logger.error(
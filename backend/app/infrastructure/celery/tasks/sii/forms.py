@@ -11,6 +11,12 @@ from typing import Dict, Any
 from datetime import datetime
 
 from app.infrastructure.celery import celery_app
+from app.infrastructure.celery.fanout import (
+    SLOT_WAIT_SECONDS,
+    acquire_slot,
+    get_max_slot_waits,
+    release_slot,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +31,8 @@ def sync_f29(
     self,
     company_id: str,
     year: str = None,
+    concurrency_group: str = None,
+    slot_waits: int = 0,
 ) -> Dict[str, Any]:
     """
     Celery task wrapper for F29 form synchronization.
@@ -34,12 +42,37 @@ def sync_f29(
     Args:
         company_id: UUID of the company (str format)
         year: Year to sync (YYYY format). Defaults to current year.
+        concurrency_group: Fan-out slot group (set by batch tasks to cap
+                     how many companies sync at once across workers)
+        slot_waits: Internal - retries spent waiting for a slot
 
     Returns:
         Dict with sync results from service layer
     """
+    if concurrency_group and not acquire_slot(concurrency_group, self.request.id):
+        max_slot_waits = get_max_slot_waits()
+        if slot_waits >= max_slot_waits:
+            # Fail this company only, so the chord callback still runs
+            logger.error(
+                f"❌ [CELERY TASK] No fan-out slot for company {company_id} "
+                f"after {slot_waits} waits, giving up"
+            )
+            return {
+                "success": False,
+                "error": "Timed out waiting for a concurrency slot",
+                "company_id": company_id,
+                "year": year,
+            }
+
+        # Wait for a free slot without consuming error retries
+        raise self.retry(
+            countdown=SLOT_WAIT_SECONDS,
+            max_retries=self.max_retries + max_slot_waits,
+            kwargs={**self.request.kwargs, "slot_waits": slot_waits + 1},
+        )
+
     try:
-        import asyncio
+        from app.infrastructure.celery.runtime import run_async
         from app.config.supabase import get_supabase_client
         from app.services.sii_service import SIIService
 
@@ -56,7 +89,7 @@ def sync_f29(
         service = SIIService(supabase)
 
         # Run async service method synchronously
-        result = asyncio.run(
+        result = run_async(
             service.sync_f29(
                 company_id=company_id,
                 year=year
@@ -101,10 +134,11 @@ def sync_f29(
             exc_info=True
         )
 
-        # Retry on unexpected errors
-        if self.request.retries < self.max_retries:
-            logger.info(f"🔄 Retrying... (attempt {self.request.retries + 1}/{self.max_retries})")
-            raise self.retry(exc=e)
+        # Retry on unexpected errors (slot waits don't count as attempts)
+        error_retries = self.request.retries - slot_waits
+        if error_retries < self.max_retries:
+            logger.info(f"🔄 Retrying... (attempt {error_retries + 1}/{self.max_retries})")
+            raise self.retry(exc=e, max_retries=self.max_retries + slot_waits)
 
         return {
             "success": False,
@@ -113,6 +147,10 @@ def sync_f29(
             "year": year,
         }
 
+    finally:
+        if concurrency_group:
+            release_slot(concurrency_group, self.request.id)
+
 
 @celery_app.task(
     bind=True,
@@ -126,13 +164,18 @@ def sync_f29_all_companies(
     """
     Sync F29 forms for ALL companies with active subscriptions.
 
-    Delegates to SIIService for business logic.
+    Fans out one sii.sync_f29 subtask per company (chord), so the batch
+    scales with the number of workers and each company keeps its own
+    retries and time limit. sii.aggregate_company_results collects the
+    summary once every company finished.
+
+    Concurrency across workers is capped by CELERY_FANOUT_MAX_CONCURRENT.
 
     Args:
         year: Year to sync (YYYY format). Defaults to current year.
 
     Returns:
-        Dict with batch sync summary from service layer
+        Dict with dispatch info (total_companies, aggregate_task_id)
     """
     if year is None:
         year = str(datetime.now().year)
@@ -140,26 +183,42 @@ def sync_f29_all_companies(
     logger.info(f"🚀 [CELERY TASK] Batch F29 sync started for all companies (year={year})")
 
     try:
-        import asyncio
-        from app.config.supabase import get_supabase_client
-        from app.services.sii_service import SIIService
+        from celery import chord
+        from .batch import aggregate_company_results, list_batch_companies
 
-        # Get Supabase client and service
-        supabase = get_supabase_client()
-        service = SIIService(supabase)
+        companies = list_batch_companies()
+        if not companies:
+            logger.info("⏭️  No companies found")
+            return {
+                "success": True,
+                "total_companies": 0,
+                "synced": 0,
+                "failed": 0,
+                "results": [],
+                "year": year
+            }
 
-        # Run async service method synchronously
-        result = asyncio.run(
-            service.sync_f29_all_companies(year=year)
-        )
+        header = [
+            sync_f29.s(
+                company_id=company["id"],
+                year=year,
+                concurrency_group="sii.sync_f29_all_companies",
+            )
+            for company in companies
+        ]
+        aggregate = chord(header)(aggregate_company_results.s(operation="f29"))
 
         logger.info(
-            f"✅ [CELERY TASK] Batch F29 sync completed: "
-            f"total={result['total_companies']}, synced={result['synced']}, "
-            f"failed={result['failed']}"
+            f"✅ [CELERY TASK] Batch F29 sync dispatched: "
+            f"{len(companies)} companies, aggregate_task_id={aggregate.id}"
         )
 
-        return result
+        return {
+            "success": True,
+            "total_companies": len(companies),
+            "aggregate_task_id": aggregate.id,
+            "year": year
+        }
 
     except Exception as e:
         logger.error(
@@ -197,7 +256,9 @@ def download_f29_pdf(
     2. Validates PDF content
     3. Extracts all F29 codes and data from the PDF
     4. Updates form29_sii_downloads with extracted data
-    5. (TODO) Uploads PDF to Supabase Storage
+    5. Uploads PDF to Supabase Storage (when F29_PDF_STORAGE_BUCKET is set)
+
+    Batch mode pipelines all forms of the company (see SIIService.download_f29_pdfs).
 
     Args:
         company_id: UUID of the company (str format)
@@ -210,7 +271,7 @@ def download_f29_pdf(
         - Batch mode: {success, company_id, total, downloaded, failed, results: [...]}
     """
     try:
-        import asyncio
+        from app.infrastructure.celery.runtime import run_async
         from app.config.supabase import get_supabase_client
         from app.services.sii_service import SIIService
 
@@ -267,52 +328,17 @@ def download_f29_pdf(
                     "results": []
                 }
 
-            # Download each PDF
-            downloaded = 0
-            failed = 0
-            results = []
-
-            for i, form in enumerate(forms_to_download, 1):
-                form_folio = form['sii_folio']
-                form_id_interno = form['sii_id_interno']
-                period = form.get('period_display', 'N/A')
-
-                logger.info(f"📥 [{i}/{total_forms}] Downloading PDF: folio={form_folio}, period={period}")
-
-                try:
-                    # Download single PDF
-                    result = asyncio.run(
-                        service.download_f29_pdf(
-                            company_id=company_id,
-                            folio=form_folio,
-                            id_interno_sii=form_id_interno
-                        )
-                    )
-
-                    if result.get("success"):
-                        downloaded += 1
-                        logger.info(f"✅ [{i}/{total_forms}] Downloaded: folio={form_folio}")
-                    else:
-                        failed += 1
-                        logger.error(f"❌ [{i}/{total_forms}] Failed: folio={form_folio}, error={result.get('error')}")
-
-                    results.append({
-                        "folio": form_folio,
-                        "period": period,
-                        "success": result.get("success"),
-                        "error": result.get("error")
-                    })
-
-                except Exception as e:
-                    failed += 1
-                    error_msg = str(e)
-                    logger.error(f"❌ [{i}/{total_forms}] Exception: folio={form_folio}, error={error_msg}")
-                    results.append({
-                        "folio": form_folio,
-                        "period": period,
-                        "success": False,
-                        "error": error_msg
-                    })
+            # Download all PDFs in one pipelined batch (single SII login,
+            # bounded concurrent downloads, parsing in a thread pool)
+            results = run_async(
+                service.download_f29_pdfs(
+                    company_id=company_id,
+                    forms=forms_to_download
+                )
+            )
+
+            downloaded = sum(1 for r in results if r["success"])
+            failed = total_forms - downloaded
 
             logger.info(
                 f"✅ [CELERY TASK] F29 PDF batch download completed: "
@@ -339,7 +365,7 @@ def download_f29_pdf(
             )
 
             # Run async service method synchronously
-            result = asyncio.run(
+            result = run_async(
                 service.download_f29_pdf(
                     company_id=company_id,
                     folio=folio,
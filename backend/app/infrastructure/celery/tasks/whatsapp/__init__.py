@@ -0,0 +1,13 @@
+"""
+WhatsApp Celery tasks for Backend V2.
+
+This module contains the workers of the WhatsApp inbound queue:
+- process_conversation: drains one conversation's pending messages in order
+- sweep_inbound_queue: reschedules conversations left without a drainer
+"""
+from .inbound import process_conversation, sweep_inbound_queue
+
+__all__ = [
+    "process_conversation",
+    "sweep_inbound_queue",
+]
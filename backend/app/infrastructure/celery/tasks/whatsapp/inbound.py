@@ -0,0 +1,168 @@
+"""
+WhatsApp Inbound Queue Celery Tasks
+
+Workers for the inbound queue filled by the Kapso webhook
+(app.services.whatsapp.inbound_queue).
+"""
+import asyncio
+import logging
+from typing import Any, Dict
+from uuid import uuid4
+
+from app.infrastructure.celery import celery_app
+from app.infrastructure.celery.runtime import async_task
+
+logger = logging.getLogger(__name__)
+
+# Messages processed per task run before yielding the worker to other
+# conversations (the conversation stays claimed and is rescheduled)
+MAX_MESSAGES_PER_RUN = 20
+
+
+async def _heartbeat(queue: Any, conversation_id: str, token: str, lost: asyncio.Event) -> None:
+    """Keep the claim alive during long agent turns; flag it if it was lost."""
+    interval = max(1, queue.active_ttl // 3)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            owned = await asyncio.to_thread(queue.heartbeat, conversation_id, token)
+        except Exception as e:
+            logger.warning(f"⚠️ WhatsApp claim heartbeat failed for {conversation_id}: {e}")
+            continue
+        if not owned:
+            lost.set()
+            return
+
+
+@async_task(
+    bind=True,
+    name="whatsapp.process_conversation",
+    max_retries=3,
+    default_retry_delay=10,
+)
+async def process_conversation(self, conversation_id: str) -> Dict[str, Any]:
+    """
+    Process the pending inbound messages of one conversation, in order.
+
+    Only one task drains a conversation at a time: the run claims it with
+    its own owner token and heartbeats the claim while it works. Runs that
+    find it owned by another task exit without touching the queue. Each
+    message is removed from the queue after it was processed.
+
+    Args:
+        conversation_id: Kapso conversation ID
+
+    Returns:
+        Dict with processed count
+    """
+    from app.config.supabase import get_supabase_client
+    from app.services.whatsapp import WhatsAppService
+    from app.services.whatsapp.inbound import process_inbound_message
+    from app.services.whatsapp.inbound_queue import get_inbound_queue
+
+    queue = get_inbound_queue()
+    token = uuid4().hex
+
+    if not queue.claim(conversation_id, token):
+        logger.info(
+            f"⏭️ [CELERY TASK] WhatsApp conversation {conversation_id} already "
+            f"has a drainer, skipping"
+        )
+        return {"success": True, "conversation_id": conversation_id, "skipped": True}
+
+    supabase = get_supabase_client()
+    whatsapp_service = WhatsAppService(supabase)
+
+    processed = 0
+    failed = 0
+    lost = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(queue, conversation_id, token, lost))
+
+    try:
+        while not lost.is_set():
+            if processed + failed >= MAX_MESSAGES_PER_RUN:
+                # Continue in a fresh task, which takes over the claim
+                if queue.handoff(conversation_id, token):
+                    process_conversation.apply_async(args=[conversation_id])
+                    logger.info(
+                        f"🔁 [CELERY TASK] WhatsApp conversation {conversation_id} "
+                        f"rescheduled after {processed + failed} messages"
+                    )
+                break
+
+            message, found = queue.peek(conversation_id)
+            if not found:
+                released = queue.release(conversation_id, token)
+                if released is False:
+                    continue  # New messages arrived while releasing
+                break
+
+            if message is not None:
+                try:
+                    await process_inbound_message(message, supabase, whatsapp_service)
+                    processed += 1
+                except Exception as e:
+                    # Don't block the conversation on a message that can't be answered
+                    failed += 1
+                    logger.error(
+                        f"❌ [CELERY TASK] WhatsApp message {message.message_id} failed: {e}",
+                        exc_info=True,
+                    )
+
+            if not queue.ack(conversation_id, token):
+                lost.set()
+    finally:
+        heartbeat.cancel()
+
+    if lost.is_set():
+        logger.warning(
+            f"⚠️ [CELERY TASK] WhatsApp conversation {conversation_id}: claim lost, "
+            f"stopping (another drainer owns it)"
+        )
+
+    logger.info(
+        f"✅ [CELERY TASK] WhatsApp conversation {conversation_id} drained: "
+        f"processed={processed}, failed={failed}"
+    )
+
+    return {
+        "success": True,
+        "conversation_id": conversation_id,
+        "processed": processed,
+        "failed": failed,
+    }
+
+
+@celery_app.task(name="whatsapp.sweep_inbound_queue")
+def sweep_inbound_queue() -> Dict[str, Any]:
+    """
+    Reschedule conversations left with messages but no drainer.
+
+    Covers workers that died mid-conversation (their claim expired) and
+    tasks that were never delivered. Runs periodically from Beat.
+
+    Returns:
+        Dict with the rescheduled conversation IDs
+    """
+    from app.services.whatsapp.inbound_queue import get_inbound_queue
+
+    queue = get_inbound_queue()
+    if not queue.available:
+        return {"success": False, "error": "inbound queue unavailable", "rescheduled": []}
+
+    rescheduled = []
+    for conversation_id in queue.sweep():
+        try:
+            process_conversation.apply_async(args=[conversation_id])
+            rescheduled.append(conversation_id)
+        except Exception as e:
+            logger.error(f"❌ Error rescheduling WhatsApp conversation {conversation_id}: {e}")
+            queue.release_claim(conversation_id)
+
+    if rescheduled:
+        logger.warning(
+            f"🧹 [CELERY TASK] WhatsApp inbound sweep rescheduled {len(rescheduled)} "
+            f"orphaned conversation(s): {rescheduled}"
+        )
+
+    return {"success": True, "rescheduled": rescheduled}
@@ -0,0 +1,369 @@
+"""
+Celery telemetry collector.
+
+Broadcast inspect() calls block for their whole timeout, so the API never
+calls them on request. Instead one collector listens to worker events
+(task-*, worker-heartbeat) and periodically writes a snapshot to Redis:
+
+- queues: pending messages per queue (LLEN on the Redis broker)
+- workers: alive / active / processed / pool concurrency per worker
+- tasks: succeeded / failed / retried counts, failure rate over a rolling
+  window and a runtime histogram per task name
+- active_tasks / scheduled_tasks / registered_tasks / worker_stats: the
+  last inspect() results, refreshed in the collector's own thread
+
+The collector starts with Celery Beat (a single process per deployment),
+or standalone with `python -m app.infrastructure.celery.telemetry`.
+Workers must send task events (worker_send_task_events in config.py).
+
+Configuration:
+    CELERY_TELEMETRY_ENABLED: start the collector with Beat (default: true)
+    CELERY_TELEMETRY_INTERVAL_SECONDS: snapshot interval (default: 5)
+    CELERY_TELEMETRY_INSPECT_INTERVAL_SECONDS: inspect() refresh (default: 60)
+    CELERY_TELEMETRY_WINDOW_SECONDS: failure rate window (default: 900)
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from celery.signals import beat_init
+
+from app.utils.redis_client import LazyRedis
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "celery:telemetry:snapshot"
+DEFAULT_INTERVAL_SECONDS = 5
+DEFAULT_INSPECT_INTERVAL_SECONDS = 60
+DEFAULT_WINDOW_SECONDS = 900
+INSPECT_TIMEOUT_SECONDS = 2.0
+
+# Runtime histogram upper bounds (seconds); tasks range from WhatsApp
+# messages (sub-second) to SII syncs (up to the 30 min hard limit).
+RUNTIME_BUCKETS = (0.5, 1, 5, 15, 60, 300, 900, 1800)
+
+_redis = LazyRedis(config.REDIS_URL, "Celery telemetry")
+
+
+def _interval_seconds() -> int:
+    return max(1, int(os.getenv("CELERY_TELEMETRY_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS)))
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class TaskStats:
+    """Counters and runtime histogram of one task name."""
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.runtime_count = 0
+        self.runtime_sum = 0.0
+        self.runtime_max = 0.0
+        self.buckets = [0] * (len(RUNTIME_BUCKETS) + 1)
+        self.recent: deque = deque()  # (timestamp, failed)
+
+    def observe(self, outcome: str, runtime: Optional[float], now: float) -> None:
+        if outcome == "retried":
+            self.retried += 1
+            return
+
+        if outcome == "failed":
+            self.failed += 1
+        else:
+            self.succeeded += 1
+        self.recent.append((now, outcome == "failed"))
+
+        if runtime is not None and runtime >= 0:
+            self.runtime_count += 1
+            self.runtime_sum += runtime
+            self.runtime_max = max(self.runtime_max, runtime)
+            for i, bound in enumerate(RUNTIME_BUCKETS):
+                if runtime <= bound:
+                    self.buckets[i] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+
+    def to_dict(self, now: float, window_seconds: int) -> Dict[str, Any]:
+        while self.recent and self.recent[0][0] < now - window_seconds:
+            self.recent.popleft()
+        window_total = len(self.recent)
+        window_failed = sum(1 for _, failed in self.recent if failed)
+
+        # Cumulative buckets ("le" semantics), like Prometheus histograms
+        histogram, running = {}, 0
+        for bound, count in zip((*RUNTIME_BUCKETS, "+Inf"), self.buckets):
+            running += count
+            histogram[str(bound)] = running
+
+        count = self.runtime_count
+        return {
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "window_total": window_total,
+            "window_failed": window_failed,
+            "failure_rate": round(window_failed / window_total, 4) if window_total else 0.0,
+            "runtime": {
+                "count": count,
+                "avg": round(self.runtime_sum / count, 3) if count else None,
+                "max": round(self.runtime_max, 3) if count else None,
+                "buckets": histogram,
+            },
+        }
+
+
+class TelemetryCollector:
+    """
+    Consumes Celery events and publishes a telemetry snapshot to Redis.
+
+    Three daemon threads: the event receiver, the snapshot writer and the
+    inspect() refresher (the only place broadcast calls block).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.interval = _interval_seconds()
+        self.inspect_interval = max(self.interval, int(os.getenv(
+            "CELERY_TELEMETRY_INSPECT_INTERVAL_SECONDS", DEFAULT_INSPECT_INTERVAL_SECONDS
+        )))
+        self.window_seconds = int(os.getenv(
+            "CELERY_TELEMETRY_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS
+        ))
+        self.state = app.events.State(max_tasks_in_memory=5000, max_workers_in_memory=100)
+        self.tasks: Dict[str, TaskStats] = {}
+        self.inspected: Dict[str, Any] = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: list = []
+
+    def start(self) -> None:
+        for target, name in (
+            (self._run_receiver, "celery-telemetry-events"),
+            (self._run_writer, "celery-telemetry-writer"),
+            (self._run_inspector, "celery-telemetry-inspect"),
+        ):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"📈 Celery telemetry collector started (interval={self.interval}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def on_event(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self.state.event(event)
+
+            event_type = event.get("type")
+            outcome = {
+                "task-succeeded": "succeeded",
+                "task-failed": "failed",
+                "task-retried": "retried",
+            }.get(event_type)
+            if outcome is None:
+                return
+
+            task = self.state.tasks.get(event.get("uuid"))
+            name = (task.name if task else None) or "unknown"
+            runtime = event.get("runtime")
+            if runtime is None and task is not None and task.started:
+                runtime = event.get("timestamp", time.time()) - task.started
+
+            stats = self.tasks.get(name)
+            if stats is None:
+                stats = self.tasks[name] = TaskStats()
+            stats.observe(outcome, runtime, time.time())
+
+    def _run_receiver(self) -> None:
+        # Worker heartbeats (every ~2s) wake the loop even when no tasks run
+        while not self._stop.is_set():
+            try:
+                with self.app.connection_for_read() as connection:
+                    receiver = self.app.events.Receiver(
+                        connection, handlers={"*": self.on_event}
+                    )
+                    for _ in receiver.itercapture(limit=None, timeout=None, wakeup=True):
+                        if self._stop.is_set():
+                            return
+            except Exception as e:
+                logger.warning(f"⚠️ Celery telemetry: event receiver error ({e}), reconnecting")
+                self._stop.wait(self.interval)
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+
+    def _queue_depths(self, client) -> Dict[str, Optional[int]]:
+        queues = [q.name for q in (self.app.conf.task_queues or [])]
+        if not queues or not str(self.app.conf.broker_url).startswith(("redis://", "rediss://")):
+            return {name: None for name in queues}
+        pipe = client.pipeline(transaction=False)
+        for name in queues:
+            pipe.llen(name)
+        return dict(zip(queues, pipe.execute()))
+
+    def _workers(self) -> Dict[str, Dict[str, Any]]:
+        worker_stats = self.inspected.get("worker_stats") or {}
+        workers = {}
+        for hostname, worker in self.state.workers.items():
+            pool = (worker_stats.get(hostname) or {}).get("pool") or {}
+            workers[hostname] = {
+                "alive": worker.alive,
+                "active": worker.active,
+                "processed": worker.processed,
+                "concurrency": pool.get("max-concurrency"),
+                "loadavg": worker.loadavg,
+                "last_heartbeat": _iso(worker.heartbeats[-1] if worker.heartbeats else None),
+            }
+        return workers
+
+    def build_snapshot(self, client) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            tasks = {
+                name: stats.to_dict(now, self.window_seconds)
+                for name, stats in sorted(self.tasks.items())
+            }
+            workers = self._workers()
+
+        return {
+            "collected_at": _iso(now),
+            "collector_started_at": _iso(self.started_at),
+            "interval_seconds": self.interval,
+            "window_seconds": self.window_seconds,
+            "queues": self._queue_depths(client),
+            "workers": workers,
+            "tasks": tasks,
+            "active_tasks": self.inspected.get("active_tasks"),
+            "scheduled_tasks": self.inspected.get("scheduled_tasks"),
+            "registered_tasks": self.inspected.get("registered_tasks"),
+            "worker_stats": self.inspected.get("worker_stats"),
+            "inspected_at": self.inspected.get("inspected_at"),
+        }
+
+    def _run_writer(self) -> None:
+        while not self._stop.wait(self.interval):
+            client = _redis.get()
+            if client is None:
+                continue  # Redis down: skip this snapshot
+            try:
+                snapshot = self.build_snapshot(client)
+                client.set(
+                    SNAPSHOT_KEY,
+                    json.dumps(snapshot, default=str),
+                    ex=self.interval * 6,
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Celery telemetry: snapshot write failed ({e})")
+
+    def _run_inspector(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.inspected = collect_inspect(self.app)
+            except Exception as e:
+                logger.warning(f"⚠️ Celery telemetry: inspect failed ({e})")
+            self._stop.wait(self.inspect_interval)
+
+
+def collect_inspect(app, timeout: float = INSPECT_TIMEOUT_SECONDS) -> Dict[str, Any]:
+    """
+    Run the inspect() broadcasts (blocking, up to `timeout` each).
+
+    Never call this on the event loop: use asyncio.to_thread().
+    """
+    inspect = app.control.inspect(timeout=timeout)
+    return {
+        "active_tasks": inspect.active(),
+        "scheduled_tasks": inspect.scheduled(),
+        "registered_tasks": inspect.registered(),
+        "worker_stats": inspect.stats(),
+        "inspected_at": _iso(time.time()),
+    }
+
+
+def get_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    Read the latest telemetry snapshot from Redis (blocking).
+
+    Returns:
+        Snapshot dict with a `stale` flag, or None if no collector has
+        written one recently
+    """
+    client = _redis.get()
+    if client is None:
+        return None
+    try:
+        raw = client.get(SNAPSHOT_KEY)
+    except Exception as e:
+        logger.warning(f"⚠️ Celery telemetry: snapshot read failed ({e})")
+        return None
+    if not raw:
+        return None
+
+    snapshot = json.loads(raw)
+    collected_at = datetime.fromisoformat(snapshot["collected_at"])
+    age = (datetime.now(timezone.utc) - collected_at).total_seconds()
+    snapshot["age_seconds"] = round(age, 1)
+    snapshot["stale"] = age > 3 * snapshot.get("interval_seconds", DEFAULT_INTERVAL_SECONDS)
+    return snapshot
+
+
+_collector: Optional[TelemetryCollector] = None
+
+
+def start_collector(app) -> TelemetryCollector:
+    """
+    Start the process-wide collector (idempotent).
+
+    Starts even if Redis is down: the writer skips snapshots until it
+    reconnects, and the event receiver keeps counting in the meantime.
+    """
+    global _collector
+    if _collector is None:
+        _collector = TelemetryCollector(app)
+        _collector.start()
+    return _collector
+
+
+@beat_init.connect
+def _start_with_beat(sender=None, **kwargs):
+    if os.getenv("CELERY_TELEMETRY_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return
+    from . import celery_app
+
+    start_collector(celery_app)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    from app.infrastructure.celery import celery_app
+
+    collector = start_collector(celery_app)
+    try:
+        collector.join()
+    except KeyboardInterrupt:
+        collector.stop()
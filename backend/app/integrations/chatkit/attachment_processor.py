@@ -5,6 +5,7 @@ Converts ChatKit attachments to OpenAI Agents framework format.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any, Dict, List
 
@@ -15,7 +16,8 @@ logger = logging.getLogger(__name__)
 
 async def convert_attachments_to_content(
     item: UserMessageItem,
-    attachment_store
+    attachment_store,
+    openai_client: Any = None,
 ) -> List[Dict[str, Any]]:
     """
     Convert UserMessageItem content (text + attachments) to OpenAI Agents framework format.
@@ -23,16 +25,24 @@ async def convert_attachments_to_content(
     Returns a list of content items that can include:
     - {"type": "input_text", "text": "..."}
     - {"type": "input_image", "image_url": "data:image/png;base64,..."}
+    - {"type": "input_file", "file_id": "file-..."} (with openai_client)
+
+    Image data URLs and OpenAI file uploads are produced once per content
+    and cached by the attachment store.
 
     Args:
         item: ChatKit UserMessageItem
         attachment_store: Attachment store for retrieving attachment data
+        openai_client: Optional AsyncOpenAI client; when given, non-image
+            files are uploaded (once) and passed as file references
 
     Returns:
         List of content parts in OpenAI Agents format
     """
-    from app.agents.core import get_attachment_content
-    from app.services.storage.attachment_storage import get_attachment_storage
+    from app.agents.core.memory_attachment_store import (
+        get_attachment_data_url,
+        get_openai_file_id,
+    )
 
     content_parts = []
 
@@ -76,7 +86,6 @@ async def convert_attachments_to_content(
     # Process all found attachments
     if attachment_ids:
         logger.info(f"🔗 Processing {len(attachment_ids)} attachment(s): {attachment_ids}")
-        storage = get_attachment_storage()
 
         for i, attachment_id in enumerate(attachment_ids):
             logger.info(f"🔗 Processing attachment {i+1}/{len(attachment_ids)}: {attachment_id}")
@@ -101,48 +110,21 @@ async def convert_attachments_to_content(
                     logger.warning(f"⚠️ No metadata found for {attachment_id}, skipping")
                     continue
 
-            # For images, ALWAYS use base64
+            # For images, ALWAYS use a base64 data URL
             if mime_type.startswith("image/"):
-                base64_content = get_attachment_content(attachment_id)
-
-                # Fallback: Try to load from Supabase Storage if not in memory
-                if not base64_content:
-                    logger.warning(f"⚠️ Image content not found in memory for {attachment_id}, trying Supabase...")
-                    try:
-                        import base64 as b64
-                        file_data = storage.download_attachment(attachment_id)
-                        if file_data:
-                            base64_content = b64.b64encode(file_data).decode('utf-8')
-                            logger.info(f"✅ Loaded image from Supabase Storage: {len(base64_content)} chars")
-                    except Exception as e:
-                        logger.error(f"❌ Failed to load from Supabase: {e}")
-
-                if base64_content:
-                    # IMPORTANT: Clean the base64 string (remove any whitespace/newlines)
-                    base64_content = base64_content.strip().replace('\n', '').replace('\r', '').replace(' ', '')
-
-                    # Validate that it's proper base64
-                    try:
-                        import base64 as b64
-                        decoded = b64.b64decode(base64_content)
-                        logger.info(f"✅ Base64 validation passed: {len(decoded)} bytes, magic: {decoded[:2].hex() if len(decoded) >= 2 else 'N/A'}")
-                    except Exception as e:
-                        logger.error(f"❌ Invalid base64 content for {attachment_id}: {e}")
-                        content_parts.append({
-                            "type": "input_text",
-                            "text": f"[Imagen con formato inválido: {filename}]"
-                        })
-                        continue
+                data_url = await asyncio.to_thread(
+                    get_attachment_data_url, attachment_id, mime_type
+                )
 
+                if data_url:
                     # Create data URL - agents framework expects this format
-                    data_url = f"data:{mime_type};base64,{base64_content}"
                     content_parts.append({
                         "type": "input_image",
                         "image_url": data_url
                     })
-                    logger.info(f"📸 Added image to content: {filename} (base64, {len(base64_content)} chars)")
+                    logger.info(f"📸 Added image to content: {filename} (base64, {len(data_url)} chars)")
                 else:
-                    logger.warning(f"⚠️ Image content not available from any source for {attachment_id}")
+                    logger.warning(f"⚠️ Image content not available for {attachment_id}")
                     # If base64 not available, skip the image
                     content_parts.append({
                         "type": "input_text",
@@ -150,10 +132,26 @@ async def convert_attachments_to_content(
                     })
             else:
                 # For non-image files (PDFs, etc.)
+                file_id = None
+                if openai_client is not None:
+                    try:
+                        file_id = await get_openai_file_id(attachment_id, openai_client, filename)
+                    except Exception as e:
+                        logger.error(f"❌ Failed to upload {filename} to OpenAI: {e}")
+
                 # Check if this PDF has been uploaded to OpenAI (has vector_store_id)
-                openai_metadata = await attachment_store.get_openai_metadata(attachment_id)
+                openai_metadata = (
+                    None if file_id
+                    else await attachment_store.get_openai_metadata(attachment_id)
+                )
 
-                if openai_metadata and 'vector_store_id' in openai_metadata:
+                if file_id:
+                    content_parts.append({
+                        "type": "input_file",
+                        "file_id": file_id
+                    })
+                    logger.info(f"📄 Added file reference: {filename} ({file_id})")
+                elif openai_metadata and 'vector_store_id' in openai_metadata:
                     # PDF is available via FileSearchTool - inform the agent
                     content_parts.append({
                         "type": "input_text",
@@ -6,6 +6,7 @@ Simplified version that uses Supabase instead of SQLAlchemy.
 from __future__ import annotations
 
 import logging
+import os
 from typing import Any, Dict, AsyncIterator
 
 from chatkit.server import ChatKitServer
@@ -21,24 +22,44 @@ from chatkit.types import (
 
 from app.services.agents import AgentService
 from app.agents.core import MemoryAttachmentStore
+from app.utils.cache import BoundedCache
 
 logger = logging.getLogger(__name__)
 
 
 class SimpleMemoryStore(Store[Dict[str, Any]]):
-    """Simple in-memory store for ChatKit threads and items."""
+    """
+    Simple in-memory store for ChatKit threads and items.
+
+    Threads are kept in a bounded LRU cache (CHATKIT_STORE_MAX_THREADS,
+    default 1000, idle for CHATKIT_STORE_TTL_SECONDS, default 24h); evicting
+    a thread drops its items too.
+    """
 
     def __init__(self):
         """Initialize empty in-memory storage."""
-        self.threads: Dict[str, ThreadMetadata] = {}
+        max_threads = int(os.getenv("CHATKIT_STORE_MAX_THREADS", 1000))
+        ttl_seconds = float(os.getenv("CHATKIT_STORE_TTL_SECONDS", 24 * 3600))
+
+        # Items have no limits of their own: they go when their thread does
         self.items: Dict[str, list[ThreadItem]] = {}
-        self.attachments: Dict[str, Attachment] = {}
+        self.threads: BoundedCache[str, ThreadMetadata] = BoundedCache(
+            "chatkit.threads",
+            max_items=max_threads,
+            ttl_seconds=ttl_seconds,
+            sliding_ttl=True,
+            on_evict=lambda thread_id, thread, reason: self.items.pop(thread_id, None),
+        )
+        self.attachments: BoundedCache[str, Attachment] = BoundedCache(
+            "chatkit.attachments", max_items=10 * max_threads, ttl_seconds=ttl_seconds
+        )
 
     async def load_thread(
         self, thread_id: str, context: Dict[str, Any]
     ) -> ThreadMetadata:
         """Load thread metadata."""
-        if thread_id not in self.threads:
+        thread = self.threads.get(thread_id)
+        if thread is None:
             # Create new thread if not exists
             from datetime import datetime, timezone
             thread = ThreadMetadata(
@@ -48,8 +69,7 @@ class SimpleMemoryStore(Store[Dict[str, Any]]):
             )
             self.threads[thread_id] = thread
             self.items[thread_id] = []
-            return thread
-        return self.threads[thread_id]
+        return thread
 
     async def save_thread(
         self, thread: ThreadMetadata, context: Dict[str, Any]
@@ -68,11 +88,10 @@ class SimpleMemoryStore(Store[Dict[str, Any]]):
         context: Dict[str, Any],
     ) -> Page[ThreadItem]:
         """Load thread items with pagination."""
-        if thread_id not in self.items:
+        items = self.items.get(thread_id)
+        if items is None:
             return Page(data=[], next_cursor=None)
 
-        items = self.items[thread_id]
-
         # Simple pagination - find index of 'after' item
         start_idx = 0
         if after:
@@ -101,16 +120,16 @@ class SimpleMemoryStore(Store[Dict[str, Any]]):
         self, attachment_id: str, context: Dict[str, Any]
     ) -> Attachment:
         """Load attachment metadata."""
-        if attachment_id not in self.attachments:
+        attachment = self.attachments.get(attachment_id)
+        if attachment is None:
             raise NotFoundError(f"Attachment {attachment_id} not found")
-        return self.attachments[attachment_id]
+        return attachment
 
     async def delete_attachment(
         self, attachment_id: str, context: Dict[str, Any]
     ) -> None:
         """Delete attachment."""
-        if attachment_id in self.attachments:
-            del self.attachments[attachment_id]
+        self.attachments.pop(attachment_id)
 
     async def load_threads(
         self,
@@ -142,9 +161,10 @@ class SimpleMemoryStore(Store[Dict[str, Any]]):
         self, thread_id: str, item: ThreadItem, context: Dict[str, Any]
     ) -> None:
         """Save a thread item."""
-        if thread_id not in self.items:
-            self.items[thread_id] = []
-        self.items[thread_id].append(item)
+        items = self.items.get(thread_id)
+        if items is None:
+            items = self.items[thread_id] = []
+        items.append(item)
 
     async def add_thread_item(
         self, thread_id: str, item: ThreadItem, context: Dict[str, Any]
@@ -156,10 +176,8 @@ class SimpleMemoryStore(Store[Dict[str, Any]]):
         self, thread_id: str, context: Dict[str, Any]
     ) -> None:
         """Delete a thread."""
-        if thread_id in self.threads:
-            del self.threads[thread_id]
-        if thread_id in self.items:
-            del self.items[thread_id]
+        self.threads.pop(thread_id)
+        self.items.pop(thread_id, None)
 
     async def delete_thread_item(
         self, thread_id: str, item_id: str, context: Dict[str, Any]
@@ -174,9 +192,7 @@ class SimpleMemoryStore(Store[Dict[str, Any]]):
         self, thread_id: str, item_id: str, context: Dict[str, Any]
     ) -> ThreadItem | None:
         """Load a specific thread item."""
-        if thread_id not in self.items:
-            return None
-        for item in self.items[thread_id]:
+        for item in self.items.get(thread_id) or []:
             if item.id == item_id:
                 return item
         return None
@@ -185,17 +201,18 @@ class SimpleMemoryStore(Store[Dict[str, Any]]):
         self, thread_id: str, item: ThreadItem, context: Dict[str, Any]
     ) -> None:
         """Save/update a thread item."""
-        if thread_id not in self.items:
-            self.items[thread_id] = []
+        items = self.items.get(thread_id)
+        if items is None:
+            items = self.items[thread_id] = []
 
         # Update existing item or append new one
-        for i, existing_item in enumerate(self.items[thread_id]):
+        for i, existing_item in enumerate(items):
             if existing_item.id == item.id:
-                self.items[thread_id][i] = item
+                items[i] = item
                 return
 
         # Item doesn't exist, append it
-        self.items[thread_id].append(item)
+        items.append(item)
 
 
 class ChatKitServerAdapter(ChatKitServer):
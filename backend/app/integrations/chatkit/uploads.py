@@ -0,0 +1,163 @@
+"""
+Streaming attachment uploads for ChatKit.
+
+Phase 2 uploads (POST /chatkit/upload/{attachment_id}) are parsed as they
+arrive instead of buffering the body: file bytes go straight into an
+AttachmentWriter (spooled to disk, hashed, size-capped). Oversized uploads
+are rejected from Content-Length before reading, or as soon as the cap is
+crossed for chunked bodies.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import python_multipart as multipart
+from python_multipart.multipart import parse_options_header
+from starlette.requests import Request
+
+from app.agents.core.memory_attachment_store import (
+    AttachmentTooLargeError,
+    AttachmentWriter,
+    StoredContent,
+)
+
+logger = logging.getLogger(__name__)
+
+# Multipart framing (boundaries, part headers) on top of the file size
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@dataclass
+class ReceivedUpload:
+    """Result of a streamed upload."""
+
+    content: StoredContent
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+class _FilePartCollector:
+    """
+    python-multipart callbacks that keep the bytes of the first file part.
+
+    Data is buffered per parser.write() call only; the caller drains it
+    into the writer after each network chunk.
+    """
+
+    def __init__(self):
+        self.pending: List[bytes] = []
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.found = False
+        self._capturing = False
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict = {}
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        filename = options.get(b"filename")
+        # Only the first file part is kept (ChatKit sends a single file)
+        self._capturing = filename is not None and not self.found
+        if self._capturing:
+            self.found = True
+            self.filename = filename.decode("utf-8", errors="replace")
+            content_type = self._headers.get(b"content-type")
+            self.content_type = content_type.decode("latin-1") if content_type else None
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._capturing:
+            self.pending.append(data[start:end])
+
+    def on_part_end(self) -> None:
+        self._capturing = False
+
+    def drain(self) -> bytes:
+        data = b"".join(self.pending)
+        self.pending.clear()
+        return data
+
+
+def _check_content_length(request: Request, max_bytes: int) -> None:
+    """Reject before reading when the declared body is already too large."""
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise AttachmentTooLargeError(max_bytes)
+
+
+async def receive_upload(request: Request, attachment_id: str) -> ReceivedUpload:
+    """
+    Stream an upload request into the attachment spool.
+
+    Accepts multipart/form-data (first file field, as sent by ChatKit) or a
+    raw body.
+
+    Raises:
+        AttachmentTooLargeError: If the file exceeds ATTACHMENT_MAX_UPLOAD_BYTES
+        ValueError: If a multipart body contains no file
+    """
+    writer = await asyncio.to_thread(AttachmentWriter)
+    try:
+        _check_content_length(request, writer.max_bytes)
+
+        content_type = request.headers.get("content-type", "")
+        if "multipart/form-data" in content_type:
+            _, params = parse_options_header(content_type)
+            boundary = params.get(b"boundary")
+            if not boundary:
+                raise ValueError("Missing multipart boundary")
+
+            collector = _FilePartCollector()
+            parser = multipart.MultipartParser(boundary, collector.callbacks())
+            async for chunk in request.stream():
+                parser.write(chunk)
+                data = collector.drain()
+                if data:
+                    await asyncio.to_thread(writer.write, data)
+            parser.finalize()
+
+            if not collector.found:
+                raise ValueError("No file found in multipart/form-data")
+            filename, file_content_type = collector.filename, collector.content_type
+        else:
+            # Fallback: raw bytes (shouldn't happen with ChatKit)
+            async for chunk in request.stream():
+                if chunk:
+                    await asyncio.to_thread(writer.write, chunk)
+            filename, file_content_type = None, content_type or None
+
+        content = await asyncio.to_thread(writer.commit, attachment_id)
+
+    except BaseException:
+        writer.abort()
+        raise
+
+    return ReceivedUpload(content=content, filename=filename, content_type=file_content_type)
@@ -9,6 +9,7 @@ from .exceptions import (
     KapsoAPIError,
     KapsoAuthenticationError,
     KapsoNotFoundError,
+    KapsoRateLimitError,
     KapsoTimeoutError,
     KapsoValidationError,
 )
@@ -16,6 +17,8 @@ from .models import (
     ConversationStatus,
     MessageType,
     InteractiveType,
+    BulkSendResult,
+    TemplateRecipient,
 )
 
 __all__ = [
@@ -23,9 +26,12 @@ __all__ = [
     "KapsoAPIError",
     "KapsoAuthenticationError",
     "KapsoNotFoundError",
+    "KapsoRateLimitError",
     "KapsoTimeoutError",
     "KapsoValidationError",
     "ConversationStatus",
     "MessageType",
     "InteractiveType",
+    "BulkSendResult",
+    "TemplateRecipient",
 ]
@@ -1,6 +1,9 @@
 """Base API client for common HTTP operations."""
 
+import asyncio
 import logging
+import os
+import weakref
 from typing import Any, Optional
 
 import httpx
@@ -9,12 +12,85 @@ from ..exceptions import (
     KapsoAPIError,
     KapsoAuthenticationError,
     KapsoNotFoundError,
+    KapsoRateLimitError,
     KapsoTimeoutError,
     KapsoValidationError,
 )
+from ..rate_limit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Connection pool (shared by all API modules of a process)
+MAX_CONNECTIONS = int(os.getenv("KAPSO_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("KAPSO_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("KAPSO_KEEPALIVE_EXPIRY_SECONDS", "30"))
+
+# Outgoing rate limit (Meta Cloud API allows ~80 msg/s per number; stay below)
+RATE_LIMIT_PER_SECOND = float(os.getenv("KAPSO_RATE_LIMIT_PER_SECOND", "20"))
+RATE_LIMIT_BURST = int(os.getenv("KAPSO_RATE_LIMIT_BURST", "40"))
+
+# Retries: 429 and connection errors always (the request was not processed),
+# timeouts and 5xx only for idempotent methods (a POST may have been delivered)
+MAX_RETRIES = int(os.getenv("KAPSO_MAX_RETRIES", "3"))
+RETRY_BACKOFF_SECONDS = 0.5
+MAX_RETRY_DELAY_SECONDS = 30.0
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_rate_limiter = TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+
+# httpx.AsyncClient is bound to the event loop it was first used on
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])."""
+    if os.getenv("KAPSO_HTTP2", "true").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the pooled keep-alive client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=_http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the pooled client of the running event loop (app shutdown)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    if retry_after is not None:
+        return min(retry_after, MAX_RETRY_DELAY_SECONDS)
+    return min(RETRY_BACKOFF_SECONDS * (2 ** attempt), MAX_RETRY_DELAY_SECONDS)
+
+
+def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
 
 class BaseAPI:
     """Base class for Kapso API modules with common HTTP functionality."""
@@ -48,9 +124,13 @@ class BaseAPI:
         """
         Make HTTP request with error handling.
 
+        Requests go through the shared connection pool and rate limiter and
+        are retried with backoff on 429, connection errors and (for
+        idempotent methods) timeouts and 5xx responses.
+
         Args:
             method: HTTP method (GET, POST, PATCH, DELETE)
-            endpoint: API endpoint (will be appended to base_url)
+            endpoint: API endpoint (appended to base_url; absolute URLs used as-is)
             data: JSON payload for request body
             params: Query parameters
             timeout: Request timeout (uses default if not specified)
@@ -63,20 +143,27 @@ class BaseAPI:
             KapsoAuthenticationError: Invalid API token (401)
             KapsoNotFoundError: Resource not found (404)
             KapsoValidationError: Validation error (422)
+            KapsoRateLimitError: Still rate limited after retries (429)
             KapsoTimeoutError: Request timeout
             KapsoAPIError: Other API errors
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if endpoint.startswith(("http://", "https://")):
+            url = endpoint
+        else:
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
         timeout_val = timeout or self.timeout
+        idempotent = method.upper() in IDEMPOTENT_METHODS
 
         # Merge headers
         request_headers = self.headers.copy()
         if headers:
             request_headers.update(headers)
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.request(
+        attempt = 0
+        while True:
+            await _rate_limiter.acquire()
+            try:
+                response = await get_http_client().request(
                     method=method,
                     url=url,
                     headers=request_headers,
@@ -84,33 +171,65 @@ class BaseAPI:
                     params=params,
                     timeout=timeout_val,
                 )
-
-                # Handle different status codes
-                if response.status_code == 401:
-                    logger.error("Authentication failed: Invalid API token")
-                    raise KapsoAuthenticationError("Invalid API token")
-                elif response.status_code == 404:
-                    logger.error(f"Resource not found: {endpoint}")
-                    raise KapsoNotFoundError(f"Resource not found: {endpoint}")
-                elif response.status_code == 422:
-                    error_detail = response.text
-                    logger.error(f"Validation error: {error_detail}")
-                    raise KapsoValidationError(error_detail)
-                elif response.status_code >= 500:
-                    error_detail = response.text
-                    logger.error(f"Server error ({response.status_code}): {error_detail}")
-                    raise KapsoAPIError(f"Server error: {error_detail}", response.status_code)
-                elif response.status_code >= 400:
-                    error_detail = response.text
-                    logger.error(f"Client error ({response.status_code}): {error_detail}")
-                    raise KapsoAPIError(error_detail, response.status_code)
-
-                # Success - return JSON
-                return response.json()
-
-        except httpx.TimeoutException as e:
-            logger.error(f"Request timeout after {timeout_val}s: {url}")
-            raise KapsoTimeoutError(f"Request timeout: {str(e)}")
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error: {str(e)}")
-            raise KapsoAPIError(f"HTTP error: {str(e)}")
+                return self._handle_response(response, endpoint)
+
+            except KapsoRateLimitError as e:
+                if attempt >= MAX_RETRIES:
+                    raise
+                delay = _retry_delay(attempt, e.retry_after)
+                _rate_limiter.penalize(delay)
+                logger.warning(f"⏳ Kapso rate limited, retrying in {delay:.1f}s: {url}")
+
+            except KapsoAPIError as e:
+                retryable = idempotent and e.status_code is not None and e.status_code >= 500
+                if not retryable or attempt >= MAX_RETRIES:
+                    raise
+                delay = _retry_delay(attempt)
+                logger.warning(f"Kapso server error ({e.status_code}), retrying in {delay:.1f}s: {url}")
+
+            except httpx.TimeoutException as e:
+                # Connect timeouts never reached the server: safe to retry any method
+                retryable = idempotent or isinstance(e, (httpx.ConnectTimeout, httpx.PoolTimeout))
+                if not retryable or attempt >= MAX_RETRIES:
+                    logger.error(f"Request timeout after {timeout_val}s: {url}")
+                    raise KapsoTimeoutError(f"Request timeout: {str(e)}")
+                delay = _retry_delay(attempt)
+                logger.warning(f"Kapso request timeout, retrying in {delay:.1f}s: {url}")
+
+            except httpx.HTTPError as e:
+                retryable = idempotent or isinstance(e, httpx.ConnectError)
+                if not retryable or attempt >= MAX_RETRIES:
+                    logger.error(f"HTTP error: {str(e)}")
+                    raise KapsoAPIError(f"HTTP error: {str(e)}")
+                delay = _retry_delay(attempt)
+                logger.warning(f"Kapso HTTP error ({e}), retrying in {delay:.1f}s: {url}")
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _handle_response(response: httpx.Response, endpoint: str) -> dict[str, Any]:
+        """Map error status codes to Kapso exceptions and parse JSON."""
+        if response.status_code == 401:
+            logger.error("Authentication failed: Invalid API token")
+            raise KapsoAuthenticationError("Invalid API token")
+        elif response.status_code == 404:
+            logger.error(f"Resource not found: {endpoint}")
+            raise KapsoNotFoundError(f"Resource not found: {endpoint}")
+        elif response.status_code == 422:
+            error_detail = response.text
+            logger.error(f"Validation error: {error_detail}")
+            raise KapsoValidationError(error_detail)
+        elif response.status_code == 429:
+            raise KapsoRateLimitError(response.text, retry_after=_parse_retry_after(response))
+        elif response.status_code >= 500:
+            error_detail = response.text
+            logger.error(f"Server error ({response.status_code}): {error_detail}")
+            raise KapsoAPIError(f"Server error: {error_detail}", response.status_code)
+        elif response.status_code >= 400:
+            error_detail = response.text
+            logger.error(f"Client error ({response.status_code}): {error_detail}")
+            raise KapsoAPIError(error_detail, response.status_code)
+
+        # Success - return JSON
+        return response.json()
@@ -1,10 +1,12 @@
 """Messages API - send and manage WhatsApp messages."""
 
+import asyncio
 import logging
 from typing import Any, Optional
 
 from .base import BaseAPI
-from ..models import MessageType, InteractiveType
+from ..exceptions import KapsoAPIError
+from ..models import BulkSendResult, InteractiveType, MessageType, TemplateRecipient
 
 logger = logging.getLogger(__name__)
 
@@ -126,6 +128,77 @@ class MessagesAPI(BaseAPI):
             data=payload,
         )
 
+    async def send_template_bulk(
+        self,
+        recipients: list[TemplateRecipient | dict[str, Any]],
+        template_name: str,
+        template_language: str = "es",
+        whatsapp_config_id: Optional[str] = None,
+        max_concurrency: int = 10,
+    ) -> list[BulkSendResult]:
+        """
+        Send a template to many recipients concurrently.
+
+        Sends are fanned out (at most max_concurrency in flight) and paced by
+        the shared rate limiter. A failing recipient does not stop the rest.
+
+        Args:
+            recipients: TemplateRecipient (or dicts with phone_number and
+                optional template_params) per destination
+            template_name: Name of approved template
+            template_language: Language code (default: es)
+            whatsapp_config_id: Optional WhatsApp config ID to send from
+            max_concurrency: Max sends in flight at once
+
+        Returns:
+            One BulkSendResult per recipient, in input order
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def send_one(recipient: TemplateRecipient) -> BulkSendResult:
+            async with semaphore:
+                try:
+                    response = await self.send_template(
+                        phone_number=recipient.phone_number,
+                        template_name=template_name,
+                        template_params=recipient.template_params,
+                        template_language=template_language,
+                        whatsapp_config_id=whatsapp_config_id,
+                    )
+                    return BulkSendResult(
+                        phone_number=recipient.phone_number,
+                        success=True,
+                        message_id=response.get("id"),
+                        response=response,
+                    )
+                except KapsoAPIError as e:
+                    return BulkSendResult(
+                        phone_number=recipient.phone_number,
+                        success=False,
+                        error=e.message,
+                        status_code=e.status_code,
+                    )
+                except Exception as e:
+                    logger.error(f"Unexpected error sending template to {recipient.phone_number}: {e}")
+                    return BulkSendResult(
+                        phone_number=recipient.phone_number,
+                        success=False,
+                        error=str(e),
+                    )
+
+        parsed = [
+            r if isinstance(r, TemplateRecipient) else TemplateRecipient(**r)
+            for r in recipients
+        ]
+        results = await asyncio.gather(*(send_one(r) for r in parsed))
+
+        failed = sum(1 for r in results if not r.success)
+        logger.info(
+            f"📤 Bulk template '{template_name}': {len(results) - failed}/{len(results)} sent"
+            + (f", {failed} failed" if failed else "")
+        )
+        return list(results)
+
     async def send_interactive(
         self,
         conversation_id: str,
@@ -3,8 +3,6 @@
 import logging
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from .base import BaseAPI
 from ..exceptions import KapsoAPIError
 
@@ -149,32 +147,17 @@ class TemplatesAPI(BaseAPI):
         logger.info(f"  - Params: {template_params}")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    meta_url,
-                    headers=self.headers,
-                    json=payload,
-                    timeout=60,
-                )
-
-                logger.info(f"📬 Template response. Status: {response.status_code}")
-
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.info(f"✅ Template '{template_name}' sent to {normalized_phone}")
-                    return result
-                else:
-                    error_text = response.text
-                    logger.error(f"❌ Error sending template: {response.status_code} - {error_text}")
-                    raise KapsoAPIError(
-                        f"Error {response.status_code}: {error_text}",
-                        status_code=response.status_code
-                    )
-
-        except httpx.HTTPStatusError as e:
-            logger.error(f"❌ HTTP error sending template: {e}")
-            raise KapsoAPIError(f"HTTP error: {str(e)}")
-        except KapsoAPIError:
+            result = await self._make_request(
+                method="POST",
+                endpoint=meta_url,
+                data=payload,
+                timeout=60,
+            )
+            logger.info(f"✅ Template '{template_name}' sent to {normalized_phone}")
+            return result
+
+        except KapsoAPIError as e:
+            logger.error(f"❌ Error sending template: {e.status_code} - {e.message}")
             raise
         except Exception as e:
             logger.error(f"❌ Unexpected error sending template: {e}")
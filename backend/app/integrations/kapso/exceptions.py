@@ -36,3 +36,11 @@ class KapsoTimeoutError(KapsoAPIError):
 
     def __init__(self, message: str = "Request timeout"):
         super().__init__(message, status_code=None)
+
+
+class KapsoRateLimitError(KapsoAPIError):
+    """Raised when Kapso/Meta rejects a request for rate limiting (429)."""
+
+    def __init__(self, message: str = "Rate limit exceeded", retry_after: float | None = None):
+        self.retry_after = retry_after
+        super().__init__(message, status_code=429)
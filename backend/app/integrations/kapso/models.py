@@ -124,6 +124,26 @@ class SendTemplateRequest(BaseModel):
     response_format: Optional[str] = "concise"
 
 
+class TemplateRecipient(BaseModel):
+    """Recipient of a bulk template send."""
+
+    phone_number: str = Field(..., description="Phone number (E.164 format)")
+    template_params: Optional[dict[str, Any] | list[Any]] = Field(
+        None, description="Per-recipient template parameters (named or positional)"
+    )
+
+
+class BulkSendResult(BaseModel):
+    """Outcome of a bulk send for one recipient."""
+
+    phone_number: str
+    success: bool
+    message_id: Optional[str] = None
+    response: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+
+
 class MessageResponse(BaseModel):
     """Response model for message operations."""
 
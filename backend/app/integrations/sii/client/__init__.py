@@ -20,6 +20,11 @@ Uso:
         client.get_compras("202501")
         client.get_f29_lista("2025")
         client.get_boletas_honorarios("10", "2025")
+
+Modo browserless (Chrome solo para el login, resto vía HTTP con cookies):
+    with SIIClient(tax_id="12345678-9", password="secret", browserless=True) as client:
+        client.get_resumen("202501")
+        client.get_compras("202501")
 """
 
 from .boletas_methods import BoletasMethods
@@ -2,9 +2,11 @@
 Clase base del cliente SII con funcionalidades core
 """
 import logging
+import threading
+import time
 from typing import Dict, Any, List, Optional
 
-from ..core import SeleniumDriver, Authenticator, SessionManager
+from ..core import SeleniumDriver, Authenticator, SessionManager, get_session_pool
 from ..extractors import ContribuyenteExtractor, F29Extractor, DTEExtractor
 from ..config import config as default_config
 from ..exceptions import AuthenticationError, ExtractionError
@@ -17,6 +19,8 @@ class SIIClientBase:
     Clase base del cliente SII con funcionalidades core:
     - Inicialización y ciclo de vida
     - Autenticación y gestión de cookies
+    - Pool de sesiones compartido por RUT (evita Selenium si hay cookies válidas)
+    - Modo browserless: Selenium solo para el login, el resto vía HTTP
     - Context manager
     """
 
@@ -26,7 +30,9 @@ class SIIClientBase:
         password: str,
         headless: bool = True,
         config: Optional[Dict] = None,
-        cookies: Optional[List[Dict]] = None
+        cookies: Optional[List[Dict]] = None,
+        use_session_pool: bool = True,
+        browserless: bool = False
     ):
         """
         Inicializa el cliente SII
@@ -38,14 +44,25 @@ class SIIClientBase:
             config: Configuración opcional (dict con timeout, window_size, etc)
             cookies: Cookies de sesión existentes (opcional). Si se proveen, se intentará
                     usarlas sin hacer login. Si no funcionan, se hará login automáticamente.
+            use_session_pool: Reutilizar/guardar cookies en el pool compartido por RUT.
+                    Si no se proveen cookies, se buscan primero en el pool.
+            browserless: Usar Selenium solo para el login. Chrome se cierra apenas se
+                    obtienen las cookies y los métodos que navegan el portal
+                    (scrapers F29/declaraciones) lanzan ExtractionError.
         """
         self.tax_id = tax_id
         self.password = password
         self.headless = headless
+        self.browserless = browserless
         self.custom_config = config or {}
         self.custom_config['headless'] = headless
 
-        # Cookies iniciales (pueden venir de fuera)
+        # Pool de sesiones compartido (Redis) por RUT
+        self._session_pool = get_session_pool() if use_session_pool else None
+        if not cookies and self._session_pool:
+            cookies = self._session_pool.get(tax_id)
+
+        # Cookies iniciales (pueden venir de fuera o del pool)
         self._initial_cookies = cookies
 
         # Componentes core (lazy initialization)
@@ -62,6 +79,11 @@ class SIIClientBase:
         self._initialized = False
         self._authenticated = bool(cookies)  # Si pasamos cookies, asumimos autenticado hasta validar
         self._current_cookies: Optional[List[Dict]] = cookies  # Cookies actuales en memoria
+        self._browser_logged_in = False  # Si el driver de Selenium tiene sesión activa
+
+        # Verificación de sesión compartida entre threads (fetch concurrente)
+        self._session_lock = threading.RLock()
+        self._session_verified_at: Optional[float] = None
 
         logger.debug(f"🚀 SIIClient initialized for {tax_id}")
         if cookies:
@@ -77,23 +99,37 @@ class SIIClientBase:
             self._initialize()
 
     def _initialize(self):
-        """Inicializa los componentes core"""
+        """
+        Inicializa los componentes core
+
+        El driver de Selenium NO se levanta aquí: solo se necesita para el
+        login o para scrapers que navegan el portal (ver _ensure_driver).
+        """
         if self._initialized:
             return
 
         logger.debug("🔧 Initializing SIIClient components...")
 
-        # Inicializar driver
-        self._driver = SeleniumDriver(custom_config=self.custom_config)
-        self._driver.start()
-
         # Inicializar session manager con cookies iniciales si existen
         self._session_manager = SessionManager(
             tax_id=self.tax_id,
             cookies=self._initial_cookies
         )
 
-        # Inicializar authenticator
+        self._initialized = True
+        logger.debug("✅ SIIClient components initialized")
+
+    def _ensure_driver(self):
+        """Levanta Chrome (Selenium) y el authenticator bajo demanda"""
+        self._ensure_initialized()
+
+        if self._driver is not None:
+            return
+
+        logger.debug("🌐 Starting Selenium driver...")
+        self._driver = SeleniumDriver(custom_config=self.custom_config)
+        self._driver.start()
+
         self._authenticator = Authenticator(
             driver=self._driver,
             session_manager=self._session_manager,
@@ -101,8 +137,38 @@ class SIIClientBase:
             password=self.password
         )
 
-        self._initialized = True
-        logger.debug("✅ SIIClient components initialized")
+    def _release_driver(self):
+        """Cierra Chrome manteniendo las cookies de sesión en memoria"""
+        if self._driver:
+            self._driver.quit()
+        self._driver = None
+        self._authenticator = None
+        self._browser_logged_in = False
+        logger.debug("🔴 Selenium driver released (browserless mode)")
+
+    def _check_browser_allowed(self, operation: str):
+        """
+        Valida que la operación pueda usar navegador
+
+        Raises:
+            ExtractionError: Si el cliente está en modo browserless
+        """
+        if self.browserless:
+            raise ExtractionError(
+                f"{operation} requires a browser session and the client is browserless",
+                resource=operation
+            )
+
+    def _require_browser_session(self, operation: str = "browser_session"):
+        """
+        Asegura un navegador autenticado (para scrapers que leen del driver)
+
+        Las cookies del pool no viven en el navegador, así que si el driver
+        no hizo login en este cliente se fuerza uno nuevo.
+        """
+        self._check_browser_allowed(operation)
+        if self._driver is None or not self._browser_logged_in:
+            self.login(force_new=True)
 
     def close(self) -> None:
         """Cierra el cliente y libera recursos"""
@@ -126,6 +192,7 @@ class SIIClientBase:
 
         self._initialized = False
         self._authenticated = False
+        self._browser_logged_in = False
 
         logger.debug("✅ SIIClient closed")
 
@@ -167,14 +234,23 @@ class SIIClientBase:
 
         logger.info(f"🔐 Authenticating {self.tax_id}...")
 
+        # El login siempre requiere navegador
+        self._ensure_driver()
+
         # IMPORTANTE: Pasar force_new al authenticator
         success = self._authenticator.authenticate(force_new=force_new)
 
         if success:
             self._authenticated = True
+            self._browser_logged_in = True
             # Actualizar cookies actuales desde el session manager
             self._current_cookies = self._session_manager.get_cookies()
+            if self._session_pool and self._current_cookies:
+                self._session_pool.save(self.tax_id, self._current_cookies)
             logger.info("✅ Authentication successful")
+            # En modo browserless Chrome solo se usa para obtener cookies
+            if self.browserless and self._current_cookies:
+                self._release_driver()
         else:
             raise AuthenticationError("Authentication failed")
 
@@ -223,6 +299,10 @@ class SIIClientBase:
         actuales siguen siendo válidas. Si están expiradas, hace re-login
         automáticamente.
 
+        Es thread-safe: varias llamadas concurrentes comparten una sola
+        verificación (o re-login), y una sesión verificada hace menos de
+        config.session_verify_ttl_seconds no se vuelve a verificar.
+
         Args:
             force_refresh: Si True, fuerza re-login sin importar el estado
 
@@ -242,8 +322,32 @@ class SIIClientBase:
             ...         # Guardar nuevas cookies en BD
             ...         save_cookies(result['cookies'])
         """
-        from ..exceptions import ExtractionError
+        with self._session_lock:
+            verify_ttl = self.custom_config.get(
+                'session_verify_ttl_seconds', default_config.session_verify_ttl_seconds
+            )
+            recently_verified = (
+                self._session_verified_at is not None
+                and time.monotonic() - self._session_verified_at < verify_ttl
+            )
+            if (
+                not force_refresh
+                and recently_verified
+                and self._authenticated
+                and self._current_cookies
+            ):
+                return {
+                    'valid': True,
+                    'refreshed': False,
+                    'cookies': self._current_cookies
+                }
+
+            result = self._verify_session(force_refresh=force_refresh)
+            self._session_verified_at = time.monotonic()
+            return result
 
+    def _verify_session(self, force_refresh: bool = False) -> dict:
+        """Implementación de verify_session (llamar con _session_lock tomado)"""
         self._ensure_initialized()
 
         # Si se fuerza refresh, hacer login directo
@@ -271,6 +375,8 @@ class SIIClientBase:
                 }
             except ExtractionError as e:
                 logger.warning(f"⚠️ Session validation failed: {e}")
+                if self._session_pool:
+                    self._session_pool.invalidate(self.tax_id)
                 logger.info("🔄 Refreshing session with new login...")
                 # Cookies expiradas, hacer re-login
                 self.login(force_new=True)
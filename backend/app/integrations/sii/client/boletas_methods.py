@@ -11,6 +11,7 @@ from typing import Dict, Any, List
 import requests
 
 from .f29_methods import F29Methods
+from ..core.http_session import get_http_session
 from ..exceptions import ExtractionError
 
 logger = logging.getLogger(__name__)
@@ -133,8 +134,8 @@ class BoletasMethods(F29Methods):
                         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
                     }
 
-                    # Realizar la petición
-                    response = requests.post(
+                    # Realizar la petición (sesión HTTP compartida)
+                    response = get_http_session().post(
                         endpoint_url,
                         json=payload,
                         cookies=cookies_dict,
@@ -60,7 +60,11 @@ class ContribuyenteMethods(SIIClientBase):
                 )
             except Exception as e:
                 logger.warning(f"⚠️ Provided cookies failed: {e}. Will retry with fresh login.")
-                # Si falla, continuar con login
+                # Si falla, descartar cookies (también del pool) y continuar con login
+                self._current_cookies = None
+                self._authenticated = False
+                if self._session_pool:
+                    self._session_pool.invalidate(self.tax_id)
 
         # Si no hay cookies válidas o fallaron, hacer login con RPA
         logger.info("🔐 No valid cookies - performing RPA login")
@@ -68,9 +72,10 @@ class ContribuyenteMethods(SIIClientBase):
             self.login()
 
         # Obtener cookies del driver después del login
-        driver_cookies = self._driver.get_cookies() if self._driver else []
+        # (en modo browserless el driver ya se cerró y las cookies quedan en memoria)
+        driver_cookies = self._driver.get_cookies() if self._driver else (self._current_cookies or [])
         cookie_names = [c.get('name') for c in driver_cookies]
         logger.info(f"🔄 Extracting with {len(driver_cookies)} cookies from driver: {cookie_names}")
 
         # Extraer con cookies frescas del driver
-        return self._contribuyente_extractor.extract(self.tax_id)
+        return self._contribuyente_extractor.extract(self.tax_id, cookies=driver_cookies)
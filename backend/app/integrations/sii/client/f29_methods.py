@@ -42,11 +42,12 @@ class F29Methods(DTEMethods):
         self._ensure_initialized()
 
         # F29 scraping requiere autenticación fresca por navegación Selenium
+        self._check_browser_allowed("f29_lista")
         logger.info("🔐 F29 scraping requires fresh authentication...")
         self.login(force_new=True)
 
-        # Lazy loading del extractor
-        if not self._f29_extractor:
+        # Lazy loading del extractor (recrearlo si se creó sin driver)
+        if not self._f29_extractor or self._f29_extractor.driver is not self._driver:
             self._f29_extractor = F29Extractor(self._driver, self.tax_id)
 
         return self._f29_extractor.search(anio, folio, save_callback=save_callback)
@@ -207,7 +208,7 @@ class F29Methods(DTEMethods):
 
         # Verificar y refrescar sesión si es necesario
         logger.info("🔐 Declaraciones con estados require authentication...")
-        self.verify_session()
+        self._require_browser_session("declaraciones_con_estados")
 
         try:
             # Obtener datos del RUT
@@ -337,7 +338,7 @@ class F29Methods(DTEMethods):
 
         # Verificar y refrescar sesión si es necesario
         logger.info("🔐 Mensajes contribuyente require authentication...")
-        self.verify_session()
+        self._require_browser_session("mensajes_contribuyente")
 
         try:
             # Obtener datos del RUT
@@ -487,7 +488,7 @@ class F29Methods(DTEMethods):
 
         # Verificar y refrescar sesión si es necesario
         logger.info("🔐 Guardar propuesta F29 require authentication...")
-        self.verify_session()
+        self._require_browser_session("guardar_propuesta_f29")
 
         try:
             # Obtener datos del RUT
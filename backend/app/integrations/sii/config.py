@@ -17,6 +17,8 @@ class Config:
 
     # Sesiones
     session_expiry_hours: int = 8
+    session_pool_ttl_seconds: int = 3600  # TTL de cookies en el pool compartido
+    session_verify_ttl_seconds: int = 60  # No re-verificar sesión antes de este tiempo
 
     # Chrome
     chrome_binary: Optional[str] = None
@@ -4,9 +4,12 @@ Componentes core de RPA v3
 from .driver import SeleniumDriver
 from .auth import Authenticator
 from .session import SessionManager
+from .session_pool import SessionPool, get_session_pool
 
 __all__ = [
     'SeleniumDriver',
     'Authenticator',
     'SessionManager',
+    'SessionPool',
+    'get_session_pool',
 ]
@@ -0,0 +1,62 @@
+"""
+Sesión HTTP compartida para las APIs JSON del SII
+
+Un único requests.Session por proceso con pool de conexiones keep-alive
+hacia www4.sii.cl, para que los extractores no abran una conexión TLS
+nueva en cada request.
+
+La sesión NUNCA guarda cookies: cada request envía las cookies del
+contribuyente en el header Cookie, y bloquear el cookie jar evita que
+un Set-Cookie de una empresa se filtre a los requests de otra.
+"""
+import http.cookiejar
+import logging
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 20
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def _create_http_session(pool_size: int) -> requests.Session:
+    """Crea la sesión con pool de conexiones y reintentos de conexión"""
+    session = requests.Session()
+
+    # No persistir cookies entre requests (ver docstring del módulo)
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+    # Reintentar solo errores de conexión; los errores HTTP los maneja cada extractor
+    retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Obtiene la sesión HTTP compartida del proceso
+
+    Tamaño del pool configurable con SII_HTTP_POOL_SIZE (default: 20).
+
+    Returns:
+        requests.Session compartida
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                pool_size = int(os.getenv("SII_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+                _http_session = _create_http_session(pool_size)
+                logger.debug(f"🌐 SII HTTP session created (pool={pool_size})")
+    return _http_session
@@ -0,0 +1,197 @@
+"""
+Pool de sesiones SII compartido entre procesos
+
+Guarda las cookies autenticadas del SII (TOKEN, etc.) por RUT en Redis,
+cifradas con Fernet y con TTL, para que llamadas sucesivas (workers de
+Celery, routers /sii/*) reutilicen la sesión sin levantar Chrome ni hacer
+login con Selenium.
+
+Si Redis no está disponible se usa un almacenamiento en memoria del
+proceso, con la misma semántica de TTL.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..config import config as default_config
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "sii:session:"
+
+
+def normalize_tax_id(tax_id: str) -> str:
+    """
+    Normaliza un RUT para usarlo como llave del pool
+
+    Args:
+        tax_id: RUT en cualquier formato (12.345.678-9, 12345678-9, 123456789)
+
+    Returns:
+        RUT en formato 12345678-9 (DV en mayúscula)
+    """
+    clean = tax_id.replace(".", "").replace(" ", "").upper()
+    if "-" not in clean:
+        clean = f"{clean[:-1]}-{clean[-1:]}"
+    return clean
+
+
+class SessionPool:
+    """
+    Pool de cookies SII por RUT con TTL y cifrado.
+
+    Las cookies se serializan a JSON y se cifran con la misma llave derivada
+    que usamos para las contraseñas SII (app.utils.encryption).
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl_seconds: Optional[int] = None):
+        """
+        Inicializa el pool
+
+        Args:
+            redis_url: URL de Redis (default: SII_SESSION_REDIS_URL o REDIS_URL)
+            ttl_seconds: Vida máxima de una sesión en el pool
+                        (default: config.session_pool_ttl_seconds)
+        """
+        self.redis_url = (
+            redis_url
+            or os.getenv("SII_SESSION_REDIS_URL")
+            or os.getenv("REDIS_URL")
+        )
+        self.ttl_seconds = ttl_seconds or default_config.session_pool_ttl_seconds
+
+        from app.utils.redis_client import LazyRedis
+
+        self._redis = LazyRedis(self.redis_url, "SII session pool", "using memory")
+        self._fernet = None
+
+        # Fallback en memoria: {tax_id: (expires_at, cookies)}
+        self._memory: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._lock = threading.Lock()
+
+    # ==========================================
+    # BACKENDS
+    # ==========================================
+
+    def _get_fernet(self):
+        """Obtiene el cifrador Fernet (llave derivada de SUPABASE_JWT_SECRET)"""
+        if self._fernet is None:
+            from cryptography.fernet import Fernet
+
+            from app.utils.encryption import get_encryption_key
+
+            self._fernet = Fernet(get_encryption_key())
+        return self._fernet
+
+    # ==========================================
+    # API PÚBLICA
+    # ==========================================
+
+    def get(self, tax_id: str) -> Optional[List[Dict]]:
+        """
+        Obtiene las cookies guardadas para un RUT
+
+        Args:
+            tax_id: RUT del contribuyente
+
+        Returns:
+            Lista de cookies o None si no hay sesión (o expiró)
+        """
+        key = normalize_tax_id(tax_id)
+        client = self._redis.get()
+
+        if client is not None:
+            try:
+                token = client.get(KEY_PREFIX + key)
+                if not token:
+                    return None
+                payload = self._get_fernet().decrypt(token)
+                cookies = json.loads(payload)
+                logger.debug(f"🍪 Pooled session found for {key} ({len(cookies)} cookies)")
+                return cookies
+            except Exception as e:
+                logger.warning(f"⚠️ Could not read pooled session for {key}: {e}")
+                return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if not entry:
+                return None
+            expires_at, cookies = entry
+            if time.time() >= expires_at:
+                del self._memory[key]
+                return None
+            return cookies
+
+    def save(self, tax_id: str, cookies: List[Dict], ttl_seconds: Optional[int] = None) -> None:
+        """
+        Guarda (o reemplaza) las cookies de un RUT
+
+        Args:
+            tax_id: RUT del contribuyente
+            cookies: Cookies autenticadas
+            ttl_seconds: TTL específico (default: self.ttl_seconds)
+        """
+        if not cookies:
+            return
+
+        key = normalize_tax_id(tax_id)
+        ttl = ttl_seconds or self.ttl_seconds
+        client = self._redis.get()
+
+        if client is not None:
+            try:
+                token = self._get_fernet().encrypt(json.dumps(cookies).encode("utf-8"))
+                client.set(KEY_PREFIX + key, token, ex=ttl)
+                logger.debug(f"💾 Pooled session saved for {key} (ttl={ttl}s)")
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Could not save pooled session for {key}: {e}")
+                return
+
+        with self._lock:
+            self._memory[key] = (time.time() + ttl, cookies)
+
+    def invalidate(self, tax_id: str) -> None:
+        """
+        Elimina la sesión de un RUT (cookies expiradas o rechazadas)
+
+        Args:
+            tax_id: RUT del contribuyente
+        """
+        key = normalize_tax_id(tax_id)
+        client = self._redis.get()
+
+        if client is not None:
+            try:
+                client.delete(KEY_PREFIX + key)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not invalidate pooled session for {key}: {e}")
+        else:
+            with self._lock:
+                self._memory.pop(key, None)
+
+        logger.debug(f"🗑️ Pooled session invalidated for {key}")
+
+
+# Instancia global (una por proceso)
+_session_pool: Optional[SessionPool] = None
+_session_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """
+    Obtiene el pool de sesiones singleton del proceso
+
+    Returns:
+        Instancia de SessionPool
+    """
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                _session_pool = SessionPool()
+    return _session_pool
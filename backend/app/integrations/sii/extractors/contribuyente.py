@@ -6,6 +6,7 @@ import requests
 from typing import Dict, Any, List
 
 from ..core import SeleniumDriver
+from ..core.http_session import get_http_session
 from ..exceptions import ExtractionError
 
 logger = logging.getLogger(__name__)
@@ -149,7 +150,7 @@ class ContribuyenteExtractor:
 
         try:
             logger.info(f"🌐 [API Request] POST to {self.MISIIR_API_URL} (opc={opc})")
-            response = requests.post(
+            response = get_http_session().post(
                 self.MISIIR_API_URL,
                 data=payload,
                 headers=headers,
@@ -7,6 +7,7 @@ import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from ..core.http_session import get_http_session
 from ..exceptions import ExtractionError
 
 logger = logging.getLogger(__name__)
@@ -17,19 +18,21 @@ class DTEExtractor:
     Extrae documentos tributarios electrónicos vía API del SII.
 
     Usa cookies directamente sin dependencia de base de datos.
-    Solo llamadas HTTP a la API del SII.
+    Solo llamadas HTTP a la API del SII (sesión HTTP compartida con keep-alive).
     """
 
     BASE_URL = "https://www4.sii.cl/consdcvinternetui/services/data/facadeService"
 
-    def __init__(self, tax_id: str):
+    def __init__(self, tax_id: str, http: Optional[requests.Session] = None):
         """
         Inicializa el extractor de DTEs
 
         Args:
             tax_id: RUT del contribuyente (formato: 12345678-9 o 12345678k)
+            http: Sesión HTTP a usar (default: sesión compartida del proceso)
         """
         self.tax_id = tax_id
+        self._http = http or get_http_session()
 
         # Extraer RUT y DV (soporta formato con o sin guión)
         if '-' in tax_id:
@@ -290,7 +293,7 @@ class DTEExtractor:
         try:
             logger.debug(f"🌐 Making API request to {url}")
             logger.debug(f"📦 Payload: {payload}")
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self._http.post(url, json=payload, headers=headers, timeout=30)
 
             # Log response for debugging
             logger.debug(f"📥 Response status: {response.status_code}")
@@ -379,7 +382,7 @@ class DTEExtractor:
                 payload["data"]["busquedaInicial"] = True
 
             logger.debug(f"🌐 Getting {operacion} summary for period {periodo_tributario}")
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self._http.post(url, json=payload, headers=headers, timeout=30)
             response.raise_for_status()
 
             result = response.json()
@@ -473,7 +476,7 @@ class DTEExtractor:
 
             logger.debug(f"🌐 Making API request to {url}")
             logger.debug(f"📦 Payload: {payload}")
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self._http.post(url, json=payload, headers=headers, timeout=30)
 
             # Log response for debugging
             logger.debug(f"📥 Response status: {response.status_code}")
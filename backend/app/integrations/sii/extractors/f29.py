@@ -8,6 +8,7 @@ from typing import List, Dict, Any, Optional
 
 from ..scrapers.f29 import F29Scraper
 from ..core import SeleniumDriver
+from ..core.http_session import get_http_session
 from ..exceptions import ExtractionError
 
 logger = logging.getLogger(__name__)
@@ -147,7 +148,8 @@ class F29Extractor:
                 'Accept': 'application/pdf'
             }
 
-            response = requests.get(url, cookies=cookies_dict, headers=headers, timeout=30)
+            # Sesión compartida: reutiliza conexiones keep-alive en descargas en lote
+            response = get_http_session().get(url, cookies=cookies_dict, headers=headers, timeout=30)
 
             # Verificar respuesta exitosa
             if response.status_code != 200:
@@ -49,6 +49,21 @@ app.include_router(chat.router, prefix="/api", tags=["Chat"])  # Chat for Expo
 app.include_router(whatsapp_router)  # WhatsApp router (authenticated) - includes own prefix
 app.include_router(whatsapp_webhook_router)  # WhatsApp webhook router (HMAC auth) - includes own prefix
 
+@app.on_event("shutdown")
+async def shutdown_query_executor():
+    from app.repositories.base import shutdown_query_executor as _shutdown
+    _shutdown(wait=False)
+
+@app.on_event("shutdown")
+async def close_kapso_http_client():
+    from app.integrations.kapso.api.base import close_http_clients
+    await close_http_clients()
+
+@app.on_event("shutdown")
+async def close_conversation_store():
+    from app.services.chat.conversation_store import close_conversation_store as _close
+    _close()
+
 @app.get("/")
 async def root():
     return {
@@ -70,3 +85,13 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
+
+@app.get("/health/caches")
+async def health_caches():
+    from app.utils.cache import get_cache_stats
+    return {"caches": get_cache_stats()}
+
+@app.get("/health/router")
+async def health_router():
+    from app.agents.orchestration.query_router import query_router
+    return query_router.get_stats()
@@ -8,7 +8,8 @@ Architecture:
 - Each repository handles queries for a specific domain
 - BaseRepository provides common functionality and error handling
 - Repositories receive a Supabase client instance at initialization
-- All methods use async/await for consistency
+- All methods are async; queries run via BaseRepository._execute on a bounded
+  thread pool so blocking supabase-py calls never stall the event loop
 
 Usage:
     from app.repositories import ContactsRepository
@@ -2,16 +2,143 @@
 Base Repository - Common functionality for all repositories.
 
 Provides shared Supabase client access and error handling patterns.
+
+supabase-py's query builders are synchronous: ``.execute()`` performs a
+blocking HTTP request. Repository methods are ``async`` so they must never
+call ``.execute()`` inline - doing so stalls the event loop (and every
+concurrent ChatKit stream) for the duration of the PostgREST round trip.
+Use ``await self._execute(query)`` instead, which offloads the request to a
+bounded thread pool shared by all repositories in the process.
 """
 
+import asyncio
+import json
 import logging
-from typing import Any, TYPE_CHECKING
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from supabase import Client
 
 logger = logging.getLogger(__name__)
 
+# Max number of PostgREST requests in flight per process. Extra queries
+# wait in the executor queue instead of opening more connections.
+DEFAULT_QUERY_CONCURRENCY = 16
+
+# Bulk upsert batch limits (rows and serialized JSON bytes per request)
+DEFAULT_UPSERT_MAX_ROWS = 500
+DEFAULT_UPSERT_MAX_BYTES = 1_000_000
+
+_query_executor: ThreadPoolExecutor | None = None
+_query_executor_lock = threading.Lock()
+
+
+def get_query_executor() -> ThreadPoolExecutor:
+    """
+    Get the process-wide executor used to run Supabase queries.
+
+    Sized by SUPABASE_QUERY_CONCURRENCY (default: 16).
+
+    Returns:
+        Shared ThreadPoolExecutor instance
+    """
+    global _query_executor
+    if _query_executor is None:
+        with _query_executor_lock:
+            if _query_executor is None:
+                max_workers = int(
+                    os.getenv("SUPABASE_QUERY_CONCURRENCY", DEFAULT_QUERY_CONCURRENCY)
+                )
+                _query_executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="supabase-query",
+                )
+                logger.info(f"Supabase query executor started ({max_workers} workers)")
+    return _query_executor
+
+
+def shutdown_query_executor(wait: bool = True) -> None:
+    """
+    Shut down the shared query executor (e.g. on application shutdown).
+
+    A new executor is created lazily if queries are issued afterwards.
+
+    Args:
+        wait: Whether to wait for in-flight queries to finish
+    """
+    global _query_executor
+    with _query_executor_lock:
+        if _query_executor is not None:
+            _query_executor.shutdown(wait=wait)
+            _query_executor = None
+
+
+def chunk_rows(
+    rows: list[dict[str, Any]],
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Split rows into batches bounded by row count and serialized size.
+
+    Args:
+        rows: Rows to split
+        max_rows: Max rows per batch (default: SUPABASE_UPSERT_MAX_ROWS or 500)
+        max_bytes: Max JSON bytes per batch (default: SUPABASE_UPSERT_MAX_BYTES or 1MB)
+
+    Yields:
+        Consecutive, non-empty batches of rows
+    """
+    if max_rows is None:
+        max_rows = int(os.getenv("SUPABASE_UPSERT_MAX_ROWS", DEFAULT_UPSERT_MAX_ROWS))
+    if max_bytes is None:
+        max_bytes = int(os.getenv("SUPABASE_UPSERT_MAX_BYTES", DEFAULT_UPSERT_MAX_BYTES))
+
+    batch: list[dict[str, Any]] = []
+    batch_bytes = 0
+    for row in rows:
+        row_bytes = len(json.dumps(row, default=str))
+        if batch and (len(batch) >= max_rows or batch_bytes + row_bytes > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(row)
+        batch_bytes += row_bytes
+
+    if batch:
+        yield batch
+
+
+def dedupe_on_conflict(
+    rows: list[dict[str, Any]],
+    conflict_columns: list[str],
+) -> list[dict[str, Any]]:
+    """
+    Keep one row per conflict key, the last one wins.
+
+    A single INSERT ... ON CONFLICT DO UPDATE cannot touch the same row twice,
+    so rows sharing the key (e.g. a factura and a nota de crédito with the same
+    folio) are collapsed the way sequential upserts would leave them. Rows with
+    a NULL in the key never conflict and are all kept.
+
+    Args:
+        rows: Rows to upsert
+        conflict_columns: Unique constraint columns
+
+    Returns:
+        Rows in first-seen order, each holding the values of its last duplicate
+    """
+    unique: dict[Any, dict[str, Any]] = {}
+    for index, row in enumerate(rows):
+        key = tuple(row.get(column) for column in conflict_columns)
+        if any(value is None for value in key):
+            key = ("__null__", index)
+        unique[key] = row
+    return list(unique.values())
+
 
 class BaseRepository:
     """Base class for all Supabase repositories."""
@@ -25,6 +152,19 @@ class BaseRepository:
         """
         self._client = client
 
+    async def _execute(self, query: Any) -> Any:
+        """
+        Execute a Supabase query builder without blocking the event loop.
+
+        Args:
+            query: Any supabase-py builder exposing a synchronous .execute()
+
+        Returns:
+            The Supabase response object
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_query_executor(), query.execute)
+
     def _log_error(self, operation: str, error: Exception, **context: Any) -> None:
         """
         Log repository errors with context.
@@ -83,3 +223,113 @@ class BaseRepository:
         else:
             logger.warning(f"Unexpected response format in {operation}: {type(response)}")
             return []
+
+    async def _upsert_with_counts(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        on_conflict: str,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+    ) -> tuple[int, int]:
+        """
+        Upsert rows and count inserted vs updated, one round trip per batch.
+
+        Rows are split with chunk_rows() and sent to the
+        bulk_upsert_with_counts RPC, which reports the counts from the
+        ON CONFLICT ... RETURNING clause. If the RPC is not deployed yet,
+        falls back to the SELECT-then-upsert path. Rows repeating a conflict
+        key are collapsed first (see dedupe_on_conflict) and the dropped
+        duplicates count as updated, as they would with one upsert per row.
+
+        Args:
+            table: Target table (must be allowed by the RPC)
+            rows: Rows to upsert (all for the same company)
+            on_conflict: Comma-separated unique constraint columns
+            max_rows: Max rows per batch (see chunk_rows)
+            max_bytes: Max JSON bytes per batch (see chunk_rows)
+
+        Returns:
+            Tuple of (newly_created_count, updated_count)
+
+        Raises:
+            Exception: Propagates database errors to the calling repository
+        """
+        conflict_columns = [column.strip() for column in on_conflict.split(",")]
+        unique_rows = dedupe_on_conflict(rows, conflict_columns)
+        nuevos = 0
+        actualizados = len(rows) - len(unique_rows)
+
+        for batch in chunk_rows(unique_rows, max_rows=max_rows, max_bytes=max_bytes):
+            try:
+                response = await self._execute(
+                    self._client.rpc(
+                        "bulk_upsert_with_counts",
+                        {
+                            "p_table": table,
+                            "p_conflict_columns": conflict_columns,
+                            "p_rows": json.loads(json.dumps(batch, default=str)),
+                        },
+                    )
+                )
+                counts = self._extract_data(response, "bulk_upsert_with_counts") or {}
+                nuevos += counts.get("inserted", 0) or 0
+                actualizados += counts.get("updated", 0) or 0
+            except Exception as e:
+                if "PGRST202" not in str(e) and "Could not find the function" not in str(e):
+                    raise
+                logger.warning(f"bulk_upsert_with_counts RPC unavailable, using fallback: {e}")
+                batch_nuevos, batch_actualizados = await self._upsert_with_lookup(
+                    table, batch, conflict_columns
+                )
+                nuevos += batch_nuevos
+                actualizados += batch_actualizados
+
+        return nuevos, actualizados
+
+    async def _upsert_with_lookup(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        conflict_columns: list[str],
+    ) -> tuple[int, int]:
+        """
+        Fallback for _upsert_with_counts: SELECT existing keys, then upsert.
+
+        Args:
+            table: Target table
+            rows: One batch of rows (all for the same company)
+            conflict_columns: Unique constraint columns (company_id first)
+
+        Returns:
+            Tuple of (newly_created_count, updated_count)
+        """
+        key_columns = [column for column in conflict_columns if column != "company_id"]
+        lookup_column = key_columns[0]
+        lookup_values = list({row[lookup_column] for row in rows if row.get(lookup_column) is not None})
+
+        existing_keys: set[tuple[Any, ...]] = set()
+        if lookup_values:
+            response = await self._execute(
+                self._client
+                .table(table)
+                .select(",".join(key_columns))
+                .eq("company_id", rows[0]["company_id"])
+                .in_(lookup_column, lookup_values)
+            )
+            existing_keys = {
+                tuple(row.get(column) for column in key_columns)
+                for row in self._extract_data_list(response, "upsert_with_lookup")
+            }
+
+        nuevos = sum(
+            1 for row in rows
+            if tuple(row.get(column) for column in key_columns) not in existing_keys
+        )
+
+        await self._execute(
+            self._client
+            .table(table)
+            .upsert(rows, on_conflict=",".join(conflict_columns))
+        )
+        return nuevos, len(rows) - nuevos
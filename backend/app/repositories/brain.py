@@ -37,14 +37,13 @@ class UserBrainRepository(BaseRepository):
             UserBrain record or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("user_brain")
                 .select("*")
                 .eq("user_id", user_id)
                 .eq("slug", slug)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_user_and_slug")
         except Exception as e:
@@ -62,13 +61,12 @@ class UserBrainRepository(BaseRepository):
             UserBrain record or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("user_brain")
                 .select("*")
                 .eq("memory_id", memory_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_memory_id")
         except Exception as e:
@@ -86,13 +84,12 @@ class UserBrainRepository(BaseRepository):
             List of UserBrain records
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("user_brain")
                 .select("*")
                 .eq("user_id", user_id)
                 .order("created_at", desc=True)
-                .execute()
             )
             return self._extract_data_list(response, "get_all_by_user")
         except Exception as e:
@@ -128,11 +125,10 @@ class UserBrainRepository(BaseRepository):
                 "content": content,
                 "extra_metadata": extra_metadata or {}
             }
-            response = (
+            response = await self._execute(
                 self._client
                 .table("user_brain")
                 .insert(data)
-                .execute()
             )
             return self._extract_data(response, "create")
         except Exception as e:
@@ -171,12 +167,11 @@ class UserBrainRepository(BaseRepository):
                 logger.warning("No fields to update")
                 return None
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("user_brain")
                 .update(update_data)
                 .eq("id", id)
-                .execute()
             )
             return self._extract_data(response, "update")
         except Exception as e:
@@ -194,12 +189,11 @@ class UserBrainRepository(BaseRepository):
             Number of deleted records
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("user_brain")
                 .delete()
                 .eq("user_id", user_id)
-                .execute()
             )
             data = self._extract_data_list(response, "delete_all_by_user")
             return len(data)
@@ -230,14 +224,13 @@ class CompanyBrainRepository(BaseRepository):
             CompanyBrain record or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("company_brain")
                 .select("*")
                 .eq("company_id", company_id)
                 .eq("slug", slug)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_company_and_slug")
         except Exception as e:
@@ -255,13 +248,12 @@ class CompanyBrainRepository(BaseRepository):
             CompanyBrain record or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("company_brain")
                 .select("*")
                 .eq("memory_id", memory_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_memory_id")
         except Exception as e:
@@ -279,13 +271,12 @@ class CompanyBrainRepository(BaseRepository):
             List of CompanyBrain records
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("company_brain")
                 .select("*")
                 .eq("company_id", company_id)
                 .order("created_at", desc=True)
-                .execute()
             )
             return self._extract_data_list(response, "get_all_by_company")
         except Exception as e:
@@ -321,11 +312,10 @@ class CompanyBrainRepository(BaseRepository):
                 "content": content,
                 "extra_metadata": extra_metadata or {}
             }
-            response = (
+            response = await self._execute(
                 self._client
                 .table("company_brain")
                 .insert(data)
-                .execute()
             )
             return self._extract_data(response, "create")
         except Exception as e:
@@ -364,12 +354,11 @@ class CompanyBrainRepository(BaseRepository):
                 logger.warning("No fields to update")
                 return None
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("company_brain")
                 .update(update_data)
                 .eq("id", id)
-                .execute()
             )
             return self._extract_data(response, "update")
         except Exception as e:
@@ -387,12 +376,11 @@ class CompanyBrainRepository(BaseRepository):
             Number of deleted records
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("company_brain")
                 .delete()
                 .eq("company_id", company_id)
-                .execute()
             )
             data = self._extract_data_list(response, "delete_all_by_company")
             return len(data)
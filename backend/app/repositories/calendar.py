@@ -32,13 +32,12 @@ class CalendarRepository(BaseRepository):
             List of company_events with embedded event_template data
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table('company_events')
                 .select('*, event_template:event_templates(*)')
                 .eq('company_id', company_id)
                 .eq('is_active', True)
-                .execute()
             )
             return self._extract_data_list(response, "get_active_company_events")
         except Exception as e:
@@ -59,13 +58,12 @@ class CalendarRepository(BaseRepository):
             Company event dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table('company_events')
                 .select('*, event_template:event_templates(*)')
                 .eq('id', company_event_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_company_event_by_id")
         except Exception as e:
@@ -80,12 +78,11 @@ class CalendarRepository(BaseRepository):
             List of mandatory event templates
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table('event_templates')
                 .select('*')
                 .eq('is_mandatory', True)
-                .execute()
             )
             return self._extract_data_list(response, "get_mandatory_event_templates")
         except Exception as e:
@@ -103,12 +100,11 @@ class CalendarRepository(BaseRepository):
             List of event templates
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table('event_templates')
                 .select('*')
                 .in_('id', template_ids)
-                .execute()
             )
             return self._extract_data_list(response, "get_event_templates_by_ids")
         except Exception as e:
@@ -129,12 +125,11 @@ class CalendarRepository(BaseRepository):
             List of company_events
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table('company_events')
                 .select('*')
                 .eq('company_id', company_id)
-                .execute()
             )
             return self._extract_data_list(response, "get_existing_company_events_by_company")
         except Exception as e:
@@ -165,11 +160,10 @@ class CalendarRepository(BaseRepository):
                 'is_active': is_active
             }
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table('company_events')
                 .insert(event_data)
-                .execute()
             )
 
             data = self._extract_data_list(response, "create_company_event")
@@ -203,7 +197,7 @@ class CalendarRepository(BaseRepository):
             List of calendar events ordered by due_date
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table('calendar_events')
                 .select('*')
@@ -211,7 +205,6 @@ class CalendarRepository(BaseRepository):
                 .in_('status', ['pending', 'in_progress', 'overdue'])
                 .gte('due_date', from_date.isoformat())
                 .order('due_date', desc=False)
-                .execute()
             )
             return self._extract_data_list(response, "get_existing_calendar_events")
         except Exception as e:
@@ -262,11 +255,10 @@ class CalendarRepository(BaseRepository):
                 'auto_generated': auto_generated
             }
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table('calendar_events')
                 .insert(event_data)
-                .execute()
             )
 
             data = self._extract_data_list(response, "create_calendar_event")
@@ -296,12 +288,11 @@ class CalendarRepository(BaseRepository):
             Updated calendar event dict or None on error
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table('calendar_events')
                 .update({'status': status})
                 .eq('id', event_id)
-                .execute()
             )
 
             data = self._extract_data_list(response, "update_calendar_event_status")
@@ -324,12 +315,11 @@ class CalendarRepository(BaseRepository):
         """
         try:
             # Get distinct company_ids from active company_events
-            response = (
+            response = await self._execute(
                 self._client
                 .table('company_events')
                 .select('company_id')
                 .eq('is_active', True)
-                .execute()
             )
 
             # Get unique company IDs
@@ -339,12 +329,11 @@ class CalendarRepository(BaseRepository):
                 return []
 
             # Fetch company details
-            companies_response = (
+            companies_response = await self._execute(
                 self._client
                 .table('companies')
                 .select('*')
                 .in_('id', company_ids)
-                .execute()
             )
 
             return self._extract_data_list(companies_response, "get_all_companies_with_active_events")
@@ -387,13 +376,12 @@ class CalendarRepository(BaseRepository):
 
             select_query = ", ".join(select_parts)
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("calendar_events")
                 .select(select_query)
                 .eq("id", event_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_event_by_id")
         except Exception as e:
@@ -436,7 +424,7 @@ class CalendarRepository(BaseRepository):
 
             query = query.order("due_date", desc=False).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_events_by_company")
         except Exception as e:
             self._log_error(
@@ -468,7 +456,7 @@ class CalendarRepository(BaseRepository):
         try:
             # This would ideally use a date range filter
             # For now, fetch pending events sorted by due_date
-            response = (
+            response = await self._execute(
                 self._client
                 .table("calendar_events")
                 .select("*, event_templates(*)")
@@ -476,7 +464,6 @@ class CalendarRepository(BaseRepository):
                 .eq("status", "pending")
                 .order("due_date", desc=False)
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_upcoming_events")
         except Exception as e:
@@ -501,13 +488,12 @@ class CalendarRepository(BaseRepository):
             Event template dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("event_templates")
                 .select("*")
                 .eq("code", template_code)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_event_template_by_code")
         except Exception as e:
@@ -522,12 +508,11 @@ class CalendarRepository(BaseRepository):
             List of event template dicts
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("event_templates")
                 .select("*")
                 .order("code")
-                .execute()
             )
             return self._extract_data_list(response, "get_all_event_templates")
         except Exception as e:
@@ -545,13 +530,12 @@ class CalendarRepository(BaseRepository):
             List of task dicts
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("event_tasks")
                 .select("*")
                 .eq("event_id", event_id)
                 .order("created_at")
-                .execute()
             )
             return self._extract_data_list(response, "get_event_tasks")
         except Exception as e:
@@ -572,14 +556,13 @@ class CalendarRepository(BaseRepository):
             List of history dicts
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("event_history")
                 .select("*")
                 .eq("event_id", event_id)
                 .order("created_at", desc=True)
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_event_history")
         except Exception as e:
@@ -611,7 +594,7 @@ class CalendarRepository(BaseRepository):
 
             template_id = template.get("id")
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("calendar_events")
                 .select("*")
@@ -619,7 +602,6 @@ class CalendarRepository(BaseRepository):
                 .eq("template_id", template_id)
                 .order("due_date", desc=True)
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_events_by_template")
         except Exception as e:
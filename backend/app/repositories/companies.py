@@ -32,13 +32,12 @@ class CompaniesRepository(BaseRepository):
             if include_tax_info:
                 select_str = "*, company_tax_info(*)"
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("companies")
                 .select(select_str)
                 .eq("id", company_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_id")
         except Exception as e:
@@ -58,13 +57,12 @@ class CompaniesRepository(BaseRepository):
             Company settings dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("company_settings")
                 .select("*")
                 .eq("company_id", company_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_company_settings")
         except Exception as e:
@@ -82,13 +80,12 @@ class CompaniesRepository(BaseRepository):
             Company dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("companies")
                 .select("*")
                 .eq("rut", rut)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_rut")
         except Exception as e:
@@ -106,13 +103,12 @@ class CompaniesRepository(BaseRepository):
             List of company dicts
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("companies")
                 .select("*")
                 .order("name")
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_all")
         except Exception as e:
@@ -133,13 +129,12 @@ class CompaniesRepository(BaseRepository):
             List of matching company dicts
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("companies")
                 .select("*")
                 .ilike("name", f"%{query}%")
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "search_by_name")
         except Exception as e:
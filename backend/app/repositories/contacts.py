@@ -27,14 +27,13 @@ class ContactsRepository(BaseRepository):
             Contact dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("contacts")
                 .select("*")
                 .eq("company_id", company_id)
                 .eq("rut", rut)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_rut")
         except Exception as e:
@@ -52,13 +51,12 @@ class ContactsRepository(BaseRepository):
             Contact dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("contacts")
                 .select("*")
                 .eq("id", contact_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_id")
         except Exception as e:
@@ -79,12 +77,11 @@ class ContactsRepository(BaseRepository):
         """
         try:
             # Use RPC function if available, otherwise aggregate in Python
-            response = (
+            response = await self._execute(
                 self._client
                 .table("sales_documents")
                 .select("total_amount")
                 .eq("contact_id", contact_id)
-                .execute()
             )
 
             data = self._extract_data_list(response, "get_sales_summary")
@@ -113,12 +110,11 @@ class ContactsRepository(BaseRepository):
             Dict with total_amount and document_count, or None if error
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("purchase_documents")
                 .select("total_amount")
                 .eq("contact_id", contact_id)
-                .execute()
             )
 
             data = self._extract_data_list(response, "get_purchase_summary")
@@ -135,7 +131,11 @@ class ContactsRepository(BaseRepository):
             return None
 
     async def get_top_clients(
-        self, company_id: str, limit: int = 5
+        self,
+        company_id: str,
+        limit: int = 5,
+        period_start: str | None = None,
+        period_end: str | None = None
     ) -> list[dict[str, Any]]:
         """
         Get top clients by total sales amount.
@@ -143,55 +143,36 @@ class ContactsRepository(BaseRepository):
         Args:
             company_id: Company UUID
             limit: Number of top clients to return
+            period_start: Optional start date (YYYY-MM-DD format)
+            period_end: Optional end date (YYYY-MM-DD format, exclusive)
 
         Returns:
             List of contact dicts with total_sales field
         """
         try:
-            # This requires a view or RPC function in Supabase
-            # For now, we'll fetch all sales and aggregate in Python
-            response = (
-                self._client
-                .table("sales_documents")
-                .select("contact_id, total_amount, contacts!inner(id, name, rut)")
-                .eq("contacts.company_id", company_id)
-                .execute()
+            data = await self._get_top_contacts(
+                "sales_documents", company_id, limit, period_start, period_end
             )
-
-            data = self._extract_data_list(response, "get_top_clients")
-            if not data:
-                return []
-
-            # Aggregate by contact
-            client_totals: dict[str, dict[str, Any]] = {}
-            for doc in data:
-                contact = doc.get("contacts")
-                if not contact:
-                    continue
-
-                contact_id = contact.get("id")
-                if contact_id not in client_totals:
-                    client_totals[contact_id] = {
-                        **contact,
-                        "total_sales": 0
-                    }
-
-                client_totals[contact_id]["total_sales"] += doc.get("total_amount", 0) or 0
-
-            # Sort by total sales and limit
-            top_clients = sorted(
-                client_totals.values(),
-                key=lambda x: x["total_sales"],
-                reverse=True
-            )[:limit]
-
-            return top_clients
+            return [
+                {
+                    "id": row.get("id"),
+                    "name": row.get("name"),
+                    "rut": row.get("rut"),
+                    "total_sales": float(row.get("total_amount") or 0),
+                    "document_count": int(row.get("document_count") or 0)
+                }
+                for row in data
+            ]
         except Exception as e:
             self._log_error("get_top_clients", e, company_id=company_id, limit=limit)
             return []
 
     async def get_top_providers(
-        self, company_id: str, limit: int = 5
+        self,
+        company_id: str,
+        limit: int = 5,
+        period_start: str | None = None,
+        period_end: str | None = None
     ) -> list[dict[str, Any]]:
         """
         Get top providers by total purchase amount.
@@ -199,51 +180,58 @@ class ContactsRepository(BaseRepository):
         Args:
             company_id: Company UUID
             limit: Number of top providers to return
+            period_start: Optional start date (YYYY-MM-DD format)
+            period_end: Optional end date (YYYY-MM-DD format, exclusive)
 
         Returns:
             List of contact dicts with total_purchases field
         """
         try:
-            response = (
-                self._client
-                .table("purchase_documents")
-                .select("contact_id, total_amount, contacts!inner(id, name, rut)")
-                .eq("contacts.company_id", company_id)
-                .execute()
+            data = await self._get_top_contacts(
+                "purchase_documents", company_id, limit, period_start, period_end
             )
-
-            data = self._extract_data_list(response, "get_top_providers")
-            if not data:
-                return []
-
-            # Aggregate by contact
-            provider_totals: dict[str, dict[str, Any]] = {}
-            for doc in data:
-                contact = doc.get("contacts")
-                if not contact:
-                    continue
-
-                contact_id = contact.get("id")
-                if contact_id not in provider_totals:
-                    provider_totals[contact_id] = {
-                        **contact,
-                        "total_purchases": 0
-                    }
-
-                provider_totals[contact_id]["total_purchases"] += doc.get("total_amount", 0) or 0
-
-            # Sort by total purchases and limit
-            top_providers = sorted(
-                provider_totals.values(),
-                key=lambda x: x["total_purchases"],
-                reverse=True
-            )[:limit]
-
-            return top_providers
+            return [
+                {
+                    "id": row.get("id"),
+                    "name": row.get("name"),
+                    "rut": row.get("rut"),
+                    "total_purchases": float(row.get("total_amount") or 0),
+                    "document_count": int(row.get("document_count") or 0)
+                }
+                for row in data
+            ]
         except Exception as e:
             self._log_error("get_top_providers", e, company_id=company_id, limit=limit)
             return []
 
+    async def _get_top_contacts(
+        self,
+        table: str,
+        company_id: str,
+        limit: int,
+        period_start: str | None,
+        period_end: str | None
+    ) -> list[dict[str, Any]]:
+        """
+        Rank contacts by document total in the database (get_top_contacts RPC).
+
+        Grouping, ordering and the limit all happen server-side, so only
+        `limit` rows come back regardless of the company's history.
+        """
+        response = await self._execute(
+            self._client.rpc(
+                "get_top_contacts",
+                {
+                    "p_table": table,
+                    "p_company_id": company_id,
+                    "p_limit": limit,
+                    "p_period_start": period_start,
+                    "p_period_end": period_end,
+                },
+            )
+        )
+        return self._extract_data_list(response, f"get_top_contacts_{table}")
+
     async def upsert_contact(
         self,
         company_id: str,
@@ -273,14 +261,13 @@ class ContactsRepository(BaseRepository):
                 "contact_type": contact_type
             }
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("contacts")
                 .upsert(
                     contact_data,
                     on_conflict="company_id,rut"
                 )
-                .execute()
             )
 
             result = self._extract_data(response, "upsert_contact")
@@ -296,3 +283,93 @@ class ContactsRepository(BaseRepository):
                 business_name=business_name
             )
             return None
+
+    async def bulk_upsert_contacts(
+        self,
+        company_id: str,
+        contacts: dict[str, str],
+        contact_type: str,
+        chunk_size: int = 200
+    ) -> dict[str, str]:
+        """
+        Resolve many contacts in a constant number of round trips.
+
+        Looks up the existing contacts with one in_() query per chunk, then
+        upserts only the new or changed ones in a single multi-row request.
+        A contact already stored with a different type becomes 'both'.
+
+        Args:
+            company_id: Company UUID
+            contacts: Mapping of RUT -> business name (already deduplicated)
+            contact_type: Type of contact ('provider' or 'client')
+            chunk_size: Max RUTs per in_() lookup (keeps URLs short)
+
+        Returns:
+            Mapping of RUT -> contact id (RUTs that failed are omitted)
+        """
+        if not contacts:
+            return {}
+
+        ruts = list(contacts)
+        contact_ids: dict[str, str] = {}
+        existing: dict[str, dict[str, Any]] = {}
+
+        try:
+            for i in range(0, len(ruts), chunk_size):
+                response = await self._execute(
+                    self._client
+                    .table("contacts")
+                    .select("id, rut, business_name, contact_type")
+                    .eq("company_id", company_id)
+                    .in_("rut", ruts[i:i + chunk_size])
+                )
+                for row in self._extract_data_list(response, "bulk_upsert_contacts"):
+                    existing[row["rut"]] = row
+
+            rows = []
+            for rut, business_name in contacts.items():
+                current = existing.get(rut)
+                if current is None:
+                    new_type = contact_type
+                elif current.get("contact_type") in (contact_type, "both"):
+                    new_type = current["contact_type"]
+                else:
+                    new_type = "both"
+
+                if (
+                    current is not None
+                    and current.get("business_name") == business_name
+                    and current.get("contact_type") == new_type
+                ):
+                    contact_ids[rut] = current["id"]
+                    continue
+
+                rows.append({
+                    "company_id": company_id,
+                    "rut": rut,
+                    "business_name": business_name,
+                    "contact_type": new_type
+                })
+
+            if rows:
+                response = await self._execute(
+                    self._client
+                    .table("contacts")
+                    .upsert(rows, on_conflict="company_id,rut")
+                )
+                for row in self._extract_data_list(response, "bulk_upsert_contacts"):
+                    contact_ids[row["rut"]] = row["id"]
+
+            logger.debug(
+                f"✅ Resolved {len(contact_ids)} contacts "
+                f"({len(rows)} upserted, {len(contacts) - len(rows)} unchanged)"
+            )
+            return contact_ids
+        except Exception as e:
+            self._log_error(
+                "bulk_upsert_contacts",
+                e,
+                company_id=company_id,
+                contact_count=len(contacts)
+            )
+            return contact_ids
@@ -5,6 +5,8 @@ Documents Repository - Handles sales and purchase document queries.
 import logging
 from typing import Any, Literal
 
+from app.utils.data_version import bump_company_data_version
+
 from .base import BaseRepository
 
 logger = logging.getLogger(__name__)
@@ -31,13 +33,12 @@ class DocumentsRepository(BaseRepository):
             if include_contact:
                 select_query = "*, contacts(*)"
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("sales_documents")
                 .select(select_query)
                 .eq("id", document_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_sales_document")
         except Exception as e:
@@ -62,13 +63,12 @@ class DocumentsRepository(BaseRepository):
             if include_contact:
                 select_query = "*, contacts(*)"
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("purchase_documents")
                 .select(select_query)
                 .eq("id", document_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_purchase_document")
         except Exception as e:
@@ -109,7 +109,7 @@ class DocumentsRepository(BaseRepository):
 
             query = query.order("emission_date", desc=True).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_documents_by_type")
         except Exception as e:
             self._log_error(
@@ -135,14 +135,13 @@ class DocumentsRepository(BaseRepository):
             List of recent sales documents
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("sales_documents")
                 .select("*, contacts(*)")
                 .eq("company_id", company_id)
                 .order("emission_date", desc=True)
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_recent_sales")
         except Exception as e:
@@ -163,14 +162,13 @@ class DocumentsRepository(BaseRepository):
             List of recent purchase documents
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("purchase_documents")
                 .select("*, contacts(*)")
                 .eq("company_id", company_id)
                 .order("emission_date", desc=True)
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_recent_purchases")
         except Exception as e:
@@ -191,14 +189,13 @@ class DocumentsRepository(BaseRepository):
             List of sales documents
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("sales_documents")
                 .select("*")
                 .eq("contact_id", contact_id)
                 .order("emission_date", desc=True)
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_sales_by_contact")
         except Exception as e:
@@ -219,14 +216,13 @@ class DocumentsRepository(BaseRepository):
             List of purchase documents
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("purchase_documents")
                 .select("*")
                 .eq("contact_id", contact_id)
                 .order("emission_date", desc=True)
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_purchases_by_contact")
         except Exception as e:
@@ -283,7 +279,7 @@ class DocumentsRepository(BaseRepository):
                     query = query.lte("issue_date", end_date)
 
                 query = query.order("issue_date", desc=True).limit(limit)
-                response = query.execute()
+                response = await self._execute(query)
                 result["purchase_documents"] = self._extract_data_list(response, "search_purchases")
 
             # Search sales
@@ -305,7 +301,7 @@ class DocumentsRepository(BaseRepository):
                     query = query.lte("issue_date", end_date)
 
                 query = query.order("issue_date", desc=True).limit(limit)
-                response = query.execute()
+                response = await self._execute(query)
                 result["sales_documents"] = self._extract_data_list(response, "search_sales")
 
         except Exception as e:
@@ -336,43 +332,18 @@ class DocumentsRepository(BaseRepository):
             return 0, 0
 
         try:
-            # Get existing documents to count new vs updated
-            company_id = documents[0]["company_id"]
-
-            # Build list of (folio, sender_rut) tuples for matching
-            doc_keys = [(doc["folio"], doc.get("sender_rut")) for doc in documents if doc.get("folio") is not None]
-
-            existing_keys = set()
-            if doc_keys:
-                # Get all purchase documents for this company with matching folios
-                folios = [key[0] for key in doc_keys]
-                response = (
-                    self._client
-                    .table("purchase_documents")
-                    .select("folio,sender_rut")
-                    .eq("company_id", company_id)
-                    .in_("folio", folios)
-                    .execute()
-                )
-                existing_keys = {(doc["folio"], doc.get("sender_rut")) for doc in response.data}
-
-            # Count new vs updated based on (folio, sender_rut) combination
-            nuevos = sum(1 for doc in documents if (doc.get("folio"), doc.get("sender_rut")) not in existing_keys)
-            actualizados = len(documents) - nuevos
-
-            # Supabase upsert (inserts or updates based on unique constraint)
-            # Note: Unique constraint is now (company_id, folio, sender_rut)
-            response = (
-                self._client
-                .table("purchase_documents")
-                .upsert(documents, on_conflict="company_id,folio,sender_rut")
-                .execute()
+            # Single round trip per batch: counts come back from the upsert itself
+            # Note: Unique constraint is (company_id, folio, sender_rut)
+            nuevos, actualizados = await self._upsert_with_counts(
+                "purchase_documents", documents, on_conflict="company_id,folio,sender_rut"
             )
 
             logger.info(
                 f"✅ Upserted {len(documents)} purchase documents: "
                 f"{nuevos} nuevos, {actualizados} actualizados"
             )
+
+            await bump_company_data_version(*{d.get("company_id") for d in documents})
             return nuevos, actualizados
 
         except Exception as e:
@@ -395,38 +366,18 @@ class DocumentsRepository(BaseRepository):
             return 0, 0
 
         try:
-            # Get existing folios to count new vs updated
-            company_id = documents[0]["company_id"]
-            folios = [doc["folio"] for doc in documents if doc.get("folio") is not None]
-
-            existing_folios = set()
-            if folios:
-                response = (
-                    self._client
-                    .table("sales_documents")
-                    .select("folio")
-                    .eq("company_id", company_id)
-                    .in_("folio", folios)
-                    .execute()
-                )
-                existing_folios = {doc["folio"] for doc in response.data}
-
-            # Count new vs updated
-            nuevos = sum(1 for doc in documents if doc.get("folio") not in existing_folios)
-            actualizados = len(documents) - nuevos
-
-            # Supabase upsert (inserts or updates based on unique constraint)
-            response = (
-                self._client
-                .table("sales_documents")
-                .upsert(documents, on_conflict="company_id,folio")
-                .execute()
+            # Single round trip per batch: counts come back from the upsert itself
+            # Note: Unique constraint is (company_id, folio)
+            nuevos, actualizados = await self._upsert_with_counts(
+                "sales_documents", documents, on_conflict="company_id,folio"
             )
 
             logger.info(
                 f"✅ Upserted {len(documents)} sales documents: "
                 f"{nuevos} nuevos, {actualizados} actualizados"
             )
+
+            await bump_company_data_version(*{d.get("company_id") for d in documents})
             return nuevos, actualizados
 
         except Exception as e:
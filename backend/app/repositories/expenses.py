@@ -89,11 +89,10 @@ class ExpensesRepository(BaseRepository):
                 "status": "draft",
             }
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("expenses")
                 .insert(data)
-                .execute()
             )
 
             return self._extract_data(response, "create_expense")
@@ -154,7 +153,7 @@ class ExpensesRepository(BaseRepository):
                 .range(offset, offset + limit - 1)
             )
 
-            response = query.execute()
+            response = await self._execute(query)
             expenses = self._extract_data_list(response, "list_expenses")
 
             # Get total count from response
@@ -209,7 +208,7 @@ class ExpensesRepository(BaseRepository):
             if date_to:
                 query = query.lte("expense_date", date_to.isoformat())
 
-            response = query.execute()
+            response = await self._execute(query)
             expenses = self._extract_data_list(response, "get_expense_summary")
 
             total_amount = sum(exp.get("total_amount", 0) or 0 for exp in expenses)
@@ -248,13 +247,12 @@ class ExpensesRepository(BaseRepository):
             Expense dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("expenses")
                 .select("*")
                 .eq("id", expense_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_expense_by_id")
         except Exception as e:
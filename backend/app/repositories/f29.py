@@ -5,6 +5,8 @@ F29 Repository - Handles F29 form queries.
 import logging
 from typing import Any
 
+from app.utils.data_version import bump_company_data_version
+
 from .base import BaseRepository
 
 logger = logging.getLogger(__name__)
@@ -24,13 +26,12 @@ class F29Repository(BaseRepository):
             F29 form dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("form29")
                 .select("*")
                 .eq("id", form_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_form_by_id")
         except Exception as e:
@@ -67,7 +68,7 @@ class F29Repository(BaseRepository):
 
             query = query.order("period", desc=True).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_forms_by_company")
         except Exception as e:
             self._log_error(
@@ -93,14 +94,13 @@ class F29Repository(BaseRepository):
             F29 form dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("form29")
                 .select("*")
                 .eq("company_id", company_id)
                 .eq("period", period)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_form_by_period")
         except Exception as e:
@@ -125,7 +125,7 @@ class F29Repository(BaseRepository):
             Latest F29 form dict or None if no forms exist
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("form29")
                 .select("*")
@@ -133,7 +133,6 @@ class F29Repository(BaseRepository):
                 .order("period", desc=True)
                 .limit(1)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_latest_form")
         except Exception as e:
@@ -166,7 +165,7 @@ class F29Repository(BaseRepository):
 
             query = query.order("due_date", desc=False).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_pending_forms")
         except Exception as e:
             self._log_error("get_pending_forms", e, company_id=company_id, limit=limit)
@@ -198,7 +197,7 @@ class F29Repository(BaseRepository):
 
             query = query.order("due_date", desc=False).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_overdue_forms")
         except Exception as e:
             self._log_error("get_overdue_forms", e, company_id=company_id, limit=limit)
@@ -218,7 +217,7 @@ class F29Repository(BaseRepository):
             List of paid F29 form dicts
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("form29")
                 .select("*")
@@ -226,7 +225,6 @@ class F29Repository(BaseRepository):
                 .eq("status", "paid")
                 .order("period", desc=True)
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_payment_history")
         except Exception as e:
@@ -247,14 +245,13 @@ class F29Repository(BaseRepository):
             F29 form dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("form29")
                 .select("*")
                 .eq("company_id", company_id)
                 .eq("folio", folio)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_folio")
         except Exception as e:
@@ -280,39 +277,17 @@ class F29Repository(BaseRepository):
             return 0, 0
 
         try:
-            # Get existing folios to count new vs updated
-            company_id = forms[0]["company_id"]
-            folios = [form["sii_folio"] for form in forms if form.get("sii_folio") is not None]
-
-            existing_folios = set()
-            if folios:
-                response = (
-                    self._client
-                    .table("form29_sii_downloads")
-                    .select("sii_folio")
-                    .eq("company_id", company_id)
-                    .in_("sii_folio", folios)
-                    .execute()
-                )
-                existing_folios = {form["sii_folio"] for form in response.data}
-
-            # Count new vs updated
-            nuevos = sum(1 for form in forms if form.get("sii_folio") not in existing_folios)
-            actualizados = len(forms) - nuevos
-
-            # Supabase upsert - use company_id + sii_folio as unique identifier
-            # This matches the unique constraint: form29_sii_downloads_company_folio_unique
-            response = (
-                self._client
-                .table("form29_sii_downloads")
-                .upsert(forms, on_conflict="company_id,sii_folio")
-                .execute()
+            # Single round trip per batch: counts come back from the upsert itself
+            # Note: Unique constraint is (company_id, sii_folio)
+            nuevos, actualizados = await self._upsert_with_counts(
+                "form29_sii_downloads", forms, on_conflict="company_id,sii_folio"
             )
 
             logger.info(
                 f"✅ Upserted {len(forms)} F29 forms to form29_sii_downloads: "
                 f"{nuevos} nuevos, {actualizados} actualizados"
             )
+            await bump_company_data_version(*{f.get("company_id") for f in forms})
             return nuevos, actualizados
 
         except Exception as e:
@@ -359,7 +334,7 @@ class F29Repository(BaseRepository):
                 query = query.neq("status", "cancelled").order("revision_number", desc=True)
 
             query = query.limit(1).maybe_single()
-            response = query.execute()
+            response = await self._execute(query)
 
             return self._extract_data(response, "get_draft_by_period")
         except Exception as e:
@@ -405,7 +380,7 @@ class F29Repository(BaseRepository):
             if exclude_cancelled:
                 query = query.neq("status", "cancelled")
 
-            response = query.execute()
+            response = await self._execute(query)
             return response.count > 0 if hasattr(response, 'count') else False
         except Exception as e:
             self._log_error(
@@ -435,7 +410,7 @@ class F29Repository(BaseRepository):
             Latest revision number (0 if none exist)
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("form29")
                 .select("revision_number")
@@ -445,7 +420,6 @@ class F29Repository(BaseRepository):
                 .order("revision_number", desc=True)
                 .limit(1)
                 .maybe_single()
-                .execute()
             )
 
             data = self._extract_data(response, "get_latest_revision_number")
@@ -503,15 +477,15 @@ class F29Repository(BaseRepository):
                 form_data["created_by_user_id"] = created_by_user_id
 
             # Insert form
-            response = (
+            response = await self._execute(
                 self._client
                 .table("form29")
                 .insert(form_data)
-                .execute()
             )
 
             result = self._extract_data(response, "create_draft")
             if result:
+                await bump_company_data_version(company_id)
                 logger.info(
                     f"✅ Created Form29 draft for company {company_id}, "
                     f"period {period_year}-{period_month:02d}, revision {revision_number}"
@@ -543,15 +517,17 @@ class F29Repository(BaseRepository):
             Updated Form29 draft or None on error
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("form29")
                 .update(updates)
                 .eq("id", form_id)
-                .execute()
             )
 
-            return self._extract_data(response, "update_draft")
+            result = self._extract_data(response, "update_draft")
+            if result:
+                await bump_company_data_version(result.get("company_id"))
+            return result
         except Exception as e:
             self._log_error("update_draft", e, form_id=form_id, updates=updates)
             return None
@@ -584,7 +560,7 @@ class F29Repository(BaseRepository):
 
             query = query.order("period_year", desc=True).order("period_month", desc=True).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_active_drafts")
         except Exception as e:
             self._log_error("get_active_drafts", e, company_id=company_id, limit=limit)
@@ -630,7 +606,7 @@ class F29Repository(BaseRepository):
 
             query = query.order("period_year", desc=True).order("period_month", desc=True).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_drafts_by_company")
         except Exception as e:
             self._log_error(
@@ -56,11 +56,10 @@ class FeedbackRepository(BaseRepository):
                 "status": "new",
             }
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("feedback")
                 .insert(data)
-                .execute()
             )
 
             return self._extract_data(response, "create_feedback")
@@ -89,12 +88,11 @@ class FeedbackRepository(BaseRepository):
             Updated feedback dict or None if error
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("feedback")
                 .update(kwargs)
                 .eq("id", feedback_id)
-                .execute()
             )
 
             return self._extract_data(response, "update_feedback")
@@ -128,7 +126,7 @@ class FeedbackRepository(BaseRepository):
             if profile_id:
                 query = query.eq("profile_id", profile_id)
 
-            response = query.maybe_single().execute()
+            response = await self._execute(query.maybe_single())
             return self._extract_data(response, "get_feedback_by_id")
         except Exception as e:
             self._log_error("get_feedback_by_id", e, feedback_id=feedback_id)
@@ -164,7 +162,7 @@ class FeedbackRepository(BaseRepository):
 
             query = query.order("created_at", desc=True).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "list_feedback_by_profile")
         except Exception as e:
             self._log_error(
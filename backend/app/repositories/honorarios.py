@@ -29,32 +29,10 @@ class HonorariosRepository(BaseRepository):
             return 0, 0
 
         try:
-            # Get existing folios to count new vs updated
-            company_id = receipts[0]["company_id"]
-            folios = [receipt["folio"] for receipt in receipts if receipt.get("folio") is not None]
-
-            existing_folios = set()
-            if folios:
-                response = (
-                    self._client
-                    .table("honorarios_receipts")
-                    .select("folio")
-                    .eq("company_id", company_id)
-                    .in_("folio", folios)
-                    .execute()
-                )
-                existing_folios = {receipt["folio"] for receipt in response.data}
-
-            # Count new vs updated
-            nuevos = sum(1 for receipt in receipts if receipt.get("folio") not in existing_folios)
-            actualizados = len(receipts) - nuevos
-
-            # Supabase upsert (inserts or updates based on unique constraint)
-            response = (
-                self._client
-                .table("honorarios_receipts")
-                .upsert(receipts, on_conflict="company_id,folio")
-                .execute()
+            # Single round trip per batch: counts come back from the upsert itself
+            # Note: Unique constraint is (company_id, folio)
+            nuevos, actualizados = await self._upsert_with_counts(
+                "honorarios_receipts", receipts, on_conflict="company_id,folio"
             )
 
             logger.info(
@@ -31,13 +31,12 @@ class NotificationsRepository(BaseRepository):
             if include_template:
                 select_query = "*, notification_templates(*)"
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("notifications")
                 .select(select_query)
                 .eq("id", notification_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_by_id")
         except Exception as e:
@@ -74,7 +73,7 @@ class NotificationsRepository(BaseRepository):
 
             query = query.order("created_at", desc=True).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_by_company")
         except Exception as e:
             self._log_error(
@@ -112,7 +111,7 @@ class NotificationsRepository(BaseRepository):
 
             query = query.order("scheduled_for", desc=False).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_pending")
         except Exception as e:
             self._log_error("get_pending", e, company_id=company_id, limit=limit)
@@ -131,13 +130,12 @@ class NotificationsRepository(BaseRepository):
             Template dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("notification_templates")
                 .select("*")
                 .eq("code", template_code)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_template_by_code")
         except Exception as e:
@@ -152,12 +150,11 @@ class NotificationsRepository(BaseRepository):
             List of template dicts
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("notification_templates")
                 .select("*")
                 .order("code")
-                .execute()
             )
             return self._extract_data_list(response, "get_all_templates")
         except Exception as e:
@@ -189,7 +186,7 @@ class NotificationsRepository(BaseRepository):
 
             template_id = template.get("id")
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("notifications")
                 .select("*")
@@ -197,7 +194,6 @@ class NotificationsRepository(BaseRepository):
                 .eq("template_id", template_id)
                 .order("created_at", desc=True)
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_recent_by_template")
         except Exception as e:
@@ -24,13 +24,12 @@ class PeopleRepository(BaseRepository):
             Person dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("people")
                 .select("*")
                 .eq("id", person_id)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_person_by_id")
         except Exception as e:
@@ -51,14 +50,13 @@ class PeopleRepository(BaseRepository):
             Person dict or None if not found
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("people")
                 .select("*")
                 .eq("company_id", company_id)
                 .eq("rut", rut)
                 .maybe_single()
-                .execute()
             )
             return self._extract_data(response, "get_person_by_rut")
         except Exception as e:
@@ -95,7 +93,7 @@ class PeopleRepository(BaseRepository):
 
             query = query.order("name").limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, "get_people_by_company")
         except Exception as e:
             self._log_error(
@@ -121,7 +119,7 @@ class PeopleRepository(BaseRepository):
             List of active employee dicts
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("people")
                 .select("*")
@@ -129,7 +127,6 @@ class PeopleRepository(BaseRepository):
                 .eq("status", "active")
                 .order("name")
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "get_active_employees")
         except Exception as e:
@@ -147,13 +144,12 @@ class PeopleRepository(BaseRepository):
             Count of active employees
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("people")
                 .select("id", count="exact")
                 .eq("company_id", company_id)
                 .eq("status", "active")
-                .execute()
             )
 
             # Supabase returns count in response.count
@@ -212,14 +208,13 @@ class PeopleRepository(BaseRepository):
         """
         try:
             # Search by name or RUT using ilike (case-insensitive)
-            response = (
+            response = await self._execute(
                 self._client
                 .table("people")
                 .select("*")
                 .eq("company_id", company_id)
                 .or_(f"name.ilike.%{query}%,rut.ilike.%{query}%")
                 .limit(limit)
-                .execute()
             )
             return self._extract_data_list(response, "search_people")
         except Exception as e:
@@ -257,11 +252,10 @@ class PeopleRepository(BaseRepository):
                 **kwargs
             }
 
-            response = (
+            response = await self._execute(
                 self._client
                 .table("people")
                 .insert(data)
-                .execute()
             )
 
             return self._extract_data(response, "create_person")
@@ -290,12 +284,11 @@ class PeopleRepository(BaseRepository):
             Updated person dict or None if error
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client
                 .table("people")
                 .update(kwargs)
                 .eq("id", person_id)
-                .execute()
             )
 
             return self._extract_data(response, "update_person")
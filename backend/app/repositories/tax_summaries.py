@@ -63,7 +63,7 @@ class TaxSummariesRepository(BaseRepository):
                 query = query.gte("issue_date", period_start).lt("issue_date", period_end)
 
             # Execute query
-            response = query.execute()
+            response = await self._execute(query)
             return self._extract_data_list(response, f"get_documents_{table}")
 
         except Exception as e:
@@ -120,6 +120,162 @@ class TaxSummariesRepository(BaseRepository):
             fields
         )
 
+    async def get_document_totals(
+        self,
+        table: str,
+        company_id: str,
+        positive_types: list[str],
+        credit_types: list[str],
+        period_start: str | None = None,
+        period_end: str | None = None
+    ) -> list[dict[str, Any]] | None:
+        """
+        Get grouped document sums computed in the database.
+
+        Calls the get_document_totals RPC, which returns one row per group
+        (positive documents vs credit notes) filtered by accounting_date.
+
+        Args:
+            table: Table name (sales_documents or purchase_documents)
+            company_id: Company UUID
+            positive_types: Document types counted as positive
+            credit_types: Document types counted as credit notes
+            period_start: Optional start date (YYYY-MM-DD format)
+            period_end: Optional end date (YYYY-MM-DD format, exclusive)
+
+        Returns:
+            List of group dicts with is_credit_note, document_count, tax_amount,
+            total_amount, net_amount, net_amount_on_time and overdue_iva_credit,
+            or None if the RPC failed
+        """
+        try:
+            response = await self._execute(
+                self._client.rpc(
+                    "get_document_totals",
+                    {
+                        "p_table": table,
+                        "p_company_id": company_id,
+                        "p_positive_types": positive_types,
+                        "p_credit_types": credit_types,
+                        "p_period_start": period_start if period_start and period_end else None,
+                        "p_period_end": period_end if period_start and period_end else None,
+                    },
+                )
+            )
+            return self._extract_data_list(response, f"get_document_totals_{table}")
+
+        except Exception as e:
+            self._log_error(
+                "get_document_totals",
+                e,
+                table=table,
+                company_id=company_id,
+                period_start=period_start
+            )
+            return None
+
+    async def get_monthly_aggregates(
+        self,
+        table: str,
+        company_id: str,
+        period_start: str,
+        document_types: list[str]
+    ) -> list[dict[str, Any]] | None:
+        """
+        Get pre-aggregated monthly sums per document type.
+
+        Reads tax_monthly_aggregates (kept up to date by document triggers), so
+        the cost does not depend on how many documents the month has.
+
+        Args:
+            table: Source table (sales_documents or purchase_documents)
+            company_id: Company UUID
+            period_start: First day of the month (YYYY-MM-DD format)
+            document_types: Document types to include
+
+        Returns:
+            List of dicts with document_type, document_count and the summed
+            amounts, or None if the query failed
+        """
+        source = "sales" if table == "sales_documents" else "purchase"
+        try:
+            response = await self._execute(
+                self._client
+                .table("tax_monthly_aggregates")
+                .select(
+                    "document_type, document_count, tax_amount, total_amount, "
+                    "net_amount, net_amount_on_time, overdue_iva_credit"
+                )
+                .eq("company_id", company_id)
+                .eq("source", source)
+                .eq("period", period_start)
+                .in_("document_type", document_types)
+            )
+            return self._extract_data_list(response, f"get_monthly_aggregates_{source}")
+
+        except Exception as e:
+            self._log_error(
+                "get_monthly_aggregates",
+                e,
+                table=table,
+                company_id=company_id,
+                period_start=period_start
+            )
+            return None
+
+    async def get_monthly_tax_trend(
+        self,
+        company_id: str,
+        period_start: str,
+        sales_positive_types: list[str],
+        sales_credit_types: list[str],
+        purchase_positive_types: list[str],
+        purchase_credit_types: list[str]
+    ) -> list[dict[str, Any]] | None:
+        """
+        Get monthly revenue, cost and IVA sums since a start month.
+
+        Calls the get_monthly_tax_trend RPC (reads tax_monthly_aggregates), so
+        the cost grows with the number of months, not documents.
+
+        Args:
+            company_id: Company UUID
+            period_start: First month to include (YYYY-MM-DD format)
+            sales_positive_types: Sales document types counted as positive
+            sales_credit_types: Sales document types subtracted (credit notes)
+            purchase_positive_types: Purchase document types counted as positive
+            purchase_credit_types: Purchase document types subtracted (credit notes)
+
+        Returns:
+            List of dicts (newest month first) with period, sales_count,
+            revenue, net_revenue, iva_debit, purchase_count, cost, net_cost and
+            iva_credit, or None if the RPC failed
+        """
+        try:
+            response = await self._execute(
+                self._client.rpc(
+                    "get_monthly_tax_trend",
+                    {
+                        "p_company_id": company_id,
+                        "p_period_start": period_start,
+                        "p_sales_positive_types": sales_positive_types,
+                        "p_sales_credit_types": sales_credit_types,
+                        "p_purchase_positive_types": purchase_positive_types,
+                        "p_purchase_credit_types": purchase_credit_types,
+                    },
+                )
+            )
+            return self._extract_data_list(response, "get_monthly_tax_trend")
+
+        except Exception as e:
+            self._log_error(
+                "get_monthly_tax_trend",
+                e,
+                company_id=company_id,
+                period_start=period_start
+            )
+            return None
+
     # Legacy methods for backward compatibility (delegate to service)
     # These will be deprecated - use TaxSummaryService instead
 
@@ -138,8 +294,8 @@ class TaxSummariesRepository(BaseRepository):
         )
 
         # Import service here to avoid circular dependency
-        from app.services.tax_summary_service import TaxSummaryService
         from app.config.supabase import get_supabase_client
+        from app.services.tax_summary_service import TaxSummaryService
 
         supabase = get_supabase_client()
         service = TaxSummaryService(supabase)
@@ -156,8 +312,8 @@ class TaxSummariesRepository(BaseRepository):
             "Use TaxSummaryService.get_revenue_summary() instead."
         )
 
-        from app.services.tax_summary_service import TaxSummaryService
         from app.config.supabase import get_supabase_client
+        from app.services.tax_summary_service import TaxSummaryService
 
         supabase = get_supabase_client()
         service = TaxSummaryService(supabase)
@@ -174,8 +330,8 @@ class TaxSummariesRepository(BaseRepository):
             "Use TaxSummaryService.get_expense_summary() instead."
         )
 
-        from app.services.tax_summary_service import TaxSummaryService
         from app.config.supabase import get_supabase_client
+        from app.services.tax_summary_service import TaxSummaryService
 
         supabase = get_supabase_client()
         service = TaxSummaryService(supabase)
@@ -195,8 +351,8 @@ class TaxSummariesRepository(BaseRepository):
         )
 
         try:
-            from app.services.tax_summary_service import TaxSummaryService
             from app.config.supabase import get_supabase_client
+            from app.services.tax_summary_service import TaxSummaryService
 
             supabase = get_supabase_client()
             service = TaxSummaryService(supabase)
@@ -221,44 +377,14 @@ class TaxSummariesRepository(BaseRepository):
         self, company_id: str, months: int = 6
     ) -> list[dict[str, Any]]:
         """
-        Get monthly revenue trend for the last N months.
+        DEPRECATED: Use TaxSummaryService.get_monthly_trend() instead.
 
-        Simple aggregation - no complex business logic.
+        Returns the last N months (newest first) with revenue, cost and IVA
+        series, aggregated in the database.
         """
-        try:
-            response = (
-                self._client
-                .table("sales_documents")
-                .select("issue_date, total_amount")
-                .eq("company_id", company_id)
-                .order("issue_date", desc=True)
-                .execute()
-            )
-
-            data = self._extract_data_list(response, "get_monthly_revenue_trend")
-
-            # Aggregate by month (YYYYMM)
-            monthly_revenue: dict[str, float] = {}
-            for doc in data:
-                issue_date = doc.get("issue_date", "")
-                if not issue_date:
-                    continue
-
-                # Extract YYYYMM from date
-                month_key = str(issue_date).replace("-", "")[:6]
-                if month_key not in monthly_revenue:
-                    monthly_revenue[month_key] = 0
-
-                monthly_revenue[month_key] += doc.get("total_amount", 0) or 0
-
-            # Sort by month and limit
-            trend = [
-                {"month": month, "revenue": revenue}
-                for month, revenue in sorted(monthly_revenue.items(), reverse=True)[:months]
-            ]
-
-            return trend
+        from app.config.supabase import get_supabase_client
+        from app.services.tax_summary_service import TaxSummaryService
 
-        except Exception as e:
-            self._log_error("get_monthly_revenue_trend", e, company_id=company_id, months=months)
-            return []
+        supabase = get_supabase_client()
+        service = TaxSummaryService(supabase)
+        return await service.get_monthly_trend(company_id, months)
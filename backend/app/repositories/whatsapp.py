@@ -43,9 +43,11 @@ class WhatsAppRepository(BaseRepository):
         try:
             # If conversation_id provided, try to fetch it first
             if conversation_id:
-                response = self._client.table("conversations").select("*").eq(
-                    "id", str(conversation_id)
-                ).maybe_single().execute()
+                response = await self._execute(
+                    self._client.table("conversations").select("*").eq(
+                        "id", str(conversation_id)
+                    ).maybe_single()
+                )
 
                 existing = self._extract_data(response, "get_conversation")
                 if existing:
@@ -53,7 +55,7 @@ class WhatsAppRepository(BaseRepository):
                     return existing
 
             # Search for recent WhatsApp conversation for this user
-            response = (
+            response = await self._execute(
                 self._client.table("conversations")
                 .select("*")
                 .eq("user_id", str(user_id))
@@ -61,7 +63,6 @@ class WhatsAppRepository(BaseRepository):
                 .order("updated_at", desc=True)
                 .limit(1)
                 .maybe_single()
-                .execute()
             )
 
             existing = self._extract_data(response, "search_whatsapp_conversation")
@@ -84,7 +85,9 @@ class WhatsAppRepository(BaseRepository):
             if conversation_id:
                 conversation_data["id"] = str(conversation_id)
 
-            response = self._client.table("conversations").insert(conversation_data).execute()
+            response = await self._execute(
+                self._client.table("conversations").insert(conversation_data)
+            )
 
             result = self._extract_data(response, "create_conversation")
             if result:
@@ -111,11 +114,10 @@ class WhatsAppRepository(BaseRepository):
             Updated conversation or None
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client.table("conversations")
                 .update({"metadata": metadata, "updated_at": datetime.utcnow().isoformat()})
                 .eq("id", str(conversation_id))
-                .execute()
             )
 
             return self._extract_data(response, "update_conversation_metadata")
@@ -135,12 +137,11 @@ class WhatsAppRepository(BaseRepository):
             Conversation dict or None
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client.table("conversations")
                 .select("*")
                 .eq("id", str(conversation_id))
                 .maybe_single()
-                .execute()
             )
 
             return self._extract_data(response, "get_conversation")
@@ -187,7 +188,9 @@ class WhatsAppRepository(BaseRepository):
                 "metadata": default_metadata,
             }
 
-            response = self._client.table("messages").insert(message_data).execute()
+            response = await self._execute(
+                self._client.table("messages").insert(message_data)
+            )
 
             result = self._extract_data(response, "add_message")
 
@@ -223,13 +226,12 @@ class WhatsAppRepository(BaseRepository):
             List of message dicts (ordered by created_at)
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client.table("messages")
                 .select("*")
                 .eq("conversation_id", str(conversation_id))
                 .order("created_at", desc=False)
                 .limit(limit)
-                .execute()
             )
 
             return self._extract_data_list(response, "get_conversation_messages")
@@ -246,9 +248,11 @@ class WhatsAppRepository(BaseRepository):
             conversation_id: Conversation ID
         """
         try:
-            self._client.table("conversations").update(
-                {"updated_at": datetime.utcnow().isoformat()}
-            ).eq("id", str(conversation_id)).execute()
+            await self._execute(
+                self._client.table("conversations").update(
+                    {"updated_at": datetime.utcnow().isoformat()}
+                ).eq("id", str(conversation_id))
+            )
 
         except Exception as e:
             self._log_error("update_conversation_timestamp", e, conversation_id=conversation_id)
@@ -271,12 +275,11 @@ class WhatsAppRepository(BaseRepository):
             # Normalize phone (ensure + prefix)
             normalized_phone = phone if phone.startswith("+") else f"+{phone}"
 
-            response = (
+            response = await self._execute(
                 self._client.table("profiles")
                 .select("*")
                 .eq("phone", normalized_phone)
                 .maybe_single()
-                .execute()
             )
 
             return self._extract_data(response, "get_profile_by_phone")
@@ -296,12 +299,11 @@ class WhatsAppRepository(BaseRepository):
             Profile dict or None
         """
         try:
-            response = (
+            response = await self._execute(
                 self._client.table("profiles")
                 .select("*")
                 .eq("id", str(user_id))
                 .maybe_single()
-                .execute()
             )
 
             return self._extract_data(response, "get_profile")
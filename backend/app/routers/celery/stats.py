@@ -5,11 +5,17 @@ Handles:
 - Getting Celery worker statistics
 - Monitoring active tasks
 - Queue statistics
+
+Stats come from the telemetry snapshot kept in Redis by the collector
+(app/infrastructure/celery/telemetry.py), so requests never wait on
+inspect() broadcasts. Without a snapshot, inspect() runs in a thread.
 """
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException
 
 from app.infrastructure.celery import celery_app
+from app.infrastructure.celery.telemetry import collect_inspect, get_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -26,10 +32,28 @@ async def get_celery_stats():
         - scheduled_tasks: Number of tasks waiting to execute
         - registered_tasks: List of registered task names
         - workers: List of active workers and their status
+        - queues: Pending messages per queue
+        - tasks: Per-task counts, failure rate and runtime histogram
+        - source: "telemetry" (snapshot) or "inspect" (live fallback)
 
     Example response:
         ```json
         {
+            "source": "telemetry",
+            "collected_at": "2025-11-20T14:03:05+00:00",
+            "stale": false,
+            "queues": {"whatsapp": 0, "default": 2, "low": 14},
+            "workers": {
+                "celery@worker1": {"alive": true, "active": 2, "processed": 156, "concurrency": 4}
+            },
+            "tasks": {
+                "sii.sync_documents": {
+                    "succeeded": 40,
+                    "failed": 2,
+                    "failure_rate": 0.05,
+                    "runtime": {"count": 42, "avg": 212.4, "buckets": {"60": 3, "300": 35, "+Inf": 42}}
+                }
+            },
             "active_tasks": {
                 "celery@worker1": [
                     {
@@ -55,20 +79,14 @@ async def get_celery_stats():
         ```
     """
     try:
-        # Get active tasks
-        inspect = celery_app.control.inspect()
-
-        active = inspect.active()
-        scheduled = inspect.scheduled()
-        registered = inspect.registered()
-        stats = inspect.stats()
+        snapshot = await asyncio.to_thread(get_snapshot)
+        if snapshot is not None:
+            return {"source": "telemetry", **snapshot}
 
-        return {
-            "active_tasks": active,
-            "scheduled_tasks": scheduled,
-            "registered_tasks": registered,
-            "worker_stats": stats,
-        }
+        # No collector running: live inspect, off the event loop
+        logger.warning("⚠️ No Celery telemetry snapshot, falling back to inspect()")
+        inspected = await asyncio.to_thread(collect_inspect, celery_app)
+        return {"source": "inspect", **inspected}
 
     except Exception as e:
         logger.error(f"❌ Failed to get Celery stats: {e}", exc_info=True)
@@ -5,11 +5,18 @@ Handles:
 - Getting task status by ID
 - Revoking/cancelling tasks
 - Retrying failed tasks
+- Fleet status (workers, queues, failure rates) from the telemetry snapshot
+
+Result backend and broker calls are blocking, so they run in a thread.
 """
+import asyncio
 import logging
+from typing import Any, Dict
+
 from fastapi import APIRouter, HTTPException, Query
 
 from app.infrastructure.celery import celery_app
+from app.infrastructure.celery.telemetry import get_snapshot
 from .models import TaskStatus, TaskStatusResponse
 
 logger = logging.getLogger(__name__)
@@ -17,6 +24,51 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _read_task_meta(task_id: str) -> Dict[str, Any]:
+    """Read a task's state, result and traceback from the result backend (blocking)."""
+    result = celery_app.AsyncResult(task_id)
+    state = result.state
+    return {
+        "state": state,
+        "result": result.result,
+        "traceback": result.traceback if state == "FAILURE" else None,
+    }
+
+
+@router.get("/status")
+async def get_celery_status():
+    """
+    Get a compact fleet status from the telemetry snapshot.
+
+    Returns:
+        - available: Whether a telemetry snapshot exists
+        - stale: Whether the snapshot is older than 3 collector intervals
+        - workers_alive: Number of workers sending heartbeats
+        - queues: Pending messages per queue
+        - failure_rates: Failure rate per task over the rolling window
+
+    Example:
+        GET /celery/status
+    """
+    snapshot = await asyncio.to_thread(get_snapshot)
+    if snapshot is None:
+        return {"available": False, "message": "Celery telemetry collector is not running"}
+
+    workers = snapshot.get("workers") or {}
+    return {
+        "available": True,
+        "stale": snapshot.get("stale"),
+        "collected_at": snapshot.get("collected_at"),
+        "workers_alive": sum(1 for w in workers.values() if w.get("alive")),
+        "workers": workers,
+        "queues": snapshot.get("queues"),
+        "failure_rates": {
+            name: stats.get("failure_rate")
+            for name, stats in (snapshot.get("tasks") or {}).items()
+        },
+    }
+
+
 @router.get("/tasks/{task_id}", response_model=TaskStatusResponse)
 async def get_task_status(task_id: str):
     """
@@ -34,46 +86,47 @@ async def get_task_status(task_id: str):
     """
     try:
         # Get task result from Celery
-        result = celery_app.AsyncResult(task_id)
+        meta = await asyncio.to_thread(_read_task_meta, task_id)
+        state, info = meta["state"], meta["result"]
 
         # Build response based on task state
         response = TaskStatusResponse(
             task_id=task_id,
-            status=TaskStatus(result.status),
+            status=TaskStatus(state),
             result=None,
             error=None,
             traceback=None,
             meta=None,
         )
 
-        if result.state == "SUCCESS":
+        if state == "SUCCESS":
             # Task completed successfully
-            response.result = result.result
+            response.result = info
 
-        elif result.state == "FAILURE":
+        elif state == "FAILURE":
             # Task failed
-            response.error = str(result.result) if result.result else "Unknown error"
-            response.traceback = result.traceback
+            response.error = str(info) if info else "Unknown error"
+            response.traceback = meta["traceback"]
 
-        elif result.state == "PENDING":
+        elif state == "PENDING":
             # Task is waiting or doesn't exist
             # Note: PENDING is also returned for non-existent task IDs
             response.meta = {"info": "Task is waiting to be executed or doesn't exist"}
 
-        elif result.state == "STARTED":
+        elif state == "STARTED":
             # Task is currently running
-            response.meta = result.info if result.info else {"info": "Task is running"}
+            response.meta = info if info else {"info": "Task is running"}
 
-        elif result.state == "RETRY":
+        elif state == "RETRY":
             # Task is being retried
-            response.meta = result.info if result.info else {"info": "Task is being retried"}
+            response.meta = info if info else {"info": "Task is being retried"}
             response.error = "Task failed and is being retried"
 
         else:
             # Other states (custom states set by tasks)
-            response.meta = result.info if result.info else {}
+            response.meta = info if info else {}
 
-        logger.info(f"📊 Task status: {task_id} -> {result.state}")
+        logger.info(f"📊 Task status: {task_id} -> {state}")
 
         return response
 
@@ -107,7 +160,8 @@ async def revoke_task(
     """
     try:
         # Revoke the task
-        celery_app.control.revoke(
+        await asyncio.to_thread(
+            celery_app.control.revoke,
             task_id,
             terminate=terminate,
             signal='SIGTERM' if terminate else None
@@ -144,12 +198,12 @@ async def retry_task(task_id: str):
     """
     try:
         # Get original task result
-        result = celery_app.AsyncResult(task_id)
+        meta = await asyncio.to_thread(_read_task_meta, task_id)
 
-        if result.state != "FAILURE":
+        if meta["state"] != "FAILURE":
             raise HTTPException(
                 status_code=400,
-                detail=f"Cannot retry task in state: {result.state}. Only FAILURE tasks can be retried."
+                detail=f"Cannot retry task in state: {meta['state']}. Only FAILURE tasks can be retried."
             )
 
         # For now, just return info that manual retry is needed
@@ -157,8 +211,8 @@ async def retry_task(task_id: str):
         return {
             "task_id": task_id,
             "message": "Task retry must be triggered manually by re-submitting the task with original parameters",
-            "status": result.state,
-            "error": str(result.result) if result.result else None
+            "status": meta["state"],
+            "error": str(meta["result"]) if meta["result"] else None
         }
 
     except HTTPException:
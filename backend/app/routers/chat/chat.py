@@ -9,7 +9,7 @@ from __future__ import annotations
 import logging
 import uuid
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile, status
 from pydantic import BaseModel, Field
 
 from app.core.auth import get_current_user
@@ -61,6 +61,21 @@ class ChatResponse(BaseModel):
     metadata: dict = Field(default_factory=dict, description="Response metadata")
 
 
+class PrefetchContextRequest(BaseModel):
+    """Request model for prefetching UI context of visible cards."""
+
+    company_id: str = Field(..., description="Company ID for context")
+    contexts: list[RequiredContext] = Field(
+        ..., max_length=20, description="UI components currently visible"
+    )
+
+
+class PrefetchContextResponse(BaseModel):
+    """Response model for context prefetch endpoint."""
+
+    scheduled: int = Field(..., description="Number of components scheduled for prefetch")
+
+
 class UploadResponse(BaseModel):
     """Response model for file upload endpoint."""
 
@@ -183,3 +198,64 @@ async def chat(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error procesando chat: {str(e)}",
         )
+
+
+@router.post(
+    "/chat/context/prefetch",
+    response_model=PrefetchContextResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def prefetch_context(
+    request: PrefetchContextRequest,
+    background_tasks: BackgroundTasks,
+    user: dict = Depends(get_current_user),
+) -> PrefetchContextResponse:
+    """
+    Preload UI context for cards visible on screen.
+
+    Runs the UI tools in the background and caches their results, so a
+    later chat message sent from one of these cards (required_context)
+    skips the pre-agent database queries.
+
+    Args:
+        request: Company ID and visible components (identifier, entity_id, entity_type)
+        background_tasks: FastAPI background tasks
+        user: Authenticated user data (from JWT token)
+
+    Returns:
+        PrefetchContextResponse with the number of components scheduled
+    """
+    user_id = user.get("sub")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User ID not found in token"
+        )
+
+    from app.agents.ui_tools import UIToolDispatcher
+    from app.config.supabase import get_supabase_client
+
+    components = [
+        {
+            "ui_component": ctx.identifier,
+            "entity_id": ctx.entity_id,
+            "entity_type": ctx.entity_type,
+        }
+        for ctx in request.contexts
+    ]
+
+    background_tasks.add_task(
+        UIToolDispatcher.prefetch,
+        components,
+        request.company_id,
+        user_id,
+        get_supabase_client(),
+    )
+
+    logger.debug(
+        f"📋 Context prefetch scheduled | company={request.company_id[:8]} | "
+        f"components={len(components)}"
+    )
+
+    return PrefetchContextResponse(scheduled=len(components))
+
@@ -64,7 +64,10 @@ async def chatkit_upload_attachment(
     Phase 1: ChatKit client -> attachment tool -> memory attachment store
               (creates metadata, returns upload URL)
     Phase 2: ChatKit client -> this endpoint with multipart/form-data
-              (stores file, updates metadata)
+              (streams the file to the attachment spool)
+
+    The body is parsed as it arrives (never fully in memory) and rejected
+    with 413 once it exceeds ATTACHMENT_MAX_UPLOAD_BYTES.
 
     Args:
         attachment_id: The attachment ID from Phase 1
@@ -74,73 +77,30 @@ async def chatkit_upload_attachment(
     Returns:
         JSON response with success status
     """
-    try:
-        from app.agents.core.memory_attachment_store import store_attachment_content
-
-        content_type = request.headers.get("content-type", "")
-
-        # ChatKit sends files as multipart/form-data
-        if "multipart/form-data" in content_type:
-            # Parse multipart form data manually
-            from starlette.datastructures import UploadFile as StarletteUploadFile
-
-            # Get form data
-            form = await request.form()
-
-            # The file should be in the form data
-            # Try common field names
-            file = None
-            for key in form.keys():
-                value = form[key]
-                if isinstance(value, StarletteUploadFile):
-                    file = value
-                    break
-
-            if file is None:
-                # If no UploadFile found, try to get the first value
-                if len(form) > 0:
-                    first_value = list(form.values())[0]
-                    if isinstance(first_value, StarletteUploadFile):
-                        file = first_value
-
-            if file is None:
-                raise ValueError("No file found in multipart/form-data")
-
-            # Read the actual file bytes
-            file_bytes = await file.read()
-
-            logger.info(f"📎 Received multipart file upload for attachment {attachment_id}")
-            logger.info(f"   File field name: {file.filename}")
-            logger.info(f"   Content-Type: {file.content_type}")
-            logger.info(f"   Size: {len(file_bytes)} bytes")
-            logger.info(f"   First 20 bytes (hex): {file_bytes[:20].hex()}")
-
-            # Store the actual file bytes
-            store_attachment_content(attachment_id, file_bytes)
-
-            return JSONResponse(
-                {
-                    "success": True,
-                    "attachment_id": attachment_id,
-                    "size": len(file_bytes),
-                }
-            )
-        else:
-            # Fallback: raw bytes (shouldn't happen with ChatKit)
-            file_bytes = await request.body()
+    from app.agents.core.memory_attachment_store import AttachmentTooLargeError
+    from app.integrations.chatkit.uploads import receive_upload
 
-            logger.info(f"📎 Received raw file upload for attachment {attachment_id}")
-            logger.info(f"   Size: {len(file_bytes)} bytes")
+    try:
+        upload = await receive_upload(request, attachment_id)
 
-            store_attachment_content(attachment_id, file_bytes)
+        logger.info(f"📎 Received file upload for attachment {attachment_id}")
+        logger.info(f"   File name: {upload.filename}")
+        logger.info(f"   Content-Type: {upload.content_type}")
+        logger.info(f"   Size: {upload.content.size} bytes (sha256 {upload.content.sha256[:12]})")
 
-            return JSONResponse(
-                {
-                    "success": True,
-                    "attachment_id": attachment_id,
-                    "size": len(file_bytes),
-                }
-            )
+        return JSONResponse(
+            {
+                "success": True,
+                "attachment_id": attachment_id,
+                "size": upload.content.size,
+            }
+        )
+    except AttachmentTooLargeError as e:
+        logger.warning(f"⚠️ Rejected upload for {attachment_id}: {e}")
+        return JSONResponse(
+            {"success": False, "error": str(e), "attachment_id": attachment_id},
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
     except Exception as e:
         logger.error(f"❌ Failed to handle file upload for {attachment_id}: {e}")
         import traceback
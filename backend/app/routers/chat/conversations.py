@@ -1,25 +1,22 @@
 """
-Conversations Router - In-Memory Implementation for Backend V2.
+Conversations Router for Backend V2.
 
-Provides conversation management WITHOUT database persistence.
-Conversations are stored in memory and lost on restart.
-
-This is a simplified version for demonstration and testing purposes.
-For production use with persistence, consider:
-- External state management (Redis, etc.)
-- Client-side conversation storage
-- Migrate to full backend with database
+Provides conversation management backed by the conversation store
+(app/services/chat/conversation_store.py): SQL tables shared by every
+uvicorn worker, on Postgres (CONVERSATIONS_DATABASE_URL) or a local SQLite
+file. Listings use indexes, messages support cursor pagination and stats
+come from counters.
 """
 from __future__ import annotations
 
 import logging
-from datetime import datetime
 from typing import Dict, List, Optional
-from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
+from app.services.chat.conversation_store import get_conversation_store
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -28,14 +25,6 @@ router = APIRouter(
 )
 
 
-# ============================================================================
-# In-Memory Storage (lost on restart)
-# ============================================================================
-
-# Structure: {conversation_id: ConversationData}
-_conversations_store: Dict[str, "ConversationData"] = {}
-
-
 # ============================================================================
 # Models
 # ============================================================================
@@ -56,6 +45,7 @@ class ConversationData(BaseModel):
     title: Optional[str] = None
     messages: List[MessageData] = Field(default_factory=list)
     metadata: Optional[Dict] = None
+    message_count: int = 0
     created_at: str
     updated_at: str
 
@@ -81,9 +71,7 @@ class AddMessageRequest(BaseModel):
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_conversation(request: CreateConversationRequest):
     """
-    Create a new conversation (in-memory).
-
-    **Note**: Conversations are stored in memory and will be lost on server restart.
+    Create a new conversation.
 
     Example:
         ```python
@@ -95,27 +83,20 @@ async def create_conversation(request: CreateConversationRequest):
         conversation_id = response.json()["data"]["id"]
         ```
     """
-    conversation_id = str(uuid4())
-    now = datetime.utcnow().isoformat()
-
     conversation = ConversationData(
-        id=conversation_id,
-        user_id=request.user_id,
-        company_id=request.company_id,
-        title=request.title or f"Conversation {conversation_id[:8]}",
-        messages=[],
-        metadata=request.metadata,
-        created_at=now,
-        updated_at=now,
+        **await get_conversation_store().create_conversation(
+            user_id=request.user_id,
+            company_id=request.company_id,
+            title=request.title,
+            conversation_metadata=request.metadata,
+        )
     )
 
-    _conversations_store[conversation_id] = conversation
-
-    logger.info(f"✅ Created conversation {conversation_id} for user {request.user_id}")
+    logger.info(f"✅ Created conversation {conversation.id} for user {request.user_id}")
 
     return {
         "data": conversation.model_dump(),
-        "message": "Conversation created successfully (in-memory)"
+        "message": "Conversation created successfully"
     }
 
 
@@ -125,13 +106,13 @@ async def list_conversations(
     company_id: Optional[str] = Query(None, description="Filter by company ID"),
     skip: int = Query(0, ge=0, description="Skip N conversations"),
     limit: int = Query(50, ge=1, le=100, description="Max conversations to return"),
+    include_messages: bool = Query(True, description="Include each conversation's messages"),
 ):
     """
-    List conversations (in-memory).
-
-    Supports filtering by user_id and company_id.
+    List conversations, most recently updated first.
 
-    **Note**: Only returns conversations from current server session.
+    Supports filtering by user_id and company_id. Pass include_messages=false
+    to list threads without loading their messages.
 
     Example:
         ```python
@@ -139,24 +120,16 @@ async def list_conversations(
         conversations = response.json()["data"]
         ```
     """
-    # Filter conversations
-    conversations = list(_conversations_store.values())
-
-    if user_id:
-        conversations = [c for c in conversations if c.user_id == user_id]
-
-    if company_id:
-        conversations = [c for c in conversations if c.company_id == company_id]
-
-    # Sort by updated_at (most recent first)
-    conversations.sort(key=lambda c: c.updated_at, reverse=True)
-
-    # Pagination
-    total = len(conversations)
-    conversations = conversations[skip:skip + limit]
+    conversations, total = await get_conversation_store().list_conversations(
+        user_id=user_id,
+        company_id=company_id,
+        skip=skip,
+        limit=limit,
+        include_messages=include_messages,
+    )
 
     return {
-        "data": [c.model_dump() for c in conversations],
+        "data": [ConversationData(**c).model_dump() for c in conversations],
         "pagination": {
             "skip": skip,
             "limit": limit,
@@ -168,7 +141,7 @@ async def list_conversations(
 @router.get("/{conversation_id}")
 async def get_conversation(conversation_id: str):
     """
-    Get a conversation by ID (in-memory).
+    Get a conversation by ID.
 
     Returns the conversation with all messages.
 
@@ -179,21 +152,21 @@ async def get_conversation(conversation_id: str):
         messages = conversation["messages"]
         ```
     """
-    conversation = _conversations_store.get(conversation_id)
+    conversation = await get_conversation_store().get_conversation(conversation_id)
 
     if not conversation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversation {conversation_id} not found (may have been lost on server restart)"
+            detail=f"Conversation {conversation_id} not found"
         )
 
-    return {"data": conversation.model_dump()}
+    return {"data": ConversationData(**conversation).model_dump()}
 
 
 @router.post("/{conversation_id}/messages", status_code=status.HTTP_201_CREATED)
 async def add_message(conversation_id: str, request: AddMessageRequest):
     """
-    Add a message to a conversation (in-memory).
+    Add a message to a conversation.
 
     Example:
         ```python
@@ -210,28 +183,20 @@ async def add_message(conversation_id: str, request: AddMessageRequest):
         })
         ```
     """
-    conversation = _conversations_store.get(conversation_id)
+    message = await get_conversation_store().add_message(
+        conversation_id, request.role, request.content
+    )
 
-    if not conversation:
+    if not message:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Conversation {conversation_id} not found"
         )
 
-    message = MessageData(
-        id=str(uuid4()),
-        role=request.role,
-        content=request.content,
-        created_at=datetime.utcnow().isoformat(),
-    )
-
-    conversation.messages.append(message)
-    conversation.updated_at = datetime.utcnow().isoformat()
-
     logger.info(f"✅ Added {request.role} message to conversation {conversation_id}")
 
     return {
-        "data": message.model_dump(),
+        "data": MessageData(**message).model_dump(),
         "message": "Message added successfully"
     }
 
@@ -239,38 +204,50 @@ async def add_message(conversation_id: str, request: AddMessageRequest):
 @router.get("/{conversation_id}/messages")
 async def list_messages(
     conversation_id: str,
-    skip: int = Query(0, ge=0, description="Skip N messages"),
+    skip: int = Query(0, ge=0, description="Skip N messages (ignored with cursor)"),
     limit: int = Query(100, ge=1, le=200, description="Max messages to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ):
     """
-    Get messages for a conversation (in-memory).
+    Get messages for a conversation.
 
-    Returns messages in chronological order.
+    Returns messages in chronological order. Follow pagination.next_cursor
+    to page through long conversations (null on the last page).
 
     Example:
         ```python
         response = requests.get(f"/api/conversations/{conversation_id}/messages")
         messages = response.json()["data"]
+        next_cursor = response.json()["pagination"]["next_cursor"]
         ```
     """
-    conversation = _conversations_store.get(conversation_id)
+    try:
+        position = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {cursor}"
+        )
 
-    if not conversation:
+    page = await get_conversation_store().list_messages(
+        conversation_id, skip=skip, limit=limit, cursor=position
+    )
+
+    if page is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Conversation {conversation_id} not found"
         )
 
-    # Pagination
-    total = len(conversation.messages)
-    messages = conversation.messages[skip:skip + limit]
+    messages, total, next_cursor = page
 
     return {
-        "data": [m.model_dump() for m in messages],
+        "data": [MessageData(**m).model_dump() for m in messages],
         "pagination": {
             "skip": skip,
             "limit": limit,
             "total": total,
+            "next_cursor": next_cursor,
         }
     }
 
@@ -278,20 +255,19 @@ async def list_messages(
 @router.delete("/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_conversation(conversation_id: str):
     """
-    Delete a conversation (in-memory).
+    Delete a conversation and its messages.
 
     Example:
         ```python
         requests.delete(f"/api/conversations/{conversation_id}")
         ```
     """
-    if conversation_id not in _conversations_store:
+    if not await get_conversation_store().delete_conversation(conversation_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Conversation {conversation_id} not found"
         )
 
-    del _conversations_store[conversation_id]
     logger.info(f"🗑️  Deleted conversation {conversation_id}")
 
     return None
@@ -300,9 +276,9 @@ async def delete_conversation(conversation_id: str):
 @router.get("/stats/summary")
 async def get_stats():
     """
-    Get conversation statistics (in-memory).
+    Get conversation statistics.
 
-    Returns summary stats about current conversations.
+    Returns summary stats about stored conversations (read from counters).
 
     Example:
         ```python
@@ -311,19 +287,13 @@ async def get_stats():
         print(f"Total conversations: {stats['total_conversations']}")
         ```
     """
-    total_conversations = len(_conversations_store)
-    total_messages = sum(len(c.messages) for c in _conversations_store.values())
-
-    unique_users = len(set(c.user_id for c in _conversations_store.values()))
-    unique_companies = len(set(c.company_id for c in _conversations_store.values() if c.company_id))
+    store = get_conversation_store()
+    stats = await store.get_stats()
 
     return {
         "data": {
-            "total_conversations": total_conversations,
-            "total_messages": total_messages,
-            "unique_users": unique_users,
-            "unique_companies": unique_companies,
-            "storage": "in-memory (volatile)",
+            **stats,
+            "storage": store.backend,
         }
     }
 
@@ -331,7 +301,7 @@ async def get_stats():
 @router.post("/clear", status_code=status.HTTP_200_OK)
 async def clear_all_conversations():
     """
-    Clear all conversations from memory.
+    Clear all conversations.
 
     **Warning**: This deletes ALL conversations permanently.
     Use only for testing/development.
@@ -341,12 +311,11 @@ async def clear_all_conversations():
         requests.post("/api/conversations/clear")
         ```
     """
-    count = len(_conversations_store)
-    _conversations_store.clear()
+    count = await get_conversation_store().clear()
 
-    logger.warning(f"⚠️  Cleared all {count} conversations from memory")
+    logger.warning(f"⚠️  Cleared all {count} conversations")
 
     return {
-        "message": f"Cleared {count} conversations from memory",
+        "message": f"Cleared {count} conversations",
         "warning": "All conversation data has been permanently deleted"
     }
@@ -1,22 +1,26 @@
 """
 Webhook routes - handle incoming WhatsApp messages from Kapso.
 
-This is the core orchestrator for inbound messages.
+The webhook only validates, dedupes and enqueues; messages are processed
+by Celery workers (see app.services.whatsapp.inbound_queue).
 """
 
+import asyncio
 import json
 import logging
 import os
 from typing import Any
 
-from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Request, status
 
 from app.config.supabase import get_supabase_client
-from app.services.whatsapp import (
-    WhatsAppAgentRunner,
-    WhatsAppService,
-    authenticate_user_by_whatsapp,
+from app.services.whatsapp import WhatsAppService
+from app.services.whatsapp.inbound import (
+    InboundMessage,
+    parse_inbound_event,
+    process_inbound_message,
 )
+from app.services.whatsapp.inbound_queue import get_inbound_queue
 from ..schemas import WebhookResponse
 
 logger = logging.getLogger(__name__)
@@ -27,6 +31,7 @@ router = APIRouter()
 @router.post("/webhook", response_model=WebhookResponse)
 async def handle_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     x_webhook_signature: str = Header(..., description="HMAC signature"),
     x_webhook_batch: str = Header(default="false", description="Batch indicator"),
 ):
@@ -35,12 +40,16 @@ async def handle_webhook(
 
     This endpoint:
     1. Validates HMAC signature
-    2. Authenticates user by phone number
-    3. Processes the message
-    4. Sends response back via WhatsApp
+    2. Extracts inbound messages and dedupes them by message ID
+    3. Enqueues them per conversation and returns immediately
+       (workers authenticate the user, run the agent and reply)
+
+    Answers 503 when the queue is too deep (backpressure): Kapso redelivers
+    later and the messages already accepted are deduped.
 
     Args:
         request: FastAPI request
+        background_tasks: Used to process inline if the queue is unavailable
         x_webhook_signature: HMAC signature header
         x_webhook_batch: Batch processing indicator
 
@@ -93,221 +102,88 @@ async def handle_webhook(
 
     logger.info(f"Processing {len(events_to_process)} webhook event(s)")
 
-    # Get Supabase client
-    supabase = get_supabase_client()
-    whatsapp_service = WhatsAppService(supabase)
-
-    processed_count = 0
-    last_conversation_id = None
-
-    for event_data in events_to_process:
-        try:
-            result = await _process_single_event(
-                event_data=event_data,
-                supabase=supabase,
-                whatsapp_service=whatsapp_service,
-            )
-            if result:
-                processed_count += 1
-                last_conversation_id = result.get("conversation_id")
-
-        except Exception as e:
-            logger.error(f"Error processing event: {e}", exc_info=True)
-            # Continue processing other events
-
-    return WebhookResponse(
-        success=True,
-        message=f"Processed {processed_count} event(s)",
-        conversation_id=last_conversation_id,
-        processed_events=processed_count,
-    )
-
-
-async def _process_single_event(
-    event_data: dict[str, Any],
-    supabase: Any,
-    whatsapp_service: WhatsAppService,
-) -> dict[str, Any] | None:
-    """
-    Process a single webhook event.
-
-    Args:
-        event_data: Event data from webhook
-        supabase: Supabase client
-        whatsapp_service: WhatsApp service instance
-
-    Returns:
-        Processing result dict or None
-    """
-    # Extract message and conversation data
-    # Kapso sends data directly in root (no event_type wrapper)
-    message_data = event_data.get("message", {})
-    conversation_data = event_data.get("conversation", {})
-
-    # Check if this is a message event
-    if not message_data:
-        logger.info("No message data found, skipping event")
-        return None
-
-    # Get direction from Kapso metadata
-    direction = message_data.get("kapso", {}).get("direction")
-
-    logger.info(f"Processing message with direction: {direction}")
-
-    # Only process inbound messages
-    if direction != "inbound":
-        logger.info(f"Ignoring {direction} message")
-        return None
-
-    # Get message content (V2: text.body, V1: content)
-    message_content = ""
-    if "text" in message_data and isinstance(message_data["text"], dict):
-        message_content = message_data["text"].get("body", "")
-    else:
-        message_content = message_data.get("content", "")
-
-    if not message_content:
-        logger.warning("No message content found")
-        return None
-
-    # Get sender phone
-    sender_phone = message_data.get("from")
-    if not sender_phone:
-        logger.error("No sender phone found in message")
-        return None
-
-    # Normalize phone (add + prefix if missing)
-    if not sender_phone.startswith("+"):
-        sender_phone = f"+{sender_phone}"
-
-    # Get conversation ID
-    conversation_id = conversation_data.get("id")
-    if not conversation_id:
-        logger.error("No conversation ID found")
-        return None
-
-    # Get message ID
-    message_id = message_data.get("id")
-
-    logger.info(f"Processing inbound message from {sender_phone}")
-
-    # Authenticate user by phone
-    authenticated_user_id = await authenticate_user_by_whatsapp(supabase, sender_phone)
-
-    if not authenticated_user_id:
-        # User not found - send registration message
-        logger.warning(f"User not found for phone: {sender_phone}")
-
-        contact_name = conversation_data.get("contact_name", "")
-        greeting = f"¡Hola {contact_name}! 👋\n\n" if contact_name else "¡Hola! 👋\n\n"
-
-        response_message = (
-            f"{greeting}"
-            "No te encontramos en nuestro sistema. "
-            "Por favor, regístrate en https://app.fizko.ai para acceder a nuestros servicios."
+    messages = [
+        message
+        for message in (parse_inbound_event(event_data) for event_data in events_to_process)
+        if message is not None
+    ]
+    last_conversation_id = messages[-1].conversation_id if messages else None
+
+    if not messages:
+        return WebhookResponse(
+            success=True,
+            message="No inbound messages",
+            conversation_id=None,
+            processed_events=0,
         )
 
-        await whatsapp_service.send_text(
-            conversation_id=conversation_id,
-            message=response_message,
+    queue = get_inbound_queue()
+    # The first check (and each retry after a backoff) pings Redis: keep it off the loop
+    if not await asyncio.to_thread(lambda: queue.available):
+        # No Redis: still acknowledge now, process after the response
+        logger.warning("WhatsApp inbound queue unavailable - processing in background")
+        background_tasks.add_task(_process_messages_inline, messages)
+        return WebhookResponse(
+            success=True,
+            message=f"Accepted {len(messages)} message(s)",
+            conversation_id=last_conversation_id,
+            processed_events=len(messages),
         )
 
-        return {"conversation_id": conversation_id, "authenticated": False}
-
-    # Get user's company_id from sessions table (user can have multiple companies)
-    client = supabase.client if hasattr(supabase, 'client') else supabase
     try:
-        # Get active session for user
-        session_response = (
-            client.table("sessions")
-            .select("company_id, is_active")
-            .eq("user_id", str(authenticated_user_id))
-            .eq("is_active", True)
-            .order("last_accessed_at", desc=True)
-            .limit(1)
-            .execute()
-        )
-
-        # Check if we got data
-        if not session_response.data or len(session_response.data) == 0:
-            logger.error(f"No active session found for user: {authenticated_user_id}")
-            response_message = "No encontramos una sesión activa. Por favor inicia sesión en la app primero."
-            await whatsapp_service.send_text(
-                conversation_id=conversation_id,
-                message=response_message,
-            )
-            return {"conversation_id": conversation_id, "authenticated": True, "error": "no_session"}
-
-        session = session_response.data[0]
-        company_id = session["company_id"]
-
-        if not company_id:
-            logger.error(f"No company_id in session for user: {authenticated_user_id}")
-            response_message = "Tu sesión no está asociada a una empresa. Por favor contacta a soporte."
-            await whatsapp_service.send_text(
-                conversation_id=conversation_id,
-                message=response_message,
-            )
-            return {"conversation_id": conversation_id, "authenticated": True, "error": "no_company"}
-
+        # Redis round trips off the event loop
+        result = await asyncio.to_thread(queue.enqueue, messages)
+        await asyncio.to_thread(_schedule_conversations, queue, result.to_schedule)
     except Exception as e:
-        logger.error(f"Error loading session for user {authenticated_user_id}: {e}", exc_info=True)
-        response_message = "Ocurrió un error al cargar tu sesión. Por favor intenta nuevamente."
-        await whatsapp_service.send_text(
-            conversation_id=conversation_id,
-            message=response_message,
+        # Kapso redelivers; messages that made it in are deduped
+        logger.error(f"Error enqueueing WhatsApp messages: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Inbound queue unavailable, retry later",
+            headers={"Retry-After": "30"},
         )
-        return {"conversation_id": conversation_id, "authenticated": True, "error": "session_load_error"}
 
-    # Execute agent with message
     logger.info(
-        f"🤖 Executing agent for user {authenticated_user_id} | "
-        f"company {company_id} | message: {message_content[:50]}..."
+        f"📥 WhatsApp webhook: queued={result.queued}, duplicates={result.duplicates}, "
+        f"rejected={result.rejected}"
     )
 
-    try:
-        agent_runner = WhatsAppAgentRunner(supabase=supabase)
-        response_message = await agent_runner.run(
-            user_id=str(authenticated_user_id),
-            company_id=str(company_id),
-            thread_id=conversation_id,  # Use conversation_id as thread_id
-            message=message_content,
-            metadata={
-                "phone": sender_phone,
-                "conversation_id": conversation_id,
-                "message_id": message_id,
-            },
+    if result.rejected:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Inbound queue is full, retry later",
+            headers={"Retry-After": "30"},
         )
 
-        logger.info(
-            f"✅ Agent response generated: {len(response_message)} chars | "
-            f"conversation {conversation_id}"
-        )
+    return WebhookResponse(
+        success=True,
+        message=f"Queued {result.queued} message(s)",
+        conversation_id=last_conversation_id,
+        processed_events=result.queued,
+    )
 
-    except Exception as e:
-        logger.error(f"❌ Error executing agent: {e}", exc_info=True)
-        response_message = "Lo siento, ocurrió un error al procesar tu mensaje. Por favor intenta nuevamente."
 
-    # Send response
-    logger.info(f"Sending response to conversation {conversation_id}")
+def _schedule_conversations(queue: Any, conversation_ids: list[str]) -> None:
+    """Start a worker for each newly claimed conversation."""
+    from app.infrastructure.celery.tasks.whatsapp import process_conversation
 
-    try:
-        result = await whatsapp_service.send_text(
-            conversation_id=conversation_id,
-            message=response_message,
-        )
-        logger.info(f"Message sent successfully: {result}")
-    except Exception as e:
-        logger.error(f"Error sending message: {e}", exc_info=True)
-        raise
+    for conversation_id in conversation_ids:
+        try:
+            process_conversation.apply_async(args=[conversation_id])
+        except Exception as e:
+            # Let the next message claim the conversation again
+            logger.error(f"Error scheduling conversation {conversation_id}: {e}", exc_info=True)
+            queue.release_claim(conversation_id)
 
-    # TODO: Save conversation and messages to database
 
-    logger.info(f"Successfully processed message for user: {authenticated_user_id}")
+async def _process_messages_inline(messages: list[InboundMessage]) -> None:
+    """Process messages in order within this process (queue fallback)."""
+    supabase = get_supabase_client()
+    whatsapp_service = WhatsAppService(supabase)
 
-    return {
-        "conversation_id": conversation_id,
-        "authenticated": True,
-        "user_id": str(authenticated_user_id),
-        "company_id": str(company_id),
-    }
+    for message in messages:
+        try:
+            await process_inbound_message(message, supabase, whatsapp_service)
+        except Exception as e:
+            logger.error(f"Error processing event: {e}", exc_info=True)
+            # Continue processing other events
@@ -288,6 +288,10 @@ class PhoneAuthService:
         # Create or get user (returns user_dict, email, one_time_password)
         user, email, one_time_password = await self._create_or_get_user(phone_number)
 
+        # A (re)login can link the phone to a user or change the active company
+        from app.services.whatsapp.identity_cache import identity_cache
+        identity_cache.invalidate_phone(phone_number)
+
         return {
             "user": user,  # user dict with id, phone, email, created_at
             "email": email,  # Email for Supabase auth
@@ -13,9 +13,10 @@ import time
 from typing import Dict, Any
 from uuid import UUID
 
-from openai import AsyncOpenAI
-
+from app.agents.orchestration.multi_agent_orchestrator import get_openai_client
+from app.agents.orchestration.query_router import query_router
 from app.agents.runner_v2 import AgentRunnerV2, AgentExecutionRequest
+from app.utils.cache import BoundedCache
 
 logger = logging.getLogger(__name__)
 
@@ -33,18 +34,22 @@ class ChatService:
 
     def __init__(self):
         """Initialize chat service with v2 runner."""
-        # Initialize OpenAI client
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
-
-        self.openai_client = AsyncOpenAI(api_key=api_key)
+        # Process-wide OpenAI client, shared with the compiled agent sets
+        self.openai_client = get_openai_client()
 
         # Initialize AgentRunnerV2
         self.runner = AgentRunnerV2(openai_client=self.openai_client)
 
-        # Cache for orchestrators (by thread_id)
-        self._orchestrator_cache: Dict[str, Any] = {}
+        # Cache for orchestrators (by thread_id), bounded by count and idle time
+        self._orchestrator_cache: BoundedCache[str, Any] = BoundedCache(
+            "chat_service.orchestrators",
+            max_items=int(os.getenv("ORCHESTRATOR_CACHE_MAX_ITEMS", 1000)),
+            ttl_seconds=float(os.getenv("ORCHESTRATOR_CACHE_TTL_SECONDS", 6 * 3600)),
+            sliding_ttl=True,
+            on_evict=lambda thread_id, orchestrator, reason: (
+                orchestrator.session_manager.forget_thread(thread_id)
+            ),
+        )
 
     async def execute(
         self,
@@ -187,7 +192,8 @@ Pregunta del usuario: {message}"""
         """
         Get or create orchestrator for a thread.
 
-        Orchestrator is cached per thread_id to maintain agent instances.
+        Orchestrator is cached per thread_id; the agents inside are compiled
+        once per process and shared between threads.
 
         Args:
             thread_id: Thread ID
@@ -198,8 +204,9 @@ Pregunta del usuario: {message}"""
             MultiAgentOrchestrator instance
         """
         # Check cache first
-        if thread_id in self._orchestrator_cache:
-            return self._orchestrator_cache[thread_id]
+        cached = self._orchestrator_cache.get(thread_id)
+        if cached is not None:
+            return cached
 
         # Create new orchestrator
         from app.agents.orchestration.multi_agent_orchestrator import (
@@ -283,8 +290,10 @@ Pregunta del usuario: {message}"""
                       If None, clears entire cache.
         """
         if thread_id:
+            query_router.forget_thread(thread_id)
             if thread_id in self._orchestrator_cache:
-                del self._orchestrator_cache[thread_id]
+                orchestrator = self._orchestrator_cache.pop(thread_id)
+                orchestrator.session_manager.forget_thread(thread_id)
                 logger.info(f"🗑️ Cleared cache for thread: {thread_id}")
         else:
             self._orchestrator_cache.clear()
@@ -0,0 +1,560 @@
+"""
+Durable store for the conversations router.
+
+Conversations used to live in a module-level dict: lost on restart, not
+shared between uvicorn workers, and listing / stats scanned every thread.
+They are now kept in SQL tables (SQLAlchemy Core):
+
+- chat_conversations: indexed by (user_id, updated_at),
+  (company_id, updated_at) and updated_at, so filtered listings are
+  index range scans
+- chat_messages: ordered by an autoincrement seq, which doubles as the
+  message pagination cursor
+- chat_conversation_owners: conversations per user / company, updated in
+  the same transaction as each create or delete, so filtered totals are O(1)
+
+Each message only bumps its own conversation's message_count; global stats
+are aggregated on read instead of from a shared counter row, which every
+write would have to lock.
+
+CONVERSATIONS_DATABASE_URL selects the database (e.g. postgresql://...,
+psycopg2); the Postgres tables come from the supabase migration
+20251204000000_chat_conversation_store.sql. Without it a local SQLite file
+stands in (sessions/conversations.db, WAL mode, shared by the workers of one
+host), created on first use. Engine calls block, so they run in a thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_SQLITE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "sessions", "conversations.db"
+)
+
+OWNER_USER = "user"
+OWNER_COMPANY = "company"
+
+metadata = MetaData()
+
+conversations_table = Table(
+    "chat_conversations",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("user_id", String(255), nullable=False),
+    Column("company_id", String(255)),
+    Column("title", Text),
+    Column("metadata", JSON),
+    Column("message_count", Integer, nullable=False, default=0),
+    Column("created_at", String(32), nullable=False),
+    Column("updated_at", String(32), nullable=False),
+    Index("ix_chat_conversations_user_updated", "user_id", "updated_at"),
+    Index("ix_chat_conversations_company_updated", "company_id", "updated_at"),
+    Index("ix_chat_conversations_updated", "updated_at"),
+)
+
+messages_table = Table(
+    "chat_messages",
+    metadata,
+    Column(
+        "seq",
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    ),
+    Column("id", String(36), nullable=False, unique=True),
+    Column(
+        "conversation_id",
+        String(36),
+        ForeignKey("chat_conversations.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("role", String(32), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("created_at", String(32), nullable=False),
+    Index("ix_chat_messages_conversation_seq", "conversation_id", "seq"),
+)
+
+owners_table = Table(
+    "chat_conversation_owners",
+    metadata,
+    Column("kind", String(16), primary_key=True),
+    Column("owner_id", String(255), primary_key=True),
+    Column("conversation_count", Integer, nullable=False),
+)
+
+
+def _now() -> str:
+    # Fixed-width timestamps so string order matches time order
+    return datetime.utcnow().isoformat(timespec="microseconds")
+
+
+def _conversation_dict(row: Any) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "company_id": row.company_id,
+        "title": row.title,
+        "metadata": row.metadata,
+        "message_count": row.message_count,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+def _message_dict(row: Any) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "role": row.role,
+        "content": row.content,
+        "created_at": row.created_at,
+    }
+
+
+class ConversationStore:
+    """
+    SQL-backed conversation store.
+
+    Public methods are async and run the blocking engine calls in a thread;
+    each write is a single transaction that also updates the owner counters.
+    """
+
+    def __init__(self, url: str, pool_size: int = DEFAULT_POOL_SIZE):
+        self.url = url
+        self.engine = self._create_engine(url, pool_size)
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    @property
+    def backend(self) -> str:
+        return self.engine.dialect.name
+
+    @staticmethod
+    def _create_engine(url: str, pool_size: int) -> Engine:
+        if not url.startswith("sqlite"):
+            return create_engine(
+                url,
+                pool_size=pool_size,
+                max_overflow=pool_size,
+                pool_pre_ping=True,
+            )
+
+        engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 30})
+
+        @event.listens_for(engine, "connect")
+        def _sqlite_pragmas(dbapi_connection, _record):
+            cursor = dbapi_connection.cursor()
+            # WAL: readers don't block the writer (several uvicorn workers)
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+        return engine
+
+    def _ensure_ready(self) -> None:
+        if self._ready:
+            return
+        with self._ready_lock:
+            if self._ready:
+                return
+            # Postgres tables are managed by the supabase migrations
+            if self.backend == "sqlite":
+                metadata.create_all(self.engine)
+            self._ready = True
+            logger.info(f"💾 Conversation store ready ({self.backend})")
+
+    async def _run(self, fn, *args: Any) -> Any:
+        def call():
+            self._ensure_ready()
+            return fn(*args)
+
+        return await asyncio.to_thread(call)
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    def _insert_stmt(self, table: Table):
+        if self.backend == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        return dialect_insert(table)
+
+    def _increment_owner(self, conn: Connection, kind: str, owner_id: str) -> bool:
+        """Count a new conversation for an owner; True if it's the owner's first."""
+        stmt = self._insert_stmt(owners_table).values(
+            kind=kind, owner_id=owner_id, conversation_count=1
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[owners_table.c.kind, owners_table.c.owner_id],
+            set_={"conversation_count": owners_table.c.conversation_count + 1},
+        ).returning(owners_table.c.conversation_count)
+        return conn.execute(stmt).scalar_one() == 1
+
+    def _decrement_owner(self, conn: Connection, kind: str, owner_id: str) -> bool:
+        """Uncount a deleted conversation; True if the owner has none left."""
+        key = (owners_table.c.kind == kind) & (owners_table.c.owner_id == owner_id)
+        remaining = conn.execute(
+            update(owners_table)
+            .where(key)
+            .values(conversation_count=owners_table.c.conversation_count - 1)
+            .returning(owners_table.c.conversation_count)
+        ).scalar_one_or_none()
+        if remaining is not None and remaining <= 0:
+            conn.execute(delete(owners_table).where(key))
+            return True
+        return False
+
+    def _owner_count(self, conn: Connection, kind: str, owner_id: str) -> int:
+        count = conn.execute(
+            select(owners_table.c.conversation_count).where(
+                (owners_table.c.kind == kind) & (owners_table.c.owner_id == owner_id)
+            )
+        ).scalar_one_or_none()
+        return count or 0
+
+    # ------------------------------------------------------------------
+    # Conversations
+    # ------------------------------------------------------------------
+
+    def _create_conversation(
+        self,
+        user_id: str,
+        company_id: Optional[str],
+        title: Optional[str],
+        conversation_metadata: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        conversation_id = str(uuid4())
+        now = _now()
+        row = {
+            "id": conversation_id,
+            "user_id": user_id,
+            "company_id": company_id,
+            "title": title or f"Conversation {conversation_id[:8]}",
+            "metadata": conversation_metadata,
+            "message_count": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        with self.engine.begin() as conn:
+            conn.execute(insert(conversations_table).values(**row))
+            self._increment_owner(conn, OWNER_USER, user_id)
+            if company_id:
+                self._increment_owner(conn, OWNER_COMPANY, company_id)
+        return row
+
+    async def create_conversation(
+        self,
+        user_id: str,
+        company_id: Optional[str] = None,
+        title: Optional[str] = None,
+        conversation_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Create a conversation and return it (without messages)."""
+        return await self._run(
+            self._create_conversation, user_id, company_id, title, conversation_metadata
+        )
+
+    def _messages_by_conversation(
+        self, conn: Connection, conversation_ids: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        grouped: Dict[str, List[Dict[str, Any]]] = {cid: [] for cid in conversation_ids}
+        if not conversation_ids:
+            return grouped
+        rows = conn.execute(
+            select(messages_table)
+            .where(messages_table.c.conversation_id.in_(conversation_ids))
+            .order_by(messages_table.c.conversation_id, messages_table.c.seq)
+        )
+        for row in rows:
+            grouped[row.conversation_id].append(_message_dict(row))
+        return grouped
+
+    def _list_conversations(
+        self,
+        user_id: Optional[str],
+        company_id: Optional[str],
+        skip: int,
+        limit: int,
+        include_messages: bool,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        conditions = []
+        if user_id:
+            conditions.append(conversations_table.c.user_id == user_id)
+        if company_id:
+            conditions.append(conversations_table.c.company_id == company_id)
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(conversations_table)
+                .where(*conditions)
+                .order_by(conversations_table.c.updated_at.desc(), conversations_table.c.id)
+                .offset(skip)
+                .limit(limit)
+            ).all()
+            conversations = [_conversation_dict(row) for row in rows]
+
+            # Per-owner totals from counters; otherwise an (indexed) count
+            if user_id and not company_id:
+                total = self._owner_count(conn, OWNER_USER, user_id)
+            elif company_id and not user_id:
+                total = self._owner_count(conn, OWNER_COMPANY, company_id)
+            else:
+                total = conn.execute(
+                    select(func.count()).select_from(conversations_table).where(*conditions)
+                ).scalar_one()
+
+            if include_messages:
+                grouped = self._messages_by_conversation(conn, [c["id"] for c in conversations])
+                for conversation in conversations:
+                    conversation["messages"] = grouped[conversation["id"]]
+
+        return conversations, total
+
+    async def list_conversations(
+        self,
+        user_id: Optional[str] = None,
+        company_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50,
+        include_messages: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List conversations, most recently updated first.
+
+        Returns:
+            (conversations, total matching the filters)
+        """
+        return await self._run(
+            self._list_conversations, user_id, company_id, skip, limit, include_messages
+        )
+
+    def _get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(conversations_table).where(conversations_table.c.id == conversation_id)
+            ).first()
+            if row is None:
+                return None
+            conversation = _conversation_dict(row)
+            conversation["messages"] = self._messages_by_conversation(
+                conn, [conversation_id]
+            )[conversation_id]
+        return conversation
+
+    async def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Get a conversation with all its messages (None if not found)."""
+        return await self._run(self._get_conversation, conversation_id)
+
+    def _delete_conversation(self, conversation_id: str) -> bool:
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                select(conversations_table)
+                .where(conversations_table.c.id == conversation_id)
+                .with_for_update()
+            ).first()
+            if row is None:
+                return False
+
+            conn.execute(
+                delete(messages_table).where(messages_table.c.conversation_id == conversation_id)
+            )
+            conn.execute(
+                delete(conversations_table).where(conversations_table.c.id == conversation_id)
+            )
+            self._decrement_owner(conn, OWNER_USER, row.user_id)
+            if row.company_id:
+                self._decrement_owner(conn, OWNER_COMPANY, row.company_id)
+        return True
+
+    async def delete_conversation(self, conversation_id: str) -> bool:
+        """Delete a conversation and its messages; False if not found."""
+        return await self._run(self._delete_conversation, conversation_id)
+
+    # ------------------------------------------------------------------
+    # Messages
+    # ------------------------------------------------------------------
+
+    def _add_message(
+        self, conversation_id: str, role: str, content: str
+    ) -> Optional[Dict[str, Any]]:
+        now = _now()
+        message = {"id": str(uuid4()), "role": role, "content": content, "created_at": now}
+        with self.engine.begin() as conn:
+            # Bump the conversation first: locks the row against a concurrent delete
+            found = conn.execute(
+                update(conversations_table)
+                .where(conversations_table.c.id == conversation_id)
+                .values(
+                    message_count=conversations_table.c.message_count + 1,
+                    updated_at=now,
+                )
+            ).rowcount
+            if not found:
+                return None
+            conn.execute(
+                insert(messages_table).values(conversation_id=conversation_id, **message)
+            )
+        return message
+
+    async def add_message(
+        self, conversation_id: str, role: str, content: str
+    ) -> Optional[Dict[str, Any]]:
+        """Append a message (None if the conversation doesn't exist)."""
+        return await self._run(self._add_message, conversation_id, role, content)
+
+    def _list_messages(
+        self,
+        conversation_id: str,
+        skip: int,
+        limit: int,
+        cursor: Optional[int],
+    ) -> Optional[Tuple[List[Dict[str, Any]], int, Optional[str]]]:
+        with self.engine.connect() as conn:
+            total = conn.execute(
+                select(conversations_table.c.message_count)
+                .where(conversations_table.c.id == conversation_id)
+            ).scalar_one_or_none()
+            if total is None:
+                return None
+
+            query = (
+                select(messages_table)
+                .where(messages_table.c.conversation_id == conversation_id)
+                .order_by(messages_table.c.seq)
+                .limit(limit + 1)
+            )
+            if cursor is not None:
+                query = query.where(messages_table.c.seq > cursor)
+            elif skip:
+                query = query.offset(skip)
+            rows = conn.execute(query).all()
+
+        next_cursor = str(rows[limit - 1].seq) if len(rows) > limit else None
+        return [_message_dict(row) for row in rows[:limit]], total, next_cursor
+
+    async def list_messages(
+        self,
+        conversation_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ) -> Optional[Tuple[List[Dict[str, Any]], int, Optional[str]]]:
+        """
+        Page through a conversation's messages in chronological order.
+
+        Pass the returned next_cursor to get the following page (keyset
+        pagination, cost independent of the position); skip is only used
+        without a cursor.
+
+        Returns:
+            (messages, total, next_cursor), or None if the conversation
+            doesn't exist
+        """
+        return await self._run(self._list_messages, conversation_id, skip, limit, cursor)
+
+    # ------------------------------------------------------------------
+    # Stats / maintenance
+    # ------------------------------------------------------------------
+
+    def _get_stats(self) -> Dict[str, int]:
+        with self.engine.connect() as conn:
+            conversations = conn.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(conversations_table.c.message_count), 0),
+                )
+            ).one()
+            owners = dict(conn.execute(
+                select(owners_table.c.kind, func.count()).group_by(owners_table.c.kind)
+            ).all())
+        return {
+            "total_conversations": conversations[0],
+            "total_messages": int(conversations[1]),
+            "unique_users": owners.get(OWNER_USER, 0),
+            "unique_companies": owners.get(OWNER_COMPANY, 0),
+        }
+
+    async def get_stats(self) -> Dict[str, int]:
+        """Conversation / message / owner totals (aggregated on read)."""
+        return await self._run(self._get_stats)
+
+    def _clear(self) -> int:
+        with self.engine.begin() as conn:
+            conn.execute(delete(messages_table))
+            count = conn.execute(delete(conversations_table)).rowcount
+            conn.execute(delete(owners_table))
+        return count
+
+    async def clear(self) -> int:
+        """Delete every conversation; returns how many there were."""
+        return await self._run(self._clear)
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+_store: Optional[ConversationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store() -> ConversationStore:
+    """
+    Get the process-wide conversation store.
+
+    Uses CONVERSATIONS_DATABASE_URL, or the local SQLite file if unset.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                url = os.getenv("CONVERSATIONS_DATABASE_URL")
+                if not url:
+                    path = os.path.abspath(DEFAULT_SQLITE_PATH)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    url = f"sqlite:///{path}"
+                _store = ConversationStore(
+                    url,
+                    pool_size=int(os.getenv("CONVERSATIONS_DB_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                )
+    return _store
+
+
+def close_conversation_store() -> None:
+    """Dispose the store's connection pool (e.g. on application shutdown)."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
@@ -0,0 +1,56 @@
+"""
+Thread pool for F29 PDF parsing.
+
+F29PDFExtractor is pure-Python and CPU bound. Parsing runs in a small
+dedicated thread pool (F29_PDF_PARSE_WORKERS, default 2) so the event loop
+stays free and a batch download keeps fetching the next PDFs while earlier
+ones are parsed.
+
+Threads share the GIL, so parses do not run in parallel with each other. A
+process pool is not an option here: F29 batches run inside Celery prefork
+children, which are daemonic and cannot start child processes.
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from app.services.f29_pdf_extractor import extract_f29_data_from_pdf
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 2
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get (or create) the parse pool of this process."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = max(1, int(os.getenv("F29_PDF_PARSE_WORKERS", DEFAULT_MAX_WORKERS)))
+                _executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="f29-pdf-parse",
+                )
+                logger.debug(f"🧮 F29 PDF parse pool created (workers={workers})")
+    return _executor
+
+
+async def extract_f29_data(pdf_bytes: bytes) -> Dict[str, Any]:
+    """
+    Extract F29 data from a PDF without blocking the event loop.
+
+    Args:
+        pdf_bytes: PDF content
+
+    Returns:
+        Same dict as extract_f29_data_from_pdf
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), extract_f29_data_from_pdf, pdf_bytes)
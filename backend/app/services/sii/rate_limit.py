@@ -0,0 +1,79 @@
+"""
+Rate limiting for concurrent SII requests.
+
+SIIClient methods are blocking (requests/Selenium), so concurrent fetching
+runs them in worker threads. SIIRateLimiter bounds how many of those calls
+are in flight for one RUT and spaces out their start times so a backfill
+does not hammer the SII portal with a single company's session.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MIN_INTERVAL = 0.2  # seconds between request starts
+
+
+class SIIRateLimiter:
+    """
+    Per-RUT limiter: bounded concurrency plus a minimum interval between calls.
+
+    Create one instance per company sync (asyncio primitives are bound to the
+    event loop that first uses them).
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int | None = None,
+        min_interval: float | None = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrent: Max SII calls in flight (default: SII_FETCH_CONCURRENCY or 4)
+            min_interval: Min seconds between call starts
+                (default: SII_MIN_REQUEST_INTERVAL or 0.2)
+        """
+        if max_concurrent is None:
+            max_concurrent = int(os.getenv("SII_FETCH_CONCURRENCY", DEFAULT_MAX_CONCURRENT))
+        if min_interval is None:
+            min_interval = float(os.getenv("SII_MIN_REQUEST_INTERVAL", DEFAULT_MIN_INTERVAL))
+
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = max(0.0, min_interval)
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._spacing_lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def _wait_for_slot(self) -> None:
+        """Sleep until this call is allowed to start."""
+        async with self._spacing_lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            delay = self._next_start - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+                now = loop.time()
+            self._next_start = now + self.min_interval
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking SIIClient call in a worker thread under the limits.
+
+        Args:
+            func: Blocking callable (e.g. client.get_compras)
+            *args, **kwargs: Arguments for func
+
+        Returns:
+            Whatever func returns (exceptions propagate)
+        """
+        async with self._semaphore:
+            await self._wait_for_slot()
+            return await asyncio.to_thread(func, *args, **kwargs)
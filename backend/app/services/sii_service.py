@@ -11,9 +11,11 @@ Uses:
 - Supabase repositories for database operations
 
 IMPORTANT: All methods are async to work with Supabase async repositories.
-Celery tasks wrap these with asyncio.run() since Celery tasks are synchronous.
+Celery tasks run these on the worker event loop (infrastructure/celery/runtime.py).
 """
+import asyncio
 import logging
+import os
 from typing import Dict, Any, List
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
@@ -21,6 +23,7 @@ from dateutil.relativedelta import relativedelta
 from app.config.supabase import SupabaseClient
 from app.integrations.sii import SIIClient
 from app.integrations.sii.exceptions import AuthenticationError, ExtractionError
+from app.utils.data_version import bump_company_data_version
 from app.utils.encryption import decrypt_password
 from app.utils.rut import normalize_rut
 from app.services.sii.parsers import (
@@ -30,6 +33,7 @@ from app.services.sii.parsers import (
     parse_daily_sales_document,
     parse_honorarios_receipt,
 )
+from app.services.sii.rate_limit import SIIRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +64,9 @@ class SIIService:
         """
         Upsert contacts for documents and link them via contact_id.
 
+        Cost scales with the number of distinct counterparties, not documents:
+        RUTs are deduplicated and resolved with one bulk lookup and upsert.
+
         Args:
             company_id: Company UUID
             documents: List of document dicts (purchase or sales)
@@ -72,31 +79,33 @@ class SIIService:
         rut_field = "sender_rut" if contact_type == "provider" else "recipient_rut"
         name_field = "sender_name" if contact_type == "provider" else "recipient_name"
 
+        # Deduplicate counterparties (skip docs without RUT, e.g. daily summaries)
+        contacts: Dict[str, str] = {}
         for doc in documents:
             rut = doc.get(rut_field)
             name = doc.get(name_field)
+            if rut and name:
+                contacts.setdefault(rut, name)
 
-            # Skip if no RUT (e.g., daily summaries)
-            if not rut or not name:
-                continue
+        if not contacts:
+            return documents
 
-            try:
-                # Upsert contact
-                contact = await self.supabase.contacts.upsert_contact(
-                    company_id=company_id,
-                    rut=rut,
-                    business_name=name,
-                    contact_type=contact_type
-                )
+        contact_ids = await self.supabase.contacts.bulk_upsert_contacts(
+            company_id=company_id,
+            contacts=contacts,
+            contact_type=contact_type
+        )
 
-                # Link document to contact
-                if contact and contact.get("id"):
-                    doc["contact_id"] = contact["id"]
+        missing = len(contacts) - len(contact_ids)
+        if missing:
+            # Continue without linking those contacts (contact_id will be None)
+            logger.warning(f"⚠️  Failed to resolve {missing} of {len(contacts)} contacts")
 
-            except Exception as e:
-                logger.warning(f"⚠️  Failed to upsert contact for {name} ({rut}): {e}")
-                # Continue without linking contact (contact_id will be None)
-                continue
+        # Link documents to contacts
+        for doc in documents:
+            contact_id = contact_ids.get(doc.get(rut_field))
+            if contact_id:
+                doc["contact_id"] = contact_id
 
         return documents
 
@@ -153,410 +162,318 @@ class SIIService:
 
         logger.info(f"📅 Syncing periods: {periods} for company {company.get('business_name')}")
 
-        compras_stats = {"total": 0, "nuevos": 0, "actualizados": 0}
-        ventas_stats = {"total": 0, "nuevos": 0, "actualizados": 0}
-        honorarios_stats = {"total": 0, "nuevos": 0, "actualizados": 0}
         errors = 0
 
-        # Use SIIClient to extract documents
-        with SIIClient(tax_id=rut, password=sii_password) as client:
-            for period in periods:
-                try:
-                    logger.info(f"📥 Processing period {period}...")
-
-                    # Step 1: Get summary to know what document types exist
-                    try:
-                        resumen_result = client.get_resumen(periodo=period)
-                        resumen_data = resumen_result.get("data", {})
-                    except ExtractionError as e:
-                        logger.warning(f"⚠️  Could not get resumen for {period}: {e}")
-                        errors += 1
-                        continue
-
-                    # Process purchases (compras)
-                    compras_result = await self._sync_purchases_for_period(
-                        client, company_id, period, resumen_data
-                    )
-                    compras_stats["nuevos"] += compras_result["nuevos"]
-                    compras_stats["actualizados"] += compras_result["actualizados"]
-                    compras_stats["total"] += compras_result["total"]
+        # Use SIIClient to extract documents (all JSON APIs: Chrome only for login)
+        with SIIClient(tax_id=rut, password=sii_password, browserless=True) as client:
+            # Stage 1: fetch every period concurrently (bounded per RUT)
+            limiter = SIIRateLimiter()
+            period_results = await asyncio.gather(
+                *(self._fetch_period(client, limiter, period) for period in periods)
+            )
 
-                    # Process sales (ventas)
-                    ventas_result = await self._sync_sales_for_period(
-                        client, company_id, period, resumen_data
-                    )
-                    ventas_stats["nuevos"] += ventas_result["nuevos"]
-                    ventas_stats["actualizados"] += ventas_result["actualizados"]
-                    ventas_stats["total"] += ventas_result["total"]
-
-                    # Process honorarios receipts
-                    try:
-                        logger.info(f"   💼 Extracting honorarios receipts...")
-                        mes = period[4:6]  # Extract month from YYYYMM
-                        anio = period[:4]  # Extract year
-
-                        honorarios_result = client.get_boletas_honorarios_todas_paginas(
-                            mes=mes,
-                            anio=anio
-                        )
-
-                        boletas = honorarios_result.get("boletas", [])
-                        logger.info(f"   📋 Honorarios: {len(boletas)} receipts")
-
-                        parsed_honorarios = []
-                        for boleta in boletas:
-                            try:
-                                receipt_data = parse_honorarios_receipt(
-                                    company_id=company_id,
-                                    boleta=boleta,
-                                    period=period,
-                                    company_rut=rut,
-                                    company_name=company.get('business_name')
-                                )
-                                if receipt_data.get("folio") is not None:
-                                    parsed_honorarios.append(receipt_data)
-                            except Exception as e:
-                                logger.error(f"❌ Error parsing honorarios receipt: {e}")
-                                continue
-
-                        if parsed_honorarios:
-                            h_nuevos, h_actualizados = await self.supabase.honorarios.upsert_honorarios_receipts(
-                                parsed_honorarios
-                            )
-                            logger.info(f"   💾 Saved honorarios: {h_nuevos} nuevos, {h_actualizados} actualizados")
-                            honorarios_stats["nuevos"] += h_nuevos
-                            honorarios_stats["actualizados"] += h_actualizados
-                            honorarios_stats["total"] += len(parsed_honorarios)
-
-                    except ExtractionError as e:
-                        logger.warning(f"⚠️  Honorarios extraction error for {period}: {e}")
-                    except Exception as e:
-                        logger.error(f"❌ Error processing honorarios for {period}: {e}")
+        batches: List[Dict[str, Any]] = []
+        for result in period_results:
+            if not result["resumen_ok"]:
+                errors += 1
+            batches.extend(result["batches"])
 
-                except Exception as e:
-                    logger.error(f"❌ Error processing period {period}: {e}")
-                    errors += 1
+        # Stage 2: parse and upsert everything that was fetched
+        stored = await self._store_fetched_batches(
+            company_id=company_id,
+            company_rut=rut,
+            company_name=company.get("business_name"),
+            batches=batches,
+        )
 
         duration = (datetime.now() - start_time).total_seconds()
 
         return {
             "success": True,
             "company_id": company_id,
-            "compras": compras_stats,
-            "ventas": ventas_stats,
-            "honorarios": honorarios_stats,
+            "compras": stored["compras"],
+            "ventas": stored["ventas"],
+            "honorarios": stored["honorarios"],
             "duration_seconds": duration,
             "errors": errors,
         }
 
-    async def _sync_purchases_for_period(
+    # =========================================================================
+    # Document sync: fetch stage
+    # =========================================================================
+
+    async def _fetch_period(
         self,
         client: SIIClient,
-        company_id: str,
-        period: str,
-        resumen_data: Dict[str, Any]
-    ) -> Dict[str, int]:
+        limiter: SIIRateLimiter,
+        period: str
+    ) -> Dict[str, Any]:
         """
-        Sync purchases for a specific period based on resumen data.
+        Fetch all raw SII payloads for one period.
 
-        Handles:
-        - Boletas (39) and Comprobantes (48) as daily summaries
-        - Other document types as individual documents
+        The resumen decides which document types exist; those detail requests
+        (compras, ventas, boletas diarias) then run in parallel together with
+        the honorarios request, all under the per-RUT limiter.
 
         Returns:
-            Dict with total, nuevos, actualizados counts
+            Dict with resumen_ok flag and a list of fetched batches
+            ({"kind", "period", "tipo_doc", "items"})
         """
-        stats = {"total": 0, "nuevos": 0, "actualizados": 0}
-
-        resumen_compras = resumen_data.get("resumen_compras", {})
-        resumen_items = resumen_compras.get("data", []) if isinstance(resumen_compras, dict) else []
-
-        if not resumen_items:
-            logger.info("   ℹ️  No compras in resumen")
-            return stats
-
-        for item in resumen_items:
-            try:
-                tipo_doc = str(item.get("rsmnTipoDocInteger", ""))
-                if not tipo_doc:
-                    continue
-
-                cantidad_docs = item.get("rsmnTotDoc", 0)
-                nombre_tipo = item.get("dcvNombreTipoDoc", f"Tipo {tipo_doc}")
-
-                logger.info(f"   📋 Compras {nombre_tipo} (Tipo {tipo_doc}): {cantidad_docs} docs")
-
-                # Check if it's a monthly summary without detail
-                es_resumen = (
-                    item.get("dcvTipoIngresoDoc") == "RESUMEN" or
-                    item.get("rsmnLink") is False
-                )
-
-                # For boletas (39) and comprobantes (48), extract daily detail
-                if es_resumen and tipo_doc in ["39", "48"]:
-                    logger.info(f"   🔄 Processing DAILY detail for tipo {tipo_doc}")
-                    result = await self._extract_daily_purchases(client, company_id, period, tipo_doc)
-                    stats["nuevos"] += result["nuevos"]
-                    stats["actualizados"] += result["actualizados"]
-                    stats["total"] += result["total"]
-
-                elif not es_resumen:
-                    # Has individual detail - extract each document
-                    result = await self._extract_individual_purchases(client, company_id, period, tipo_doc)
-                    stats["nuevos"] += result["nuevos"]
-                    stats["actualizados"] += result["actualizados"]
-                    stats["total"] += result["total"]
-
-                # Note: We skip monthly summaries for other document types (not implemented yet)
+        logger.info(f"📥 Fetching period {period}...")
+
+        honorarios_task = asyncio.create_task(
+            self._fetch_batch(
+                limiter, "honorarios", period, None,
+                lambda: client.get_boletas_honorarios_todas_paginas(
+                    mes=period[4:6], anio=period[:4]
+                ).get("boletas", [])
+            )
+        )
 
-            except Exception as e:
-                logger.error(f"❌ Error processing compras tipo {item.get('rsmnTipoDocInteger')}: {e}")
-                continue
+        try:
+            resumen_result = await limiter.run(client.get_resumen, periodo=period)
+            resumen_data = resumen_result.get("data", {})
+        except Exception as e:
+            if isinstance(e, ExtractionError):
+                logger.warning(f"⚠️  Could not get resumen for {period}: {e}")
+            else:
+                logger.error(f"❌ Error processing period {period}: {e}")
+            honorarios = await honorarios_task
+            return {"resumen_ok": False, "batches": [honorarios] if honorarios else []}
+
+        jobs = [honorarios_task]
+        for operation, resumen_key in (("purchase", "resumen_compras"), ("sales", "resumen_ventas")):
+            jobs.extend(
+                self._detail_fetch_jobs(client, limiter, period, operation, resumen_data.get(resumen_key, {}))
+            )
 
-        return stats
+        batches = await asyncio.gather(*jobs)
+        return {"resumen_ok": True, "batches": [b for b in batches if b]}
 
-    async def _sync_sales_for_period(
+    def _detail_fetch_jobs(
         self,
         client: SIIClient,
-        company_id: str,
+        limiter: SIIRateLimiter,
         period: str,
-        resumen_data: Dict[str, Any]
-    ) -> Dict[str, int]:
+        operation: str,
+        resumen: Dict[str, Any]
+    ) -> List[Any]:
         """
-        Sync sales for a specific period based on resumen data.
+        Build fetch coroutines for every document type listed in a resumen.
 
         Handles:
         - Boletas (39) and Comprobantes (48) as daily summaries
         - Other document types as individual documents
 
-        Returns:
-            Dict with total, nuevos, actualizados counts
+        Args:
+            operation: "purchase" (compras) or "sales" (ventas)
         """
-        stats = {"total": 0, "nuevos": 0, "actualizados": 0}
-
-        resumen_ventas = resumen_data.get("resumen_ventas", {})
-        resumen_items = resumen_ventas.get("data", []) if isinstance(resumen_ventas, dict) else []
+        label = "Compras" if operation == "purchase" else "Ventas"
+        resumen_items = resumen.get("data", []) if isinstance(resumen, dict) else []
 
         if not resumen_items:
-            logger.info("   ℹ️  No ventas in resumen")
-            return stats
+            logger.info(f"   ℹ️  No {label.lower()} in resumen for {period}")
+            return []
 
+        jobs = []
         for item in resumen_items:
-            try:
-                tipo_doc = str(item.get("rsmnTipoDocInteger", ""))
-                if not tipo_doc:
-                    continue
-
-                cantidad_docs = item.get("rsmnTotDoc", 0)
-                nombre_tipo = item.get("dcvNombreTipoDoc", f"Tipo {tipo_doc}")
-
-                logger.info(f"   📋 Ventas {nombre_tipo} (Tipo {tipo_doc}): {cantidad_docs} docs")
-
-                # Check if it's a monthly summary without detail
-                es_resumen = (
-                    item.get("dcvTipoIngresoDoc") == "RESUMEN" or
-                    item.get("rsmnLink") is False
-                )
-
-                # For boletas (39) and comprobantes (48), extract daily detail
-                if es_resumen and tipo_doc in ["39", "48"]:
-                    logger.info(f"   🔄 Processing DAILY detail for tipo {tipo_doc}")
-                    result = await self._extract_daily_sales(client, company_id, period, tipo_doc)
-                    stats["nuevos"] += result["nuevos"]
-                    stats["actualizados"] += result["actualizados"]
-                    stats["total"] += result["total"]
-
-                elif not es_resumen:
-                    # Has individual detail - extract each document
-                    result = await self._extract_individual_sales(client, company_id, period, tipo_doc)
-                    stats["nuevos"] += result["nuevos"]
-                    stats["actualizados"] += result["actualizados"]
-                    stats["total"] += result["total"]
-
-                # Note: We skip monthly summaries for other document types (not implemented yet)
-
-            except Exception as e:
-                logger.error(f"❌ Error processing ventas tipo {item.get('rsmnTipoDocInteger')}: {e}")
+            tipo_doc = str(item.get("rsmnTipoDocInteger", ""))
+            if not tipo_doc:
                 continue
 
-        return stats
+            cantidad_docs = item.get("rsmnTotDoc", 0)
+            nombre_tipo = item.get("dcvNombreTipoDoc", f"Tipo {tipo_doc}")
+            logger.info(f"   📋 {label} {nombre_tipo} (Tipo {tipo_doc}) {period}: {cantidad_docs} docs")
 
-    async def _extract_daily_purchases(
+            # Check if it's a monthly summary without detail
+            es_resumen = (
+                item.get("dcvTipoIngresoDoc") == "RESUMEN" or
+                item.get("rsmnLink") is False
+            )
+
+            if es_resumen and tipo_doc in ["39", "48"]:
+                # Boletas/comprobantes: daily detail
+                jobs.append(self._fetch_batch(
+                    limiter, f"{operation}_daily", period, tipo_doc,
+                    lambda t=tipo_doc: client.get_boletas_diarias(periodo=period, tipo_doc=t).get("data", [])
+                ))
+            elif not es_resumen and operation == "purchase":
+                jobs.append(self._fetch_batch(
+                    limiter, "purchase", period, tipo_doc,
+                    lambda t=tipo_doc: client.get_compras(
+                        periodo=period, tipo_doc=t, estado_contab="REGISTRO"
+                    ).get("data", [])
+                ))
+            elif not es_resumen:
+                jobs.append(self._fetch_batch(
+                    limiter, "sales", period, tipo_doc,
+                    lambda t=tipo_doc: client.get_ventas(periodo=period, tipo_doc=t).get("data", [])
+                ))
+
+            # Note: We skip monthly summaries for other document types (not implemented yet)
+
+        return jobs
+
+    async def _fetch_batch(
         self,
-        client: SIIClient,
-        company_id: str,
+        limiter: SIIRateLimiter,
+        kind: str,
         period: str,
-        tipo_doc: str
-    ) -> Dict[str, int]:
-        """Extract daily purchase summaries (boletas/comprobantes)."""
-        try:
-            result = client.get_boletas_diarias(periodo=period, tipo_doc=tipo_doc)
-            daily_documents = result.get("data", [])
-
-            logger.info(f"      ✅ Extracted {len(daily_documents)} daily totals")
-
-            parsed_docs = []
-            for daily_doc in daily_documents:
-                try:
-                    doc_data = parse_daily_purchase_document(
-                        company_id=company_id,
-                        period=period,
-                        tipo_doc=tipo_doc,
-                        daily_doc=daily_doc
-                    )
-                    parsed_docs.append(doc_data)
-                except Exception as e:
-                    logger.error(f"❌ Error parsing daily purchase doc: {e}")
-                    continue
-
-            if parsed_docs:
-                nuevos, actualizados = await self.supabase.documents.upsert_purchase_documents(
-                    parsed_docs
-                )
-                logger.info(f"      💾 Saved: {nuevos} nuevos, {actualizados} actualizados")
-                return {"total": len(parsed_docs), "nuevos": nuevos, "actualizados": actualizados}
-
-            return {"total": 0, "nuevos": 0, "actualizados": 0}
+        tipo_doc: str | None,
+        fetch: Any
+    ) -> Dict[str, Any] | None:
+        """
+        Run one blocking SII fetch under the limiter.
 
+        Returns:
+            Batch dict, or None if the request failed (failures are logged and
+            don't abort the rest of the sync)
+        """
+        try:
+            items = await limiter.run(fetch)
+            logger.info(f"      ✅ {kind} {period} tipo {tipo_doc or '-'}: {len(items)} items")
+            return {"kind": kind, "period": period, "tipo_doc": tipo_doc, "items": items}
         except ExtractionError as e:
-            logger.warning(f"⚠️  Error extracting daily purchases for tipo {tipo_doc}: {e}")
-            return {"total": 0, "nuevos": 0, "actualizados": 0}
+            logger.warning(f"⚠️  Error extracting {kind} for {period} tipo {tipo_doc}: {e}")
+        except Exception as e:
+            logger.error(f"❌ Error fetching {kind} for {period} tipo {tipo_doc}: {e}")
+        return None
+
+    # =========================================================================
+    # Document sync: upsert stage
+    # =========================================================================
 
-    async def _extract_daily_sales(
+    def _parse_batch(
         self,
-        client: SIIClient,
         company_id: str,
-        period: str,
-        tipo_doc: str
-    ) -> Dict[str, int]:
-        """Extract daily sales summaries (boletas/comprobantes)."""
-        try:
-            result = client.get_boletas_diarias(periodo=period, tipo_doc=tipo_doc)
-            daily_documents = result.get("data", [])
-
-            logger.info(f"      ✅ Extracted {len(daily_documents)} daily totals")
+        company_rut: str,
+        company_name: str | None,
+        batch: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Parse the raw items of a fetched batch into DB rows."""
+        kind = batch["kind"]
+        period = batch["period"]
+        tipo_doc = batch["tipo_doc"]
 
-            parsed_docs = []
-            for daily_doc in daily_documents:
-                try:
-                    doc_data = parse_daily_sales_document(
+        parsed = []
+        for item in batch["items"]:
+            try:
+                if kind == "purchase_daily":
+                    row = parse_daily_purchase_document(
+                        company_id=company_id, period=period, tipo_doc=tipo_doc, daily_doc=item
+                    )
+                elif kind == "sales_daily":
+                    row = parse_daily_sales_document(
+                        company_id=company_id, period=period, tipo_doc=tipo_doc, daily_doc=item
+                    )
+                elif kind == "purchase":
+                    row = parse_purchase_document(
+                        company_id=company_id, doc=item, tipo_doc=tipo_doc, estado_contab="REGISTRO"
+                    )
+                elif kind == "sales":
+                    row = parse_sales_document(company_id=company_id, doc=item, tipo_doc=tipo_doc)
+                else:
+                    row = parse_honorarios_receipt(
                         company_id=company_id,
+                        boleta=item,
                         period=period,
-                        tipo_doc=tipo_doc,
-                        daily_doc=daily_doc
+                        company_rut=company_rut,
+                        company_name=company_name
                     )
-                    parsed_docs.append(doc_data)
-                except Exception as e:
-                    logger.error(f"❌ Error parsing daily sales doc: {e}")
-                    continue
+            except Exception as e:
+                logger.error(f"❌ Error parsing {kind} item: {e}")
+                continue
 
-            if parsed_docs:
-                nuevos, actualizados = await self.supabase.documents.upsert_sales_documents(
-                    parsed_docs
-                )
-                logger.info(f"      💾 Saved: {nuevos} nuevos, {actualizados} actualizados")
-                return {"total": len(parsed_docs), "nuevos": nuevos, "actualizados": actualizados}
+            # Daily summaries are always kept; individual docs need a folio
+            if kind.endswith("_daily") or row.get("folio") is not None:
+                parsed.append(row)
 
-            return {"total": 0, "nuevos": 0, "actualizados": 0}
+        return parsed
 
-        except ExtractionError as e:
-            logger.warning(f"⚠️  Error extracting daily sales for tipo {tipo_doc}: {e}")
-            return {"total": 0, "nuevos": 0, "actualizados": 0}
-
-    async def _extract_individual_purchases(
+    async def _store_fetched_batches(
         self,
-        client: SIIClient,
         company_id: str,
-        period: str,
-        tipo_doc: str
-    ) -> Dict[str, int]:
-        """Extract individual purchase documents."""
-        try:
-            compras_result = client.get_compras(
-                periodo=period,
-                tipo_doc=tipo_doc,
-                estado_contab="REGISTRO"
-            )
-            compras = compras_result.get("data", [])
-            logger.info(f"      ✅ Extracted {len(compras)} individual documents")
-
-            parsed_compras = []
-            for doc in compras:
-                try:
-                    doc_data = parse_purchase_document(
-                        company_id=company_id,
-                        doc=doc,
-                        tipo_doc=tipo_doc,
-                        estado_contab="REGISTRO"
-                    )
-                    if doc_data.get("folio") is not None:
-                        parsed_compras.append(doc_data)
-                except Exception as e:
-                    logger.error(f"❌ Error parsing purchase doc: {e}")
-                    continue
-
-            if parsed_compras:
-                # Upsert contacts and link to documents
-                parsed_compras = await self._upsert_contact_and_link_documents(
-                    company_id, parsed_compras, contact_type="provider"
-                )
+        company_rut: str,
+        company_name: str | None,
+        batches: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Parse every fetched batch and upsert it, grouped by table.
 
-                nuevos, actualizados = await self.supabase.documents.upsert_purchase_documents(
-                    parsed_compras
-                )
-                logger.info(f"      💾 Saved: {nuevos} nuevos, {actualizados} actualizados")
-                return {"total": len(parsed_compras), "nuevos": nuevos, "actualizados": actualizados}
+        Contacts are resolved once for all individual documents of the sync,
+        and each table gets one upsert per period (keeps request sizes bounded).
+        A period mixes every tipo_doc, so rows repeating a folio are collapsed
+        by the repository before the upsert (the later tipo_doc wins).
 
-            return {"total": 0, "nuevos": 0, "actualizados": 0}
+        Returns:
+            Dict with compras, ventas and honorarios stats
+        """
+        purchases: Dict[str, List[Dict[str, Any]]] = {}
+        sales: Dict[str, List[Dict[str, Any]]] = {}
+        honorarios: Dict[str, List[Dict[str, Any]]] = {}
+        linked_purchases: List[Dict[str, Any]] = []
+        linked_sales: List[Dict[str, Any]] = []
+
+        for batch in batches:
+            rows = self._parse_batch(company_id, company_rut, company_name, batch)
+            if not rows:
+                continue
+            kind = batch["kind"]
+            if kind.startswith("purchase"):
+                purchases.setdefault(batch["period"], []).extend(rows)
+                if kind == "purchase":
+                    linked_purchases.extend(rows)
+            elif kind.startswith("sales"):
+                sales.setdefault(batch["period"], []).extend(rows)
+                if kind == "sales":
+                    linked_sales.extend(rows)
+            else:
+                honorarios.setdefault(batch["period"], []).extend(rows)
+
+        # Upsert contacts and link to documents (rows are updated in place)
+        if linked_purchases:
+            await self._upsert_contact_and_link_documents(
+                company_id, linked_purchases, contact_type="provider"
+            )
+        if linked_sales:
+            await self._upsert_contact_and_link_documents(
+                company_id, linked_sales, contact_type="client"
+            )
 
-        except ExtractionError as e:
-            logger.warning(f"⚠️  Error extracting individual purchases for tipo {tipo_doc}: {e}")
-            return {"total": 0, "nuevos": 0, "actualizados": 0}
+        return {
+            "compras": await self._upsert_grouped(
+                purchases, self.supabase.documents.upsert_purchase_documents, "compras"
+            ),
+            "ventas": await self._upsert_grouped(
+                sales, self.supabase.documents.upsert_sales_documents, "ventas"
+            ),
+            "honorarios": await self._upsert_grouped(
+                honorarios, self.supabase.honorarios.upsert_honorarios_receipts, "honorarios"
+            ),
+        }
 
-    async def _extract_individual_sales(
+    async def _upsert_grouped(
         self,
-        client: SIIClient,
-        company_id: str,
-        period: str,
-        tipo_doc: str
+        rows_by_period: Dict[str, List[Dict[str, Any]]],
+        upsert: Any,
+        label: str
     ) -> Dict[str, int]:
-        """Extract individual sales documents."""
-        try:
-            ventas_result = client.get_ventas(periodo=period, tipo_doc=tipo_doc)
-            ventas = ventas_result.get("data", [])
-            logger.info(f"      ✅ Extracted {len(ventas)} individual documents")
-
-            parsed_ventas = []
-            for doc in ventas:
-                try:
-                    doc_data = parse_sales_document(
-                        company_id=company_id,
-                        doc=doc,
-                        tipo_doc=tipo_doc
-                    )
-                    if doc_data.get("folio") is not None:
-                        parsed_ventas.append(doc_data)
-                except Exception as e:
-                    logger.error(f"❌ Error parsing sales doc: {e}")
-                    continue
-
-            if parsed_ventas:
-                # Upsert contacts and link to documents
-                parsed_ventas = await self._upsert_contact_and_link_documents(
-                    company_id, parsed_ventas, contact_type="client"
-                )
+        """Upsert rows period by period and accumulate total/nuevos/actualizados."""
+        stats = {"total": 0, "nuevos": 0, "actualizados": 0}
 
-                nuevos, actualizados = await self.supabase.documents.upsert_sales_documents(
-                    parsed_ventas
-                )
-                logger.info(f"      💾 Saved: {nuevos} nuevos, {actualizados} actualizados")
-                return {"total": len(parsed_ventas), "nuevos": nuevos, "actualizados": actualizados}
+        for period, rows in sorted(rows_by_period.items()):
+            try:
+                nuevos, actualizados = await upsert(rows)
+            except Exception as e:
+                logger.error(f"❌ Error saving {label} for {period}: {e}")
+                continue
 
-            return {"total": 0, "nuevos": 0, "actualizados": 0}
+            logger.info(f"   💾 {label} {period}: {nuevos} nuevos, {actualizados} actualizados")
+            stats["nuevos"] += nuevos
+            stats["actualizados"] += actualizados
+            stats["total"] += len(rows)
 
-        except ExtractionError as e:
-            logger.warning(f"⚠️  Error extracting individual sales for tipo {tipo_doc}: {e}")
-            return {"total": 0, "nuevos": 0, "actualizados": 0}
+        return stats
 
     async def sync_documents_all_companies(
         self,
@@ -886,30 +803,17 @@ class SIIService:
                 "error": str (si falla)
             }
         """
-        from app.utils.pdf_validator import is_valid_f29_pdf, get_pdf_size_mb
-        from app.services.f29_pdf_extractor import extract_f29_data_from_pdf
-        import asyncio
-
         try:
-            # 1. Obtener empresa y RUT
-            company = await self.supabase.companies.get_by_id(company_id)
-            if not company:
-                return {"success": False, "error": f"Company {company_id} not found"}
-
-            rut = company["rut"]
-            sii_password_encrypted = company.get("sii_password")
-
-            if not sii_password_encrypted:
-                return {"success": False, "error": "No SII credentials configured"}
+            # 1. Obtener empresa y credenciales
+            credentials = await self._get_f29_pdf_credentials(company_id)
+            if "error" in credentials:
+                return {"success": False, "error": credentials["error"]}
 
-            # 2. Decrypt password
-            sii_password = decrypt_password(sii_password_encrypted)
-            if not sii_password:
-                return {"success": False, "error": "Invalid encrypted SII password"}
-
-            # 3. Descargar PDF usando SIIClient (sync en thread)
+            # 2. Descargar PDF usando SIIClient (sync en thread)
             def _download_pdf():
-                with SIIClient(tax_id=rut, password=sii_password) as client:
+                with SIIClient(
+                    tax_id=credentials["rut"], password=credentials["password"], browserless=True
+                ) as client:
                     client.login()  # Ensure logged in
 
                     # Use SIIClient method to download PDF (uses F29Extractor internally)
@@ -920,56 +824,203 @@ class SIIService:
 
             pdf_bytes = await asyncio.to_thread(_download_pdf)
 
-            if not pdf_bytes:
-                return {"success": False, "error": "Failed to download PDF"}
+            # 3. Validar, extraer y guardar
+            return await self._process_f29_pdf(company_id, folio, pdf_bytes)
+
+        except Exception as e:
+            logger.error(f"❌ Error downloading F29 PDF: {e}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    async def download_f29_pdfs(
+        self,
+        company_id: str,
+        forms: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Descarga en lote los PDFs de varios F29 de una empresa.
+
+        Pipeline por formulario: descarga → validación → extracción → guardado.
+        Un solo login (SIIClient compartido) y las descargas corren en paralelo
+        bajo el SIIRateLimiter; la extracción corre en un pool de threads
+        (services/sii/pdf_pool.py) y cada PDF se guarda apenas termina, sin
+        esperar al resto del lote.
+
+        Args:
+            company_id: ID de la empresa
+            forms: Filas de form29_sii_downloads (sii_folio, sii_id_interno, period_display)
 
-            # 4. Validar PDF
-            is_valid, validation_msg = is_valid_f29_pdf(pdf_bytes)
-            if not is_valid:
-                return {
+        Returns:
+            Lista de resultados en el mismo orden de forms:
+            [{"folio", "period", "success", "error"}]
+        """
+        if not forms:
+            return []
+
+        credentials = await self._get_f29_pdf_credentials(company_id)
+        if "error" in credentials:
+            return [
+                {
+                    "folio": form["sii_folio"],
+                    "period": form.get("period_display", "N/A"),
                     "success": False,
-                    "error": f"Invalid PDF: {validation_msg}"
+                    "error": credentials["error"],
                 }
+                for form in forms
+            ]
 
-            pdf_size_mb = get_pdf_size_mb(pdf_bytes)
-            logger.info(f"✅ PDF válido descargado: {pdf_size_mb:.2f} MB")
+        total = len(forms)
+        limiter = SIIRateLimiter()
 
-            # 5. Extraer datos del PDF
-            extracted_data = None
+        async def _pipeline(index: int, form: Dict[str, Any], client: SIIClient) -> Dict[str, Any]:
+            folio = form["sii_folio"]
+            period = form.get("period_display", "N/A")
             try:
-                extracted_data = extract_f29_data_from_pdf(pdf_bytes)
-                if extracted_data.get('extraction_success'):
-                    logger.info(f"✅ Datos extraídos: {extracted_data.get('codes_extracted', 0)} códigos")
-                else:
-                    logger.warning(f"⚠️ Extracción parcial: {extracted_data.get('error')}")
+                pdf_bytes = await limiter.run(
+                    client.get_f29_compacto,
+                    folio=folio,
+                    id_interno_sii=form["sii_id_interno"],
+                )
+                result = await self._process_f29_pdf(company_id, folio, pdf_bytes)
             except Exception as e:
-                logger.warning(f"⚠️ Error extrayendo datos del PDF: {e}")
+                result = {"success": False, "error": str(e)}
 
-            # 6. Actualizar registro con datos extraídos
-            # TODO: Subir PDF a Supabase Storage
-            storage_url = None  # Pendiente: implementar upload a Supabase Storage
+            if result.get("success"):
+                logger.info(f"✅ [{index}/{total}] PDF F29 procesado: folio={folio}, period={period}")
+            else:
+                logger.error(f"❌ [{index}/{total}] PDF F29 falló: folio={folio}, error={result.get('error')}")
 
-            if extracted_data and extracted_data.get('extraction_success'):
-                # Actualizar extra_data con datos extraídos
-                # pdf_download_status can be: pending, downloaded, error
+            return {
+                "folio": folio,
+                "period": period,
+                "success": bool(result.get("success")),
+                "error": result.get("error"),
+            }
+
+        with SIIClient(
+            tax_id=credentials["rut"], password=credentials["password"], browserless=True
+        ) as client:
+            # Login una sola vez; todas las descargas reutilizan las cookies
+            await asyncio.to_thread(client.login)
+            return list(await asyncio.gather(
+                *(_pipeline(i, form, client) for i, form in enumerate(forms, 1))
+            ))
+
+    async def _get_f29_pdf_credentials(self, company_id: str) -> Dict[str, Any]:
+        """
+        RUT y clave SII descifrada de la empresa.
+
+        Returns:
+            {"rut", "password"} o {"error": str}
+        """
+        company = await self.supabase.companies.get_by_id(company_id)
+        if not company:
+            return {"error": f"Company {company_id} not found"}
+
+        sii_password_encrypted = company.get("sii_password")
+        if not sii_password_encrypted:
+            return {"error": "No SII credentials configured"}
+
+        sii_password = decrypt_password(sii_password_encrypted)
+        if not sii_password:
+            return {"error": "Invalid encrypted SII password"}
+
+        return {"rut": company["rut"], "password": sii_password}
+
+    async def _process_f29_pdf(
+        self,
+        company_id: str,
+        folio: str,
+        pdf_bytes: bytes | None,
+    ) -> Dict[str, Any]:
+        """
+        Valida un PDF F29 descargado, extrae sus datos y los guarda.
+
+        Returns:
+            Dict con success, storage_url, extracted_data, pdf_size_mb o error
+        """
+        from app.utils.pdf_validator import is_valid_f29_pdf, get_pdf_size_mb
+        from app.services.sii.pdf_pool import extract_f29_data
+
+        if not pdf_bytes:
+            return {"success": False, "error": "Failed to download PDF"}
+
+        # 1. Validar PDF
+        is_valid, validation_msg = is_valid_f29_pdf(pdf_bytes)
+        if not is_valid:
+            return {
+                "success": False,
+                "error": f"Invalid PDF: {validation_msg}"
+            }
+
+        pdf_size_mb = get_pdf_size_mb(pdf_bytes)
+        logger.info(f"✅ PDF válido descargado: {pdf_size_mb:.2f} MB")
+
+        # 2. Extraer datos del PDF (pool de threads, fuera del event loop)
+        extracted_data = None
+        try:
+            extracted_data = await extract_f29_data(pdf_bytes)
+            if extracted_data.get('extraction_success'):
+                logger.info(f"✅ Datos extraídos: {extracted_data.get('codes_extracted', 0)} códigos")
+            else:
+                logger.warning(f"⚠️ Extracción parcial: {extracted_data.get('error')}")
+        except Exception as e:
+            logger.warning(f"⚠️ Error extrayendo datos del PDF: {e}")
+
+        # 3. Subir PDF a Supabase Storage (si hay bucket configurado)
+        storage_url = await self._upload_f29_pdf(company_id, folio, pdf_bytes)
+
+        # 4. Actualizar registro con datos extraídos
+        if extracted_data and extracted_data.get('extraction_success'):
+            # Actualizar extra_data con datos extraídos
+            # pdf_download_status can be: pending, downloaded, error
+            await asyncio.to_thread(
                 self.supabase._client.table('form29_sii_downloads').update({
                     'extra_data': {'f29_data': extracted_data},
                     'pdf_download_status': 'downloaded',  # Mark as downloaded even if not uploaded to storage
                     'pdf_storage_url': storage_url
-                }).eq('company_id', company_id).eq('sii_folio', folio).execute()
+                }).eq('company_id', company_id).eq('sii_folio', folio).execute
+            )
 
-                logger.info(f"✅ F29 data saved to database: {len(extracted_data.get('codes', {}))} codes")
+            await bump_company_data_version(company_id)
 
-            return {
-                "success": True,
-                "storage_url": storage_url,
-                "extracted_data": extracted_data,
-                "pdf_size_mb": pdf_size_mb
-            }
+            logger.info(f"✅ F29 data saved to database: {len(extracted_data.get('codes', {}))} codes")
 
+        return {
+            "success": True,
+            "storage_url": storage_url,
+            "extracted_data": extracted_data,
+            "pdf_size_mb": pdf_size_mb
+        }
+
+    async def _upload_f29_pdf(
+        self,
+        company_id: str,
+        folio: str,
+        pdf_bytes: bytes,
+    ) -> str | None:
+        """
+        Sube el PDF a Supabase Storage (bucket F29_PDF_STORAGE_BUCKET).
+
+        Returns:
+            Path del objeto en el bucket, o None si no hay bucket configurado
+            o la subida falla (la extracción se guarda igual)
+        """
+        bucket = os.getenv("F29_PDF_STORAGE_BUCKET")
+        if not bucket:
+            return None
+
+        path = f"{company_id}/f29/{folio}.pdf"
+        try:
+            await asyncio.to_thread(
+                self.supabase._client.storage.from_(bucket).upload,
+                path,
+                pdf_bytes,
+                {"content-type": "application/pdf", "upsert": "true"},
+            )
+            return f"{bucket}/{path}"
         except Exception as e:
-            logger.error(f"❌ Error downloading F29 PDF: {e}", exc_info=True)
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            logger.warning(f"⚠️ Error subiendo PDF F29 a Storage ({path}): {e}")
+            return None
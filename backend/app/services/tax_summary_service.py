@@ -8,10 +8,30 @@ to repositories. Follows the service layer pattern for separation of concerns.
 from __future__ import annotations
 
 import logging
+from datetime import date
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Document type groups used by every summary
+SALES_POSITIVE_TYPES = [
+    'factura_venta', 'boleta', 'boleta_exenta',
+    'factura_exenta', 'comprobante_pago',
+    'liquidacion_factura', 'nota_debito_venta'
+]
+SALES_CREDIT_TYPES = ['nota_credito_venta']
+PURCHASE_POSITIVE_TYPES = [
+    'factura_compra', 'factura_exenta_compra',
+    'liquidacion_factura', 'nota_debito_compra',
+    'declaracion_ingreso'
+]
+PURCHASE_CREDIT_TYPES = ['nota_credito_compra']
+
+TOTAL_FIELDS = (
+    "tax_amount", "total_amount", "net_amount",
+    "net_amount_on_time", "overdue_iva_credit"
+)
+
 
 class TaxSummaryService:
     """
@@ -22,17 +42,23 @@ class TaxSummaryService:
     - Revenue and expense summaries
     - Tax balance computations
 
-    Uses SupabaseClient repositories for data access.
+    Uses SupabaseClient repositories for data access. Monthly sums are read
+    from tax_monthly_aggregates; other ranges are computed in the database
+    (get_document_totals RPC). The Python aggregation path is kept as the
+    reference implementation and as a fallback.
     """
 
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, use_sql_aggregates: bool = True):
         """
         Initialize service with Supabase client.
 
         Args:
             supabase_client: SupabaseClient instance with repository access
+            use_sql_aggregates: Aggregate in the database (False = fetch rows
+                and sum in Python, the reference implementation)
         """
         self.supabase = supabase_client
+        self.use_sql_aggregates = use_sql_aggregates
 
     async def get_iva_summary(
         self, company_id: str, period: str | None = None
@@ -71,94 +97,45 @@ class TaxSummaryService:
             # Calculate date range
             period_start, period_end = self._calculate_period_range(period)
 
-            # Get sales data with total_amount and net_amount for PPM calculation
-            sales_positive = await self._get_documents(
-                "sales_documents",
-                company_id,
-                document_types=[
-                    'factura_venta', 'boleta', 'boleta_exenta',
-                    'factura_exenta', 'comprobante_pago',
-                    'liquidacion_factura', 'nota_debito_venta'
-                ],
-                period_start=period_start,
-                period_end=period_end,
-                fields=["tax_amount", "total_amount", "net_amount", "overdue_iva_credit"]
-            )
-
-            sales_credits = await self._get_documents(
+            # Sales: positive documents and credit notes in one aggregate
+            sales = await self._get_document_totals(
                 "sales_documents",
                 company_id,
-                document_types=['nota_credito_venta'],
-                period_start=period_start,
-                period_end=period_end,
-                fields=["tax_amount", "total_amount", "net_amount", "overdue_iva_credit"]
+                SALES_POSITIVE_TYPES,
+                SALES_CREDIT_TYPES,
+                period_start,
+                period_end
             )
+            sales_positive = sales["positive"]
+            sales_credits = sales["credit"]
 
-            # Calculate net sales IVA and revenue
-            sales_positive_tax = sum(doc.get("tax_amount", 0) or 0 for doc in sales_positive)
-            sales_positive_total = sum(doc.get("total_amount", 0) or 0 for doc in sales_positive)
-            sales_positive_overdue = sum(doc.get("overdue_iva_credit", 0) or 0 for doc in sales_positive)
-
+            debito_fiscal = sales_positive["tax_amount"] - sales_credits["tax_amount"]
+            total_revenue = sales_positive["total_amount"] - sales_credits["total_amount"]
             # For PPM calculation: exclude documents with overdue_iva_credit
             # If a document has overdue, it means it's "out of time" and shouldn't affect the tax base
-            sales_positive_net = sum(
-                doc.get("net_amount", 0) or 0
-                for doc in sales_positive
-                if not (doc.get("overdue_iva_credit", 0) or 0) > 0
-            )
-
-            sales_credit_tax = sum(doc.get("tax_amount", 0) or 0 for doc in sales_credits)
-            sales_credit_total = sum(doc.get("total_amount", 0) or 0 for doc in sales_credits)
-            sales_credit_overdue = sum(doc.get("overdue_iva_credit", 0) or 0 for doc in sales_credits)
-
-            # For PPM calculation: exclude credit notes with overdue_iva_credit
-            sales_credit_net = sum(
-                doc.get("net_amount", 0) or 0
-                for doc in sales_credits
-                if not (doc.get("overdue_iva_credit", 0) or 0) > 0
-            )
-
-            debito_fiscal = sales_positive_tax - sales_credit_tax
-            total_revenue = sales_positive_total - sales_credit_total
-            net_revenue = sales_positive_net - sales_credit_net
+            net_revenue = sales_positive["net_amount_on_time"] - sales_credits["net_amount_on_time"]
             # Overdue IVA: ALWAYS adds to tax burden (can't be recovered)
             # Both positive docs AND credit notes increase the burden
-            overdue_iva_from_sales = sales_positive_overdue + sales_credit_overdue
-
-            # Get purchase data using repository
-            purchases_positive = await self._get_documents(
-                "purchase_documents",
-                company_id,
-                document_types=[
-                    'factura_compra', 'factura_exenta_compra',
-                    'liquidacion_factura', 'nota_debito_compra',
-                    'declaracion_ingreso'
-                ],
-                period_start=period_start,
-                period_end=period_end,
-                fields=["tax_amount", "overdue_iva_credit"]
-            )
+            overdue_iva_from_sales = sales_positive["overdue_iva_credit"] + sales_credits["overdue_iva_credit"]
 
-            purchases_credits = await self._get_documents(
+            # Purchases: positive documents and credit notes in one aggregate
+            purchases = await self._get_document_totals(
                 "purchase_documents",
                 company_id,
-                document_types=['nota_credito_compra'],
-                period_start=period_start,
-                period_end=period_end,
-                fields=["tax_amount", "overdue_iva_credit"]
+                PURCHASE_POSITIVE_TYPES,
+                PURCHASE_CREDIT_TYPES,
+                period_start,
+                period_end
             )
+            purchases_positive = purchases["positive"]
+            purchases_credits = purchases["credit"]
 
-            # Calculate net purchase IVA
-            purchases_positive_tax = sum(doc.get("tax_amount", 0) or 0 for doc in purchases_positive)
-            purchases_positive_overdue = sum(doc.get("overdue_iva_credit", 0) or 0 for doc in purchases_positive)
-
-            purchases_credit_tax = sum(doc.get("tax_amount", 0) or 0 for doc in purchases_credits)
-            purchases_credit_overdue = sum(doc.get("overdue_iva_credit", 0) or 0 for doc in purchases_credits)
-
-            credito_fiscal = purchases_positive_tax - purchases_credit_tax
+            credito_fiscal = purchases_positive["tax_amount"] - purchases_credits["tax_amount"]
             # Overdue IVA: ALWAYS adds to tax burden (can't be claimed)
             # Both positive docs AND credit notes increase the burden
-            overdue_iva_from_purchases = purchases_positive_overdue + purchases_credit_overdue
+            overdue_iva_from_purchases = (
+                purchases_positive["overdue_iva_credit"] + purchases_credits["overdue_iva_credit"]
+            )
 
             # Calculate total overdue IVA credit
             overdue_iva_credit = overdue_iva_from_sales + overdue_iva_from_purchases
@@ -179,8 +156,8 @@ class TaxSummaryService:
             reverse_charge_withholding = await self._get_reverse_charge_withholding(company_id, period_start, period_end)
 
             # Count documents
-            sales_count = len(sales_positive) + len(sales_credits)
-            purchases_count = len(purchases_positive) + len(purchases_credits)
+            sales_count = sales_positive["count"] + sales_credits["count"]
+            purchases_count = purchases_positive["count"] + purchases_credits["count"]
 
             return {
                 "debito_fiscal": debito_fiscal,
@@ -226,44 +203,25 @@ class TaxSummaryService:
         try:
             period_start, period_end = self._calculate_period_range(period)
 
-            # Get positive sales
-            sales_positive = await self._get_documents(
-                "sales_documents",
-                company_id,
-                document_types=[
-                    'factura_venta', 'boleta', 'boleta_exenta',
-                    'factura_exenta', 'comprobante_pago',
-                    'liquidacion_factura', 'nota_debito_venta'
-                ],
-                period_start=period_start,
-                period_end=period_end,
-                fields=["total_amount", "net_amount"]
-            )
-
-            # Get credit notes
-            sales_credits = await self._get_documents(
+            sales = await self._get_document_totals(
                 "sales_documents",
                 company_id,
-                document_types=['nota_credito_venta'],
-                period_start=period_start,
-                period_end=period_end,
-                fields=["total_amount", "net_amount"]
+                SALES_POSITIVE_TYPES,
+                SALES_CREDIT_TYPES,
+                period_start,
+                period_end
             )
+            positive = sales["positive"]
+            credit = sales["credit"]
 
             # Calculate net revenue
-            positive_total = sum(doc.get("total_amount", 0) or 0 for doc in sales_positive)
-            positive_net = sum(doc.get("net_amount", 0) or 0 for doc in sales_positive)
-
-            credit_total = sum(doc.get("total_amount", 0) or 0 for doc in sales_credits)
-            credit_net = sum(doc.get("net_amount", 0) or 0 for doc in sales_credits)
-
-            total_revenue = positive_total - credit_total
-            net_revenue = positive_net - credit_net
+            total_revenue = positive["total_amount"] - credit["total_amount"]
+            net_revenue = positive["net_amount"] - credit["net_amount"]
 
             return {
                 "total_revenue": total_revenue,
                 "net_revenue": net_revenue,
-                "document_count": len(sales_positive) + len(sales_credits)
+                "document_count": positive["count"] + credit["count"]
             }
 
         except Exception as e:
@@ -290,44 +248,25 @@ class TaxSummaryService:
         try:
             period_start, period_end = self._calculate_period_range(period)
 
-            # Get positive purchases
-            purchases_positive = await self._get_documents(
+            purchases = await self._get_document_totals(
                 "purchase_documents",
                 company_id,
-                document_types=[
-                    'factura_compra', 'factura_exenta_compra',
-                    'liquidacion_factura', 'nota_debito_compra',
-                    'declaracion_ingreso'
-                ],
-                period_start=period_start,
-                period_end=period_end,
-                fields=["total_amount", "net_amount"]
-            )
-
-            # Get credit notes
-            purchases_credits = await self._get_documents(
-                "purchase_documents",
-                company_id,
-                document_types=['nota_credito_compra'],
-                period_start=period_start,
-                period_end=period_end,
-                fields=["total_amount", "net_amount"]
+                PURCHASE_POSITIVE_TYPES,
+                PURCHASE_CREDIT_TYPES,
+                period_start,
+                period_end
             )
+            positive = purchases["positive"]
+            credit = purchases["credit"]
 
             # Calculate net expenses
-            positive_total = sum(doc.get("total_amount", 0) or 0 for doc in purchases_positive)
-            positive_net = sum(doc.get("net_amount", 0) or 0 for doc in purchases_positive)
-
-            credit_total = sum(doc.get("total_amount", 0) or 0 for doc in purchases_credits)
-            credit_net = sum(doc.get("net_amount", 0) or 0 for doc in purchases_credits)
-
-            total_expenses = positive_total - credit_total
-            net_expenses = positive_net - credit_net
+            total_expenses = positive["total_amount"] - credit["total_amount"]
+            net_expenses = positive["net_amount"] - credit["net_amount"]
 
             return {
                 "total_expenses": total_expenses,
                 "net_expenses": net_expenses,
-                "document_count": len(purchases_positive) + len(purchases_credits)
+                "document_count": positive["count"] + credit["count"]
             }
 
         except Exception as e:
@@ -338,8 +277,118 @@ class TaxSummaryService:
                 "document_count": 0
             }
 
+    async def get_monthly_trend(
+        self, company_id: str, months: int = 6
+    ) -> list[dict[str, Any]]:
+        """
+        Monthly revenue, cost and IVA series for the last N months.
+
+        Bounded by the first month of the window and aggregated in the
+        database (get_monthly_tax_trend RPC), so the cost depends on `months`,
+        not on the company's history. Credit notes are subtracted.
+
+        Args:
+            company_id: Company UUID
+            months: Number of months including the current one
+
+        Returns:
+            One dict per month, newest first, with month (YYYYMM), revenue,
+            net_revenue, cost, net_cost, iva_debit, iva_credit, iva_balance,
+            sales_count and purchase_count (months without documents are zero);
+            empty if the trend could not be calculated
+        """
+        try:
+            periods = self._trend_periods(months)
+            if not periods:
+                return []
+
+            rows_by_period: dict[str, dict[str, Any]] = {}
+            rows = None
+            if self.use_sql_aggregates:
+                rows = await self.supabase.tax_summaries.get_monthly_tax_trend(
+                    company_id,
+                    periods[-1],
+                    SALES_POSITIVE_TYPES,
+                    SALES_CREDIT_TYPES,
+                    PURCHASE_POSITIVE_TYPES,
+                    PURCHASE_CREDIT_TYPES
+                )
+                if rows is None:
+                    logger.warning("Monthly tax trend RPC unavailable, using per-month totals")
+
+            if rows is not None:
+                for row in rows:
+                    rows_by_period[str(row.get("period"))[:10]] = {
+                        "revenue": float(row.get("revenue") or 0),
+                        "net_revenue": float(row.get("net_revenue") or 0),
+                        "iva_debit": float(row.get("iva_debit") or 0),
+                        "sales_count": int(row.get("sales_count") or 0),
+                        "cost": float(row.get("cost") or 0),
+                        "net_cost": float(row.get("net_cost") or 0),
+                        "iva_credit": float(row.get("iva_credit") or 0),
+                        "purchase_count": int(row.get("purchase_count") or 0),
+                    }
+            else:
+                for period_start in periods:
+                    rows_by_period[period_start] = await self._get_month_trend_totals(
+                        company_id, period_start
+                    )
+
+            trend = []
+            for period_start in periods:
+                values = rows_by_period.get(period_start) or {
+                    "revenue": 0.0, "net_revenue": 0.0, "iva_debit": 0.0, "sales_count": 0,
+                    "cost": 0.0, "net_cost": 0.0, "iva_credit": 0.0, "purchase_count": 0,
+                }
+                trend.append({
+                    "month": period_start[:7].replace("-", ""),
+                    **values,
+                    "iva_balance": values["iva_debit"] - values["iva_credit"],
+                })
+
+            return trend
+
+        except Exception as e:
+            logger.error(f"Error calculating monthly trend: {e}", exc_info=True)
+            return []
+
     # Private helper methods
 
+    async def _get_month_trend_totals(
+        self, company_id: str, period_start: str
+    ) -> dict[str, Any]:
+        """Trend values of one month from _get_document_totals (fallback path)."""
+        _, period_end = self._calculate_period_range(period_start[:7])
+        sales = await self._get_document_totals(
+            "sales_documents", company_id, SALES_POSITIVE_TYPES, SALES_CREDIT_TYPES,
+            period_start, period_end
+        )
+        purchases = await self._get_document_totals(
+            "purchase_documents", company_id, PURCHASE_POSITIVE_TYPES, PURCHASE_CREDIT_TYPES,
+            period_start, period_end
+        )
+        return {
+            "revenue": sales["positive"]["total_amount"] - sales["credit"]["total_amount"],
+            "net_revenue": sales["positive"]["net_amount"] - sales["credit"]["net_amount"],
+            "iva_debit": sales["positive"]["tax_amount"] - sales["credit"]["tax_amount"],
+            "sales_count": sales["positive"]["count"] + sales["credit"]["count"],
+            "cost": purchases["positive"]["total_amount"] - purchases["credit"]["total_amount"],
+            "net_cost": purchases["positive"]["net_amount"] - purchases["credit"]["net_amount"],
+            "iva_credit": purchases["positive"]["tax_amount"] - purchases["credit"]["tax_amount"],
+            "purchase_count": purchases["positive"]["count"] + purchases["credit"]["count"],
+        }
+
+    @staticmethod
+    def _trend_periods(months: int) -> list[str]:
+        """First days (YYYY-MM-DD) of the last N months, newest first."""
+        today = date.today()
+        year, month = today.year, today.month
+        periods = []
+        for _ in range(max(0, months)):
+            periods.append(f"{year}-{month:02d}-01")
+            year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+        return periods
+
     def _calculate_ppm(self, net_revenue: float) -> float | None:
         """
         Calculate PPM (Pago Provisional Mensual) as 0.125% of net revenue.
@@ -552,6 +601,123 @@ class TaxSummaryService:
 
         return None
 
+    async def _get_document_totals(
+        self,
+        table: str,
+        company_id: str,
+        positive_types: list[str],
+        credit_types: list[str],
+        period_start: str | None,
+        period_end: str | None
+    ) -> dict[str, dict[str, float]]:
+        """
+        Get summed amounts for positive documents and credit notes.
+
+        Single months come from the materialized monthly aggregates; other
+        ranges use the get_document_totals RPC. Falls back to the Python
+        reference implementation if neither is available.
+
+        Returns:
+            Dict with "positive" and "credit" groups, each holding count plus
+            the TOTAL_FIELDS sums
+        """
+        if self.use_sql_aggregates and period_start and self._is_single_month(period_start, period_end):
+            rows = await self.supabase.tax_summaries.get_monthly_aggregates(
+                table,
+                company_id,
+                period_start,
+                positive_types + credit_types
+            )
+            if rows is not None:
+                totals = {"positive": self._empty_totals(), "credit": self._empty_totals()}
+                for row in rows:
+                    group = totals["credit" if row.get("document_type") in credit_types else "positive"]
+                    group["count"] += int(row.get("document_count") or 0)
+                    for field in TOTAL_FIELDS:
+                        group[field] += float(row.get(field) or 0)
+                return totals
+
+            logger.warning(f"Monthly aggregates unavailable for {table}, using get_document_totals")
+
+        if self.use_sql_aggregates:
+            rows = await self.supabase.tax_summaries.get_document_totals(
+                table,
+                company_id,
+                positive_types,
+                credit_types,
+                period_start,
+                period_end
+            )
+            if rows is not None:
+                totals = {"positive": self._empty_totals(), "credit": self._empty_totals()}
+                for row in rows:
+                    group = totals["credit" if row.get("is_credit_note") else "positive"]
+                    group["count"] = int(row.get("document_count") or 0)
+                    for field in TOTAL_FIELDS:
+                        group[field] = float(row.get(field) or 0)
+                return totals
+
+            logger.warning(f"SQL aggregate unavailable for {table}, using Python aggregation")
+
+        return await self._get_document_totals_python(
+            table,
+            company_id,
+            positive_types,
+            credit_types,
+            period_start,
+            period_end
+        )
+
+    async def _get_document_totals_python(
+        self,
+        table: str,
+        company_id: str,
+        positive_types: list[str],
+        credit_types: list[str],
+        period_start: str | None,
+        period_end: str | None
+    ) -> dict[str, dict[str, float]]:
+        """
+        Reference implementation of _get_document_totals: fetch rows, sum in Python.
+        """
+        fields = ["tax_amount", "total_amount", "net_amount", "overdue_iva_credit"]
+        totals = {}
+        for group, document_types in (("positive", positive_types), ("credit", credit_types)):
+            documents = await self._get_documents(
+                table,
+                company_id,
+                document_types=document_types,
+                period_start=period_start,
+                period_end=period_end,
+                fields=fields
+            )
+            totals[group] = {
+                "count": len(documents),
+                "tax_amount": sum(doc.get("tax_amount", 0) or 0 for doc in documents),
+                "total_amount": sum(doc.get("total_amount", 0) or 0 for doc in documents),
+                "net_amount": sum(doc.get("net_amount", 0) or 0 for doc in documents),
+                "net_amount_on_time": sum(
+                    doc.get("net_amount", 0) or 0
+                    for doc in documents
+                    if not (doc.get("overdue_iva_credit", 0) or 0) > 0
+                ),
+                "overdue_iva_credit": sum(doc.get("overdue_iva_credit", 0) or 0 for doc in documents),
+            }
+        return totals
+
+    @staticmethod
+    def _empty_totals() -> dict[str, float]:
+        """Totals for a group with no documents."""
+        return {"count": 0, **{field: 0.0 for field in TOTAL_FIELDS}}
+
+    def _is_single_month(self, period_start: str, period_end: str | None) -> bool:
+        """Whether [period_start, period_end) is exactly one calendar month."""
+        period = period_start[:7]
+        return (
+            period_start.endswith("-01")
+            and self._calculate_period_range(period) == (period_start, period_end)
+        )
+
     def _calculate_period_range(self, period: str | None) -> tuple[str | None, str | None]:
         """
         Calculate date range from period string.
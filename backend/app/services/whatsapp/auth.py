@@ -4,6 +4,8 @@ import logging
 from typing import Optional, Union
 from uuid import UUID
 
+from .identity_cache import identity_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,7 +17,8 @@ async def authenticate_user_by_whatsapp(
     Authenticate user by WhatsApp phone number.
 
     Looks up user profile by phone number and returns user ID.
-    Phone numbers are normalized with + prefix.
+    Phone numbers are normalized with + prefix. Found users are cached
+    (see identity_cache), so repeat messages skip the profiles query.
 
     Args:
         supabase: Supabase client (SupabaseClient or raw Client)
@@ -28,6 +31,11 @@ async def authenticate_user_by_whatsapp(
         # Normalize phone number (ensure + prefix)
         normalized_phone = phone_number if phone_number.startswith("+") else f"+{phone_number}"
 
+        cached_user_id = identity_cache.get_user_id(normalized_phone)
+        if cached_user_id is not None:
+            logger.debug(f"Authenticated user from cache: {cached_user_id}")
+            return cached_user_id
+
         logger.info(f"Authenticating user by phone: {normalized_phone}")
 
         # Get underlying client if wrapped
@@ -44,6 +52,7 @@ async def authenticate_user_by_whatsapp(
         if hasattr(response, "data") and response.data and len(response.data) > 0:
             profile = response.data[0]
             user_id = UUID(profile["id"])
+            identity_cache.set_user_id(normalized_phone, user_id)
             logger.info(
                 f"Authenticated user: {profile.get('full_name')} ({profile.get('email')})"
             )
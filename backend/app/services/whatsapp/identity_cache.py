@@ -0,0 +1,199 @@
+"""
+TTL caches for WhatsApp identity lookups.
+
+Every inbound message used to hit Supabase twice (phone → user, user →
+active company) and every send by phone listed Kapso conversations. These
+caches make a chatty user cost no lookups after the first message:
+
+- phone → user_id            WHATSAPP_USER_CACHE_TTL_SECONDS (default 1h)
+- user_id → company_id       WHATSAPP_COMPANY_CACHE_TTL_SECONDS (default 2 min;
+                             the active session is switched from the app)
+- phone → conversation_id    WHATSAPP_CONVERSATION_CACHE_TTL_SECONDS (default 1h;
+                             also filled from inbound webhooks)
+
+Identity mappings decide whose data a message reaches, and they are
+invalidated by the API (phone verification) while messages are processed
+by Celery workers. So phone → user and user → company live in Redis
+(REDIS_URL), shared by every process; each process only keeps them for
+WHATSAPP_IDENTITY_LOCAL_TTL_SECONDS (default 5s) in front of Redis. An
+invalidation reaches all processes within that window. Without Redis
+only the short-lived local entries are used.
+
+Only positive results are cached (a phone that is not registered yet is
+looked up again on its next message). Conversations are per process; a
+failed send invalidates the entry it used.
+"""
+
+import logging
+import os
+from typing import Optional
+from uuid import UUID
+
+from app.utils.cache import BoundedCache
+from app.utils.redis_client import LazyRedis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "whatsapp:identity:"
+
+DEFAULT_MAX_ITEMS = 10000
+DEFAULT_USER_TTL_SECONDS = 3600
+DEFAULT_COMPANY_TTL_SECONDS = 120
+DEFAULT_CONVERSATION_TTL_SECONDS = 3600
+DEFAULT_LOCAL_TTL_SECONDS = 5
+
+
+def normalize_phone(phone_number: str) -> str:
+    """Phone as cache key: digits only, no + prefix."""
+    return phone_number.lstrip("+").replace(" ", "")
+
+
+class WhatsAppIdentityCache:
+    """Shared (Redis) identity mappings plus process-local caches."""
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or os.getenv("REDIS_URL")
+        self.user_ttl = int(os.getenv("WHATSAPP_USER_CACHE_TTL_SECONDS", DEFAULT_USER_TTL_SECONDS))
+        self.company_ttl = int(
+            os.getenv("WHATSAPP_COMPANY_CACHE_TTL_SECONDS", DEFAULT_COMPANY_TTL_SECONDS)
+        )
+        local_ttl = int(os.getenv("WHATSAPP_IDENTITY_LOCAL_TTL_SECONDS", DEFAULT_LOCAL_TTL_SECONDS))
+
+        self.users: BoundedCache[str, UUID] = BoundedCache(
+            "whatsapp_phone_user",
+            max_items=DEFAULT_MAX_ITEMS,
+            ttl_seconds=min(local_ttl, self.user_ttl),
+        )
+        self.companies: BoundedCache[str, str] = BoundedCache(
+            "whatsapp_user_company",
+            max_items=DEFAULT_MAX_ITEMS,
+            ttl_seconds=min(local_ttl, self.company_ttl),
+        )
+        self.conversations: BoundedCache[tuple[str, Optional[str]], str] = BoundedCache(
+            "whatsapp_phone_conversation",
+            max_items=DEFAULT_MAX_ITEMS,
+            ttl_seconds=int(
+                os.getenv("WHATSAPP_CONVERSATION_CACHE_TTL_SECONDS", DEFAULT_CONVERSATION_TTL_SECONDS)
+            ),
+        )
+
+        self._redis = LazyRedis(
+            self.redis_url, "WhatsApp identity cache", "using local caches", socket_timeout=1
+        )
+
+    # Redis
+
+    @staticmethod
+    def _user_key(phone: str) -> str:
+        return f"{KEY_PREFIX}user:{phone}"
+
+    @staticmethod
+    def _company_key(user_id: str) -> str:
+        return f"{KEY_PREFIX}company:{user_id}"
+
+    def _shared_get(self, key: str) -> Optional[str]:
+        client = self._redis.get()
+        if client is None:
+            return None
+        try:
+            value = client.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ WhatsApp identity cache read failed: {e}")
+            return None
+        return value.decode() if value is not None else None
+
+    def _shared_set(self, key: str, value: str, ttl: int) -> None:
+        client = self._redis.get()
+        if client is None:
+            return
+        try:
+            client.set(key, value, ex=ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ WhatsApp identity cache write failed: {e}")
+
+    def _shared_delete(self, *keys: str) -> None:
+        client = self._redis.get()
+        if client is None:
+            return
+        try:
+            client.delete(*keys)
+        except Exception as e:
+            # Local entries still expire within seconds
+            logger.error(f"❌ WhatsApp identity cache invalidation failed: {e}")
+
+    # phone → user
+
+    def get_user_id(self, phone_number: str) -> Optional[UUID]:
+        phone = normalize_phone(phone_number)
+        user_id = self.users.get(phone)
+        if user_id is None:
+            value = self._shared_get(self._user_key(phone))
+            if value is not None:
+                user_id = UUID(value)
+                self.users[phone] = user_id
+        return user_id
+
+    def set_user_id(self, phone_number: str, user_id: UUID) -> None:
+        phone = normalize_phone(phone_number)
+        self.users[phone] = user_id
+        self._shared_set(self._user_key(phone), str(user_id), self.user_ttl)
+
+    # user → company (active session)
+
+    def get_company_id(self, user_id: UUID | str) -> Optional[str]:
+        key = str(user_id)
+        company_id = self.companies.get(key)
+        if company_id is None:
+            company_id = self._shared_get(self._company_key(key))
+            if company_id is not None:
+                self.companies[key] = company_id
+        return company_id
+
+    def set_company_id(self, user_id: UUID | str, company_id: str) -> None:
+        key = str(user_id)
+        self.companies[key] = str(company_id)
+        self._shared_set(self._company_key(key), str(company_id), self.company_ttl)
+
+    # phone → conversation
+
+    def get_conversation_id(
+        self,
+        phone_number: str,
+        whatsapp_config_id: Optional[str] = None,
+    ) -> Optional[str]:
+        return self.conversations.get((normalize_phone(phone_number), whatsapp_config_id))
+
+    def set_conversation_id(
+        self,
+        phone_number: str,
+        conversation_id: str,
+        whatsapp_config_id: Optional[str] = None,
+    ) -> None:
+        self.conversations[(normalize_phone(phone_number), whatsapp_config_id)] = conversation_id
+
+    # Invalidation
+
+    def invalidate_phone(self, phone_number: str) -> None:
+        """Drop everything cached for a phone (user and conversations), in every process."""
+        phone = normalize_phone(phone_number)
+        user_id = self.get_user_id(phone)
+        self.users.pop(phone)
+        self._shared_delete(self._user_key(phone))
+        if user_id is not None:
+            self.invalidate_user(user_id)
+        for key in [k for k in self.conversations.keys() if k[0] == phone]:
+            self.conversations.pop(key)
+        logger.debug(f"🧹 WhatsApp identity cache invalidated for phone {phone}")
+
+    def invalidate_user(self, user_id: UUID | str) -> None:
+        """Drop a user's cached company (e.g. session changed), in every process."""
+        key = str(user_id)
+        self.companies.pop(key)
+        self._shared_delete(self._company_key(key))
+
+    def invalidate_conversation(self, phone_number: str, whatsapp_config_id: Optional[str] = None) -> None:
+        """Drop a cached conversation (e.g. sending to it failed)."""
+        self.conversations.pop((normalize_phone(phone_number), whatsapp_config_id))
+
+
+identity_cache = WhatsAppIdentityCache()
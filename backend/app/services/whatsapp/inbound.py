@@ -0,0 +1,269 @@
+"""
+Inbound WhatsApp message handling.
+
+parse_inbound_event extracts an InboundMessage from a Kapso webhook event;
+process_inbound_message authenticates the sender, resolves the company,
+runs the agent and sends the reply. The webhook only parses and enqueues;
+processing happens in the inbound queue worker (see inbound_queue.py).
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from .agent_runner import WhatsAppAgentRunner
+from .auth import authenticate_user_by_whatsapp
+from .identity_cache import identity_cache
+from .service import WhatsAppService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InboundMessage:
+    """Inbound text message from a Kapso webhook event."""
+    conversation_id: str
+    sender_phone: str
+    content: str
+    message_id: Optional[str] = None
+    contact_name: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "InboundMessage":
+        return cls(**data)
+
+
+def parse_inbound_event(event_data: dict[str, Any]) -> InboundMessage | None:
+    """
+    Extract the inbound message of a single webhook event.
+
+    Args:
+        event_data: Event data from webhook
+
+    Returns:
+        InboundMessage, or None if the event is not an inbound text message
+    """
+    # Extract message and conversation data
+    # Kapso sends data directly in root (no event_type wrapper)
+    message_data = event_data.get("message", {})
+    conversation_data = event_data.get("conversation", {})
+
+    # Check if this is a message event
+    if not message_data:
+        logger.info("No message data found, skipping event")
+        return None
+
+    # Get direction from Kapso metadata
+    direction = message_data.get("kapso", {}).get("direction")
+
+    # Only process inbound messages
+    if direction != "inbound":
+        logger.info(f"Ignoring {direction} message")
+        return None
+
+    # Get message content (V2: text.body, V1: content)
+    message_content = ""
+    if "text" in message_data and isinstance(message_data["text"], dict):
+        message_content = message_data["text"].get("body", "")
+    else:
+        message_content = message_data.get("content", "")
+
+    if not message_content:
+        logger.warning("No message content found")
+        return None
+
+    # Get sender phone
+    sender_phone = message_data.get("from")
+    if not sender_phone:
+        logger.error("No sender phone found in message")
+        return None
+
+    # Normalize phone (add + prefix if missing)
+    if not sender_phone.startswith("+"):
+        sender_phone = f"+{sender_phone}"
+
+    # Get conversation ID
+    conversation_id = conversation_data.get("id")
+    if not conversation_id:
+        logger.error("No conversation ID found")
+        return None
+
+    return InboundMessage(
+        conversation_id=conversation_id,
+        sender_phone=sender_phone,
+        content=message_content,
+        message_id=message_data.get("id"),
+        contact_name=conversation_data.get("contact_name", "") or "",
+    )
+
+
+# Sentinel: the user has no active session
+_NO_SESSION = object()
+
+
+async def _load_active_company(client: Any, user_id: Any) -> Any:
+    """
+    Company of the user's most recently used active session.
+
+    Returns:
+        company_id (cached when set), None if the session has no company,
+        or _NO_SESSION if there is no active session
+    """
+    session_response = (
+        client.table("sessions")
+        .select("company_id, is_active")
+        .eq("user_id", str(user_id))
+        .eq("is_active", True)
+        .order("last_accessed_at", desc=True)
+        .limit(1)
+        .execute()
+    )
+
+    if not session_response.data:
+        return _NO_SESSION
+
+    company_id = session_response.data[0]["company_id"]
+    if company_id:
+        identity_cache.set_company_id(user_id, company_id)
+    return company_id
+
+
+async def process_inbound_message(
+    message: InboundMessage,
+    supabase: Any,
+    whatsapp_service: WhatsAppService,
+) -> dict[str, Any]:
+    """
+    Authenticate the sender, run the agent and send the reply.
+
+    Args:
+        message: Inbound message
+        supabase: Supabase client
+        whatsapp_service: WhatsApp service instance
+
+    Returns:
+        Processing result dict
+    """
+    conversation_id = message.conversation_id
+    sender_phone = message.sender_phone
+
+    logger.info(f"Processing inbound message from {sender_phone}")
+
+    # The sender just wrote to this conversation: sends by phone can reuse it
+    identity_cache.set_conversation_id(sender_phone, conversation_id)
+
+    # Authenticate user by phone
+    authenticated_user_id = await authenticate_user_by_whatsapp(supabase, sender_phone)
+
+    if not authenticated_user_id:
+        # User not found - send registration message
+        logger.warning(f"User not found for phone: {sender_phone}")
+
+        contact_name = message.contact_name
+        greeting = f"¡Hola {contact_name}! 👋\n\n" if contact_name else "¡Hola! 👋\n\n"
+
+        response_message = (
+            f"{greeting}"
+            "No te encontramos en nuestro sistema. "
+            "Por favor, regístrate en https://app.fizko.ai para acceder a nuestros servicios."
+        )
+
+        await whatsapp_service.send_text(
+            conversation_id=conversation_id,
+            message=response_message,
+        )
+
+        return {"conversation_id": conversation_id, "authenticated": False}
+
+    # Get user's company_id from sessions table (user can have multiple companies)
+    company_id = identity_cache.get_company_id(authenticated_user_id)
+    client = supabase.client if hasattr(supabase, 'client') else supabase
+    try:
+        if company_id is not None:
+            logger.debug(f"Company {company_id} for user {authenticated_user_id} from cache")
+        else:
+            company_id = await _load_active_company(client, authenticated_user_id)
+
+        if company_id is _NO_SESSION:
+            logger.error(f"No active session found for user: {authenticated_user_id}")
+            response_message = "No encontramos una sesión activa. Por favor inicia sesión en la app primero."
+            await whatsapp_service.send_text(
+                conversation_id=conversation_id,
+                message=response_message,
+            )
+            return {"conversation_id": conversation_id, "authenticated": True, "error": "no_session"}
+
+        if not company_id:
+            logger.error(f"No company_id in session for user: {authenticated_user_id}")
+            response_message = "Tu sesión no está asociada a una empresa. Por favor contacta a soporte."
+            await whatsapp_service.send_text(
+                conversation_id=conversation_id,
+                message=response_message,
+            )
+            return {"conversation_id": conversation_id, "authenticated": True, "error": "no_company"}
+
+    except Exception as e:
+        identity_cache.invalidate_user(authenticated_user_id)
+        logger.error(f"Error loading session for user {authenticated_user_id}: {e}", exc_info=True)
+        response_message = "Ocurrió un error al cargar tu sesión. Por favor intenta nuevamente."
+        await whatsapp_service.send_text(
+            conversation_id=conversation_id,
+            message=response_message,
+        )
+        return {"conversation_id": conversation_id, "authenticated": True, "error": "session_load_error"}
+
+    # Execute agent with message
+    logger.info(
+        f"🤖 Executing agent for user {authenticated_user_id} | "
+        f"company {company_id} | message: {message.content[:50]}..."
+    )
+
+    try:
+        agent_runner = WhatsAppAgentRunner(supabase=supabase)
+        response_message = await agent_runner.run(
+            user_id=str(authenticated_user_id),
+            company_id=str(company_id),
+            thread_id=conversation_id,  # Use conversation_id as thread_id
+            message=message.content,
+            metadata={
+                "phone": sender_phone,
+                "conversation_id": conversation_id,
+                "message_id": message.message_id,
+            },
+        )
+
+        logger.info(
+            f"✅ Agent response generated: {len(response_message)} chars | "
+            f"conversation {conversation_id}"
+        )
+
+    except Exception as e:
+        logger.error(f"❌ Error executing agent: {e}", exc_info=True)
+        response_message = "Lo siento, ocurrió un error al procesar tu mensaje. Por favor intenta nuevamente."
+
+    # Send response
+    logger.info(f"Sending response to conversation {conversation_id}")
+
+    try:
+        result = await whatsapp_service.send_text(
+            conversation_id=conversation_id,
+            message=response_message,
+        )
+        logger.info(f"Message sent successfully: {result}")
+    except Exception as e:
+        logger.error(f"Error sending message: {e}", exc_info=True)
+        raise
+
+    # TODO: Save conversation and messages to database
+
+    logger.info(f"Successfully processed message for user: {authenticated_user_id}")
+
+    return {
+        "conversation_id": conversation_id,
+        "authenticated": True,
+        "user_id": str(authenticated_user_id),
+        "company_id": str(company_id),
+    }
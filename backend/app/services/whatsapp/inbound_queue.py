@@ -0,0 +1,381 @@
+"""
+Durable inbound queue for WhatsApp messages.
+
+The webhook validates the signature, enqueues the messages and returns
+immediately; Celery workers run the agent and send the replies. Slow agent
+turns no longer make Kapso time out and redeliver.
+
+Layout in Redis (REDIS_URL):
+- whatsapp:inbox:{conversation_id}   list of pending messages (FIFO)
+- whatsapp:inbox:active:{conv_id}    claim of the conversation: "scheduled"
+                                     while a worker task is queued, then the
+                                     owner token of the task draining it (one
+                                     drainer at a time, so replies keep
+                                     message order)
+- whatsapp:inbox:pending             conversations with queued messages
+- whatsapp:inbox:seen:{message_id}   dedupe marker for redeliveries
+- whatsapp:inbox:depth               pending messages across conversations
+
+The drainer heartbeats its claim while it works; ack / release only act
+for the current owner, so a drainer that lost its claim stops without
+touching the queue. Claims of dead workers expire, and the periodic
+sweeper reschedules conversations that still have messages but no claim.
+
+Messages are removed from the list only after they were processed
+(at-least-once; the dedupe marker covers Kapso redeliveries). When the
+queue is deeper than WHATSAPP_QUEUE_MAX_DEPTH new messages are rejected and
+the webhook answers 503 so Kapso retries later.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.utils.redis_client import LazyRedis
+
+from .inbound import InboundMessage
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "whatsapp:inbox:"
+DEPTH_KEY = f"{KEY_PREFIX}depth"
+PENDING_KEY = f"{KEY_PREFIX}pending"
+SCHEDULED = "scheduled"
+
+DEFAULT_MAX_DEPTH = 1000
+DEFAULT_DEDUP_TTL_SECONDS = 24 * 3600
+DEFAULT_ACTIVE_TTL_SECONDS = 60  # heartbeated every third of it while draining
+
+# Returns -1 (queue full), 0 (duplicate), 1 (queued), 2 (queued, conversation needs a drainer)
+_ENQUEUE_SCRIPT = """
+local depth = tonumber(redis.call('GET', KEYS[1]) or '0')
+if depth >= tonumber(ARGV[2]) then
+  return -1
+end
+if ARGV[4] == '1' then
+  if not redis.call('SET', KEYS[2], '1', 'NX', 'EX', tonumber(ARGV[3])) then
+    return 0
+  end
+end
+redis.call('RPUSH', KEYS[3], ARGV[1])
+redis.call('INCR', KEYS[1])
+redis.call('SADD', KEYS[5], ARGV[6])
+if redis.call('SET', KEYS[4], ARGV[7], 'NX', 'EX', tonumber(ARGV[5])) then
+  return 2
+end
+return 1
+"""
+
+# Take over a scheduled (or expired) claim with the task's owner token
+_CLAIM_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current == false or current == ARGV[2] then
+  redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[3]))
+  return 1
+end
+return 0
+"""
+
+# Extend the claim if still owned
+_HEARTBEAT_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+  return 1
+end
+return 0
+"""
+
+# Remove the processed head message (owner only) and extend the claim
+_ACK_SCRIPT = """
+if redis.call('GET', KEYS[3]) ~= ARGV[1] then
+  return 0
+end
+if redis.call('LPOP', KEYS[1]) then
+  if redis.call('DECR', KEYS[2]) < 0 then
+    redis.call('SET', KEYS[2], 0)
+  end
+end
+redis.call('EXPIRE', KEYS[3], tonumber(ARGV[2]))
+return 1
+"""
+
+# Release the conversation (owner only) if nothing arrived meanwhile.
+# Returns -1 (not the owner), 0 (messages pending), 1 (released)
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+  return -1
+end
+if redis.call('LLEN', KEYS[1]) == 0 then
+  redis.call('DEL', KEYS[2])
+  redis.call('SREM', KEYS[3], ARGV[2])
+  return 1
+end
+return 0
+"""
+
+# Hand the claim back to the scheduled state (owner only) before rescheduling
+_HANDOFF_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+  return 1
+end
+return 0
+"""
+
+# Drop a scheduled claim whose task could not be sent
+_UNSCHEDULE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  redis.call('DEL', KEYS[1])
+end
+return 1
+"""
+
+# Sweeper: 1 if the conversation has messages but no claim (now scheduled)
+_SWEEP_SCRIPT = """
+if redis.call('LLEN', KEYS[1]) == 0 then
+  if redis.call('EXISTS', KEYS[2]) == 0 then
+    redis.call('SREM', KEYS[3], ARGV[1])
+  end
+  return 0
+end
+if redis.call('SET', KEYS[2], ARGV[2], 'NX', 'EX', tonumber(ARGV[3])) then
+  return 1
+end
+return 0
+"""
+
+
+@dataclass
+class EnqueueResult:
+    """Outcome of enqueueing a webhook batch."""
+    queued: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    # Conversations that had no active drainer: schedule a worker for each
+    to_schedule: list[str] = field(default_factory=list)
+
+
+class InboundQueue:
+    """Per-conversation FIFO queue of inbound messages in Redis."""
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or os.getenv("REDIS_URL")
+        self.max_depth = int(os.getenv("WHATSAPP_QUEUE_MAX_DEPTH", DEFAULT_MAX_DEPTH))
+        self.dedup_ttl = int(os.getenv("WHATSAPP_DEDUP_TTL_SECONDS", DEFAULT_DEDUP_TTL_SECONDS))
+        self.active_ttl = int(os.getenv("WHATSAPP_QUEUE_ACTIVE_TTL_SECONDS", DEFAULT_ACTIVE_TTL_SECONDS))
+
+        self._redis = LazyRedis(self.redis_url, "WhatsApp inbound queue")
+
+    # ==========================================
+    # Redis
+    # ==========================================
+
+    @property
+    def available(self) -> bool:
+        return self._redis.available
+
+    @staticmethod
+    def _list_key(conversation_id: str) -> str:
+        return f"{KEY_PREFIX}{conversation_id}"
+
+    @staticmethod
+    def _active_key(conversation_id: str) -> str:
+        return f"{KEY_PREFIX}active:{conversation_id}"
+
+    # ==========================================
+    # Producer (webhook)
+    # ==========================================
+
+    def enqueue(self, messages: list[InboundMessage]) -> EnqueueResult:
+        """
+        Enqueue messages in arrival order.
+
+        Args:
+            messages: Parsed inbound messages
+
+        Returns:
+            EnqueueResult (queued / duplicates / rejected by backpressure)
+        """
+        client = self._redis.get()
+        if client is None:
+            raise RuntimeError("WhatsApp inbound queue unavailable")
+
+        result = EnqueueResult()
+        for message in messages:
+            status = client.eval(
+                _ENQUEUE_SCRIPT,
+                5,
+                DEPTH_KEY,
+                f"{KEY_PREFIX}seen:{message.message_id or ''}",
+                self._list_key(message.conversation_id),
+                self._active_key(message.conversation_id),
+                PENDING_KEY,
+                json.dumps(message.to_dict()),
+                self.max_depth,
+                self.dedup_ttl,
+                "1" if message.message_id else "0",
+                self.active_ttl,
+                message.conversation_id,
+                SCHEDULED,
+            )
+            if status == -1:
+                result.rejected += 1
+            elif status == 0:
+                result.duplicates += 1
+                logger.info(f"♻️ Duplicate WhatsApp message skipped: {message.message_id}")
+            else:
+                result.queued += 1
+                if status == 2 and message.conversation_id not in result.to_schedule:
+                    result.to_schedule.append(message.conversation_id)
+
+        return result
+
+    def release_claim(self, conversation_id: str) -> None:
+        """Drop a scheduled claim whose worker could not be scheduled."""
+        client = self._redis.get()
+        if client is not None:
+            client.eval(_UNSCHEDULE_SCRIPT, 1, self._active_key(conversation_id), SCHEDULED)
+
+    def sweep(self) -> list[str]:
+        """
+        Find conversations with pending messages and no claim.
+
+        Their drainer died (or was never scheduled); they are marked as
+        scheduled and returned so the caller can start a worker for each.
+        """
+        client = self._redis.get()
+        if client is None:
+            return []
+
+        to_schedule = []
+        for raw_id in client.sscan_iter(PENDING_KEY):
+            conversation_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+            orphaned = client.eval(
+                _SWEEP_SCRIPT,
+                3,
+                self._list_key(conversation_id),
+                self._active_key(conversation_id),
+                PENDING_KEY,
+                conversation_id,
+                SCHEDULED,
+                self.active_ttl,
+            )
+            if orphaned:
+                to_schedule.append(conversation_id)
+        return to_schedule
+
+    def depth(self) -> int:
+        """Pending messages across all conversations."""
+        client = self._redis.get()
+        if client is None:
+            return 0
+        return int(client.get(DEPTH_KEY) or 0)
+
+    # ==========================================
+    # Consumer (worker)
+    # ==========================================
+
+    def claim(self, conversation_id: str, token: str) -> bool:
+        """
+        Become the drainer of a conversation.
+
+        Returns:
+            False if another task owns it (this run must not drain)
+        """
+        return bool(self._redis.get().eval(
+            _CLAIM_SCRIPT,
+            1,
+            self._active_key(conversation_id),
+            token,
+            SCHEDULED,
+            self.active_ttl,
+        ))
+
+    def heartbeat(self, conversation_id: str, token: str) -> bool:
+        """Extend the claim. Returns False if it was lost."""
+        return bool(self._redis.get().eval(
+            _HEARTBEAT_SCRIPT,
+            1,
+            self._active_key(conversation_id),
+            token,
+            self.active_ttl,
+        ))
+
+    def handoff(self, conversation_id: str, token: str) -> bool:
+        """Put an owned claim back in the scheduled state for the next task."""
+        return bool(self._redis.get().eval(
+            _HANDOFF_SCRIPT,
+            1,
+            self._active_key(conversation_id),
+            token,
+            SCHEDULED,
+            self.active_ttl,
+        ))
+
+    def peek(self, conversation_id: str) -> tuple[InboundMessage | None, bool]:
+        """
+        Get the oldest pending message of a conversation (not removed).
+
+        Returns:
+            (message, found): found is True if there was a head entry, even
+            if it could not be decoded (ack it to skip it)
+        """
+        raw = self._redis.get().lindex(self._list_key(conversation_id), 0)
+        if raw is None:
+            return None, False
+        try:
+            return InboundMessage.from_dict(json.loads(raw)), True
+        except Exception as e:
+            logger.error(f"❌ Corrupt WhatsApp queue entry in {conversation_id}: {e}")
+            return None, True
+
+    def ack(self, conversation_id: str, token: str) -> bool:
+        """
+        Remove the processed head message and extend the claim.
+
+        Returns:
+            False if the claim was lost (nothing removed; stop draining)
+        """
+        return bool(self._redis.get().eval(
+            _ACK_SCRIPT,
+            3,
+            self._list_key(conversation_id),
+            DEPTH_KEY,
+            self._active_key(conversation_id),
+            token,
+            self.active_ttl,
+        ))
+
+    def release(self, conversation_id: str, token: str) -> Optional[bool]:
+        """
+        Release the conversation if it has no pending messages.
+
+        Returns:
+            True if released, False if new messages arrived (keep draining),
+            None if the claim was lost (stop draining)
+        """
+        released = self._redis.get().eval(
+            _RELEASE_SCRIPT,
+            3,
+            self._list_key(conversation_id),
+            self._active_key(conversation_id),
+            PENDING_KEY,
+            token,
+            conversation_id,
+        )
+        if released == -1:
+            return None
+        return bool(released)
+
+
+_inbound_queue: Optional[InboundQueue] = None
+
+
+def get_inbound_queue() -> InboundQueue:
+    """Get the process-wide inbound queue."""
+    global _inbound_queue
+    if _inbound_queue is None:
+        _inbound_queue = InboundQueue()
+    return _inbound_queue
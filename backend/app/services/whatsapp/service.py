@@ -6,12 +6,35 @@ from typing import Any, Optional
 
 from supabase import Client
 
-from app.integrations.kapso import KapsoClient, MessageType, InteractiveType
+from app.integrations.kapso import (
+    BulkSendResult,
+    InteractiveType,
+    KapsoAPIError,
+    KapsoClient,
+    KapsoNotFoundError,
+    MessageType,
+)
 from .conversation_manager import WhatsAppConversationManager
+from .identity_cache import identity_cache
 
 logger = logging.getLogger(__name__)
 
 
+def _is_stale_conversation_error(error: Exception) -> bool:
+    """
+    Whether a send failed because the conversation no longer accepts messages.
+
+    Only these are safe to resend to a fresh conversation: timeouts, rate
+    limits and 5xx may have delivered the message already.
+    """
+    if isinstance(error, KapsoNotFoundError):
+        return True
+    if isinstance(error, KapsoAPIError) and error.status_code in (400, 409, 422):
+        message = error.message.lower()
+        return "closed" in message or "ended" in message
+    return False
+
+
 class WhatsAppService:
     """
     High-level WhatsApp service wrapper.
@@ -66,13 +89,17 @@ class WhatsAppService:
         """
         try:
             # If phone_number provided but no conversation_id, find active conversation
+            from_cache = False
             if not conversation_id and phone_number:
-                logger.info(f"Finding active conversation for phone: {phone_number}")
-                conversation = await self._find_active_conversation(
-                    phone_number=phone_number,
-                    whatsapp_config_id=whatsapp_config_id,
-                )
-                conversation_id = conversation["id"]
+                conversation_id = identity_cache.get_conversation_id(phone_number, whatsapp_config_id)
+                from_cache = conversation_id is not None
+                if not from_cache:
+                    logger.info(f"Finding active conversation for phone: {phone_number}")
+                    conversation = await self._find_active_conversation(
+                        phone_number=phone_number,
+                        whatsapp_config_id=whatsapp_config_id,
+                    )
+                    conversation_id = conversation["id"]
 
             if not conversation_id:
                 raise ValueError(
@@ -80,10 +107,26 @@ class WhatsAppService:
                 )
 
             logger.info(f"Sending text message to conversation: {conversation_id}")
-            result = await self.kapso.messages.send_text(
-                conversation_id=conversation_id,
-                message=message,
-            )
+            try:
+                result = await self.kapso.messages.send_text(
+                    conversation_id=conversation_id,
+                    message=message,
+                )
+            except KapsoAPIError as e:
+                if not from_cache or not _is_stale_conversation_error(e):
+                    raise
+                # Cached conversation was closed: look it up again once
+                logger.warning(f"Send to cached conversation {conversation_id} failed ({e}), refreshing")
+                identity_cache.invalidate_conversation(phone_number, whatsapp_config_id)
+                conversation = await self._find_active_conversation(
+                    phone_number=phone_number,
+                    whatsapp_config_id=whatsapp_config_id,
+                )
+                conversation_id = conversation["id"]
+                result = await self.kapso.messages.send_text(
+                    conversation_id=conversation_id,
+                    message=message,
+                )
 
             # Ensure conversation_id is in result (Kapso API may not include it)
             if "conversation_id" not in result:
@@ -209,6 +252,39 @@ class WhatsAppService:
             whatsapp_config_id=whatsapp_config_id,
         )
 
+    async def send_template_bulk(
+        self,
+        recipients: list[dict[str, Any]],
+        template_name: str,
+        template_language: str = "es",
+        whatsapp_config_id: Optional[str] = None,
+        max_concurrency: int = 10,
+    ) -> list[BulkSendResult]:
+        """
+        Send an approved template to many phone numbers concurrently.
+
+        Use for notification bursts (e.g. reminders to every company): sends
+        share the pooled client and rate limiter, and each recipient gets its
+        own result instead of the batch failing on the first error.
+
+        Args:
+            recipients: Dicts with phone_number and optional template_params
+            template_name: Approved template name
+            template_language: Language code (default: es)
+            whatsapp_config_id: Optional WhatsApp config ID to send from
+            max_concurrency: Max sends in flight at once
+
+        Returns:
+            One BulkSendResult per recipient, in input order
+        """
+        return await self.kapso.messages.send_template_bulk(
+            recipients=recipients,
+            template_name=template_name,
+            template_language=template_language,
+            whatsapp_config_id=whatsapp_config_id,
+            max_concurrency=max_concurrency,
+        )
+
     # =========================================================================
     # Private Helpers
     # =========================================================================
@@ -264,6 +340,7 @@ class WhatsAppService:
 
                 if conv_phone == normalized_phone and conv_status == "active":
                     logger.info(f"✅ Active conversation found for {normalized_phone}")
+                    identity_cache.set_conversation_id(normalized_phone, conv["id"], whatsapp_config_id)
                     return conv
 
             # If not found, raise informative error
@@ -1,9 +1,12 @@
 """Utility functions for Backend V2."""
 
 from .rut import normalize_rut, validate_rut, format_rut
+from .cache import BoundedCache, get_cache_stats
 
 __all__ = [
     "normalize_rut",
     "validate_rut",
     "format_rut",
+    "BoundedCache",
+    "get_cache_stats",
 ]
@@ -0,0 +1,256 @@
+"""
+Bounded in-memory cache with LRU eviction, TTL and metrics.
+
+Used by the process-local stores (orchestrators, attachments, ChatKit
+threads) so they cannot grow for the life of the process. Supports the
+dict operations those stores already use (`in`, `[]`, `get`, `pop`,
+`values`, ...), so it can replace a plain dict in place.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# Reasons passed to on_evict
+EVICT_SIZE = "size"
+EVICT_EXPIRED = "expired"
+
+_registry: "weakref.WeakSet[BoundedCache]" = weakref.WeakSet()
+
+
+class BoundedCache(Generic[K, V]):
+    """
+    Thread-safe LRU cache bounded by item count and/or bytes, with optional TTL.
+
+    - max_items: evict least recently used entries beyond this count
+    - max_bytes: evict LRU entries until the summed size fits (sizeof(value))
+    - ttl_seconds: entries expire this long after they were last written
+      (or last read too, with sliding_ttl=True: idle expiry)
+    - on_evict(key, value, reason): called for size/TTL evictions (not for
+      explicit pop/del/clear)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+        sliding_ttl: bool = False,
+        sizeof: Callable[[V], int] | None = None,
+        on_evict: Callable[[K, V, str], None] | None = None,
+    ):
+        self.name = name
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sliding_ttl = sliding_ttl
+        self._sizeof = sizeof or sys.getsizeof
+        self._on_evict = on_evict
+
+        # key -> (expires_at, size, value)
+        self._data: OrderedDict[K, tuple[float | None, int, V]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._next_purge = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        _registry.add(self)
+
+    # ------------------------------------------------------------------
+    # Internal helpers (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _is_expired(self, entry: tuple[float | None, int, V], now: float) -> bool:
+        expires_at = entry[0]
+        return expires_at is not None and now >= expires_at
+
+    def _remove(self, key: K) -> tuple[float | None, int, V]:
+        entry = self._data.pop(key)
+        self._bytes -= entry[1]
+        return entry
+
+    def _evict(self, key: K, reason: str, evicted: list) -> None:
+        entry = self._remove(key)
+        if reason == EVICT_EXPIRED:
+            self.expirations += 1
+        else:
+            self.evictions += 1
+        evicted.append((key, entry[2], reason))
+
+    def _enforce_limits(self, evicted: list, force_purge: bool = False) -> None:
+        if self.ttl_seconds is not None:
+            now = time.monotonic()
+            # Full expiry scan at most every ttl/10 seconds (reads already
+            # drop the expired entries they hit)
+            if force_purge or now >= self._next_purge:
+                self._next_purge = now + max(1.0, self.ttl_seconds / 10)
+                for key in [k for k, e in self._data.items() if self._is_expired(e, now)]:
+                    self._evict(key, EVICT_EXPIRED, evicted)
+
+        while self.max_items is not None and len(self._data) > self.max_items:
+            self._evict(next(iter(self._data)), EVICT_SIZE, evicted)
+
+        while self.max_bytes is not None and self._bytes > self.max_bytes and len(self._data) > 1:
+            self._evict(next(iter(self._data)), EVICT_SIZE, evicted)
+
+    def _notify(self, evicted: list) -> None:
+        """Run eviction callbacks outside the lock."""
+        if not evicted:
+            return
+        for key, value, reason in evicted:
+            if self._on_evict:
+                try:
+                    self._on_evict(key, value, reason)
+                except Exception as e:
+                    logger.warning(f"⚠️ [{self.name}] on_evict failed for {key}: {e}")
+        logger.debug(f"🧹 [{self.name}] Evicted {len(evicted)} entries")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        """Get a value (refreshes LRU position). Expired entries count as misses."""
+        evicted: list = []
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._is_expired(entry, time.monotonic()):
+                self._evict(key, EVICT_EXPIRED, evicted)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                value = default
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+                value = entry[2]
+                if self.sliding_ttl and self.ttl_seconds is not None:
+                    self._data[key] = (time.monotonic() + self.ttl_seconds, entry[1], value)
+
+        self._notify(evicted)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Insert or replace a value, then evict to fit the limits."""
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+
+        evicted: list = []
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (expires_at, size, value)
+            self._bytes += size
+            self._enforce_limits(evicted)
+
+        self._notify(evicted)
+
+    def pop(self, key: K, default: Any = None) -> V | Any:
+        """Remove and return a value (no eviction callback)."""
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._remove(key)[2]
+
+    def clear(self) -> None:
+        """Remove all entries (no eviction callbacks)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drop expired entries now. Returns how many were removed."""
+        evicted: list = []
+        with self._lock:
+            self._enforce_limits(evicted, force_purge=True)
+        self._notify(evicted)
+        return len(evicted)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "items": len(self._data),
+                "bytes": self._bytes if self.max_bytes is not None else None,
+                "max_items": self.max_items,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    # ------------------------------------------------------------------
+    # dict compatibility
+    # ------------------------------------------------------------------
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._data.get(key)  # type: ignore[arg-type]
+            return entry is not None and not self._is_expired(entry, time.monotonic())
+
+    def __getitem__(self, key: K) -> V:
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: K) -> None:
+        with self._lock:
+            if key not in self._data:
+                raise KeyError(key)
+            self._remove(key)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self.keys())
+
+    def keys(self) -> list[K]:
+        """Snapshot of live keys (LRU order, oldest first)."""
+        now = time.monotonic()
+        with self._lock:
+            return [k for k, e in self._data.items() if not self._is_expired(e, now)]
+
+    def values(self) -> list[V]:
+        """Snapshot of live values (LRU order, oldest first)."""
+        now = time.monotonic()
+        with self._lock:
+            return [e[2] for e in self._data.values() if not self._is_expired(e, now)]
+
+    def items(self) -> list[tuple[K, V]]:
+        """Snapshot of live (key, value) pairs (LRU order, oldest first)."""
+        now = time.monotonic()
+        with self._lock:
+            return [(k, e[2]) for k, e in self._data.items() if not self._is_expired(e, now)]
+
+
+def get_cache_stats() -> list[dict[str, Any]]:
+    """Stats of every live BoundedCache in the process."""
+    return [cache.stats() for cache in list(_registry)]
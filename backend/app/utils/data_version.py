@@ -0,0 +1,69 @@
+"""
+Per-company data version for cache invalidation.
+
+Writers (document and F29 upserts) bump a company's version; readers put
+the version in their cache keys, so entries computed before a write are
+never served again. Versions live in Redis (REDIS_URL) so a sync running
+in a Celery worker invalidates caches in the API processes. Without Redis
+the version is process-local and caches rely on their TTL across processes.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Optional
+
+from app.utils.redis_client import LazyRedis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "data_version:company:"
+VERSION_TTL_SECONDS = 30 * 24 * 3600
+
+_redis = LazyRedis(lambda: os.getenv("REDIS_URL"), "Data versions", "using process-local versions")
+_local_versions: dict[str, int] = {}
+_local_lock = threading.Lock()
+
+
+def _get_version_sync(company_id: str) -> int:
+    client = _redis.get()
+    if client is not None:
+        try:
+            return int(client.get(f"{KEY_PREFIX}{company_id}") or 0)
+        except Exception as e:
+            logger.warning(f"⚠️ Data version read failed for {company_id}: {e}")
+    return _local_versions.get(company_id, 0)
+
+
+def _bump_versions_sync(company_ids: list[str]) -> None:
+    with _local_lock:
+        for company_id in company_ids:
+            _local_versions[company_id] = _local_versions.get(company_id, 0) + 1
+
+    client = _redis.get()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for company_id in company_ids:
+            key = f"{KEY_PREFIX}{company_id}"
+            pipe.incr(key)
+            pipe.expire(key, VERSION_TTL_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"⚠️ Data version bump failed for {company_ids}: {e}")
+
+
+async def get_company_data_version(company_id: Optional[str]) -> int:
+    """Current data version of a company (0 if never bumped)."""
+    if not company_id:
+        return 0
+    return await asyncio.to_thread(_get_version_sync, str(company_id))
+
+
+async def bump_company_data_version(*company_ids: Optional[str]) -> None:
+    """Mark companies' data as changed (invalidates versioned caches)."""
+    ids = sorted({str(c) for c in company_ids if c})
+    if ids:
+        await asyncio.to_thread(_bump_versions_sync, ids)
@@ -0,0 +1,87 @@
+"""
+Lazily connected Redis client that survives Redis being down.
+
+Several components use Redis only to share state across processes (WhatsApp
+inbound queue and identity cache, data versions, SII session pool, Celery
+telemetry and fan-out slots) and fall back to process-local behavior
+without it. They connect on first use and, if Redis is unreachable, retry
+after a backoff instead of on every call (each attempt can block for the
+socket timeout) or never again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+REDIS_RETRY_SECONDS = 30
+
+
+class LazyRedis:
+    """
+    Redis client connected on first get(), retried after a backoff while down.
+
+    - url: Redis URL, or a callable returning it (read on each connect
+      attempt); no URL means no Redis, get() returns None without logging
+    - name: component name for the log line
+    - fallback: what the component does meanwhile, e.g. "using memory"
+
+    The connected client is kept in `client` (tests may assign a fake one).
+    """
+
+    def __init__(
+        self,
+        url: Union[Optional[str], Callable[[], Optional[str]]],
+        name: str,
+        fallback: str = "",
+        socket_timeout: float = 2,
+        retry_seconds: float = REDIS_RETRY_SECONDS,
+    ):
+        self.url = url
+        self.name = name
+        self.fallback = fallback
+        self.socket_timeout = socket_timeout
+        self.retry_seconds = retry_seconds
+        self.client: Any = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def _url(self) -> Optional[str]:
+        return self.url() if callable(self.url) else self.url
+
+    def get(self):
+        """Get the client (None without a URL or while Redis is unavailable)."""
+        if self.client is not None:
+            return self.client
+        if time.monotonic() < self._retry_at:
+            return None
+        url = self._url()
+        if not url:
+            return None
+
+        with self._lock:
+            if self.client is not None or time.monotonic() < self._retry_at:
+                return self.client
+            try:
+                import redis
+
+                client = redis.Redis.from_url(url, socket_timeout=self.socket_timeout)
+                client.ping()
+                self.client = client
+            except Exception as e:
+                fallback = f", {self.fallback}" if self.fallback else ""
+                logger.warning(
+                    f"⚠️ {self.name}: Redis unavailable ({e}){fallback} "
+                    f"(retrying in {self.retry_seconds:g}s)"
+                )
+                self._retry_at = time.monotonic() + self.retry_seconds
+
+        return self.client
+
+    @property
+    def available(self) -> bool:
+        return self.get() is not None
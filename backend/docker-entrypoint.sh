@@ -71,17 +71,40 @@ case "$1" in
 
         # Start Celery worker
         # - Concurrency: 2 workers for SII tasks (heavy Selenium)
-        # - Queues: default (general) and low (heavy SII tasks)
+        # - Queues: default (general) and low (heavy SII tasks); WhatsApp has its own worker
         # - Loglevel: info (can be overridden with CELERY_LOG_LEVEL)
         exec /app/.venv/bin/celery -A app.infrastructure.celery.worker worker \
             --loglevel=${CELERY_LOG_LEVEL:-info} \
             --concurrency=${CELERY_CONCURRENCY:-2} \
-            --queues=default,low \
+            --queues=${CELERY_QUEUES:-default,low} \
             --max-tasks-per-child=50 \
             --time-limit=1800 \
             --soft-time-limit=1500
         ;;
 
+    celery-worker-whatsapp)
+        echo -e "${GREEN}💬 Starting Celery Worker (WhatsApp)${NC}"
+
+        # Check Redis connection (required for Celery)
+        echo -e "${BLUE}→${NC} Waiting for Redis..."
+        timeout 30 bash -c 'until redis-cli -u "$REDIS_URL" ping > /dev/null 2>&1; do sleep 1; done' || \
+            { echo -e "${RED}✗${NC} Redis not available"; exit 1; }
+        echo -e "${GREEN}✓${NC} Redis is ready"
+
+        # Start Celery worker for inbound WhatsApp messages only
+        # - Queue: whatsapp (never waits behind SII syncs)
+        # - Prefetch 1: a long agent turn doesn't hold other conversations' tasks
+        # - Time limit: one task run (up to 20 messages of a conversation)
+        exec /app/.venv/bin/celery -A app.infrastructure.celery.worker worker \
+            --hostname=whatsapp@%h \
+            --loglevel=${CELERY_LOG_LEVEL:-info} \
+            --concurrency=${WHATSAPP_CELERY_CONCURRENCY:-4} \
+            --queues=whatsapp \
+            --prefetch-multiplier=1 \
+            --time-limit=900 \
+            --soft-time-limit=840
+        ;;
+
     celery-beat)
         echo -e "${GREEN}⏰ Starting Celery Beat Scheduler${NC}"
 
@@ -130,6 +153,7 @@ case "$1" in
         echo "  fastapi        - Start FastAPI (production)"
         echo "  fastapi-dev    - Start FastAPI (development with hot-reload)"
         echo "  celery-worker  - Start Celery worker (SII tasks)"
+        echo "  celery-worker-whatsapp - Start Celery worker (WhatsApp inbound queue)"
         echo "  celery-beat    - Start Celery Beat scheduler (periodic tasks)"
         echo "  test|pytest    - Run tests with pytest"
         echo "  bash           - Interactive shell"
@@ -138,6 +162,7 @@ case "$1" in
         echo "  docker run backend-v2 fastapi"
         echo "  docker run backend-v2 fastapi-dev"
         echo "  docker run backend-v2 celery-worker"
+        echo "  docker run backend-v2 celery-worker-whatsapp"
         echo "  docker run backend-v2 celery-beat"
         echo "  docker run backend-v2 test tests/ -v"
         echo "  docker run backend-v2 bash"
@@ -0,0 +1,34 @@
+#!/bin/bash
+# ============================================
+# Railway Celery WhatsApp Worker Start Script
+# ============================================
+# This script is called by Railway to start the WhatsApp inbound worker.
+# It consumes only the 'whatsapp' queue so user replies never wait behind
+# the long-running SII tasks of the main worker.
+
+set -e
+
+echo "========================================"
+echo "Starting Celery WhatsApp Worker (Railway)"
+echo "========================================"
+
+# Check Redis connection (required for Celery)
+echo "→ Waiting for Redis..."
+timeout 30 bash -c 'until redis-cli -u "$REDIS_URL" ping > /dev/null 2>&1; do sleep 1; done' || \
+    { echo "✗ Redis not available"; exit 1; }
+echo "✓ Redis is ready"
+
+# Start Celery worker
+echo "→ Starting Celery worker..."
+echo "  • Concurrency: ${WHATSAPP_CELERY_CONCURRENCY:-4}"
+echo "  • Queues: whatsapp"
+echo "  • Log level: ${CELERY_LOG_LEVEL:-info}"
+
+exec /app/.venv/bin/celery -A app.infrastructure.celery.worker worker \
+    --hostname=whatsapp@%h \
+    --loglevel=${CELERY_LOG_LEVEL:-info} \
+    --concurrency=${WHATSAPP_CELERY_CONCURRENCY:-4} \
+    --queues=whatsapp \
+    --prefetch-multiplier=1 \
+    --time-limit=900 \
+    --soft-time-limit=840
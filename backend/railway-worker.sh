@@ -19,13 +19,13 @@ echo "✓ Redis is ready"
 # Start Celery worker
 echo "→ Starting Celery worker..."
 echo "  • Concurrency: ${CELERY_CONCURRENCY:-2}"
-echo "  • Queues: default, low"
+echo "  • Queues: ${CELERY_QUEUES:-default,low}"
 echo "  • Log level: ${CELERY_LOG_LEVEL:-info}"
 
 exec /app/.venv/bin/celery -A app.infrastructure.celery.worker worker \
     --loglevel=${CELERY_LOG_LEVEL:-info} \
     --concurrency=${CELERY_CONCURRENCY:-2} \
-    --queues=default,low \
+    --queues=${CELERY_QUEUES:-default,low} \
     --max-tasks-per-child=50 \
     --time-limit=1800 \
     --soft-time-limit=1500
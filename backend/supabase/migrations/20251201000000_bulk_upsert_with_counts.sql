@@ -0,0 +1,81 @@
+-- =====================================================================
+-- Bulk upsert with inserted/updated counts
+-- =====================================================================
+-- Description: Upserts a JSON array of rows into one of the SII sync tables
+-- and returns how many rows were inserted vs updated in the same round trip.
+-- Replaces the "SELECT existing folios with in_(), then upsert" pattern used
+-- by the documents, F29 and honorarios repositories.
+--
+-- A row is counted as inserted when xmax = 0 in the RETURNING clause
+-- (ON CONFLICT DO UPDATE sets xmax on the updated tuple).
+-- =====================================================================
+
+CREATE OR REPLACE FUNCTION public.bulk_upsert_with_counts(
+  p_table text,
+  p_conflict_columns text[],
+  p_rows jsonb
+)
+RETURNS TABLE (inserted integer, updated integer)
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+  v_columns text;
+  v_updates text;
+  v_conflict text;
+BEGIN
+  IF p_table NOT IN (
+    'purchase_documents',
+    'sales_documents',
+    'form29_sii_downloads',
+    'honorarios_receipts'
+  ) THEN
+    RAISE EXCEPTION 'bulk_upsert_with_counts: table % is not allowed', p_table;
+  END IF;
+
+  IF p_rows IS NULL OR jsonb_array_length(p_rows) = 0 THEN
+    RETURN QUERY SELECT 0, 0;
+    RETURN;
+  END IF;
+
+  -- Only columns present in the payload AND in the table are written
+  SELECT
+    string_agg(quote_ident(c.column_name), ', '),
+    string_agg(format('%1$I = EXCLUDED.%1$I', c.column_name), ', ')
+      FILTER (WHERE c.column_name <> ALL (p_conflict_columns))
+  INTO v_columns, v_updates
+  FROM (
+    SELECT DISTINCT jsonb_object_keys(r) AS key
+    FROM jsonb_array_elements(p_rows) AS r
+  ) AS payload_keys
+  JOIN information_schema.columns AS c
+    ON c.table_schema = 'public'
+   AND c.table_name = p_table
+   AND c.column_name = payload_keys.key;
+
+  SELECT string_agg(quote_ident(col), ', ')
+  INTO v_conflict
+  FROM unnest(p_conflict_columns) AS col;
+
+  RETURN QUERY EXECUTE format(
+    'WITH upserted AS (
+       INSERT INTO public.%1$I AS t (%2$s)
+       SELECT %2$s FROM jsonb_populate_recordset(NULL::public.%1$I, $1)
+       ON CONFLICT (%3$s) DO UPDATE SET %4$s
+       RETURNING (t.xmax = 0) AS is_insert
+     )
+     SELECT
+       (count(*) FILTER (WHERE is_insert))::integer,
+       (count(*) FILTER (WHERE NOT is_insert))::integer
+     FROM upserted',
+    p_table, v_columns, v_conflict, v_updates
+  )
+  USING p_rows;
+END;
+$$;
+
+COMMENT ON FUNCTION public.bulk_upsert_with_counts(text, text[], jsonb) IS
+  'Upsert JSON rows into an SII sync table and return (inserted, updated) counts in one round trip';
+
+GRANT EXECUTE ON FUNCTION public.bulk_upsert_with_counts(text, text[], jsonb) TO service_role;
@@ -0,0 +1,73 @@
+-- =====================================================================
+-- Server-side document totals for tax summaries
+-- =====================================================================
+-- Description: Returns grouped sums of sales or purchase documents for a
+-- company (optionally within an accounting_date range), split by positive
+-- documents vs credit notes. Used by TaxSummaryService so dashboards get
+-- IVA / revenue / expense totals without pulling every row.
+--
+-- net_amount_on_time excludes documents with overdue_iva_credit > 0
+-- (out-of-time documents don't affect the PPM base).
+-- =====================================================================
+
+CREATE OR REPLACE FUNCTION public.get_document_totals(
+  p_table text,
+  p_company_id uuid,
+  p_positive_types text[],
+  p_credit_types text[],
+  p_period_start date DEFAULT NULL,
+  p_period_end date DEFAULT NULL
+)
+RETURNS TABLE (
+  is_credit_note boolean,
+  document_count bigint,
+  tax_amount numeric,
+  total_amount numeric,
+  net_amount numeric,
+  net_amount_on_time numeric,
+  overdue_iva_credit numeric
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+BEGIN
+  IF p_table NOT IN ('sales_documents', 'purchase_documents') THEN
+    RAISE EXCEPTION 'get_document_totals: table % is not allowed', p_table;
+  END IF;
+
+  RETURN QUERY EXECUTE format(
+    'SELECT
+       d.document_type = ANY ($3) AS is_credit_note,
+       count(*) AS document_count,
+       COALESCE(sum(d.tax_amount), 0)::numeric AS tax_amount,
+       COALESCE(sum(d.total_amount), 0)::numeric AS total_amount,
+       COALESCE(sum(d.net_amount), 0)::numeric AS net_amount,
+       COALESCE(sum(d.net_amount) FILTER (
+         WHERE COALESCE(d.overdue_iva_credit, 0) <= 0
+       ), 0)::numeric AS net_amount_on_time,
+       COALESCE(sum(d.overdue_iva_credit), 0)::numeric AS overdue_iva_credit
+     FROM public.%I AS d
+     WHERE d.company_id = $1
+       AND d.document_type = ANY ($2 || $3)
+       AND ($4::date IS NULL OR d.accounting_date >= $4)
+       AND ($5::date IS NULL OR d.accounting_date < $5)
+     GROUP BY 1',
+    p_table
+  )
+  USING p_company_id, p_positive_types, p_credit_types, p_period_start, p_period_end;
+END;
+$$;
+
+COMMENT ON FUNCTION public.get_document_totals(text, uuid, text[], text[], date, date) IS
+  'Grouped sums (positive vs credit notes) of sales/purchase documents for tax summaries';
+
+GRANT EXECUTE ON FUNCTION public.get_document_totals(text, uuid, text[], text[], date, date) TO service_role;
+
+-- Tax summaries filter by accounting_date (not issue_date)
+CREATE INDEX IF NOT EXISTS idx_sales_documents_company_accounting_date
+ON sales_documents(company_id, accounting_date);
+
+CREATE INDEX IF NOT EXISTS idx_purchase_documents_company_accounting_date
+ON purchase_documents(company_id, accounting_date);
@@ -0,0 +1,142 @@
+-- =====================================================================
+-- Monthly tax aggregates per company / period / document type
+-- =====================================================================
+-- Description: Pre-aggregated sums of sales and purchase documents by
+-- accounting month, so monthly IVA / revenue / expense summaries read a
+-- handful of rows instead of scanning the documents of the period.
+--
+-- Buckets are kept up to date by the backend: after every document upsert
+-- DocumentsRepository calls refresh_tax_monthly_aggregates() for the
+-- (company, month) pairs it touched, which recomputes only those buckets.
+-- =====================================================================
+
+CREATE TABLE IF NOT EXISTS tax_monthly_aggregates (
+    company_id UUID NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+    source TEXT NOT NULL CHECK (source IN ('sales', 'purchase')),
+    period DATE NOT NULL,  -- first day of the accounting month
+    document_type TEXT NOT NULL,
+    document_count INTEGER NOT NULL DEFAULT 0,
+    tax_amount NUMERIC NOT NULL DEFAULT 0,
+    total_amount NUMERIC NOT NULL DEFAULT 0,
+    net_amount NUMERIC NOT NULL DEFAULT 0,
+    net_amount_on_time NUMERIC NOT NULL DEFAULT 0,
+    overdue_iva_credit NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (company_id, source, period, document_type)
+);
+
+-- RLS: users read their companies' aggregates, only the backend writes
+ALTER TABLE tax_monthly_aggregates ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view their company's tax aggregates" ON tax_monthly_aggregates;
+CREATE POLICY "Users can view their company's tax aggregates"
+    ON tax_monthly_aggregates
+    FOR SELECT
+    TO authenticated
+    USING (
+        company_id IN (
+            SELECT company_id
+            FROM sessions
+            WHERE user_id = auth.uid()
+            AND is_active = true
+        )
+    );
+
+DROP POLICY IF EXISTS "Service role can manage tax aggregates" ON tax_monthly_aggregates;
+CREATE POLICY "Service role can manage tax aggregates"
+    ON tax_monthly_aggregates
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- Recompute the buckets of the given months (all months if p_periods is NULL)
+CREATE OR REPLACE FUNCTION public.refresh_tax_monthly_aggregates(
+  p_table text,
+  p_company_id uuid,
+  p_periods date[] DEFAULT NULL
+)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+  v_source text;
+  v_periods date[];
+  v_rows integer;
+BEGIN
+  IF p_table = 'sales_documents' THEN
+    v_source := 'sales';
+  ELSIF p_table = 'purchase_documents' THEN
+    v_source := 'purchase';
+  ELSE
+    RAISE EXCEPTION 'refresh_tax_monthly_aggregates: table % is not allowed', p_table;
+  END IF;
+
+  -- Normalize to month starts
+  IF p_periods IS NOT NULL THEN
+    SELECT array_agg(DISTINCT date_trunc('month', p)::date)
+    INTO v_periods
+    FROM unnest(p_periods) AS p;
+  END IF;
+
+  DELETE FROM tax_monthly_aggregates AS a
+  WHERE a.company_id = p_company_id
+    AND a.source = v_source
+    AND (v_periods IS NULL OR a.period = ANY (v_periods));
+
+  EXECUTE format(
+    'INSERT INTO tax_monthly_aggregates (
+       company_id, source, period, document_type, document_count,
+       tax_amount, total_amount, net_amount, net_amount_on_time, overdue_iva_credit
+     )
+     SELECT
+       d.company_id,
+       $2,
+       date_trunc(''month'', d.accounting_date)::date,
+       d.document_type,
+       count(*),
+       COALESCE(sum(d.tax_amount), 0),
+       COALESCE(sum(d.total_amount), 0),
+       COALESCE(sum(d.net_amount), 0),
+       COALESCE(sum(d.net_amount) FILTER (
+         WHERE COALESCE(d.overdue_iva_credit, 0) <= 0
+       ), 0),
+       COALESCE(sum(d.overdue_iva_credit), 0)
+     FROM public.%I AS d
+     WHERE d.company_id = $1
+       AND d.accounting_date IS NOT NULL
+       AND ($3::date[] IS NULL OR date_trunc(''month'', d.accounting_date)::date = ANY ($3))
+     GROUP BY d.company_id, 3, d.document_type',
+    p_table
+  )
+  USING p_company_id, v_source, v_periods;
+
+  GET DIAGNOSTICS v_rows = ROW_COUNT;
+  RETURN v_rows;
+END;
+$$;
+
+COMMENT ON TABLE tax_monthly_aggregates IS 'Monthly sums of sales/purchase documents per company and document type (by accounting_date)';
+COMMENT ON COLUMN tax_monthly_aggregates.period IS 'First day of the accounting month';
+COMMENT ON COLUMN tax_monthly_aggregates.net_amount_on_time IS 'Net amount of documents without overdue_iva_credit (PPM base)';
+COMMENT ON FUNCTION public.refresh_tax_monthly_aggregates(text, uuid, date[]) IS
+  'Recompute tax_monthly_aggregates buckets for a company (given months, or all when NULL)';
+
+GRANT EXECUTE ON FUNCTION public.refresh_tax_monthly_aggregates(text, uuid, date[]) TO service_role;
+
+-- Backfill existing documents
+DO $$
+DECLARE
+  v_company uuid;
+BEGIN
+  FOR v_company IN SELECT DISTINCT company_id FROM sales_documents LOOP
+    PERFORM public.refresh_tax_monthly_aggregates('sales_documents', v_company);
+  END LOOP;
+
+  FOR v_company IN SELECT DISTINCT company_id FROM purchase_documents LOOP
+    PERFORM public.refresh_tax_monthly_aggregates('purchase_documents', v_company);
+  END LOOP;
+END;
+$$;
@@ -0,0 +1,70 @@
+-- =====================================================================
+-- Top clients / providers ranking
+-- =====================================================================
+-- Description: Returns the contacts with the highest document totals for a
+-- company, grouped, ordered and limited in the database. Replaces fetching
+-- every sales/purchase row with a contacts!inner join and ranking in Python.
+--
+-- Optional accounting_date range (inclusive start, exclusive end).
+-- =====================================================================
+
+CREATE OR REPLACE FUNCTION public.get_top_contacts(
+  p_table text,
+  p_company_id uuid,
+  p_limit integer DEFAULT 5,
+  p_period_start date DEFAULT NULL,
+  p_period_end date DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  name text,
+  rut text,
+  total_amount numeric,
+  document_count bigint
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+BEGIN
+  IF p_table NOT IN ('sales_documents', 'purchase_documents') THEN
+    RAISE EXCEPTION 'get_top_contacts: table % is not allowed', p_table;
+  END IF;
+
+  RETURN QUERY EXECUTE format(
+    'WITH ranked AS (
+       SELECT
+         d.contact_id,
+         COALESCE(sum(d.total_amount), 0)::numeric AS total_amount,
+         count(*) AS document_count
+       FROM public.%I AS d
+       WHERE d.company_id = $1
+         AND d.contact_id IS NOT NULL
+         AND ($3::date IS NULL OR d.accounting_date >= $3)
+         AND ($4::date IS NULL OR d.accounting_date < $4)
+       GROUP BY d.contact_id
+       ORDER BY total_amount DESC
+       LIMIT $2
+     )
+     SELECT c.id, c.business_name, c.rut, r.total_amount, r.document_count
+     FROM ranked AS r
+     JOIN public.contacts AS c ON c.id = r.contact_id
+     ORDER BY r.total_amount DESC',
+    p_table
+  )
+  USING p_company_id, GREATEST(p_limit, 0), p_period_start, p_period_end;
+END;
+$$;
+
+COMMENT ON FUNCTION public.get_top_contacts(text, uuid, integer, date, date) IS
+  'Top contacts by document total_amount for a company (sales = clients, purchases = providers)';
+
+GRANT EXECUTE ON FUNCTION public.get_top_contacts(text, uuid, integer, date, date) TO service_role;
+
+-- Covering indexes: the ranking is an index-only scan per company
+CREATE INDEX IF NOT EXISTS idx_sales_documents_company_contact_totals
+ON sales_documents(company_id, contact_id) INCLUDE (total_amount, accounting_date);
+
+CREATE INDEX IF NOT EXISTS idx_purchase_documents_company_contact_totals
+ON purchase_documents(company_id, contact_id) INCLUDE (total_amount, accounting_date);
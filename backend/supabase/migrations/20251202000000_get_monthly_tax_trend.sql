@@ -0,0 +1,77 @@
+-- =====================================================================
+-- Monthly tax trend (revenue, cost and IVA series)
+-- =====================================================================
+-- Description: Returns one row per accounting month since p_period_start
+-- with sales and purchase sums, credit notes subtracted. Reads the
+-- tax_monthly_aggregates buckets, so a trend chart costs a few rows per
+-- month no matter how many documents (or years of history) the company has.
+-- =====================================================================
+
+CREATE OR REPLACE FUNCTION public.get_monthly_tax_trend(
+  p_company_id uuid,
+  p_period_start date,
+  p_sales_positive_types text[],
+  p_sales_credit_types text[],
+  p_purchase_positive_types text[],
+  p_purchase_credit_types text[]
+)
+RETURNS TABLE (
+  period date,
+  sales_count bigint,
+  revenue numeric,
+  net_revenue numeric,
+  iva_debit numeric,
+  purchase_count bigint,
+  cost numeric,
+  net_cost numeric,
+  iva_credit numeric
+)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+  WITH signed AS (
+    SELECT
+      a.period,
+      a.source,
+      a.document_count,
+      CASE
+        WHEN a.source = 'sales' AND a.document_type = ANY (p_sales_credit_types) THEN -1
+        WHEN a.source = 'purchase' AND a.document_type = ANY (p_purchase_credit_types) THEN -1
+        ELSE 1
+      END AS sign,
+      a.total_amount,
+      a.net_amount,
+      a.tax_amount
+    FROM tax_monthly_aggregates AS a
+    WHERE a.company_id = p_company_id
+      AND a.period >= date_trunc('month', p_period_start)::date
+      AND (
+        (a.source = 'sales' AND a.document_type = ANY (p_sales_positive_types || p_sales_credit_types))
+        OR (a.source = 'purchase' AND a.document_type = ANY (p_purchase_positive_types || p_purchase_credit_types))
+      )
+  )
+  SELECT
+    s.period,
+    COALESCE(sum(s.document_count) FILTER (WHERE s.source = 'sales'), 0)::bigint,
+    COALESCE(sum(s.sign * s.total_amount) FILTER (WHERE s.source = 'sales'), 0)::numeric,
+    COALESCE(sum(s.sign * s.net_amount) FILTER (WHERE s.source = 'sales'), 0)::numeric,
+    COALESCE(sum(s.sign * s.tax_amount) FILTER (WHERE s.source = 'sales'), 0)::numeric,
+    COALESCE(sum(s.document_count) FILTER (WHERE s.source = 'purchase'), 0)::bigint,
+    COALESCE(sum(s.sign * s.total_amount) FILTER (WHERE s.source = 'purchase'), 0)::numeric,
+    COALESCE(sum(s.sign * s.net_amount) FILTER (WHERE s.source = 'purchase'), 0)::numeric,
+    COALESCE(sum(s.sign * s.tax_amount) FILTER (WHERE s.source = 'purchase'), 0)::numeric
+  FROM signed AS s
+  GROUP BY s.period
+  ORDER BY s.period DESC;
+$$;
+
+COMMENT ON FUNCTION public.get_monthly_tax_trend(uuid, date, text[], text[], text[], text[]) IS
+  'Monthly revenue / cost / IVA series (credit notes subtracted) from tax_monthly_aggregates';
+
+GRANT EXECUTE ON FUNCTION public.get_monthly_tax_trend(uuid, date, text[], text[], text[], text[]) TO service_role;
+
+-- The trend scans a company's buckets by period across both sources
+CREATE INDEX IF NOT EXISTS idx_tax_monthly_aggregates_company_period
+ON tax_monthly_aggregates(company_id, period);
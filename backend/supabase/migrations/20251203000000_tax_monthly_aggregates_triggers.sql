@@ -0,0 +1,189 @@
+-- =====================================================================
+-- Keep tax_monthly_aggregates up to date with statement-level triggers
+-- =====================================================================
+-- Description: The backend used to call refresh_tax_monthly_aggregates()
+-- after each upsert, for the months present in the batch. That missed the
+-- previous month of documents whose accounting_date moved, ignored deletes,
+-- and an RPC failure left the aggregates stale with nothing to fix them.
+--
+-- The buckets are now recomputed by AFTER ... FOR EACH STATEMENT triggers,
+-- in the same transaction as the document write. Transition tables give the
+-- old and new rows of the statement, so both the previous and the new
+-- accounting month of an updated document are recomputed, once per
+-- (company, month) no matter how many rows the statement touched.
+--
+-- Postgres does not allow transition tables on triggers with more than one
+-- event, hence one trigger per event.
+-- =====================================================================
+
+-- The triggers run refresh_tax_monthly_aggregates() inside every document
+-- write, so two transactions writing the same company and month now
+-- recompute the same buckets concurrently. Redefine it to take a
+-- transaction-level advisory lock on (company, source) first.
+CREATE OR REPLACE FUNCTION public.refresh_tax_monthly_aggregates(
+  p_table text,
+  p_company_id uuid,
+  p_periods date[] DEFAULT NULL
+)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+  v_source text;
+  v_periods date[];
+  v_rows integer;
+BEGIN
+  IF p_table = 'sales_documents' THEN
+    v_source := 'sales';
+  ELSIF p_table = 'purchase_documents' THEN
+    v_source := 'purchase';
+  ELSE
+    RAISE EXCEPTION 'refresh_tax_monthly_aggregates: table % is not allowed', p_table;
+  END IF;
+
+  -- Serialize refreshes of the same company and source: concurrent writes
+  -- would otherwise both DELETE + INSERT the same buckets and the second
+  -- INSERT fails on the primary key. Statements after the lock take a new
+  -- snapshot, so the waiting refresh also sees the documents just committed.
+  PERFORM pg_advisory_xact_lock(
+    hashtextextended('tax_monthly_aggregates:' || p_company_id::text || ':' || v_source, 0)
+  );
+
+  -- Normalize to month starts
+  IF p_periods IS NOT NULL THEN
+    SELECT array_agg(DISTINCT date_trunc('month', p)::date)
+    INTO v_periods
+    FROM unnest(p_periods) AS p;
+  END IF;
+
+  DELETE FROM tax_monthly_aggregates AS a
+  WHERE a.company_id = p_company_id
+    AND a.source = v_source
+    AND (v_periods IS NULL OR a.period = ANY (v_periods));
+
+  EXECUTE format(
+    'INSERT INTO tax_monthly_aggregates (
+       company_id, source, period, document_type, document_count,
+       tax_amount, total_amount, net_amount, net_amount_on_time, overdue_iva_credit
+     )
+     SELECT
+       d.company_id,
+       $2,
+       date_trunc(''month'', d.accounting_date)::date,
+       d.document_type,
+       count(*),
+       COALESCE(sum(d.tax_amount), 0),
+       COALESCE(sum(d.total_amount), 0),
+       COALESCE(sum(d.net_amount), 0),
+       COALESCE(sum(d.net_amount) FILTER (
+         WHERE COALESCE(d.overdue_iva_credit, 0) <= 0
+       ), 0),
+       COALESCE(sum(d.overdue_iva_credit), 0)
+     FROM public.%I AS d
+     WHERE d.company_id = $1
+       AND d.accounting_date IS NOT NULL
+       AND ($3::date[] IS NULL OR date_trunc(''month'', d.accounting_date)::date = ANY ($3))
+     GROUP BY d.company_id, 3, d.document_type',
+    p_table
+  )
+  USING p_company_id, v_source, v_periods;
+
+  GET DIAGNOSTICS v_rows = ROW_COUNT;
+  RETURN v_rows;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION public.refresh_tax_monthly_aggregates_from_statement()
+RETURNS trigger
+LANGUAGE plpgsql
+-- Documents may be written by roles that can only read the aggregates
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_rows text;
+  v_company uuid;
+  v_periods date[];
+BEGIN
+  -- Only the transition tables of the firing event exist
+  v_rows := CASE TG_OP
+    WHEN 'INSERT' THEN 'SELECT company_id, accounting_date FROM new_rows'
+    WHEN 'DELETE' THEN 'SELECT company_id, accounting_date FROM old_rows'
+    ELSE 'SELECT company_id, accounting_date FROM new_rows
+          UNION ALL
+          SELECT company_id, accounting_date FROM old_rows'
+  END;
+
+  FOR v_company, v_periods IN EXECUTE format(
+    'SELECT company_id, array_agg(DISTINCT date_trunc(''month'', accounting_date)::date)
+     FROM (%s) AS touched
+     WHERE accounting_date IS NOT NULL
+     GROUP BY company_id',
+    v_rows
+  )
+  LOOP
+    PERFORM public.refresh_tax_monthly_aggregates(TG_TABLE_NAME::text, v_company, v_periods);
+  END LOOP;
+
+  RETURN NULL;
+END;
+$$;
+
+COMMENT ON FUNCTION public.refresh_tax_monthly_aggregates_from_statement() IS
+  'Statement trigger: recompute the tax_monthly_aggregates months touched by a document write';
+
+-- Sales documents
+DROP TRIGGER IF EXISTS sales_documents_aggregates_insert ON sales_documents;
+CREATE TRIGGER sales_documents_aggregates_insert
+  AFTER INSERT ON sales_documents
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_tax_monthly_aggregates_from_statement();
+
+DROP TRIGGER IF EXISTS sales_documents_aggregates_update ON sales_documents;
+CREATE TRIGGER sales_documents_aggregates_update
+  AFTER UPDATE ON sales_documents
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_tax_monthly_aggregates_from_statement();
+
+DROP TRIGGER IF EXISTS sales_documents_aggregates_delete ON sales_documents;
+CREATE TRIGGER sales_documents_aggregates_delete
+  AFTER DELETE ON sales_documents
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_tax_monthly_aggregates_from_statement();
+
+-- Purchase documents
+DROP TRIGGER IF EXISTS purchase_documents_aggregates_insert ON purchase_documents;
+CREATE TRIGGER purchase_documents_aggregates_insert
+  AFTER INSERT ON purchase_documents
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_tax_monthly_aggregates_from_statement();
+
+DROP TRIGGER IF EXISTS purchase_documents_aggregates_update ON purchase_documents;
+CREATE TRIGGER purchase_documents_aggregates_update
+  AFTER UPDATE ON purchase_documents
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_tax_monthly_aggregates_from_statement();
+
+DROP TRIGGER IF EXISTS purchase_documents_aggregates_delete ON purchase_documents;
+CREATE TRIGGER purchase_documents_aggregates_delete
+  AFTER DELETE ON purchase_documents
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_tax_monthly_aggregates_from_statement();
+
+-- Rebuild once: buckets may have drifted under the previous scheme
+DO $$
+DECLARE
+  v_company uuid;
+BEGIN
+  FOR v_company IN SELECT DISTINCT company_id FROM sales_documents LOOP
+    PERFORM public.refresh_tax_monthly_aggregates('sales_documents', v_company);
+  END LOOP;
+
+  FOR v_company IN SELECT DISTINCT company_id FROM purchase_documents LOOP
+    PERFORM public.refresh_tax_monthly_aggregates('purchase_documents', v_company);
+  END LOOP;
+END;
+$$;
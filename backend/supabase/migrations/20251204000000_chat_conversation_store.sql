@@ -0,0 +1,88 @@
+-- =====================================================================
+-- Conversation store tables for the /conversations router
+-- =====================================================================
+-- Description: Durable storage for ConversationStore
+-- (app/services/chat/conversation_store.py) when CONVERSATIONS_DATABASE_URL
+-- points at Postgres. The store no longer creates these tables at runtime;
+-- only its local SQLite stand-in does.
+--
+-- - chat_conversations: listed by (user_id | company_id | -, updated_at)
+-- - chat_messages: seq is both the order and the pagination cursor
+-- - chat_conversation_owners: conversations per user / company, so the
+--   filtered totals and the unique user / company counts need no scan
+--
+-- Timestamps are fixed-width ISO strings written by the backend, so string
+-- order matches time order (same columns as the SQLAlchemy tables).
+-- =====================================================================
+
+CREATE TABLE IF NOT EXISTS chat_conversations (
+    id VARCHAR(36) PRIMARY KEY,
+    user_id VARCHAR(255) NOT NULL,
+    company_id VARCHAR(255),
+    title TEXT,
+    metadata JSON,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    created_at VARCHAR(32) NOT NULL,
+    updated_at VARCHAR(32) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_chat_conversations_user_updated
+    ON chat_conversations (user_id, updated_at);
+CREATE INDEX IF NOT EXISTS ix_chat_conversations_company_updated
+    ON chat_conversations (company_id, updated_at);
+CREATE INDEX IF NOT EXISTS ix_chat_conversations_updated
+    ON chat_conversations (updated_at);
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    seq BIGSERIAL PRIMARY KEY,
+    id VARCHAR(36) NOT NULL UNIQUE,
+    conversation_id VARCHAR(36) NOT NULL
+        REFERENCES chat_conversations(id) ON DELETE CASCADE,
+    role VARCHAR(32) NOT NULL,
+    content TEXT NOT NULL,
+    created_at VARCHAR(32) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_chat_messages_conversation_seq
+    ON chat_messages (conversation_id, seq);
+
+CREATE TABLE IF NOT EXISTS chat_conversation_owners (
+    kind VARCHAR(16) NOT NULL CHECK (kind IN ('user', 'company')),
+    owner_id VARCHAR(255) NOT NULL,
+    conversation_count INTEGER NOT NULL,
+    PRIMARY KEY (kind, owner_id)
+);
+
+-- RLS: only the backend reads and writes these tables
+ALTER TABLE chat_conversations ENABLE ROW LEVEL SECURITY;
+ALTER TABLE chat_messages ENABLE ROW LEVEL SECURITY;
+ALTER TABLE chat_conversation_owners ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role can manage chat conversations" ON chat_conversations;
+CREATE POLICY "Service role can manage chat conversations"
+    ON chat_conversations
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+DROP POLICY IF EXISTS "Service role can manage chat messages" ON chat_messages;
+CREATE POLICY "Service role can manage chat messages"
+    ON chat_messages
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+DROP POLICY IF EXISTS "Service role can manage chat conversation owners" ON chat_conversation_owners;
+CREATE POLICY "Service role can manage chat conversation owners"
+    ON chat_conversation_owners
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+COMMENT ON TABLE chat_conversations IS 'Conversations of the /conversations router (ConversationStore)';
+COMMENT ON COLUMN chat_conversations.message_count IS 'Messages in the conversation, bumped with each insert';
+COMMENT ON TABLE chat_messages IS 'Messages of chat_conversations, ordered by seq';
+COMMENT ON TABLE chat_conversation_owners IS 'Conversation count per user / company (row removed at zero)';
@@ -0,0 +1,166 @@
+"""
+Tests unitarios de la subida de adjuntos en streaming (ChatKit fase 2).
+
+Alimentan receive_upload con cuerpos multipart partidos en chunks
+arbitrarios y verifican el archivo escrito en el spool, el límite de
+tamaño, la deduplicación por hash y la limpieza de spools viejos.
+
+Para ejecutar:
+    pytest tests/test_attachment_uploads.py -v
+"""
+import asyncio
+import hashlib
+import os
+import time
+
+import pytest
+
+pytest.importorskip("chatkit")
+pytest.importorskip("python_multipart")
+
+from starlette.requests import Request  # noqa: E402
+
+from app.agents.core import memory_attachment_store as store  # noqa: E402
+from app.integrations.chatkit.uploads import receive_upload  # noqa: E402
+
+BOUNDARY = "----fizko-test-boundary"
+
+
+@pytest.fixture(autouse=True)
+def spool(tmp_path, monkeypatch):
+    """Spool y caches aislados por test."""
+    spool_dir = tmp_path / "spool" / str(os.getpid())
+    monkeypatch.setattr(store, "ATTACHMENT_SPOOL_ROOT", str(tmp_path / "spool"))
+    monkeypatch.setattr(store, "ATTACHMENT_SPOOL_DIR", str(spool_dir))
+    store._content_storage.clear()
+    store._attachment_content.clear()
+    yield spool_dir
+    store._content_storage.clear()
+    store._attachment_content.clear()
+
+
+def _multipart_body(content: bytes, filename: str = "boleta.pdf") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="note"\r\n\r\n'
+        f"not a file\r\n"
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: application/pdf\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _request(
+    body: bytes, content_type: str, chunk_size: int, content_length: bool = True
+) -> Request:
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    headers = [(b"content-type", content_type.encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+
+    async def receive():
+        if chunks:
+            return {"type": "http.request", "body": chunks.pop(0), "more_body": bool(chunks)}
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {"type": "http", "method": "POST", "path": "/chatkit/upload", "headers": headers}
+    return Request(scope, receive)
+
+
+def _upload(body: bytes, content_type: str = f"multipart/form-data; boundary={BOUNDARY}",
+            chunk_size: int = 7, attachment_id: str = "atc_1", **kwargs):
+    return asyncio.run(
+        receive_upload(_request(body, content_type, chunk_size, **kwargs), attachment_id)
+    )
+
+
+@pytest.mark.unit
+class TestReceiveUpload:
+    """Parser multipart en streaming."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_file_part_is_spooled(self, chunk_size):
+        content = os.urandom(5000)
+
+        upload = _upload(_multipart_body(content), chunk_size=chunk_size)
+
+        assert upload.filename == "boleta.pdf"
+        assert upload.content_type == "application/pdf"
+        assert upload.content.size == len(content)
+        assert upload.content.sha256 == hashlib.sha256(content).hexdigest()
+        assert upload.content.read() == content
+        assert store.get_stored_content("atc_1") == upload.content
+
+    def test_raw_body(self):
+        upload = _upload(b"raw bytes", content_type="application/octet-stream")
+
+        assert upload.filename is None
+        assert upload.content_type == "application/octet-stream"
+        assert upload.content.read() == b"raw bytes"
+
+    def test_multipart_without_file(self, spool):
+        body = (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="note"\r\n\r\n'
+            f"hola\r\n--{BOUNDARY}--\r\n"
+        ).encode()
+
+        with pytest.raises(ValueError):
+            _upload(body)
+        assert list(spool.iterdir()) == []
+
+    def test_oversized_declared_length_is_rejected(self, monkeypatch, spool):
+        monkeypatch.setattr(store, "ATTACHMENT_MAX_UPLOAD_BYTES", 10)
+        body = _multipart_body(b"x" * (store.ATTACHMENT_MAX_UPLOAD_BYTES + 100_000))
+
+        with pytest.raises(store.AttachmentTooLargeError):
+            _upload(body, chunk_size=65536)
+        assert list(spool.iterdir()) == []
+
+    def test_oversized_chunked_body_is_rejected(self, monkeypatch, spool):
+        monkeypatch.setattr(store, "ATTACHMENT_MAX_UPLOAD_BYTES", 1000)
+
+        with pytest.raises(store.AttachmentTooLargeError):
+            _upload(_multipart_body(b"x" * 2000), content_length=False)
+        assert list(spool.iterdir()) == []
+
+    def test_same_content_is_stored_once(self, spool):
+        content = b"%PDF-1.4 misma boleta"
+
+        first = _upload(_multipart_body(content), attachment_id="atc_1")
+        second = _upload(_multipart_body(content), attachment_id="atc_2")
+
+        assert first.content.path == second.content.path
+        assert [p.name for p in spool.iterdir()] == [first.content.sha256]
+
+
+@pytest.mark.unit
+class TestCleanSpool:
+    """Limpieza de spools de procesos anteriores."""
+
+    def _make_dir(self, root, name: str, age_seconds: float = 0):
+        path = root / name
+        path.mkdir(parents=True)
+        (path / "content").write_bytes(b"x")
+        if age_seconds:
+            old = time.time() - age_seconds
+            os.utime(path, (old, old))
+        return path
+
+    def test_removes_stale_and_own_directories(self, spool):
+        root = spool.parent
+        expired = store.ATTACHMENT_CACHE_TTL_SECONDS + 60
+        stale = self._make_dir(root, "111", age_seconds=expired)
+        recent = self._make_dir(root, "222")
+        own = self._make_dir(root, spool.name)
+        other = self._make_dir(root, "not-a-pid", age_seconds=expired)
+
+        store._clean_spool()
+
+        assert not stale.exists()
+        assert not own.exists()
+        assert recent.exists()
+        assert other.exists()
+
+    def test_missing_root(self, spool):
+        store._clean_spool()  # no existe aún: no falla
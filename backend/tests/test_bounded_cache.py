@@ -0,0 +1,210 @@
+"""
+Tests unitarios de BoundedCache (app/utils/cache.py).
+
+Cubren la expulsión LRU por cantidad y por bytes, la expiración por TTL
+(fija y deslizante), el callback on_evict y la compatibilidad con dict.
+
+Para ejecutar:
+    pytest tests/test_bounded_cache.py -v
+"""
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import EVICT_EXPIRED, EVICT_SIZE, BoundedCache, get_cache_stats
+
+
+class FakeClock:
+    """Reemplazo de time.monotonic controlable desde el test."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.mark.unit
+class TestLRU:
+    """Expulsión por tamaño."""
+
+    def test_evicts_least_recently_used(self):
+        cache = BoundedCache("test", max_items=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache.get("a")  # "b" pasa a ser el menos usado
+        cache["c"] = 3
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.evictions == 1
+
+    def test_replacing_a_key_does_not_evict(self):
+        cache = BoundedCache("test", max_items=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["a"] = 10
+
+        assert len(cache) == 2
+        assert cache["a"] == 10
+        assert cache.evictions == 0
+
+    def test_max_bytes(self):
+        cache = BoundedCache("test", max_bytes=10, sizeof=len)
+        cache["a"] = "xxxx"
+        cache["b"] = "yyyy"
+        cache["c"] = "zzzz"
+
+        assert cache.keys() == ["b", "c"]
+        assert cache.stats()["bytes"] == 8
+
+    def test_oversized_value_is_kept_alone(self):
+        cache = BoundedCache("test", max_bytes=4, sizeof=len)
+        cache["a"] = "xx"
+        cache["b"] = "x" * 10
+
+        assert cache.keys() == ["b"]
+
+
+@pytest.mark.unit
+class TestTTL:
+    """Expiración por tiempo."""
+
+    def test_entry_expires_after_ttl(self, clock):
+        cache = BoundedCache("test", ttl_seconds=10)
+        cache["a"] = 1
+
+        clock.advance(9)
+        assert cache.get("a") == 1
+
+        clock.advance(1)
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+
+    def test_fixed_ttl_is_not_extended_by_reads(self, clock):
+        cache = BoundedCache("test", ttl_seconds=10)
+        cache["a"] = 1
+
+        clock.advance(6)
+        cache.get("a")
+        clock.advance(6)
+
+        assert "a" not in cache
+
+    def test_sliding_ttl_is_extended_by_reads(self, clock):
+        cache = BoundedCache("test", ttl_seconds=10, sliding_ttl=True)
+        cache["a"] = 1
+
+        clock.advance(6)
+        cache.get("a")
+        clock.advance(6)
+
+        assert cache.get("a") == 1
+
+    def test_purge_expired(self, clock):
+        cache = BoundedCache("test", ttl_seconds=10)
+        cache["a"] = 1
+        cache["b"] = 2
+        clock.advance(5)
+        cache["c"] = 3
+        clock.advance(5)
+
+        assert cache.purge_expired() == 2
+        assert cache.keys() == ["c"]
+
+
+@pytest.mark.unit
+class TestOnEvict:
+    """Callback de expulsión."""
+
+    def test_called_for_size_and_expiry(self, clock):
+        evicted = []
+        cache = BoundedCache(
+            "test",
+            max_items=1,
+            ttl_seconds=10,
+            on_evict=lambda key, value, reason: evicted.append((key, value, reason)),
+        )
+        cache["a"] = 1
+        cache["b"] = 2
+        clock.advance(10)
+        cache.get("b")
+
+        assert evicted == [("a", 1, EVICT_SIZE), ("b", 2, EVICT_EXPIRED)]
+
+    def test_not_called_for_explicit_removal(self):
+        evicted = []
+        cache = BoundedCache("test", on_evict=lambda *args: evicted.append(args))
+        cache["a"] = 1
+        cache["b"] = 2
+        cache.pop("a")
+        del cache["b"]
+        cache["c"] = 3
+        cache.clear()
+
+        assert evicted == []
+
+    def test_failing_callback_does_not_break_the_cache(self):
+        def on_evict(key, value, reason):
+            raise RuntimeError("boom")
+
+        cache = BoundedCache("test", max_items=1, on_evict=on_evict)
+        cache["a"] = 1
+        cache["b"] = 2
+
+        assert cache.keys() == ["b"]
+
+
+@pytest.mark.unit
+class TestDictCompatibility:
+    """Operaciones de dict que usan los stores."""
+
+    def test_getitem_missing_raises(self):
+        cache = BoundedCache("test")
+        with pytest.raises(KeyError):
+            cache["missing"]
+
+    def test_delitem_missing_raises(self):
+        cache = BoundedCache("test")
+        with pytest.raises(KeyError):
+            del cache["missing"]
+
+    def test_pop_default(self):
+        cache = BoundedCache("test")
+        cache["a"] = 1
+
+        assert cache.pop("a") == 1
+        assert cache.pop("a", "default") == "default"
+
+    def test_iteration_in_lru_order(self):
+        cache = BoundedCache("test")
+        cache["a"] = 1
+        cache["b"] = 2
+        cache.get("a")
+
+        assert list(cache) == ["b", "a"]
+        assert cache.values() == [2, 1]
+        assert cache.items() == [("b", 2), ("a", 1)]
+
+    def test_stats(self):
+        cache = BoundedCache("test-stats", max_items=5)
+        cache["a"] = 1
+        cache.get("a")
+        cache.get("b")
+
+        stats = cache.stats()
+        assert stats["items"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert any(s["name"] == "test-stats" for s in get_cache_stats())
@@ -0,0 +1,223 @@
+"""
+Tests unitarios del upsert masivo de repositorios (app/repositories/base.py).
+
+Cubren el corte en lotes por filas y bytes (chunk_rows) y el conteo de
+nuevos / actualizados de _upsert_with_counts, tanto con la RPC
+bulk_upsert_with_counts como con el fallback SELECT + upsert.
+
+Para ejecutar:
+    pytest tests/test_bulk_upsert.py -v
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.repositories.base import BaseRepository, chunk_rows, dedupe_on_conflict
+
+COMPANY_ID = "company-1"
+
+
+def _row(folio: int, **extra) -> dict:
+    return {"company_id": COMPANY_ID, "folio": folio, "document_type": 33, **extra}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Builder de supabase-py: registra la llamada y devuelve la respuesta."""
+
+    def __init__(self, client, kind, payload, response=None):
+        self.client = client
+        self.kind = kind
+        self.payload = payload
+        self.response = response
+        self.filters = {}
+
+    def select(self, columns):
+        self.kind = "select"
+        self.payload = columns
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = sorted(values)
+        return self
+
+    def upsert(self, rows, on_conflict):
+        self.kind = "upsert"
+        self.payload = (rows, on_conflict)
+        return self
+
+    def execute(self):
+        self.client.executed.append(self)
+        if isinstance(self.response, Exception):
+            raise self.response
+        return FakeResponse(self.response)
+
+
+class FakeClient:
+    def __init__(self, rpc_responses=None, existing=None):
+        self.rpc_responses = list(rpc_responses or [])
+        self.existing = existing or []
+        self.executed = []
+
+    def rpc(self, name, params):
+        return FakeQuery(self, name, params, self.rpc_responses.pop(0))
+
+    def table(self, name):
+        return FakeQuery(self, "table", name, self.existing)
+
+
+@pytest.mark.unit
+class TestChunkRows:
+    """Corte en lotes."""
+
+    def test_splits_by_row_count(self):
+        rows = [_row(i) for i in range(7)]
+
+        batches = list(chunk_rows(rows, max_rows=3, max_bytes=10_000))
+
+        assert [len(b) for b in batches] == [3, 3, 1]
+        assert [r for b in batches for r in b] == rows
+
+    def test_splits_by_serialized_size(self):
+        rows = [_row(i, detalle="x" * 100) for i in range(5)]
+        row_bytes = len(json.dumps(rows[0]))
+
+        batches = list(chunk_rows(rows, max_rows=100, max_bytes=2 * row_bytes + 1))
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+    def test_oversized_row_gets_its_own_batch(self):
+        rows = [_row(1), _row(2, detalle="x" * 1000), _row(3)]
+
+        batches = list(chunk_rows(rows, max_rows=100, max_bytes=200))
+
+        assert [len(b) for b in batches] == [1, 1, 1]
+
+    def test_empty(self):
+        assert list(chunk_rows([], max_rows=10, max_bytes=100)) == []
+
+    def test_defaults_from_env(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_UPSERT_MAX_ROWS", "2")
+
+        batches = list(chunk_rows([_row(i) for i in range(5)]))
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+    def test_non_json_values_are_sized(self):
+        from datetime import date
+
+        batches = list(chunk_rows([_row(1, fecha=date(2025, 1, 31))], max_rows=10, max_bytes=1000))
+
+        assert len(batches) == 1
+
+
+@pytest.mark.unit
+class TestDedupeOnConflict:
+    """Filas que repiten la clave de conflicto."""
+
+    def test_last_row_wins(self):
+        factura = _row(1, document_type=33, total=100)
+        nota_credito = _row(1, document_type=61, total=-100)
+
+        rows = dedupe_on_conflict([factura, _row(2), nota_credito], ["company_id", "folio"])
+
+        assert rows == [nota_credito, _row(2)]
+
+    def test_null_keys_never_conflict(self):
+        rows = [_row(None, fecha="2025-01-01"), _row(None, fecha="2025-01-02")]
+
+        assert dedupe_on_conflict(rows, ["company_id", "folio"]) == rows
+
+
+@pytest.mark.unit
+class TestUpsertWithCounts:
+    """Conteo de nuevos / actualizados."""
+
+    def test_sums_rpc_counts_per_batch(self):
+        client = FakeClient(rpc_responses=[
+            {"inserted": 2, "updated": 1},
+            {"inserted": 0, "updated": 2},
+        ])
+        repo = BaseRepository(client)
+        rows = [_row(i) for i in range(5)]
+
+        counts = asyncio.run(repo._upsert_with_counts(
+            "sales_documents", rows, "company_id, folio, document_type", max_rows=3
+        ))
+
+        assert counts == (2, 3)
+        first = client.executed[0]
+        assert first.kind == "bulk_upsert_with_counts"
+        assert first.payload["p_table"] == "sales_documents"
+        assert first.payload["p_conflict_columns"] == ["company_id", "folio", "document_type"]
+        assert len(first.payload["p_rows"]) == 3
+
+    def test_repeated_folio_is_sent_once(self):
+        # Factura y nota de crédito con el mismo folio en el mismo periodo
+        client = FakeClient(rpc_responses=[{"inserted": 2, "updated": 0}])
+        repo = BaseRepository(client)
+        rows = [_row(1, document_type=33), _row(2), _row(1, document_type=61)]
+
+        counts = asyncio.run(repo._upsert_with_counts(
+            "sales_documents", rows, "company_id,folio"
+        ))
+
+        assert counts == (2, 1)
+        sent = client.executed[0].payload["p_rows"]
+        assert [(r["folio"], r["document_type"]) for r in sent] == [(1, 61), (2, 33)]
+
+    def test_rpc_rows_are_json_serializable(self):
+        from datetime import date
+
+        client = FakeClient(rpc_responses=[{"inserted": 1, "updated": 0}])
+        repo = BaseRepository(client)
+
+        asyncio.run(repo._upsert_with_counts(
+            "sales_documents", [_row(1, fecha=date(2025, 1, 31))], "company_id,folio"
+        ))
+
+        assert client.executed[0].payload["p_rows"][0]["fecha"] == "2025-01-31"
+
+    def test_fallback_when_rpc_missing(self):
+        missing = Exception("PGRST202: Could not find the function public.bulk_upsert_with_counts")
+        client = FakeClient(
+            rpc_responses=[missing],
+            existing=[{"folio": 1, "document_type": 33}],
+        )
+        repo = BaseRepository(client)
+        rows = [_row(1), _row(2), _row(3)]
+
+        counts = asyncio.run(repo._upsert_with_counts(
+            "sales_documents", rows, "company_id,folio,document_type"
+        ))
+
+        assert counts == (2, 1)
+        select, upsert = client.executed[1], client.executed[2]
+        assert select.filters == {"company_id": COMPANY_ID, "folio": [1, 2, 3]}
+        assert upsert.kind == "upsert"
+        assert upsert.payload == (rows, "company_id,folio,document_type")
+
+    def test_other_errors_propagate(self):
+        client = FakeClient(rpc_responses=[Exception("connection reset")])
+        repo = BaseRepository(client)
+
+        with pytest.raises(Exception, match="connection reset"):
+            asyncio.run(repo._upsert_with_counts("sales_documents", [_row(1)], "company_id,folio"))
+
+    def test_no_rows(self):
+        client = FakeClient()
+        repo = BaseRepository(client)
+
+        counts = asyncio.run(repo._upsert_with_counts("sales_documents", [], "company_id,folio"))
+
+        assert counts == (0, 0)
+        assert client.executed == []
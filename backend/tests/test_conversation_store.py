@@ -0,0 +1,159 @@
+"""
+Tests unitarios del store de conversaciones (app/services/chat/conversation_store.py).
+
+Corren contra un SQLite temporal: paginación de conversaciones y mensajes
+(offset y cursor), totales desde los contadores y borrado.
+
+Para ejecutar:
+    pytest tests/test_conversation_store.py -v
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.services.chat.conversation_store import ConversationStore  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ConversationStore(f"sqlite:///{tmp_path / 'conversations.db'}")
+    yield store
+    store.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _create(store, user_id="user-1", company_id="company-1", messages=0):
+    conversation = run(store.create_conversation(user_id, company_id))
+    for i in range(messages):
+        run(store.add_message(conversation["id"], "user", f"mensaje {i}"))
+    return conversation
+
+
+@pytest.mark.unit
+class TestListConversations:
+    """Listado paginado, más recientes primero."""
+
+    def test_pages_by_updated_at(self, store):
+        ids = [_create(store)["id"] for _ in range(5)]
+        # Un mensaje nuevo la mueve al principio
+        run(store.add_message(ids[0], "user", "hola"))
+
+        first, total = run(store.list_conversations(user_id="user-1", limit=2))
+        second, _ = run(store.list_conversations(user_id="user-1", skip=2, limit=2))
+        third, _ = run(store.list_conversations(user_id="user-1", skip=4, limit=2))
+
+        listed = [c["id"] for c in first + second + third]
+        assert total == 5
+        assert listed == [ids[0], ids[4], ids[3], ids[2], ids[1]]
+
+    def test_filters_and_totals(self, store):
+        _create(store, user_id="user-1", company_id="company-1")
+        _create(store, user_id="user-1", company_id="company-2")
+        _create(store, user_id="user-2", company_id="company-1")
+
+        assert run(store.list_conversations(user_id="user-1"))[1] == 2
+        assert run(store.list_conversations(company_id="company-1"))[1] == 2
+        assert run(store.list_conversations(user_id="user-1", company_id="company-1"))[1] == 1
+        assert run(store.list_conversations())[1] == 3
+
+    def test_include_messages(self, store):
+        conversation = _create(store, messages=2)
+
+        with_messages, _ = run(store.list_conversations(user_id="user-1"))
+        without, _ = run(store.list_conversations(user_id="user-1", include_messages=False))
+
+        assert [m["content"] for m in with_messages[0]["messages"]] == ["mensaje 0", "mensaje 1"]
+        assert with_messages[0]["message_count"] == 2
+        assert "messages" not in without[0]
+        assert without[0]["id"] == conversation["id"]
+
+
+@pytest.mark.unit
+class TestListMessages:
+    """Paginación de mensajes por offset y por cursor."""
+
+    def test_cursor_pages_in_order(self, store):
+        conversation = _create(store, messages=5)
+
+        contents, cursor = [], None
+        while True:
+            messages, total, cursor = run(
+                store.list_messages(conversation["id"], limit=2, cursor=cursor)
+            )
+            contents.extend(m["content"] for m in messages)
+            assert total == 5
+            if cursor is None:
+                break
+            cursor = int(cursor)
+
+        assert contents == [f"mensaje {i}" for i in range(5)]
+
+    def test_last_full_page_has_no_cursor(self, store):
+        conversation = _create(store, messages=4)
+
+        _, _, cursor = run(store.list_messages(conversation["id"], limit=2))
+        messages, _, next_cursor = run(
+            store.list_messages(conversation["id"], limit=2, cursor=int(cursor))
+        )
+
+        assert [m["content"] for m in messages] == ["mensaje 2", "mensaje 3"]
+        assert next_cursor is None
+
+    def test_skip_without_cursor(self, store):
+        conversation = _create(store, messages=5)
+
+        messages, _, next_cursor = run(store.list_messages(conversation["id"], skip=3, limit=10))
+
+        assert [m["content"] for m in messages] == ["mensaje 3", "mensaje 4"]
+        assert next_cursor is None
+
+    def test_missing_conversation(self, store):
+        assert run(store.list_messages("missing")) is None
+        assert run(store.add_message("missing", "user", "hola")) is None
+
+
+@pytest.mark.unit
+class TestCountersAndDelete:
+    """Contadores mantenidos en cada escritura."""
+
+    def test_stats(self, store):
+        _create(store, user_id="user-1", company_id="company-1", messages=2)
+        _create(store, user_id="user-1", company_id=None, messages=1)
+        _create(store, user_id="user-2", company_id="company-1")
+
+        assert run(store.get_stats()) == {
+            "total_conversations": 3,
+            "total_messages": 3,
+            "unique_users": 2,
+            "unique_companies": 1,
+        }
+
+    def test_delete_updates_counters(self, store):
+        keep = _create(store, user_id="user-1", messages=1)
+        drop = _create(store, user_id="user-2", company_id="company-2", messages=2)
+
+        assert run(store.delete_conversation(drop["id"])) is True
+        assert run(store.delete_conversation(drop["id"])) is False
+
+        assert run(store.get_conversation(drop["id"])) is None
+        assert run(store.get_conversation(keep["id"]))["messages"][0]["content"] == "mensaje 0"
+        assert run(store.list_conversations(user_id="user-2"))[1] == 0
+        assert run(store.get_stats()) == {
+            "total_conversations": 1,
+            "total_messages": 1,
+            "unique_users": 1,
+            "unique_companies": 1,
+        }
+
+    def test_clear(self, store):
+        _create(store, messages=1)
+        _create(store, user_id="user-2")
+
+        assert run(store.clear()) == 2
+        assert run(store.list_conversations()) == ([], 0)
+        assert run(store.get_stats())["total_messages"] == 0
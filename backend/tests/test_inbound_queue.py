@@ -0,0 +1,222 @@
+"""
+Tests unitarios de la cola de entrada de WhatsApp (inbound_queue).
+
+Ejecutan los scripts Lua contra fakeredis: claim con token de dueño,
+ack / release solo para el dueño, handoff y sweeper de conversaciones
+huérfanas.
+
+Para ejecutar:
+    pytest tests/test_inbound_queue.py -v
+"""
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.services.whatsapp.inbound import InboundMessage  # noqa: E402
+from app.services.whatsapp.inbound_queue import (  # noqa: E402
+    DEPTH_KEY,
+    PENDING_KEY,
+    SCHEDULED,
+    InboundQueue,
+)
+
+CONVERSATION_ID = "conv-1"
+
+
+def _message(message_id: str, conversation_id: str = CONVERSATION_ID) -> InboundMessage:
+    return InboundMessage(
+        conversation_id=conversation_id,
+        sender_phone="+56911111111",
+        content=f"mensaje {message_id}",
+        message_id=message_id,
+    )
+
+
+@pytest.fixture
+def queue():
+    """Cola sobre un Redis en memoria."""
+    queue = InboundQueue(redis_url="redis://test")
+    queue._redis.client = fakeredis.FakeRedis()
+    return queue
+
+
+def _active(queue: InboundQueue, conversation_id: str = CONVERSATION_ID):
+    value = queue._redis.client.get(queue._active_key(conversation_id))
+    return value.decode() if value is not None else None
+
+
+@pytest.mark.unit
+class TestEnqueue:
+    """Encolado desde el webhook."""
+
+    def test_first_message_schedules_conversation(self, queue):
+        result = queue.enqueue([_message("m1"), _message("m2")])
+
+        assert result.queued == 2
+        assert result.to_schedule == [CONVERSATION_ID]
+        assert _active(queue) == SCHEDULED
+        assert queue.depth() == 2
+        assert queue._redis.client.sismember(PENDING_KEY, CONVERSATION_ID)
+
+    def test_duplicate_message_is_skipped(self, queue):
+        queue.enqueue([_message("m1")])
+        result = queue.enqueue([_message("m1")])
+
+        assert result.duplicates == 1
+        assert result.queued == 0
+        assert queue.depth() == 1
+
+    def test_claimed_conversation_is_not_rescheduled(self, queue):
+        queue.enqueue([_message("m1")])
+        assert queue.claim(CONVERSATION_ID, "owner")
+
+        result = queue.enqueue([_message("m2")])
+
+        assert result.queued == 1
+        assert result.to_schedule == []
+
+    def test_full_queue_rejects(self, queue):
+        queue.max_depth = 1
+        result = queue.enqueue([_message("m1"), _message("m2")])
+
+        assert result.queued == 1
+        assert result.rejected == 1
+
+
+@pytest.mark.unit
+class TestClaim:
+    """Claim con token de dueño."""
+
+    def test_claim_takes_over_scheduled_marker(self, queue):
+        queue.enqueue([_message("m1")])
+
+        assert queue.claim(CONVERSATION_ID, "owner-a")
+        assert _active(queue) == "owner-a"
+
+    def test_second_drainer_cannot_claim(self, queue):
+        queue.enqueue([_message("m1")])
+        assert queue.claim(CONVERSATION_ID, "owner-a")
+
+        assert not queue.claim(CONVERSATION_ID, "owner-b")
+        assert _active(queue) == "owner-a"
+
+    def test_expired_claim_can_be_taken(self, queue):
+        queue.enqueue([_message("m1")])
+        assert queue.claim(CONVERSATION_ID, "owner-a")
+        queue._redis.client.delete(queue._active_key(CONVERSATION_ID))  # TTL vencido
+
+        assert queue.claim(CONVERSATION_ID, "owner-b")
+
+    def test_heartbeat_only_for_owner(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+
+        assert queue.heartbeat(CONVERSATION_ID, "owner-a")
+        assert not queue.heartbeat(CONVERSATION_ID, "owner-b")
+
+
+@pytest.mark.unit
+class TestAckAndRelease:
+    """Ack / release verifican el token dentro del script."""
+
+    def test_ack_pops_head_for_owner(self, queue):
+        queue.enqueue([_message("m1"), _message("m2")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+
+        message, found = queue.peek(CONVERSATION_ID)
+        assert found and message.message_id == "m1"
+        assert queue.ack(CONVERSATION_ID, "owner-a")
+
+        message, _ = queue.peek(CONVERSATION_ID)
+        assert message.message_id == "m2"
+        assert queue.depth() == 1
+
+    def test_ack_from_stale_drainer_keeps_message(self, queue):
+        queue.enqueue([_message("m1"), _message("m2")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+
+        assert not queue.ack(CONVERSATION_ID, "owner-b")
+
+        message, _ = queue.peek(CONVERSATION_ID)
+        assert message.message_id == "m1"
+        assert queue.depth() == 2
+
+    def test_release_when_empty(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+        queue.ack(CONVERSATION_ID, "owner-a")
+
+        assert queue.release(CONVERSATION_ID, "owner-a") is True
+        assert _active(queue) is None
+        assert not queue._redis.client.sismember(PENDING_KEY, CONVERSATION_ID)
+
+    def test_release_keeps_claim_when_messages_arrived(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+
+        assert queue.release(CONVERSATION_ID, "owner-a") is False
+        assert _active(queue) == "owner-a"
+
+    def test_release_from_stale_drainer(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+        queue.ack(CONVERSATION_ID, "owner-a")
+
+        assert queue.release(CONVERSATION_ID, "owner-b") is None
+        assert _active(queue) == "owner-a"
+
+    def test_depth_never_negative(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+        queue._redis.client.set(DEPTH_KEY, 0)
+
+        queue.ack(CONVERSATION_ID, "owner-a")
+
+        assert queue.depth() == 0
+
+    def test_handoff_lets_next_task_claim(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+
+        assert queue.handoff(CONVERSATION_ID, "owner-a")
+        assert _active(queue) == SCHEDULED
+        assert queue.claim(CONVERSATION_ID, "owner-b")
+
+
+@pytest.mark.unit
+class TestSweep:
+    """Sweeper de conversaciones sin drainer."""
+
+    def test_orphaned_conversation_is_rescheduled(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+        queue._redis.client.delete(queue._active_key(CONVERSATION_ID))  # worker murió
+
+        assert queue.sweep() == [CONVERSATION_ID]
+        assert _active(queue) == SCHEDULED
+        # Ya marcada: el siguiente barrido no la duplica
+        assert queue.sweep() == []
+
+    def test_claimed_conversation_is_left_alone(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+
+        assert queue.sweep() == []
+        assert _active(queue) == "owner-a"
+
+    def test_empty_conversation_leaves_pending_set(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+        queue.ack(CONVERSATION_ID, "owner-a")
+        queue._redis.client.delete(queue._active_key(CONVERSATION_ID))
+
+        assert queue.sweep() == []
+        assert not queue._redis.client.sismember(PENDING_KEY, CONVERSATION_ID)
+
+    def test_release_claim_only_drops_scheduled_marker(self, queue):
+        queue.enqueue([_message("m1")])
+        queue.claim(CONVERSATION_ID, "owner-a")
+
+        queue.release_claim(CONVERSATION_ID)
+
+        assert _active(queue) == "owner-a"
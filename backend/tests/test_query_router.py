@@ -0,0 +1,168 @@
+"""
+Tests unitarios del router de consultas (app/agents/orchestration/query_router.py).
+
+Verifican qué mensajes se enrutan localmente, cuáles reutilizan la decisión
+previa del thread y cuáles quedan para el clasificador LLM.
+
+Para ejecutar:
+    pytest tests/test_query_router.py -v
+"""
+import pytest
+
+from app.agents.orchestration.query_router import (
+    QUESTION_MARKER,
+    TIER_CACHE,
+    TIER_LLM,
+    TIER_LOCAL,
+    QueryRouter,
+    RoutingDecision,
+    extract_question,
+    tokenize,
+)
+
+THREAD_ID = "thread-1"
+
+
+@pytest.fixture
+def router(monkeypatch):
+    monkeypatch.delenv("AGENT_LOCAL_ROUTER_ENABLED", raising=False)
+    monkeypatch.delenv("AGENT_ROUTER_MIN_SCORE", raising=False)
+    monkeypatch.delenv("AGENT_ROUTER_MIN_MARGIN", raising=False)
+    return QueryRouter()
+
+
+@pytest.mark.unit
+class TestTokenize:
+    """Normalización de términos."""
+
+    def test_strips_accents_stopwords_and_stems(self):
+        assert tokenize("¿Cuánto debo pagar de IVA este mes?") == ["cuanto", "debo", "pagar", "iva"]
+
+    def test_singular_and_plural_share_a_stem(self):
+        assert tokenize("facturas") == tokenize("factura")
+
+    def test_extract_question_drops_ui_context(self):
+        message = f"## Contexto de la factura\nFolio 123\n\n{QUESTION_MARKER} ¿está pagada?"
+
+        assert extract_question(message) == "¿está pagada?"
+        assert extract_question("contexto ¿y esto?", ui_context="contexto") == "¿y esto?"
+
+
+@pytest.mark.unit
+class TestLocalTier:
+    """Decisiones sin LLM."""
+
+    @pytest.mark.parametrize("message", ["hola", "¡Muchas gracias!", "Buenas tardes"])
+    def test_small_talk(self, router, message):
+        decision = router.route(THREAD_ID, message)
+
+        assert decision.agent_name == "general_knowledge"
+        assert decision.tier == TIER_LOCAL
+
+    def test_conceptual_question(self, router):
+        decision = router.route(THREAD_ID, "¿Qué es el IVA?")
+
+        assert decision.agent_name == "general_knowledge"
+
+    def test_conceptual_question_about_own_data_goes_to_llm(self, router):
+        assert router.route(THREAD_ID, "¿Qué es esta factura de mi empresa?") is None
+
+    @pytest.mark.parametrize("message, agent", [
+        ("muéstrame mis facturas de venta", "tax_documents"),
+        ("cuánto debo pagar de IVA este mes", "monthly_taxes"),
+        ("lista mis empleados", "payroll"),
+        ("registrar un gasto en combustible", "expense"),
+        ("encontré un error en la app", "feedback"),
+        ("cambiar mi correo", "settings"),
+    ])
+    def test_clear_domain_message(self, router, message, agent):
+        decision = router.route(THREAD_ID, message)
+
+        assert decision.agent_name == agent
+        assert decision.tier == TIER_LOCAL
+        assert decision.score >= router.min_score
+
+    def test_ambiguous_message_goes_to_llm(self, router):
+        # Facturas (documentos) + IVA (impuestos): sin margen suficiente
+        assert router.route(THREAD_ID, "factura de compra iva") is None
+
+    def test_question_after_ui_context(self, router):
+        message = f"## Documento\nFolio 991\n\n{QUESTION_MARKER} hola"
+
+        assert router.route(THREAD_ID, message).agent_name == "general_knowledge"
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv("AGENT_LOCAL_ROUTER_ENABLED", "false")
+
+        assert QueryRouter().route(THREAD_ID, "hola") is None
+
+
+@pytest.mark.unit
+class TestCacheTier:
+    """Reutilización de la decisión del thread en seguimientos cortos."""
+
+    def test_follow_up_reuses_thread_agent(self, router):
+        router.route(THREAD_ID, "cuánto debo pagar de IVA este mes")
+
+        decision = router.route(THREAD_ID, "¿y el de octubre?")
+
+        assert decision.agent_name == "monthly_taxes"
+        assert decision.tier == TIER_CACHE
+
+    def test_small_talk_keeps_thread_agent(self, router):
+        router.route(THREAD_ID, "muéstrame mis facturas de octubre")
+        router.route(THREAD_ID, "gracias")
+
+        decision = router.route(THREAD_ID, "¿y las de noviembre?")
+
+        assert decision.agent_name == "tax_documents"
+        assert decision.tier == TIER_CACHE
+
+    def test_conceptual_question_keeps_thread_agent(self, router):
+        router.route(THREAD_ID, "lista mis empleados")
+        router.route(THREAD_ID, "¿Qué es el IVA?")
+
+        assert router.route(THREAD_ID, "dale").agent_name == "payroll"
+
+    def test_follow_up_without_history_goes_to_llm(self, router):
+        assert router.route(THREAD_ID, "dale") is None
+
+    def test_follow_up_is_per_thread(self, router):
+        router.route("other-thread", "lista mis empleados")
+
+        assert router.route(THREAD_ID, "dale") is None
+
+    def test_follow_up_with_ui_context_goes_to_llm(self, router):
+        router.route(THREAD_ID, "lista mis empleados")
+        ui_context = "Contexto de la factura"
+
+        assert router.route(THREAD_ID, f"{ui_context}\n¿y esto?", ui_context) is None
+
+    def test_llm_decision_is_reused(self, router):
+        router.record(THREAD_ID, RoutingDecision("expense", TIER_LLM))
+
+        assert router.route(THREAD_ID, "dale").agent_name == "expense"
+
+    def test_forget_thread(self, router):
+        router.route(THREAD_ID, "lista mis empleados")
+        router.forget_thread(THREAD_ID)
+
+        assert router.route(THREAD_ID, "dale") is None
+
+
+@pytest.mark.unit
+class TestStats:
+    """Contadores por tier."""
+
+    def test_counts_per_tier_and_agent(self, router):
+        router.route(THREAD_ID, "hola")
+        router.route(THREAD_ID, "lista mis empleados")
+        router.route(THREAD_ID, "dale")
+        router.record(THREAD_ID, RoutingDecision("expense", TIER_LLM))
+
+        stats = router.get_stats()
+
+        assert stats["total"] == 4
+        assert stats["tiers"] == {"local": 2, "cache": 1, "llm": 1}
+        assert stats["tier_share"]["local"] == 0.5
+        assert stats["agents"] == {"general_knowledge": 1, "payroll": 2, "expense": 1}
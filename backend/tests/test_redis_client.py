@@ -0,0 +1,98 @@
+"""
+Tests unitarios de LazyRedis (app/utils/redis_client.py).
+
+Verifican la conexión en el primer uso, el backoff mientras Redis no
+responde y la reconexión cuando vuelve.
+
+Para ejecutar:
+    pytest tests/test_redis_client.py -v
+"""
+import os
+
+import pytest
+
+redis = pytest.importorskip("redis")
+
+from app.utils import redis_client  # noqa: E402
+from app.utils.redis_client import LazyRedis  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self, up: bool):
+        self.up = up
+
+    def ping(self):
+        if not self.up:
+            raise ConnectionError("connection refused")
+        return True
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(redis_client.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Estado del Redis falso y URLs con las que se intentó conectar."""
+    state = {"up": False, "connects": []}
+
+    def from_url(url, socket_timeout):
+        state["connects"].append(url)
+        return FakeRedis(state["up"])
+
+    monkeypatch.setattr(redis.Redis, "from_url", staticmethod(from_url))
+    return state
+
+
+@pytest.mark.unit
+class TestLazyRedis:
+    """Conexión perezosa con backoff."""
+
+    def test_without_url(self, server):
+        lazy = LazyRedis(None, "test")
+
+        assert lazy.get() is None
+        assert not lazy.available
+        assert server["connects"] == []
+
+    def test_connects_once(self, server):
+        server["up"] = True
+        lazy = LazyRedis("redis://localhost", "test")
+
+        client = lazy.get()
+
+        assert client is not None
+        assert lazy.get() is client
+        assert server["connects"] == ["redis://localhost"]
+
+    def test_retries_after_backoff(self, server, clock):
+        lazy = LazyRedis("redis://localhost", "test", retry_seconds=30)
+
+        assert lazy.get() is None
+        server["up"] = True
+        clock.now += 29
+        assert lazy.get() is None  # todavía en backoff
+        assert len(server["connects"]) == 1
+
+        clock.now += 1
+        assert lazy.get() is not None
+        assert len(server["connects"]) == 2
+
+    def test_url_callable_is_read_on_connect(self, server, monkeypatch):
+        server["up"] = True
+        monkeypatch.setenv("REDIS_URL", "redis://from-env")
+        lazy = LazyRedis(lambda: os.getenv("REDIS_URL"), "test")
+
+        assert lazy.available
+        assert server["connects"] == ["redis://from-env"]